@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__doc__ = "比较 P115FileSystem.glob 的两种策略：服务端搜索 vs 逐个罗列目录"
+
+from argparse import ArgumentParser
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+
+from p115 import P115Client
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("pattern", nargs="?", default="**/*.nfo", help="通配符模式，默认值 '**/*.nfo'")
+    parser.add_argument("-d", "--dirname", default="/", help="开始匹配的目录，默认值 '/'")
+    parser.add_argument("-i", "--ignore-case", action="store_true", help="忽略大小写")
+    parser.add_argument("-cp", "--cookies-path", default="115-cookies.txt", help="cookies 文件保存路径，默认为当前工作目录下的 115-cookies.txt")
+    return parser.parse_args()
+
+
+def count_calls(client, counter: Counter):
+    "统计各个接口的调用次数"
+    for name in ("fs_files", "fs_search", "fs_file", "fs_file_skim"):
+        func = getattr(client, name)
+        def wrapper(*args, __name=name, __func=func, **kwds):
+            counter[__name] += 1
+            return __func(*args, **kwds)
+        setattr(client, name, wraps(func)(wrapper))
+
+
+def run(fs, args, use_search: bool):
+    fs.id_to_ancestor.clear()
+    if fs.id_to_readdir is not None:
+        fs.id_to_readdir.clear()
+    counter.clear()
+    start = perf_counter()
+    paths = {p.path for p in fs.glob(
+        args.pattern,
+        args.dirname,
+        ignore_case=args.ignore_case,
+        use_search=use_search,
+    )}
+    elapsed = perf_counter() - start
+    print(f"use_search={use_search!r:5}  hits={len(paths):<8}  elapsed={elapsed:.3f}s  calls={dict(counter)}")
+    return paths
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    client = P115Client(Path(args.cookies_path), check_for_relogin=True)
+    counter: Counter[str] = Counter()
+    count_calls(client, counter)
+    fs = client.get_fs()
+    by_search = run(fs, args, use_search=True)
+    by_listing = run(fs, args, use_search=False)
+    if by_search != by_listing:
+        print("⚠️ results differ")
+        print("  only by search:", sorted(by_search - by_listing)[:20])
+        print("  only by listing:", sorted(by_listing - by_search)[:20])
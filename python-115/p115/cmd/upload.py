@@ -80,15 +80,18 @@ def main(argv: None | list[str] | Namespace = None, /):
     from os.path import dirname, normpath
     from textwrap import indent
     from threading import Lock
+    from _thread import start_new_thread
+    from time import sleep
     from traceback import format_exc
     from typing import cast, ContextManager
     from urllib.error import URLError
 
-    from concurrenttools import thread_batch
     from hashtools import file_digest
     from p115 import check_response, MultipartUploadAbort, MultipartResumeData
     from p115.component import P115Client
+    from p115.tool.scheduler import LANE_NAMES, TransferScheduler
     from posixpatht import escape, joinpath as pjoinpath, normpath as pnormpath, split as psplit, path_is_dir_form
+    from rich.filesize import decimal as format_size
     from rich.progress import (
         Progress, DownloadColumn, FileSizeColumn, MofNCompleteColumn, SpinnerColumn, 
         TimeElapsedColumn, TransferSpeedColumn, 
@@ -108,12 +111,23 @@ def main(argv: None | list[str] | Namespace = None, /):
     use_request = args.use_request
     max_workers = args.max_workers
     max_retries = args.max_retries
+    small_threshold = args.small_threshold
+    max_large_workers = args.max_large_workers
+    limit_rate = args.limit_rate
+    limit_rate_per_conn = args.limit_rate_per_conn
     resume = args.resume
     remove_done = args.remove_done
     with_root = args.with_root
 
     if max_workers <= 0:
         max_workers = 1
+    scheduler = TransferScheduler(
+        max_workers, 
+        small_threshold=small_threshold, 
+        max_large_workers=max_large_workers, 
+        rate_limit=limit_rate, 
+        conn_rate_limit=limit_rate_per_conn, 
+    )
     count_lock: None | ContextManager = None
     if max_workers > 1:
         count_lock = Lock()
@@ -304,6 +318,8 @@ def main(argv: None | list[str] | Namespace = None, /):
         try:
             while not closed:
                 step = yield
+                if step:
+                    scheduler.throttle(step)
                 progress.update(task, description=update_desc(), advance=step)
                 progress.update(statistics_bar, description=get_stat_str(), advance=step, total=tasks["size"])
         finally:
@@ -554,13 +570,27 @@ def main(argv: None | list[str] | Namespace = None, /):
         update_tasks(1, not src_attr["is_directory"], src_attr.get("size"))
         get_stat_str = lambda: f"📊 [cyan bold]statistics[/cyan bold] 🧮 {tasks['total']} = 💯 {success['total']} + ⛔ {failed['total']} + ⏳ {unfinished['total']}"
         statistics_bar = progress.add_task(get_stat_str(), total=tasks["size"])
+        lane_bars = {name: progress.add_task(f"🚦 {name}", total=None) for name in LANE_NAMES}
         closed = False
+        def update_lanes():
+            while not closed:
+                for name, lane in scheduler.lane_stats().items():
+                    progress.update(
+                        lane_bars[name], 
+                        description=f"🚦 [magenta bold]{name:<5}[/magenta bold] ⏳ {lane['pending']} 🏃 {lane['running']} 💯 {lane['done']} 🚀 {format_size(int(lane['speed']))}/s", 
+                        completed=lane["bytes"], 
+                    )
+                sleep(0.5)
         try:
-            thread_batch(work, unfinished_tasks.values(), max_workers=max_workers)
+            start_new_thread(update_lanes, ())
+            scheduler.run(work, unfinished_tasks.values())
             stats["is_completed"] = True
         finally:
             closed = True
             progress.remove_task(statistics_bar)
+            for lane_bar in lane_bars.values():
+                progress.remove_task(lane_bar)
+            stats["lanes"] = scheduler.lane_stats()
             stats["elapsed"] = str(datetime.now() - start_time)
             console_print(f"📊 [cyan bold]statistics:[/cyan bold] {stats}")
     return Result(stats, all_tasks)
@@ -606,6 +636,10 @@ parser.add_argument("-t", "--dst-path", default="/", help="""115 网盘中的文
 parser.add_argument("-ps", "--part-size", default=1 << 30, type=int, help="分块上传时的分块大小，单位是 Byte，默认为 1073741824，即 1GB")
 
 parser.add_argument("-m", "--max-workers", default=1, type=int, help="并发线程数，默认值 1")
+parser.add_argument("-ml", "--max-large-workers", default=0, type=int, help="同时上传大文件的最大线程数，剩余的线程只上传小文件，如果 <= 0（默认），则为 -m/--max-workers 的一半（至少为 1）")
+parser.add_argument("-st", "--small-threshold", default=1 << 26, type=int, help="小文件和大文件的分界，单位是 Byte，默认为 67108864，即 64MB")
+parser.add_argument("-l", "--limit-rate", default=0, type=int, help="全局的最大上传速率，单位是 Byte/s，如果 <= 0（默认），则不限速")
+parser.add_argument("-lc", "--limit-rate-per-conn", default=0, type=int, help="单个连接的最大上传速率，单位是 Byte/s，如果 <= 0（默认），则不限速")
 parser.add_argument("-mr", "--max-retries", default=-1, type=int, 
                     help="""最大重试次数。
     - 如果小于 0（默认），则会对一些超时、网络请求错误进行无限重试，其它错误进行抛出
@@ -4,16 +4,17 @@
 from __future__ import annotations
 
 __author__ = "ChenyangGao <https://chenyanggao.github.io>"
-__all__ = ["P115Path", "P115FileSystem"]
+__all__ = ["P115Path", "P115PathGroup", "P115FileSystem"]
 
 import errno
 
-from asyncio import Lock as AsyncLock
+from asyncio import gather, Lock as AsyncLock, Semaphore as AsyncSemaphore
 from collections import deque, UserString
 from collections.abc import (
     AsyncIterable, AsyncIterator, Callable, Coroutine, ItemsView, Iterable, Iterator, 
     Mapping, Sequence, 
 )
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property, partial
 from io import BytesIO, TextIOWrapper
 from itertools import accumulate, cycle, islice
@@ -21,6 +22,7 @@ from json import JSONDecodeError
 from os import path as ospath, fspath, remove, rmdir, scandir, stat_result, PathLike
 from pathlib import Path
 from posixpath import splitext
+from re import compile as re_compile, escape as re_escape
 from shutil import SameFileError
 from stat import S_IFDIR, S_IFREG
 from threading import Lock
@@ -32,6 +34,7 @@ from weakref import WeakValueDictionary
 
 from dictattr import AttrDict
 from filewrap import Buffer, SupportsRead
+from glob_pattern import translate_iter
 from http_request import SupportsGeturl
 from iterutils import run_gen_step, run_gen_step_iter, Yield, YieldFrom
 from p115client import check_response, normalize_attr, P115URL
@@ -42,6 +45,69 @@ from .client import P115Client
 from .fs_base import IDOrPathType, P115PathBase, P115FileSystemBase
 
 
+#: 115 的搜索接口最多只能翻到第 10000 条
+SEARCH_MAX_COUNT = 10_000
+CRE_GLOB_SUFFIX_search = re_compile(r"(?<!^)\.([^.*?\[\]]+)$").search
+CRE_GLOB_WILDCARD_split = re_compile(r"\[[^]]*\]|[*?]").split
+
+
+def _glob_search_plan(
+    pattern: str, 
+    /, 
+    ignore_case: bool = False, 
+    allow_escaped_slash: bool = True, 
+) -> None | tuple[list[str], str, dict]:
+    """为 glob 制定搜索计划，如果不能用搜索接口来表达，则返回 None
+
+    :return: 3 元组 (固定前缀的各部分, 用于验证的正则表达式（相对于前缀目录）, 搜索接口的查询参数)
+    """
+    splitted_pats = tuple(translate_iter(pattern, allow_escaped_slash=allow_escaped_slash))
+    if not splitted_pats:
+        return None
+    i = 0
+    prefix: list[str] = []
+    # NOTE: 忽略大小写时，固定前缀也需要模糊匹配，所以不能直接定位目录
+    if not ignore_case:
+        for i, (_, typ, orig) in enumerate(splitted_pats):
+            if typ != "orig":
+                break
+            prefix.append(orig)
+        else:
+            return None
+    rest = splitted_pats[i:]
+    # NOTE: 只有递归匹配（**）时，搜索才比罗列目录更快
+    if not any(typ == "dstar" for _, typ, _ in rest):
+        return None
+    pat, typ, orig = rest[-1]
+    if typ == "orig":
+        payload = {"search_value": orig}
+    elif typ == "pat":
+        if allow_escaped_slash:
+            part = splits(pattern, parse_dots=False, unescape=None)[0][-1]
+        else:
+            part = pattern.rstrip("/").rpartition("/")[-1]
+        payload = {}
+        if match := CRE_GLOB_SUFFIX_search(part):
+            payload["suffix"] = match[1]
+            part = part[:match.start()]
+        fragment = max(CRE_GLOB_WILDCARD_split(part), key=len).strip(" .")
+        if "suffix" in payload:
+            payload["search_value"] = "."
+        elif len(fragment) >= 2:
+            payload["search_value"] = fragment
+        else:
+            return None
+    else:
+        return None
+    regex = "".join(
+        "(?:/%s)?" % pat if typ == "dstar" else "/" + pat 
+        for pat, typ, _ in rest
+    )
+    if ignore_case:
+        regex = "(?i:%s)" % regex
+    return prefix, regex, payload
+
+
 class LRUDict(dict):
 
     def __init__(self, /, maxsize: int = 0):
@@ -219,6 +285,32 @@ class P115AncestorPath(UserString):
 
 class P115Path(P115PathBase):
     fs: P115FileSystem
+    group: None | P115PathGroup = None
+
+    def __getattr__(self, attr, /):
+        try:
+            return self.attr[attr]
+        except KeyError as e:
+            # NOTE: 即使 `hydrate()` 返回 False，也可能刚被别处（在等待锁时）补全了，所以总是再查找一次
+            if (group := self.group) is not None and not attr.startswith("_"):
+                group.hydrate()
+                try:
+                    return self.attr[attr]
+                except KeyError:
+                    pass
+            raise AttributeError(attr) from e
+
+    def __getitem__(self, key, /):
+        try:
+            return self.attr[key]
+        except KeyError:
+            if (group := self.group) is None:
+                raise
+            if key in ("path", "ancestors", "ancestor_path"):
+                group.hydrate_paths()
+            else:
+                group.hydrate()
+            return self.attr[key]
 
     @property
     def ancestors(self, /) -> list[Ancestor]:
@@ -737,6 +829,184 @@ class P115Path(P115PathBase):
     rm = remove
 
 
+class P115PathGroup:
+    """一组 P115Path 的批量补全（hydration）
+
+    搜索结果等处得到的 P115Path，往往只有部分属性（例如缺少 "path"）。
+    如果它们属于同一个组，那么当其中一个访问缺失的属性时，会为整组一次性补全，
+    而不是每个对象各自请求一次
+
+    - 缺少路径时，用 `P115FileSystem.get_ancestors_batch` 批量获取（每个不同的父目录请求一次）
+    - 缺少其它属性时，按父目录分组，罗列父目录来批量获取完整的属性；
+      如果某个父目录下只有 1 个成员，则把这些成员的 id 每 `skim_chunk_size` 个一批，用 `fs_file_skim` 批量获取，
+      但这个接口只返回名字、大小、sha1 和提取码，其它缺少的属性仍需用 `P115FileSystem.attr` 获取
+    - 每个成员在补全成功后才会标记为已补全，中途出错（例如超时或被风控）时，剩下的成员在下次需要时会重试，
+      补全之后才添加的成员，会在下次需要时再（为这些新成员）补全
+
+    :param fs: 文件系统对象
+    :param paths: 初始的成员
+    :param max_workers: 批量获取路径时，请求父目录的最大并发数
+    :param skim_chunk_size: 用 `fs_file_skim` 批量获取时，每批的 id 数
+    """
+    def __init__(
+        self, 
+        /, 
+        fs: P115FileSystem, 
+        paths: Iterable[P115Path] = (), 
+        max_workers: int = 1, 
+        skim_chunk_size: int = 100, 
+    ):
+        self.fs = fs
+        self.members: list[P115Path] = []
+        self.max_workers = max_workers
+        self.skim_chunk_size = max(skim_chunk_size, 1)
+        # NOTE: 尚未补全的成员，键是 `id(path)`，补全成功后才会移除
+        self._unhydrated: dict[int, P115Path] = {}
+        self._lock = Lock()
+        self._alock = AsyncLock()
+        for path in paths:
+            self.add(path)
+
+    def __len__(self, /) -> int:
+        return len(self.members)
+
+    def __iter__(self, /) -> Iterator[P115Path]:
+        return iter(self.members)
+
+    def __repr__(self, /) -> str:
+        return f"<{type(self).__module__}.{type(self).__qualname__}(fs={self.fs!r}, members={len(self.members)}, hydrated={self.hydrated!r}) at {hex(id(self))}>"
+
+    @property
+    def hydrated(self, /) -> bool:
+        "是否所有成员都已补全"
+        return not self._unhydrated
+
+    def add(self, path: P115Path, /) -> P115Path:
+        "添加成员，并返回它"
+        path.group = self
+        self.members.append(path)
+        self._unhydrated[id(path)] = path
+        return path
+
+    @overload
+    def hydrate_paths(
+        self, 
+        /, 
+        async_: Literal[False] = False, 
+    ) -> int:
+        ...
+    @overload
+    def hydrate_paths(
+        self, 
+        /, 
+        async_: Literal[True], 
+    ) -> Coroutine[Any, Any, int]:
+        ...
+    def hydrate_paths(
+        self, 
+        /, 
+        async_: Literal[False, True] = False, 
+    ) -> int | Coroutine[Any, Any, int]:
+        "为缺少路径的成员批量获取路径，返回补全的个数"
+        def gen_step():
+            attrs = [p.attr for p in self.members if "path" not in p.attr]
+            if not attrs:
+                return 0
+            result = yield self.fs.get_ancestors_batch(
+                attrs, 
+                max_workers=self.max_workers, 
+                async_=async_, 
+            )
+            return len(result)
+        if async_:
+            async def request():
+                async with self._alock:
+                    return await run_gen_step(gen_step, async_=True)
+            return request()
+        with self._lock:
+            return run_gen_step(gen_step)
+
+    @overload
+    def hydrate(
+        self, 
+        /, 
+        async_: Literal[False] = False, 
+    ) -> bool:
+        ...
+    @overload
+    def hydrate(
+        self, 
+        /, 
+        async_: Literal[True], 
+    ) -> Coroutine[Any, Any, bool]:
+        ...
+    def hydrate(
+        self, 
+        /, 
+        async_: Literal[False, True] = False, 
+    ) -> bool | Coroutine[Any, Any, bool]:
+        "为尚未补全的成员批量获取属性，返回是否进行了补全（每个成员只会成功补全一次）"
+        def gen_step():
+            # NOTE: 并发的补全已经被锁串行化，这里处理的是快照，补全期间新添加的成员留到下次
+            unhydrated = self._unhydrated
+            if not unhydrated:
+                return False
+            fs = self.fs
+            groups: dict[int, dict[int, list[P115Path]]] = {}
+            for path in tuple(unhydrated.values()):
+                attr = path.attr
+                groups.setdefault(attr.get("parent_id", -1), {}).setdefault(attr["id"], []).append(path)
+            skims: dict[int, list[P115Path]] = {}
+            for pid, id_to_paths in groups.items():
+                if pid >= 0 and len(id_to_paths) > 1:
+                    try:
+                        subattrs = yield fs.listdir_attr(pid, async_=async_)
+                    except (FileNotFoundError, NotADirectoryError):
+                        subattrs = []
+                    for subattr in subattrs:
+                        for path in id_to_paths.pop(subattr["id"], ()):
+                            path.attr.update(subattr)
+                            unhydrated.pop(id(path), None)
+                # NOTE: 父目录罗列不到的成员（可能已被移走），和父目录下只有 1 个的成员一起批量获取
+                skims.update(id_to_paths)
+            ids = list(skims)
+            chunk_size = self.skim_chunk_size
+            for i in range(0, len(ids), chunk_size):
+                chunk = ids[i:i+chunk_size]
+                try:
+                    resp = yield fs.fs_file_skim(chunk, async_=async_)
+                    infos = resp["data"]
+                except FileNotFoundError:
+                    # NOTE: 不确定是哪些 id 不存在，逐个重新获取
+                    infos = []
+                    if len(chunk) > 1:
+                        for fid in chunk:
+                            try:
+                                resp = yield fs.fs_file_skim(fid, async_=async_)
+                            except FileNotFoundError:
+                                continue
+                            infos.extend(resp["data"])
+                for info in infos:
+                    for path in skims.get(int(info["file_id"]), ()):
+                        attr = path.attr
+                        attr["name"] = info["file_name"]
+                        attr["pickcode"] = info["pick_code"]
+                        if not attr.get("is_directory"):
+                            attr["size"] = int(info["file_size"])
+                            attr["sha1"] = info["sha1"]
+                # NOTE: 没有返回信息的 id 已经不存在，也不再补全
+                for fid in chunk:
+                    for path in skims[fid]:
+                        unhydrated.pop(id(path), None)
+            return True
+        if async_:
+            async def request():
+                async with self._alock:
+                    return await run_gen_step(gen_step, async_=True)
+            return request()
+        with self._lock:
+            return run_gen_step(gen_step)
+
 class P115FileSystem(P115FileSystemBase[P115Path]):
     id_to_attr: WeakValueDictionary[int, AttrDict]
     id_to_ancestor: WeakValueDictionary[int, Ancestor]
@@ -1022,7 +1292,7 @@ class P115FileSystem(P115FileSystemBase[P115Path]):
     @overload
     def fs_file_skim(
         self, 
-        id: int, 
+        id: int | Iterable[int], 
         /, 
         *, 
         async_: Literal[False] = False, 
@@ -1031,7 +1301,7 @@ class P115FileSystem(P115FileSystemBase[P115Path]):
     @overload
     def fs_file_skim(
         self, 
-        id: int, 
+        id: int | Iterable[int], 
         /, 
         *, 
         async_: Literal[True], 
@@ -1039,12 +1309,15 @@ class P115FileSystem(P115FileSystemBase[P115Path]):
         ...
     def fs_file_skim(
         self, 
-        id: int, 
+        id: int | Iterable[int], 
         /, 
         *, 
         _g = cycle((True, False)).__next__, 
         async_: Literal[False, True] = False, 
     ) -> dict | Coroutine[Any, Any, dict]:
+        # NOTE: 可以传入多个 id（用逗号隔开），一次批量获取它们的简略信息
+        if not isinstance(id, int):
+            id = ",".join(map(str, id))
         def gen_step():
             resp = yield partial(
                 self.client.fs_file_skim, 
@@ -1631,6 +1904,28 @@ class P115FileSystem(P115FileSystemBase[P115Path]):
                 path_to_id[path] = ancestor["id"]
         return ancestors
 
+    def _set_ancestor(self, attr: dict, parent: Ancestor, /) -> Ancestor:
+        "把 `attr` 挂到已知的父目录 `parent` 之下，并更新它的 path 字段"
+        id_to_ancestor = self.id_to_ancestor
+        cid = attr["id"]
+        try:
+            ancestor = id_to_ancestor[cid]
+        except KeyError:
+            ancestor = id_to_ancestor[cid] = Ancestor(
+                id=cid, 
+                parent_id=attr["parent_id"], 
+                name=attr["name"], 
+                is_directory=attr["is_directory"], 
+                parent=parent, 
+            )
+        else:
+            ancestor.update(parent_id=attr["parent_id"], name=attr["name"])
+            ancestor.parent = parent
+        attr["path"] = ancestor.ancestor_path
+        if (path_to_id := self.path_to_id) is not None:
+            path_to_id[ancestor.path + "/"[:attr["is_directory"]]] = cid
+        return ancestor
+
     @overload
     def _get_ancestors(
         self, 
@@ -1665,17 +1960,9 @@ class P115FileSystem(P115FileSystemBase[P115Path]):
                 id = attr["parent_id"]
             if ancestor := self.id_to_ancestor.get(id):
                 if attr is None:
-                    return ancestor
+                    return ancestor.ancestors
                 else:
-                    ancestor = Ancestor(
-                        id=id, 
-                        parent_id=attr["parent_id"], 
-                        name=attr["name"], 
-                        is_directory=attr["is_directory"], 
-                        parent=ancestor, 
-                    )
-                    attr["path"] = ancestor.ancestor_path
-                    return ancestor
+                    return self._set_ancestor(attr, ancestor).ancestors
             elif id:
                 resp = yield self.fs_files({"cid": id, "limit": 2}, async_=async_)
                 return self._get_ancestors_from_response(resp, attr)
@@ -2539,6 +2826,112 @@ class P115FileSystem(P115FileSystemBase[P115Path]):
             return attr["ancestors"]
         return run_gen_step(gen_step, async_=async_)
 
+    @overload
+    def get_ancestors_batch(
+        self, 
+        ids_or_attrs: Iterable[int | dict], 
+        /, 
+        max_workers: int = 1, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> dict[int, list[Ancestor]]:
+        ...
+    @overload
+    def get_ancestors_batch(
+        self, 
+        ids_or_attrs: Iterable[int | dict], 
+        /, 
+        max_workers: int = 1, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[Any, Any, dict[int, list[Ancestor]]]:
+        ...
+    def get_ancestors_batch(
+        self, 
+        ids_or_attrs: Iterable[int | dict], 
+        /, 
+        max_workers: int = 1, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> dict[int, list[Ancestor]] | Coroutine[Any, Any, dict[int, list[Ancestor]]]:
+        """批量获取各个上级目录的少量信息（从根目录到当前目录）
+
+        先按父目录进行分组，每个不同的父目录只请求一次（已经在 `id_to_ancestor` 中的则不需请求），
+        然后批量填充 `id_to_ancestor`，并为传入的 attr 设置 "path"。
+        对于搜索结果之类的大量文件，请求次数从文件数降低为（未缓存的）父目录数
+
+        :param ids_or_attrs: 一组 id 或者 attr（至少有 "id"、"parent_id"、"name" 和 "is_directory" 字段），
+                             传入 id 时，如果未被缓存，则需要先请求一次以获取 attr
+        :param max_workers: 请求父目录时的最大并发数，<= 1 时逐个请求
+
+        :return: 字典，id 到祖先列表的映射（不存在的 id 会被忽略）
+        """
+        def gen_step():
+            id_to_ancestor = self.id_to_ancestor
+            root = self.root_ancestor
+            result: dict[int, list[Ancestor]] = {}
+            attrs: list[dict] = []
+            for id_or_attr in ids_or_attrs:
+                if not isinstance(id_or_attr, int):
+                    attrs.append(id_or_attr)
+                elif not id_or_attr:
+                    result[0] = [root]
+                elif ancestor := id_to_ancestor.get(id_or_attr):
+                    result[id_or_attr] = ancestor.ancestors
+                else:
+                    try:
+                        resp = yield self.fs_file(id_or_attr, async_=async_)
+                    except FileNotFoundError:
+                        continue
+                    attrs.append(normalize_attr(resp["data"][0], dict_cls=AttrDictWithAncestors))
+            # NOTE: id_to_ancestor 是弱引用字典，在此期间保持对父目录的引用
+            parents: dict[int, Ancestor] = {0: root}
+            for attr in attrs:
+                pid = attr["parent_id"]
+                if pid not in parents and (ancestor := id_to_ancestor.get(pid)):
+                    parents[pid] = ancestor
+            pids = [pid for pid in {attr["parent_id"] for attr in attrs} if pid not in parents]
+            def add_parent(resp, /):
+                if resp is not None:
+                    ancestors = self._get_ancestors_from_response(resp)
+                    for ancestor in ancestors[1:]:
+                        parents[ancestor["id"]] = ancestor
+            if max_workers > 1 and len(pids) > 1:
+                if async_:
+                    async def request(pid, sema=AsyncSemaphore(max_workers)):
+                        async with sema:
+                            try:
+                                return await self.fs_files({"cid": pid, "limit": 1}, async_=True)
+                            except (FileNotFoundError, NotADirectoryError):
+                                return None
+                    resps = yield gather(*map(request, pids))
+                else:
+                    def request(pid):
+                        try:
+                            return self.fs_files({"cid": pid, "limit": 1})
+                        except (FileNotFoundError, NotADirectoryError):
+                            return None
+                    with ThreadPoolExecutor(max_workers) as executor:
+                        resps = list(executor.map(request, pids))
+                for resp in resps:
+                    add_parent(resp)
+            else:
+                for pid in pids:
+                    # NOTE: 前面的请求会顺带获取到整条祖先链，所以后面的父目录可能已经不需要请求了
+                    if pid in parents:
+                        continue
+                    try:
+                        resp = yield self.fs_files({"cid": pid, "limit": 1}, async_=async_)
+                    except (FileNotFoundError, NotADirectoryError):
+                        continue
+                    add_parent(resp)
+            set_ancestor = self._set_ancestor
+            for attr in attrs:
+                if parent := parents.get(attr["parent_id"]):
+                    result[attr["id"]] = set_ancestor(attr, parent).ancestors
+            return result
+        return run_gen_step(gen_step, async_=async_)
+
     @overload
     def get_id_from_pickcode(
         self, 
@@ -2659,6 +3052,44 @@ class P115FileSystem(P115FileSystemBase[P115Path]):
             return run_gen_step(gen_step, async_=async_)
         return super().get_path(id_or_path, pid=pid, async_=async_)
 
+    @overload
+    def get_path_batch(
+        self, 
+        ids_or_attrs: Iterable[int | dict], 
+        /, 
+        max_workers: int = 1, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> dict[int, str]:
+        ...
+    @overload
+    def get_path_batch(
+        self, 
+        ids_or_attrs: Iterable[int | dict], 
+        /, 
+        max_workers: int = 1, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[Any, Any, dict[int, str]]:
+        ...
+    def get_path_batch(
+        self, 
+        ids_or_attrs: Iterable[int | dict], 
+        /, 
+        max_workers: int = 1, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> dict[int, str] | Coroutine[Any, Any, dict[int, str]]:
+        "批量获取路径，请参考 `get_ancestors_batch`"
+        def gen_step():
+            id_to_ancestors = yield self.get_ancestors_batch(
+                ids_or_attrs, 
+                max_workers=max_workers, 
+                async_=async_, 
+            )
+            return {id: ancestors[-1].path for id, ancestors in id_to_ancestors.items()}
+        return run_gen_step(gen_step, async_=async_)
+
     @overload
     def get_patht(
         self, 
@@ -2833,6 +3264,126 @@ class P115FileSystem(P115FileSystemBase[P115Path]):
             async_=async_, 
         )
 
+    @overload
+    def glob(
+        self, 
+        /, 
+        pattern: str = "*", 
+        dirname: IDOrPathType = "", 
+        ignore_case: bool = False, 
+        allow_escaped_slash: bool = True, 
+        use_search: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> Iterator[P115Path]:
+        ...
+    @overload
+    def glob(
+        self, 
+        /, 
+        pattern: str = "*", 
+        dirname: IDOrPathType = "", 
+        ignore_case: bool = False, 
+        allow_escaped_slash: bool = True, 
+        use_search: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[P115Path]:
+        ...
+    def glob(
+        self, 
+        /, 
+        pattern: str = "*", 
+        dirname: IDOrPathType = "", 
+        ignore_case: bool = False, 
+        allow_escaped_slash: bool = True, 
+        use_search: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[P115Path] | AsyncIterator[P115Path]:
+        """通配符匹配
+
+        如果模式中含有递归匹配（**），且最后一部分含有可搜索的字面量（扩展名或者名字片段），
+        则会在离得最近的固定前缀目录中，使用服务端搜索（`fs_search`）来获取候选项，
+        然后再用完整的模式进行验证，否则回退到逐个罗列目录
+
+        .. note::
+            服务端搜索最多只能翻到 10000 条，如果某个目录中的候选项超过此数，
+            则罗列这个目录，并对它的子目录分别进行搜索
+
+            服务端的搜索索引可能有延迟，刚刚上传的文件可能还搜不到，此时请指定 `use_search=False`
+
+        :param pattern: 模式
+        :param dirname: 开始匹配的目录（如果模式以 "/" 开头，则忽略此参数）
+        :param ignore_case: 是否忽略大小写
+        :param allow_escaped_slash: 是否允许用 "\\/" 转义 "/"
+        :param use_search: 是否允许使用服务端搜索
+        """
+        plan = None
+        if use_search:
+            plan = _glob_search_plan(
+                pattern, 
+                ignore_case=ignore_case, 
+                allow_escaped_slash=allow_escaped_slash, 
+            )
+        if plan is None:
+            return super().glob(
+                pattern, 
+                dirname, 
+                ignore_case=ignore_case, 
+                allow_escaped_slash=allow_escaped_slash, 
+                async_=async_, 
+            )
+        prefix, regex, query = plan
+        def gen_step():
+            if pattern.startswith("/"):
+                top = 0
+            else:
+                attr = yield self.attr(dirname, async_=async_)
+                top = attr["id"]
+            try:
+                attr = yield self.attr(prefix or top, pid=top, async_=async_)
+            except FileNotFoundError:
+                return
+            if not attr["is_directory"]:
+                return
+            if (top_path := str(attr["path"])) == "/":
+                top_path = ""
+            match = re_compile(re_escape(top_path) + regex).fullmatch
+            id_to_ancestor = self.id_to_ancestor
+            # NOTE: id_to_ancestor 是弱引用字典，在匹配期间保持对父目录的引用，使后续各页的候选项也能共享缓存
+            parents: dict[int, None | Ancestor] = {}
+            def search_step(cid: int, /):
+                payload = {**query, "cid": cid, "offset": 0, "limit": 1_000}
+                offset = 0
+                while True:
+                    resp = yield self.fs_search(payload, async_=async_)
+                    if not offset and resp["count"] > SEARCH_MAX_COUNT:
+                        subattrs = yield self.listdir_attr(cid, async_=async_)
+                        for subattr in subattrs:
+                            if match(str(subattr["path"])):
+                                yield Yield(P115Path(self, subattr))
+                            if subattr["is_directory"]:
+                                yield from search_step(subattr["id"])
+                        return
+                    if resp["offset"] != offset:
+                        return
+                    data = resp["data"]
+                    if not data:
+                        return
+                    attrs = [normalize_attr(attr, dict_cls=AttrDictWithAncestors) for attr in data]
+                    yield self.get_ancestors_batch(attrs, async_=async_)
+                    for attr in attrs:
+                        if (pid := attr["parent_id"]) not in parents:
+                            parents[pid] = id_to_ancestor.get(pid)
+                        if "path" in attr and match(str(attr["path"])):
+                            yield Yield(P115Path(self, attr))
+                    offset = payload["offset"] = offset + resp["page_size"]
+                    if offset >= resp["count"] or offset >= SEARCH_MAX_COUNT:
+                        return
+            yield from search_step(attr["id"])
+        return run_gen_step_iter(gen_step, async_=async_)
+
     # TODO: 如果超过 5 万个文件，则需要分批进入隐藏模式
     @overload
     def hide(
@@ -3901,9 +4452,11 @@ class P115FileSystem(P115FileSystemBase[P115Path]):
                 data = resp["data"]
                 if not data:
                     return
-                for attr in data:
-                    attr = normalize_attr(attr, dict_cls=AttrDictWithAncestors)
-                    yield Yield(P115Path(self, attr))
+                # NOTE: 先把这一页都加入组中，再逐个产出，这样第一次补全时就可以为整页批量获取
+                group = P115PathGroup(self, (
+                    P115Path(self, normalize_attr(attr, dict_cls=AttrDictWithAncestors)) for attr in data))
+                for path in group:
+                    yield Yield(path)
                 offset = payload["offset"] = offset + resp["page_size"]
                 if offset >= resp["count"] or offset >= 10_000:
                     break
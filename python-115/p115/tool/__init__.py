@@ -5,3 +5,4 @@ __author__ = "ChenyangGao <https://chenyanggao.github.io>"
 
 from p115client.tool import *
 from .tool import *
+from .scheduler import *
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+from __future__ import annotations
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = [
+    "LANE_DIR", "LANE_SMALL", "LANE_LARGE", "LANE_NAMES",
+    "TokenBucket", "LaneStats", "TransferScheduler",
+]
+
+from asyncio import (
+    sleep as async_sleep, CancelledError, Condition as AsyncCondition, TaskGroup,
+)
+from collections import deque
+from collections.abc import AsyncIterable, Callable, Coroutine, Iterable
+from contextvars import copy_context, ContextVar
+from dataclasses import dataclass, field
+from inspect import isawaitable
+from os import cpu_count
+from _thread import start_new_thread
+from threading import Condition, Lock
+from time import perf_counter, sleep
+from typing import cast, Any, Final
+
+from argtools import argcount
+
+
+#: 目录（罗列）任务的车道，总是最先被调度
+LANE_DIR: Final = 0
+#: 小文件的车道
+LANE_SMALL: Final = 1
+#: 大文件的车道，同时运行的数目受 `max_large_workers` 限制
+LANE_LARGE: Final = 2
+LANE_NAMES: Final = ("dir", "small", "large")
+
+#: 当前正在执行的任务所属的 (车道, 单连接令牌桶)，每个线程或协程都有独立的上下文
+_current: ContextVar[tuple[int, None | TokenBucket]] = ContextVar("_current", default=(LANE_DIR, None))
+
+
+class TokenBucket:
+    """令牌桶，用于限制字节速率（线程安全），也可在协程中使用
+
+    :param rate: 每秒补充的令牌数（即字节数），<= 0 时不限速
+    :param capacity: 桶的容量（即允许的突发量），默认等于 `rate`
+    """
+    __slots__ = ("rate", "capacity", "_tokens", "_stamp", "_lock")
+
+    def __init__(self, /, rate: float, capacity: None | float = None):
+        self.rate = rate
+        if capacity is None or capacity <= 0:
+            capacity = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._stamp = perf_counter()
+        self._lock = Lock()
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(rate={self.rate!r}, capacity={self.capacity!r})"
+
+    def reserve(self, n: float, /) -> float:
+        """预支 `n` 个令牌，返回需要等待的秒数（令牌允许透支，由等待时间来偿还）
+        """
+        rate = self.rate
+        if rate <= 0 or n <= 0:
+            return 0.0
+        with self._lock:
+            now = perf_counter()
+            tokens = min(self.capacity, self._tokens + (now - self._stamp) * rate) - n
+            self._tokens = tokens
+            self._stamp = now
+        if tokens >= 0:
+            return 0.0
+        return -tokens / rate
+
+    def acquire(self, n: float, /):
+        """取得 `n` 个令牌，不足时阻塞等待
+        """
+        if wait := self.reserve(n):
+            sleep(wait)
+
+    async def async_acquire(self, n: float, /):
+        """取得 `n` 个令牌，不足时异步等待
+        """
+        if wait := self.reserve(n):
+            await async_sleep(wait)
+
+
+@dataclass(slots=True)
+class LaneStats:
+    """单个车道的实时统计
+    """
+    name: str
+    pending: int = 0
+    running: int = 0
+    done: int = 0
+    bytes: int = 0
+    speed: float = 0.0
+    _last_bytes: int = field(default=0, repr=False)
+    _last_stamp: float = field(default_factory=perf_counter, repr=False)
+
+    def update_speed(self, /, interval: float = 0.5) -> float:
+        now = perf_counter()
+        dt = now - self._last_stamp
+        if dt >= interval:
+            instant = (self.bytes - self._last_bytes) / dt
+            # NOTE: 指数平滑，避免显示的速度剧烈抖动
+            self.speed = instant if not self.speed else 0.3 * instant + 0.7 * self.speed
+            self._last_bytes = self.bytes
+            self._last_stamp = now
+        return self.speed
+
+
+class TransferScheduler:
+    """按文件大小分车道的任务调度器，并对带宽进行全局和单连接的整形
+
+    调度规则：
+
+    1. 目录（罗列）任务优先于文件任务，这样可以尽早发现更多的任务
+    2. 大小 >= `small_threshold` 的文件进入大文件车道，同时运行的大文件任务不超过 `max_large_workers`，
+       剩余的工作者只处理小文件，因此少数几个巨大的文件不会占满所有工作者
+    3. 所有任务共享一个全局令牌桶（`rate_limit`），每个工作者还有一个自己的令牌桶（`conn_rate_limit`）
+
+    在执行任务时，通过 `throttle(n)` 报告已经传输的字节数，如果超速则会阻塞（或异步等待）
+
+    :param max_workers: 最大并发数，<= 0 时自动确定
+    :param small_threshold: 小文件和大文件的分界（字节）
+    :param max_large_workers: 同时运行的大文件任务的最大数目，默认为 `max_workers` 的一半（至少为 1）
+    :param rate_limit: 全局的最大速率（字节/秒），<= 0 时不限速
+    :param conn_rate_limit: 单个连接（工作者）的最大速率（字节/秒），<= 0 时不限速
+    :param classify: 把任务映射为 (车道, 大小)，默认用 `TransferScheduler.classify_attr` 处理 `task.src_attr`
+    """
+    def __init__(
+        self,
+        /,
+        max_workers: None | int = None,
+        small_threshold: int = 1 << 26,
+        max_large_workers: None | int = None,
+        rate_limit: float = 0,
+        conn_rate_limit: float = 0,
+        classify: None | Callable[[Any], tuple[int, int]] = None,
+    ):
+        if max_workers is None or max_workers <= 0:
+            max_workers = min(32, (cpu_count() or 1) + 4)
+        if max_large_workers is None or max_large_workers <= 0:
+            max_large_workers = max(1, max_workers // 2)
+        self.max_workers = max_workers
+        self.max_large_workers = min(max_large_workers, max_workers)
+        self.small_threshold = small_threshold
+        self.rate_limit = rate_limit
+        self.conn_rate_limit = conn_rate_limit
+        self.bucket = TokenBucket(rate_limit)
+        if classify is None:
+            classify = self.classify_task
+        self.classify = classify
+        self.lanes: tuple[LaneStats, ...] = tuple(map(LaneStats, LANE_NAMES))
+        self._queues: tuple[deque, ...] = (deque(), deque(), deque())
+        self._lock = Lock()
+
+    def __repr__(self, /) -> str:
+        return f"<{type(self).__module__}.{type(self).__qualname__}(max_workers={self.max_workers!r}, max_large_workers={self.max_large_workers!r}, small_threshold={self.small_threshold!r}, rate_limit={self.rate_limit!r}, conn_rate_limit={self.conn_rate_limit!r}) at {hex(id(self))}>"
+
+    def classify_attr(self, attr, /) -> tuple[int, int]:
+        """根据文件属性（需要有 "is_directory" 和 "size" 字段）确定车道
+        """
+        if attr["is_directory"]:
+            return LANE_DIR, 0
+        size = attr.get("size") or 0
+        return (LANE_LARGE if size >= self.small_threshold else LANE_SMALL), size
+
+    def classify_task(self, task, /) -> tuple[int, int]:
+        """默认的分类函数，任务需要有 `src_attr` 属性，否则视为小文件
+        """
+        try:
+            attr = task.src_attr
+        except AttributeError:
+            return LANE_SMALL, 0
+        return self.classify_attr(attr)
+
+    def _enqueue(self, task, /):
+        lane, _ = self.classify(task)
+        self._queues[lane].append(task)
+        self.lanes[lane].pending += 1
+
+    def _dequeue(self, /) -> None | tuple[int, Any]:
+        queues, lanes = self._queues, self.lanes
+        if queues[LANE_DIR]:
+            lane = LANE_DIR
+        elif queues[LANE_LARGE] and lanes[LANE_LARGE].running < self.max_large_workers:
+            lane = LANE_LARGE
+        elif queues[LANE_SMALL]:
+            lane = LANE_SMALL
+        else:
+            return None
+        stats = lanes[lane]
+        stats.pending -= 1
+        stats.running += 1
+        return lane, queues[lane].popleft()
+
+    def _finish(self, lane: int, /):
+        stats = self.lanes[lane]
+        stats.running -= 1
+        stats.done += 1
+
+    @property
+    def unfinished(self, /) -> int:
+        return sum(s.pending + s.running for s in self.lanes)
+
+    def throttle(self, n: int, /):
+        """报告当前任务已传输 `n` 字节，超速时阻塞
+        """
+        lane, conn_bucket = _current.get()
+        self.lanes[lane].bytes += n
+        self.bucket.acquire(n)
+        if conn_bucket is not None:
+            conn_bucket.acquire(n)
+
+    async def async_throttle(self, n: int, /):
+        """报告当前任务已传输 `n` 字节，超速时异步等待
+        """
+        lane, conn_bucket = _current.get()
+        self.lanes[lane].bytes += n
+        await self.bucket.async_acquire(n)
+        if conn_bucket is not None:
+            await conn_bucket.async_acquire(n)
+
+    def lane_stats(self, /) -> dict[str, dict]:
+        """各车道的实时统计：排队数、运行数、完成数、已传输字节数和速率（字节/秒）
+        """
+        return {
+            s.name: {
+                "pending": s.pending,
+                "running": s.running,
+                "done": s.done,
+                "bytes": s.bytes,
+                "speed": s.update_speed(),
+            } for s in self.lanes
+        }
+
+    def _new_conn_bucket(self, /) -> None | TokenBucket:
+        if self.conn_rate_limit > 0:
+            return TokenBucket(self.conn_rate_limit)
+        return None
+
+    def run(
+        self,
+        work: Callable[[Any], Any] | Callable[[Any, Callable], Any],
+        tasks: Iterable,
+        callback: None | Callable[[Any], Any] = None,
+    ):
+        """用线程池执行任务，接口与 `concurrenttools.thread_batch` 相同
+
+        :param work: 执行任务的函数，如果接受 2 个参数，则第 2 个参数是 `submit`，用于提交新任务
+        :param tasks: 初始的任务
+        :param callback: 每个任务成功执行后，对其返回值进行回调
+        """
+        ac = argcount(work)
+        if ac < 1:
+            raise TypeError(f"{work!r} should accept a positional argument as task")
+        with_submit = ac > 1
+        cond = Condition(self._lock)
+        nthreads = 0
+        running = True
+
+        def worker(conn_bucket):
+            while True:
+                with cond:
+                    while running and (item := self._dequeue()) is None:
+                        cond.wait()
+                    if not running:
+                        return
+                lane, task = cast(tuple[int, Any], item)
+                _current.set((lane, conn_bucket))
+                try:
+                    if with_submit:
+                        r = work(task, submit) # type: ignore
+                    else:
+                        r = work(task) # type: ignore
+                    if callback is not None:
+                        callback(r)
+                except BaseException:
+                    pass
+                finally:
+                    with cond:
+                        self._finish(lane)
+                        cond.notify_all()
+
+        def submit(task):
+            nonlocal nthreads
+            with cond:
+                self._enqueue(task)
+                if nthreads < self.max_workers:
+                    nthreads += 1
+                    start_new_thread(copy_context().run, (worker, self._new_conn_bucket()))
+                cond.notify()
+
+        for task in tasks:
+            submit(task)
+        try:
+            with cond:
+                while self.unfinished:
+                    cond.wait()
+        finally:
+            with cond:
+                running = False
+                for q in self._queues:
+                    q.clear()
+                for s in self.lanes:
+                    s.pending = 0
+                cond.notify_all()
+
+    async def async_run(
+        self,
+        work: Callable[[Any], Coroutine] | Callable[[Any, Callable], Coroutine],
+        tasks: Iterable | AsyncIterable,
+        callback: None | Callable[[Any], Any] = None,
+    ):
+        """用协程执行任务，接口与 `concurrenttools.async_batch` 相同
+
+        .. note::
+            仅供在异步代码中调用，命令行的 `download` 和 `upload` 都是多线程的，使用的是 `run`
+
+        :param work: 执行任务的异步函数，如果接受 2 个参数，则第 2 个参数是 `submit`，用于提交新任务
+        :param tasks: 初始的任务
+        :param callback: 每个任务成功执行后，对其返回值进行回调，可以是异步函数
+        """
+        ac = argcount(work)
+        if ac < 1:
+            raise TypeError(f"{work!r} should accept a positional argument as task")
+        with_submit = ac > 1
+        cond = AsyncCondition()
+        nworkers = 0
+        running = True
+
+        async def worker(conn_bucket):
+            while True:
+                async with cond:
+                    while running and (item := self._dequeue()) is None:
+                        await cond.wait()
+                    if not running:
+                        return
+                lane, task = cast(tuple[int, Any], item)
+                _current.set((lane, conn_bucket))
+                try:
+                    if with_submit:
+                        r = await work(task, submit) # type: ignore
+                    else:
+                        r = await work(task) # type: ignore
+                    if callback is not None:
+                        t = callback(r)
+                        if isawaitable(t):
+                            await t
+                except (KeyboardInterrupt, CancelledError):
+                    raise
+                except BaseException:
+                    pass
+                finally:
+                    self._finish(lane)
+                    async with cond:
+                        cond.notify_all()
+
+        def submit(task):
+            nonlocal nworkers
+            self._enqueue(task)
+            if nworkers < self.max_workers:
+                nworkers += 1
+                # NOTE: 每个工作者协程都有自己的上下文副本，所以 `_current` 互不干扰
+                tg.create_task(worker(self._new_conn_bucket()))
+            create_task(notify())
+
+        async def notify():
+            async with cond:
+                cond.notify()
+
+        async with TaskGroup() as tg:
+            create_task = tg.create_task
+            if isinstance(tasks, Iterable):
+                for task in tasks:
+                    submit(task)
+            else:
+                async for task in tasks:
+                    submit(task)
+            try:
+                async with cond:
+                    while self.unfinished:
+                        await cond.wait()
+            finally:
+                running = False
+                for q in self._queues:
+                    q.clear()
+                for s in self.lanes:
+                    s.pending = 0
+                async with cond:
+                    cond.notify_all()
@@ -8,3 +8,5 @@ from .init import parser, subparsers
 from .iterdir import *
 from .fuse import *
 from .update_115_cookies import *
+from .rename import *
+from .strm import *
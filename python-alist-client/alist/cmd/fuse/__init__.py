@@ -4,7 +4,7 @@
 __author__ = "ChenyangGao <https://chenyanggao.github.io>"
 __all__: list[str] = []
 __doc__ = """\
-    🌍 基于 alist 和 fuse 的只读文件系统，支持罗列 strm 🪩
+    🌍 基于 alist 和 fuse 的文件系统（默认只读，可以开启写入），支持罗列 strm 🪩
 
 ⏰ 由于网盘对多线程访问的限制，请停用挂载目录的显示图标预览
 
@@ -167,10 +167,13 @@ def main(args):
         print(".".join(map(str, __version__)))
         raise SystemExit(0)
 
+    from alist.cmd.fuse.util.blockcache import BlockCache
     from alist.cmd.fuse.util.fuser import AlistFuseOperations
     from alist.cmd.fuse.util.log import logger
     from alist.cmd.fuse.util.predicate import make_predicate
     from alist.cmd.fuse.util.strm import parse as make_strm_converter
+    from alist.cmd.fuse.util.urlcache import UrlCache
+    from alist.cmd.fuse.util.metrics import Metrics, serve_metrics
 
     mount_point = args.mount_point
     if not mount_point:
@@ -185,6 +188,11 @@ def main(args):
         "noauto_cache": True, 
         "ro": True, 
     }
+    if args.writable:
+        options.pop("ro")
+    for name in ("entry_timeout", "attr_timeout", "negative_timeout"):
+        if (value := getattr(args, name)) is not None:
+            options[name] = value
     if fuse_options := args.fuse_options:
         for option in fuse_options:
             if "=" in option:
@@ -248,6 +256,12 @@ def main(args):
     if direct_open_exes := args.direct_open_exes:
         direct_open_exes = set(direct_open_exes).__contains__
 
+    metrics = None
+    if metrics_address := args.metrics_address:
+        host, _, port = metrics_address.rpartition(":")
+        metrics = Metrics()
+        serve_metrics(metrics, host or "127.0.0.1", int(port))
+
     from os.path import exists, abspath
 
     print(f"""
@@ -285,6 +299,25 @@ def main(args):
         open_file=open_file, 
         direct_open_names=direct_open_names, 
         direct_open_exes=direct_open_exes, 
+        block_cache=BlockCache(
+            block_size=args.block_size, 
+            max_bytes=args.block_cache_size, 
+            disk_dir=args.block_cache_dir, 
+            disk_max_bytes=args.block_cache_dir_size, 
+            max_readahead=args.max_readahead_blocks, 
+        ), 
+        max_connections_per_file=args.max_connections_per_file, 
+        cache_path=args.cache_path, 
+        warmup_depth=args.warmup_depth, 
+        warmup_workers=args.warmup_workers, 
+        negative_ttl=args.negative_ttl, 
+        url_cache=UrlCache(ttl=args.url_cache_ttl), 
+        metrics=metrics, 
+        slow_op_threshold=args.slow_op_threshold, 
+        writable=args.writable, 
+        spool_dir=args.spool_dir, 
+        spool_size=args.spool_size, 
+        max_upload_workers=args.max_upload_workers, 
     ).run(**options)
 
 
@@ -406,6 +439,26 @@ Reference:
     - https://docs.python.org/3/library/collections.abc.html#collections-abstract-base-classes
 """)
 parser.add_argument("-pc", "--pickle-cache", action="store_true", help="数据进出缓存时，需要使用 pickle 模块进行序列化和反序列化")
+parser.add_argument("-cp", "--cache-path", default="", help="把目录列表持久化到此 SQLite 数据库文件（优先级高于 -c/--make-cache），重新挂载后，先返回缓存的列表，再在后台刷新")
+parser.add_argument("-wd", "--warmup-depth", default=0, type=int, help="挂载后，在后台预先罗列目录树的最大深度，等于 0 则不预先罗列，小于 0 则不限制，默认值是 0")
+parser.add_argument("-ww", "--warmup-workers", default=4, type=int, help="预先罗列目录树的最大并发数，默认值是 4")
+parser.add_argument("-bs", "--block-size", default=1 << 20, type=int, help="块缓存中每块的字节数，默认值是 1048576 (1 MB)")
+parser.add_argument("-bm", "--block-cache-size", default=128 << 20, type=int, help="块缓存的内存层的最大字节数，默认值是 134217728 (128 MB)")
+parser.add_argument("-bd", "--block-cache-dir", default="", help="块缓存的磁盘层所在的目录（会在其中创建临时目录，退出时删除），默认不启用磁盘层")
+parser.add_argument("-bds", "--block-cache-dir-size", default=1 << 30, type=int, help="块缓存的磁盘层的最大字节数，默认值是 1073741824 (1 GB)")
+parser.add_argument("-ra", "--max-readahead-blocks", default=8, type=int, help="顺序读取时最多预读的块数，等于 0 则不预读，默认值是 8")
+parser.add_argument("-cf", "--max-connections-per-file", default=4, type=int, help="每个打开的文件最多使用的连接数（并发的按位置读取会分配到位置最近的连接上），默认值是 4")
+parser.add_argument("-nt", "--negative-ttl", default=10, type=float, help="不存在的路径的缓存时间（秒），在此期间再次查询时直接报告不存在，等于 0 则不缓存，默认值是 10")
+parser.add_argument("-ut", "--url-cache-ttl", default=600, type=float, help="链接（strm 的内容和打开文件时获取的链接）的缓存时间（秒），等于 0 则不缓存，默认值是 600")
+parser.add_argument("-ma", "--metrics-address", default="", help="度量的 HTTP 服务的监听地址，格式为 [host:]port（例如 127.0.0.1:9105），/metrics 是 Prometheus 的文本格式，其它路径返回 JSON，默认不启用")
+parser.add_argument("-sot", "--slow-op-threshold", default=0, type=float, help="耗时（秒）达到此值的操作会被记录为 WARNING 日志，等于 0 则不记录，默认值是 0")
+parser.add_argument("-wr", "--writable", action="store_true", help="允许写入（新建、写入、截断、改名、删除文件和目录），写入的数据先暂存到本地，关闭文件后在后台上传，目录的变化立即可见，在后台按顺序同步到远程")
+parser.add_argument("-sd", "--spool-dir", default="", help="写入的暂存文件所在的目录（会在其中创建临时目录，上传完成后删除），默认使用系统的临时目录")
+parser.add_argument("-ss", "--spool-size", default=1 << 30, type=int, help="暂存文件最多占用的字节数，超出时写入会等待上传腾出空间，默认值是 1073741824 (1 GB)")
+parser.add_argument("-uw", "--max-upload-workers", default=4, type=int, help="后台上传的最大并发数，默认值是 4")
+parser.add_argument("-et", "--entry-timeout", type=float, help="内核缓存文件名查询结果的时间（秒），即 fuse 挂载选项 entry_timeout，默认由 fuse 决定")
+parser.add_argument("-at", "--attr-timeout", type=float, help="内核缓存文件属性的时间（秒），即 fuse 挂载选项 attr_timeout，默认由 fuse 决定")
+parser.add_argument("-ent", "--negative-timeout", type=float, help="内核缓存不存在的文件名的时间（秒），即 fuse 挂载选项 negative_timeout，默认由 fuse 决定")
 parser.add_argument(
     "-fo", "--fuse-option", dest="fuse_options", metavar="option", nargs="+", 
     help="""fuse 挂载选项，支持如下几种格式：
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 # encoding: utf-8
 
-from .fuser import *
 from .log import *
 from .predicate import *
 from .strm import *
+from .strmtree import *
 
-from . import __fuse_monkey_patch
+
+def __getattr__(name: str, /):
+    # NOTE: import the fuser lazily, so that the helpers (e.g. `make_strm_tree`) work without libfuse
+    if name == "AlistFuseOperations":
+        from .fuser import AlistFuseOperations
+        return AlistFuseOperations
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
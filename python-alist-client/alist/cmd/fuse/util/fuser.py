@@ -28,32 +28,39 @@ except ImportError:
 import errno
 import logging
 
-from collections.abc import Callable, MutableMapping
-from concurrent.futures import Future, ThreadPoolExecutor
+from collections.abc import Callable, Iterator, MutableMapping
+from concurrent.futures import wait as wait_futures, Future, ThreadPoolExecutor, FIRST_COMPLETED
 from functools import partial, update_wrapper
 from http.client import InvalidURL
 from itertools import count
 from json import dumps as json_dumps
-from os import fsencode, PathLike
+from os import fsencode, PathLike, O_ACCMODE, O_RDONLY, O_TRUNC
 from platform import system
 from pickle import dumps as pickle_dumps, loads as pickle_loads
 from posixpath import join as joinpath, split as splitpath, splitext
-from stat import S_IFDIR, S_IFREG
+from stat import S_IFDIR, S_IFREG, S_ISDIR
 from subprocess import run
 from sys import maxsize
 from _thread import start_new_thread, allocate_lock
-from time import sleep, time
+from reprlib import repr as short_repr
+from time import perf_counter, sleep, time
 from typing import cast, Any, Concatenate, Final, IO, ParamSpec
 from unicodedata import normalize
 from urllib.parse import quote
 
 from alist import AlistFileSystem, AlistPath
 from filewrap import Buffer
-from httpfile import HTTPFileReader
+from httpfile import HTTPFileReader, HTTPPositionalReader
 from http_request import SupportsGeturl
 from yarl import URL
 
+from .blockcache import BlockCache, BlockFile
+from .dircache import SqliteDirCache
+from . import __fuse_monkey_patch
 from .log import logger
+from .metrics import Metrics
+from .spool import LocalFile, SpoolFile, WriteBack
+from .urlcache import UrlCache
 
 
 Args = ParamSpec("Args")
@@ -70,6 +77,27 @@ def _get_process():
 
 PROCESS_STR = type("ProcessStr", (), {"__str__": staticmethod(_get_process)})()
 
+_process_names: MutableMapping[int, str] = TTLCache(1024, ttl=60)
+_process_names_lock = allocate_lock()
+
+def _get_process_name() -> str:
+    "the name of the calling process (cached by pid), for per-process metrics"
+    pid = fuse_get_context()[-1]
+    if pid <= 0:
+        return "UNDETERMINED"
+    with _process_names_lock:
+        try:
+            return _process_names[pid]
+        except KeyError:
+            pass
+    try:
+        name = Process(pid).name()
+    except Exception:
+        name = "UNDETERMINED"
+    with _process_names_lock:
+        _process_names[pid] = name
+    return name
+
 if not hasattr(ThreadPoolExecutor, "__del__"):
     setattr(ThreadPoolExecutor, "__del__", lambda self, /: self.shutdown(cancel_futures=True))
 
@@ -78,6 +106,7 @@ def readdir_future_wrapper(
     self, 
     submit: Callable[Concatenate[Callable[Args, Any], Args], Future], 
     cooldown: int | float = 30, 
+    max_stale_wait: int | float = 1, 
 ):
     readdir = type(self).readdir
     cooldown_pool: None | MutableMapping = None
@@ -94,6 +123,14 @@ def readdir_future_wrapper(
         except KeyError:
             result = None
             refresh = True
+            self._incr("dircache_misses")
+        else:
+            self._incr("dircache_hits")
+            # NOTE: the listing persisted by a previous mount is still fresh within the cooldown
+            if refresh and cooldown_pool is not None:
+                age = self._get_cache_age(path)
+                if age is not None and age < cooldown:
+                    refresh = False
         if refresh:
             with lock:
                 try:
@@ -107,9 +144,9 @@ def readdir_future_wrapper(
                     future.add_done_callback(done_callback)
         if result is None:
             return future.result()
-        elif refresh:
+        elif refresh and max_stale_wait > 0:
             try:
-                return future.result(1)
+                return future.result(max_stale_wait)
             except TimeoutError:
                 pass
         return result
@@ -139,6 +176,19 @@ class AlistFuseOperations(Operations):
         open_file: None | Callable[[AlistPath], str | Callable] = None, 
         direct_open_names: None | Callable[[str], bool] = None, 
         direct_open_exes: None | Callable[[str], bool] = None, 
+        block_cache: None | BlockCache = None, 
+        max_connections_per_file: int = 4, 
+        cache_path: str = "", 
+        warmup_depth: int = 0, 
+        warmup_workers: int = 4, 
+        negative_ttl: float = 10, 
+        url_cache: None | UrlCache = None, 
+        metrics: None | Metrics = None, 
+        slow_op_threshold: float = 0, 
+        writable: bool = False, 
+        spool_dir: str = "", 
+        spool_size: int = 1 << 30, 
+        max_upload_workers: int = 4, 
     ):
         self.__finalizer__: list[Callable] = []
         self._log = partial(logger.log, extra={"instance": repr(self)})
@@ -165,6 +215,11 @@ class AlistFuseOperations(Operations):
         # NOTE: id generator for file handler
         self._next_fh: Callable[[], int] = count(1).__next__
         # NOTE: cache `readdir` pulled file attribute map
+        self.persistent_cache: None | SqliteDirCache = None
+        if cache_path:
+            cache = self.persistent_cache = SqliteDirCache(cache_path, fs.as_path)
+            register(cache.close)
+            self.pickle_cache = False
         if cache is None or isinstance(cache, (dict, Cache)):
             if cache is None:
                 if max_readdir_cooldown <= 0:
@@ -175,7 +230,7 @@ class AlistFuseOperations(Operations):
         else:
             self.temp_cache = LRUCache(128)
         self.cache: MutableMapping = cache
-        self._fh_to_file: dict[int, tuple[IO[bytes], bytes]] = {}
+        self._fh_to_file: dict[int, tuple[None | BlockFile, bytes]] = {}
         def close_all():
             popitem = self._fh_to_file.popitem
             while True:
@@ -188,6 +243,13 @@ class AlistFuseOperations(Operations):
                 except:
                     pass
         register(close_all)
+        # NOTE: block cache shared by all file handlers
+        if block_cache is None:
+            block_cache = BlockCache()
+            register(block_cache.close)
+        self.block_cache = block_cache
+        self.max_connections_per_file = max_connections_per_file
+        self._fh_locks: dict[int, Any] = {}
         # NOTE: multi threaded directory reading control
         executor: None | ThreadPoolExecutor = None
         if max_readdir_workers == 0:
@@ -202,10 +264,88 @@ class AlistFuseOperations(Operations):
             self, 
             submit=submit, 
             cooldown=max_readdir_cooldown, 
+            # NOTE: with a persistent cache, serve stale listings immediately and refresh them in the background
+            max_stale_wait=0 if cache_path else 1, 
         )
         if executor is not None:
             register(partial(executor.shutdown, wait=False, cancel_futures=True))
-        self.normpath_map: dict[str, str] = {}
+        if self.persistent_cache is None:
+            self.normpath_map: dict[str, str] = {}
+        else:
+            self.normpath_map = self.persistent_cache.normpath_map()
+        self.max_readdir_cooldown = max_readdir_cooldown
+        self.warmup_depth = warmup_depth
+        self.warmup_workers = warmup_workers
+        # NOTE: cache paths known not to exist, media scanners probe a lot of them (e.g. .nfo, -poster.jpg, .srt)
+        self._negative_cache: None | MutableMapping = None
+        if negative_ttl > 0:
+            self._negative_cache = TTLCache(65536, ttl=negative_ttl)
+        self._negative_lock = allocate_lock()
+        # NOTE: urls shared by strm generation and `_open`
+        if url_cache is None:
+            url_cache = UrlCache()
+        self.url_cache = url_cache
+        # NOTE: operation metrics and slow operation log, see `__call__`
+        self.metrics = metrics
+        self.slow_op_threshold = slow_op_threshold
+        self._http_stats: dict[str, int] = {"connects": 0, "reconnects": 0}
+        if metrics is not None:
+            metrics.register("blockcache", lambda: block_cache.stats)
+            metrics.register("urlcache", lambda: url_cache.stats)
+            metrics.register("http", self._get_http_stats)
+        # NOTE: write support, written data is spooled locally and uploaded in the background, see `WriteBack`
+        self._perm = 0o777 if writable else 0o555
+        self.writeback: None | WriteBack = None
+        if writable:
+            writeback = self.writeback = WriteBack(spool_dir, max_bytes=spool_size, max_workers=max_upload_workers)
+            register(writeback.close)
+            if metrics is not None:
+                metrics.register("writeback", lambda: writeback.stats)
+        # NOTE: fh -> spooled file opened for writing, and path -> the same spooled file (shared by handlers)
+        self._writers: dict[int, SpoolFile] = {}
+        self._path_to_writer: dict[str, SpoolFile] = {}
+        self._writers_lock = allocate_lock()
+        # NOTE: changes not yet done remotely, {dir: {name: entry}}, an empty dict means removed (each removal 
+        #       has its own one, so it can be told apart), they survive relisting and cache eviction until done
+        self._overlay: dict[str, dict[str, dict]] = {}
+        self._overlay_lock = allocate_lock()
+        # NOTE: directories not yet created or renamed remotely, path -> the path to list instead ("" for empty)
+        self._pending_dirs: dict[str, str] = {}
+        self._closed = False
+        def set_closed():
+            self._closed = True
+        register(set_closed)
+
+    def __call__(self, /, op: str, *args):
+        metrics = self.metrics
+        threshold = self.slow_op_threshold
+        if metrics is None and threshold <= 0:
+            return super().__call__(op, *args)
+        start = perf_counter()
+        result = None
+        error = False
+        try:
+            result = super().__call__(op, *args)
+            return result
+        except BaseException:
+            error = True
+            raise
+        finally:
+            elapsed = perf_counter() - start
+            if metrics is not None:
+                metrics.observe(
+                    op, 
+                    elapsed, 
+                    nbytes=len(result) if op == "read" and result is not None else 0, 
+                    process=_get_process_name(), 
+                    error=error, 
+                )
+            if 0 < threshold <= elapsed:
+                self._log(
+                    logging.WARNING, 
+                    "slow operation: \x1b[1m%s\x1b[0m%s took \x1b[1;31m%.3f\x1b[0m seconds by \x1b[3;4m%s\x1b[0m", 
+                    op, short_repr(args), elapsed, PROCESS_STR, 
+                )
 
     def __del__(self, /):
         self.close()
@@ -217,15 +357,135 @@ class AlistFuseOperations(Operations):
             except BaseException as e:
                 self._log(logging.ERROR, "failed to finalize with %r", func)
 
+    def init(self, /, path: str):
+        if self.warmup_depth:
+            start_new_thread(self.warmup, ("/", self.warmup_depth, self.warmup_workers))
+
+    def warmup(self, /, top: str = "/", depth: int = -1, max_workers: int = 4):
+        """预先罗列目录树，已缓存且未过冷却时间的目录不会重新罗列
+
+        :param top: 顶层目录
+        :param depth: 最大深度，< 0 时不限
+        :param max_workers: 最大并发数
+        """
+        readdir = type(self).readdir
+        cooldown = self.max_readdir_cooldown
+        def fetch(path: str, /) -> dict:
+            age = self._get_cache_age(path)
+            if age is not None and (cooldown <= 0 or age < cooldown):
+                try:
+                    return self._get_cache(path)
+                except KeyError:
+                    pass
+            readdir(self, path)
+            return self._get_cache(path)
+        start_t = time()
+        count = 0
+        with ThreadPoolExecutor(max(max_workers, 1)) as executor:
+            pending: dict[Future, tuple[str, int]] = {executor.submit(fetch, top): (top, 0)}
+            while pending and not self._closed:
+                done, _ = wait_futures(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, level = pending.pop(future)
+                    try:
+                        entries = future.result()
+                    except BaseException as e:
+                        self._log(
+                            logging.WARNING, 
+                            "warmup failed: \x1b[4;34m%s\x1b[0m\n  |_ \x1b[1;4;31m%s\x1b[0m: %s", 
+                            path, type(e).__qualname__, e, 
+                        )
+                        continue
+                    count += 1
+                    if depth >= 0 and level >= depth:
+                        continue
+                    for name, attr in entries.items():
+                        if S_ISDIR(attr["st_mode"]) and not self._closed:
+                            subpath = joinpath(path, name)
+                            pending[executor.submit(fetch, subpath)] = (subpath, level + 1)
+            for future in pending:
+                future.cancel()
+        self._log(logging.INFO, "warmup finished: %d directories in %.3f seconds", count, time() - start_t)
+
+    def _get_cache_age(self, path: str, /) -> None | float:
+        if (cache := self.persistent_cache) is None:
+            return None
+        return cache.age(path)
+
+    def _incr(self, name: str, n: int = 1, /):
+        if (metrics := self.metrics) is not None:
+            metrics.incr(name, n)
+
+    def _get_http_stats(self, /) -> dict[str, int]:
+        "connections opened by the files which have been released, plus the ones still open"
+        stats = dict(self._http_stats)
+        for file, _ in list(self._fh_to_file.values()):
+            if (fstats := getattr(getattr(file, "file", None), "stats", None)) is not None:
+                for k, v in fstats.items():
+                    stats[k] = stats.get(k, 0) + v
+        return stats
+
+    def _is_negative(self, path: str, /) -> bool:
+        if (negative_cache := self._negative_cache) is None:
+            return False
+        with self._negative_lock:
+            return path in negative_cache
+
+    def _set_negative(self, path: str, /):
+        if (negative_cache := self._negative_cache) is None:
+            return
+        with self._negative_lock:
+            negative_cache[path] = None
+
+    def _clear_negative(self, path: str, names, /):
+        if (negative_cache := self._negative_cache) is None:
+            return
+        with self._negative_lock:
+            if not negative_cache:
+                return
+            negative_cache.pop(path, None)
+            for name in names:
+                negative_cache.pop(joinpath(path, name), None)
+
+    def _clear_negative_tree(self, path: str, /):
+        "drop the negative entries under `path`"
+        if (negative_cache := self._negative_cache) is None:
+            return
+        prefix = path + "/"
+        with self._negative_lock:
+            for p in [p for p in negative_cache if p.startswith(prefix)]:
+                negative_cache.pop(p, None)
+
     def getattr(self, /, path: str, fh: int = 0, _rootattr={"st_mode": S_IFDIR | 0o555}) -> dict:
         self._log(logging.DEBUG, "getattr(path=\x1b[4;34m%r\x1b[0m, fh=%r) by \x1b[3;4m%s\x1b[0m", path, fh, PROCESS_STR)
         if path == "/":
-            return _rootattr
-        dir_, name = splitpath(normalize("NFC", path))
+            return _rootattr if self.writeback is None else {"st_mode": S_IFDIR | 0o777}
+        path = normalize("NFC", path)
+        if self._is_negative(path):
+            self._incr("negative_hits")
+            raise FileNotFoundError(errno.ENOENT, path)
+        dir_, name = splitpath(path)
+        if (overlay := self._overlay.get(dir_)) and name in overlay:
+            if not (attr := overlay[name]):
+                raise FileNotFoundError(errno.ENOENT, path)
+            return attr
         try:
             dird = self._get_cache(dir_)
+            self._incr("dircache_hits")
         except KeyError:
+            self._incr("dircache_misses")
+            # NOTE: check the parent against the (usually cached) ancestors first, 
+            #       so probing inside a non-existent directory costs no listing
+            if dir_ != "/":
+                try:
+                    dirattr = self.getattr(dir_)
+                except FileNotFoundError:
+                    self._set_negative(path)
+                    raise FileNotFoundError(errno.ENOENT, path) from None
+                if not S_ISDIR(dirattr["st_mode"]):
+                    raise NotADirectoryError(errno.ENOTDIR, path)
             try:
+                # NOTE: concurrent lookups in the same parent wait for the same listing task
                 self.readdir(dir_)
                 dird = self._get_cache(dir_)
             except BaseException as e:
@@ -236,14 +496,18 @@ class AlistFuseOperations(Operations):
                 )
                 raise OSError(errno.EIO, path) from e
         try:
-            return dird[name]
+            attr = dird[name]
         except KeyError as e:
+            self._set_negative(path)
             self._log(
                 logging.WARNING, 
                 "file not found: \x1b[4;34m%s\x1b[0m\n  |_ \x1b[1;4;31m%s\x1b[0m: %s", 
                 path, type(e).__qualname__, e, 
             )
             raise FileNotFoundError(errno.ENOENT, path) from e
+        if attr.get("_strm"):
+            self._get_strm_data(attr)
+        return attr
 
     def getxattr(self, /, path: str, name: str, position: int = 0):
         """获取扩展属性的值，返回值会被序列化为 JSON，所以需要进行反序列化解析
@@ -256,6 +520,9 @@ class AlistFuseOperations(Operations):
         fuse_attr = self.getattr(path)
         attr      = fuse_attr["_attr"]
         pathobj   = fuse_attr["_path"]
+        if attr is None:
+            # NOTE: not yet uploaded
+            raise OSError(93, name)
         if name == "attr":
             return fsencode(json_dumps(attr, ensure_ascii=False))
         elif name == "url":
@@ -280,6 +547,8 @@ class AlistFuseOperations(Operations):
 
     def open(self, /, path: str, flags: int = 0) -> int:
         self._log(logging.INFO, "open(path=\x1b[4;34m%r\x1b[0m, flags=%r) by \x1b[3;4m%s\x1b[0m", path, flags, PROCESS_STR)
+        if flags & O_ACCMODE != O_RDONLY or flags & O_TRUNC:
+            return self._open_writer(normalize("NFC", path), truncate=bool(flags & O_TRUNC))
         pid = fuse_get_context()[-1]
         path = self.normpath_map.get(normalize("NFC", path), path)
         if pid > 0 and (self.direct_open_names or self.direct_open_exes):
@@ -313,16 +582,64 @@ class AlistFuseOperations(Operations):
                 )
         return self._next_fh()
 
+    def _url_key(self, kind: str, pathobj, /) -> tuple[str, str, str]:
+        return kind, pathobj["path"], pathobj.get("sign") or ""
+
+    def _get_strm_data(self, attr: dict, /) -> bytes:
+        "获取 strm 文件的内容（链接），链接会被缓存，同时更新属性中的文件大小"
+        pathobj = attr["_path"]
+        strm_make = self.strm_make
+        try:
+            if strm_make:
+                url = self.url_cache.get(self._url_key("strm", pathobj), lambda: strm_make(pathobj) or None) or ""
+            else:
+                url = self.url_cache.get(self._url_key("strm", pathobj), partial(pathobj.get_url, ensure_ascii=False))
+        except Exception:
+            url = ""
+        if not url:
+            self._log(
+                logging.WARNING, 
+                "can't make strm for file: \x1b[4;34m%s\x1b[0m", 
+                pathobj.relative_to(), 
+            )
+        data = url.encode("utf-8")
+        attr["st_size"] = len(data)
+        return data
+
     def _open(self, path: str, /, start: int = 0):
         attr = self.getattr(path)
+        if attr.get("_spool"):
+            try:
+                return LocalFile(attr["_spool"]), b""
+            except FileNotFoundError:
+                # NOTE: the upload has just finished and removed the spooled file, wait for the entry to be refreshed
+                if (writeback := self.writeback) is not None:
+                    writeback.flush(5)
+                attr = self.getattr(path)
+                if attr.get("_spool"):
+                    raise
         path = attr["_path"]["path"]
+        if attr.get("_strm"):
+            return None, self._get_strm_data(attr)
         if attr.get("_data") is not None:
             return None, attr["_data"]
         file: None | IO[bytes]
         if self.open_file is None:
-            file = attr["_path"].open("rb")
+            # NOTE: resolving the raw url costs a request, reuse it across opens
+            pathobj = attr["_path"]
+            urlkey = self._url_key("raw", pathobj)
+            headers = self.fs.request_kwargs.get("headers")
+            try:
+                file = self.fs.client.open(self.url_cache.get(urlkey, pathobj.get_raw_url), headers=headers)
+            except Exception:
+                # NOTE: the cached url may have expired, resolve it again
+                self.url_cache.pop(urlkey)
+                file = self.fs.client.open(self.url_cache.get(urlkey, pathobj.get_raw_url), headers=headers)
         else:
-            rawfile = self.open_file(attr["_path"])
+            pathobj = attr["_path"]
+            open_file = self.open_file
+            urlkey = self._url_key("open", pathobj)
+            rawfile = self.url_cache.get(urlkey, lambda: open_file(pathobj))
             if isinstance(rawfile, Buffer):
                 return None, rawfile
             elif isinstance(rawfile, str) and rawfile.startswith(("http://", "https://")) or isinstance(rawfile, (SupportsGeturl, URL)):
@@ -332,7 +649,12 @@ class AlistFuseOperations(Operations):
                     url = rawfile.geturl()
                 else:
                     url = str(rawfile)
-                file = HTTPFileReader(url, urlopen=urllib3_request)
+                try:
+                    file = HTTPFileReader(url, urlopen=urllib3_request)
+                except Exception:
+                    # NOTE: the cached url may have expired, make it again on next open
+                    self.url_cache.pop(urlkey)
+                    raise
             elif isinstance(rawfile, (str, PathLike)):
                 file = open(rawfile, "rb")
             else:
@@ -340,33 +662,33 @@ class AlistFuseOperations(Operations):
         file = cast(IO[bytes], file)
         if attr["st_size"] <= 2048:
             return None, file.read()
-        if start == 0:
-            # cache 2048 in bytes (2 KB)
-            preread = file.read(2048)
-        else:
-            preread = b""
-        return file, preread
+        if isinstance(file, HTTPFileReader):
+            # NOTE: positional reads through a small pool of range connections, 
+            #       so that concurrent reads of the same handle neither race nor reconnect each other
+            file = cast(IO[bytes], HTTPPositionalReader.from_reader(file, self.max_connections_per_file))
+        # NOTE: the file key contains the version, so blocks of a changed file won't be hit
+        key = "%s\0%s\0%s" % (path, attr["st_size"], attr["st_mtime"])
+        return BlockFile(self.block_cache, key, attr["st_size"], file), b""
 
     def read(self, /, path: str, size: int, offset: int, fh: int = 0) -> bytes:
         self._log(logging.DEBUG, "read(path=\x1b[4;34m%r\x1b[0m, size=%r, offset=%r, fh=%r) by \x1b[3;4m%s\x1b[0m", path, size, offset, fh, PROCESS_STR)
         if not fh:
             return b""
         try:
+            if (writer := self._writers.get(fh)) is not None:
+                return writer.read(offset, size)
             try:
                 file, preread = self._fh_to_file[fh]
             except KeyError:
-                file, preread = self._fh_to_file[fh] = self._open(path, offset)
-            cache_size = len(preread)
+                # NOTE: the kernel may send concurrent reads for the same handle, only open once
+                with self._fh_locks.setdefault(fh, allocate_lock()):
+                    try:
+                        file, preread = self._fh_to_file[fh]
+                    except KeyError:
+                        file, preread = self._fh_to_file[fh] = self._open(path, offset)
             if file is None:
                 return preread[offset:offset+size]
-            elif offset < cache_size:
-                if offset + size <= cache_size:
-                    return preread[offset:offset+size]
-                elif file is not None:
-                    file.seek(cache_size)
-                    return preread[offset:] + file.read(offset+size-cache_size)
-            file.seek(offset)
-            return file.read(size)
+            return file.read(offset, size)
         except BaseException as e:
             self._log(
                 logging.ERROR, 
@@ -406,54 +728,40 @@ class AlistFuseOperations(Operations):
         strm_make = self.strm_make
         cache = {}
         path = normalize("NFC", path)
-        realpath = self.normpath_map.get(path, path)
+        listpath = self._listing_path(path) if self._pending_dirs else path
         as_path = self.fs.as_path
         try:
-            ls = self.fs.listdir_attr(realpath.lstrip("/"), refresh=self.refresh)
+            if listpath:
+                realpath = self.normpath_map.get(listpath, listpath)
+                ls = self.fs.listdir_attr(realpath.lstrip("/"), refresh=self.refresh)
+            else:
+                # NOTE: created locally, but not yet remotely
+                realpath = path
+                ls = []
             for attr in ls:
                 pathobj = as_path(attr)
                 name    = pathobj.name
-                subpath = pathobj.path
                 isdir   = pathobj.is_dir()
-                data = None
-                if isdir:
-                    size = 0
+                is_strm = False
                 if not isdir and strm_predicate and strm_predicate(pathobj):
-                    if strm_make:
-                        try:
-                            url = strm_make(pathobj) or ""
-                        except Exception:
-                            url = ""
-                        if not url:
-                            self._log(
-                                logging.WARNING, 
-                                "can't make strm for file: \x1b[4;34m%s\x1b[0m", 
-                                pathobj.relative_to(), 
-                            )
-                        data = url.encode("utf-8")
-                    else:
-                        data = pathobj.get_url(ensure_ascii=False).encode("utf-8")
-                    size = len(cast(bytes, data))
+                    # NOTE: the url is made on first access, see `_get_strm_data`
+                    is_strm = True
                     name = splitext(name)[0] + ".strm"
                 elif predicate and not predicate(pathobj):
                     continue
-                else:
-                    size = int(pathobj.get("size") or 0)
                 normname = normalize("NFC", name)
-                cache[normname] = dict(
-                    st_mode=(S_IFDIR if isdir else S_IFREG) | 0o555, 
-                    st_size=size, 
-                    st_ctime=pathobj["ctime"], 
-                    st_mtime=pathobj["mtime"], 
-                    st_atime=pathobj.get("atime") or pathobj["mtime"], 
-                    _attr=attr, 
-                    _path=pathobj, 
-                    _data=data, 
-                )
+                cache[normname] = self._make_entry(attr, pathobj, is_strm=is_strm)
                 normsubpath = joinpath(path, normname)
                 if normsubpath != normalize("NFD", normsubpath):
                     self.normpath_map[normsubpath] = joinpath(realpath, name)
+            if overlay := self._overlay.get(path):
+                for name, entry in list(overlay.items()):
+                    if not entry:
+                        cache.pop(name, None)
+                    else:
+                        cache[name] = entry
             self._set_cache(path, cache)
+            self._clear_negative(path, cache)
             return [".", "..", *cache]
         except BaseException as e:
             self._log(
@@ -467,9 +775,25 @@ class AlistFuseOperations(Operations):
         self._log(logging.DEBUG, "release(path=\x1b[4;34m%r\x1b[0m, fh=%r) by \x1b[3;4m%s\x1b[0m", path, fh, PROCESS_STR)
         if not fh:
             return
+        if (writer := self._writers.pop(fh, None)) is not None:
+            try:
+                self._release_writer(writer)
+            except BaseException as e:
+                self._log(
+                    logging.ERROR, 
+                    "can't release file: \x1b[4;34m%s\x1b[0m\n  |_ \x1b[1;4;31m%s\x1b[0m: %s", 
+                    path, type(e).__qualname__, e, 
+                )
+                raise OSError(errno.EIO, path) from e
+            return
+        self._fh_locks.pop(fh, None)
         try:
             file, _ = self._fh_to_file.pop(fh)
             if file is not None:
+                if (fstats := getattr(getattr(file, "file", None), "stats", None)) is not None:
+                    http_stats = self._http_stats
+                    for k, v in fstats.items():
+                        http_stats[k] = http_stats.get(k, 0) + v
                 file.close()
         except KeyError:
             pass
@@ -481,7 +805,430 @@ class AlistFuseOperations(Operations):
             )
             raise OSError(errno.EIO, path) from e
 
+    def _make_entry(self, attr, pathobj, /, is_strm: bool = False) -> dict:
+        isdir = pathobj.is_dir()
+        return dict(
+            st_mode=(S_IFDIR if isdir else S_IFREG) | self._perm, 
+            st_size=0 if isdir or is_strm else int(pathobj.get("size") or 0), 
+            st_ctime=pathobj["ctime"], 
+            st_mtime=pathobj["mtime"], 
+            st_atime=pathobj.get("atime") or pathobj["mtime"], 
+            _attr=attr, 
+            _path=pathobj, 
+            _data=None, 
+            _strm=is_strm, 
+        )
+
+    def _drop_cache(self, path: str, /, tree: bool = False):
+        "drop the cached listing of a directory (and of its descendants if `tree`), so it will be listed again"
+        prefix = path.rstrip("/") + "/"
+        for cache in (self.temp_cache, self.cache):
+            if cache is None:
+                continue
+            keys = [k for k in list(cache) if k == path or k.startswith(prefix)] if tree else (path,)
+            for key in keys:
+                try:
+                    del cache[key]
+                except KeyError:
+                    pass
+
+    def _listing_path(self, path: str, /) -> str:
+        "the path to list for `path`, which may be (under) a directory not yet created or renamed remotely"
+        pending = self._pending_dirs
+        p = path
+        while True:
+            try:
+                src = pending[p]
+            except KeyError:
+                if p == "/":
+                    return path
+                p = splitpath(p)[0]
+            else:
+                if not src:
+                    return ""
+                return src + path[len(p):]
+
+    def _remote_path(self, path: str, /) -> str:
+        realpath = self.normpath_map.get(path)
+        if realpath is None:
+            dir_, name = splitpath(path)
+            realpath = joinpath(self.normpath_map.get(dir_, dir_), name)
+        return self.fs.abspath(realpath.lstrip("/"))
+
+    def _upload_file(self, local: str, /, remote: str):
+        self.fs.upload(local, remote, overwrite=True)
+
+    def _remote_entry(self, remote: str, /) -> dict:
+        attr = self.fs.attr(remote, refresh=True)
+        return self._make_entry(attr, self.fs.as_path(attr))
+
+    def _check_writable(self, path: str, /) -> WriteBack:
+        if (writeback := self.writeback) is None:
+            raise PermissionError(errno.EROFS, path)
+        return writeback
+
+    def _patch(self, dir_: str, name: str, entry: dict, /):
+        "apply a change to the directory cache at once, and keep it in the overlay until it's done remotely"
+        with self._overlay_lock:
+            self._overlay.setdefault(dir_, {})[name] = entry
+        try:
+            dird = self._get_cache(dir_)
+        except KeyError:
+            pass
+        else:
+            if entry:
+                dird[name] = entry
+            else:
+                dird.pop(name, None)
+            self._set_cache(dir_, dird)
+        if entry:
+            self._clear_negative(dir_, (name,))
+
+    def _settle(
+        self, 
+        dir_: str, 
+        name: str, 
+        entry: dict, 
+        /, 
+        remote: str = "", 
+        error: None | BaseException = None, 
+    ):
+        "a change has been done (or failed) remotely, drop it from the overlay, and refresh the entry from `remote`"
+        new: None | dict = None
+        if remote and error is None:
+            try:
+                new = self._remote_entry(remote)
+            except Exception as e:
+                self._log(
+                    logging.WARNING, 
+                    "can't refresh: \x1b[4;34m%s\x1b[0m\n  |_ \x1b[1;4;31m%s\x1b[0m: %s", 
+                    remote, type(e).__qualname__, e, 
+                )
+        with self._overlay_lock:
+            overlay = self._overlay.get(dir_)
+            if overlay is None or overlay.get(name) is not entry:
+                # NOTE: moved along with a renamed directory, or superseded by a later change
+                for dir_, overlay in self._overlay.items():
+                    if (found := next((k for k, v in overlay.items() if v is entry), None)) is not None:
+                        name = found
+                        break
+                else:
+                    return
+            del overlay[name]
+            if not overlay:
+                del self._overlay[dir_]
+        if error is not None or remote and new is None:
+            # NOTE: the cache may be inconsistent with the remote, list it again
+            self._drop_cache(dir_)
+        elif new is not None:
+            try:
+                dird = self._get_cache(dir_)
+            except KeyError:
+                return
+            dird[name] = new
+            self._set_cache(dir_, dird)
+
+    def _schedule(self, changes, func: Callable, /, *args, paths=()) -> Future:
+        "run a metadata operation remotely in the background, then settle the changes: [(dir, name, entry, remote)]"
+        future = cast(WriteBack, self.writeback).schedule(func, *args, paths=paths)
+        def done(future: Future, /):
+            error = future.exception()
+            if error is not None:
+                self._log(
+                    logging.ERROR, 
+                    "can't %s%r\n  |_ \x1b[1;4;31m%s\x1b[0m: %s", 
+                    func.__name__, args, type(error).__qualname__, error, 
+                )
+            for dir_, name, entry, remote in changes:
+                self._settle(dir_, name, entry, remote, error)
+        future.add_done_callback(done)
+        return future
+
+    def _iter_content(self, path: str, size: int, /) -> Iterator[bytes]:
+        "the current content of a file, to be copied into the spool before the first write"
+        file, data = self._open(path)
+        if file is None:
+            yield bytes(data)
+            return
+        try:
+            for offset in range(0, size, 1 << 20):
+                yield file.read(offset, min(1 << 20, size - offset))
+        finally:
+            file.close()
+
+    def _open_writer(self, /, path: str, truncate: bool = False, create: bool = False) -> int:
+        writeback = self._check_writable(path)
+        fetch = None
+        if not create:
+            attr = self.getattr(path)
+            if S_ISDIR(attr["st_mode"]):
+                raise IsADirectoryError(errno.EISDIR, path)
+            if attr.get("_strm"):
+                raise PermissionError(errno.EPERM, path)
+            if not truncate and attr["st_size"]:
+                fetch = partial(self._iter_content, path, attr["st_size"])
+        with self._writers_lock:
+            writer = self._path_to_writer.get(path)
+            if writer is None:
+                # NOTE: the content is fetched on first read or write, not now
+                writer = self._path_to_writer[path] = SpoolFile(writeback, path, fetch)
+            else:
+                writer.refs += 1
+            fh = self._next_fh()
+            self._writers[fh] = writer
+        if create:
+            writer.dirty = True
+            self._touch(writer)
+        elif truncate:
+            writer.truncate(0)
+            self._touch(writer)
+        return fh
+
+    def _touch(self, writer: SpoolFile, /):
+        "update the entry of a file being written, the entry goes to the overlay on first change"
+        if not writer.path:
+            # NOTE: unlinked
+            return
+        dir_, name = splitpath(writer.path)
+        now = time()
+        entry = self._overlay.get(dir_, {}).get(name)
+        if not entry or entry.get("_spool") != writer.local:
+            try:
+                base = self.getattr(writer.path)
+            except OSError:
+                base = None
+            if base:
+                entry = dict(base)
+            else:
+                entry = {"st_ctime": now, "_attr": None, "_path": None}
+            entry.update(st_mode=S_IFREG | self._perm, _data=None, _strm=False, _spool=writer.local)
+            self._patch(dir_, name, entry)
+        entry["st_size"] = writer.size
+        entry["st_mtime"] = entry["st_atime"] = now
+
+    def _release_writer(self, writer: SpoolFile, /):
+        with self._writers_lock:
+            writer.refs -= 1
+            if writer.refs:
+                return
+            if self._path_to_writer.get(writer.path) is writer:
+                del self._path_to_writer[writer.path]
+        writer.close()
+        if not (writer.dirty and writer.path):
+            writer.discard()
+            return
+        path = writer.path
+        dir_, name = splitpath(path)
+        entry = self._overlay.get(dir_, {}).get(name)
+        remote = self._remote_path(path)
+        def callback(error: None | BaseException, /):
+            if error is None:
+                self._settle(dir_, name, entry, remote)
+            # NOTE: otherwise keep the entry in the overlay, so the data can still be read from the spool
+        self._check_writable(path).upload(path, writer.local, writer.size, partial(self._upload_file, remote=remote), callback)
+
+    def create(self, /, path: str, mode: int = 0o644, fi=None) -> int:
+        self._log(logging.INFO, "create(path=\x1b[4;34m%r\x1b[0m, mode=%o) by \x1b[3;4m%s\x1b[0m", path, mode, PROCESS_STR)
+        return self._open_writer(normalize("NFC", path), create=True)
+
+    def write(self, /, path: str, data: bytes, offset: int, fh: int = 0) -> int:
+        self._log(logging.DEBUG, "write(path=\x1b[4;34m%r\x1b[0m, size=%r, offset=%r, fh=%r) by \x1b[3;4m%s\x1b[0m", path, len(data), offset, fh, PROCESS_STR)
+        try:
+            writer = self._writers[fh]
+        except KeyError:
+            raise OSError(errno.EBADF, path) from None
+        try:
+            n = writer.write(data, offset)
+        except BaseException as e:
+            self._log(
+                logging.ERROR, 
+                "can't write file: \x1b[4;34m%s\x1b[0m\n  |_ \x1b[1;4;31m%s\x1b[0m: %s", 
+                path, type(e).__qualname__, e, 
+            )
+            raise OSError(errno.EIO, path) from e
+        self._touch(writer)
+        return n
+
+    def truncate(self, /, path: str, length: int, fh: None | int = None) -> int:
+        self._log(logging.INFO, "truncate(path=\x1b[4;34m%r\x1b[0m, length=%r, fh=%r) by \x1b[3;4m%s\x1b[0m", path, length, fh, PROCESS_STR)
+        path = normalize("NFC", path)
+        self._check_writable(path)
+        writer = self._writers.get(fh) if fh else None
+        if writer is None:
+            writer = self._path_to_writer.get(path)
+        if writer is not None:
+            writer.truncate(length)
+            self._touch(writer)
+            return 0
+        fh = self._open_writer(path, truncate=not length)
+        try:
+            if length:
+                self._writers[fh].truncate(length)
+                self._touch(self._writers[fh])
+        finally:
+            self.release(path, fh)
+        return 0
+
+    def mkdir(self, /, path: str, mode: int = 0o755) -> int:
+        self._log(logging.INFO, "mkdir(path=\x1b[4;34m%r\x1b[0m) by \x1b[3;4m%s\x1b[0m", path, PROCESS_STR)
+        path = normalize("NFC", path)
+        self._check_writable(path)
+        try:
+            self.getattr(path)
+        except FileNotFoundError:
+            pass
+        else:
+            raise FileExistsError(errno.EEXIST, path)
+        dir_, name = splitpath(path)
+        now = time()
+        entry = dict(
+            st_mode=S_IFDIR | self._perm, 
+            st_size=0, 
+            st_ctime=now, 
+            st_mtime=now, 
+            st_atime=now, 
+            _attr=None, 
+            _path=None, 
+            _data=None, 
+            _strm=False, 
+        )
+        self._pending_dirs[path] = ""
+        self._set_cache(path, {})
+        self._patch(dir_, name, entry)
+        remote = self._remote_path(path)
+        self._schedule([(dir_, name, entry, remote)], self.fs.makedirs, remote).add_done_callback(
+            lambda _: self._pending_dirs.pop(path, None))
+        return 0
+
+    def rmdir(self, /, path: str) -> int:
+        self._log(logging.INFO, "rmdir(path=\x1b[4;34m%r\x1b[0m) by \x1b[3;4m%s\x1b[0m", path, PROCESS_STR)
+        path = normalize("NFC", path)
+        self._check_writable(path)
+        if not S_ISDIR(self.getattr(path)["st_mode"]):
+            raise NotADirectoryError(errno.ENOTDIR, path)
+        if self.readdir(path)[2:]:
+            raise OSError(errno.ENOTEMPTY, path)
+        dir_, name = splitpath(path)
+        removed: dict = {}
+        self._patch(dir_, name, removed)
+        self._drop_cache(path, tree=True)
+        self._schedule([(dir_, name, removed, "")], self.fs.rmdir, self._remote_path(path), paths=(path,))
+        return 0
+
+    def unlink(self, /, path: str) -> int:
+        self._log(logging.INFO, "unlink(path=\x1b[4;34m%r\x1b[0m) by \x1b[3;4m%s\x1b[0m", path, PROCESS_STR)
+        path = normalize("NFC", path)
+        self._check_writable(path)
+        if S_ISDIR(self.getattr(path)["st_mode"]):
+            raise IsADirectoryError(errno.EISDIR, path)
+        with self._writers_lock:
+            # NOTE: the handlers still open can go on reading and writing, but nothing will be uploaded
+            if (writer := self._path_to_writer.pop(path, None)) is not None:
+                writer.path = ""
+        dir_, name = splitpath(path)
+        removed: dict = {}
+        self._patch(dir_, name, removed)
+        def remove(remote: str, /):
+            try:
+                self.fs.remove(remote)
+            except FileNotFoundError:
+                # NOTE: never uploaded
+                pass
+        self._schedule([(dir_, name, removed, "")], remove, self._remote_path(path), paths=(path,))
+        return 0
+
+    def rename(self, /, old: str, new: str) -> int:
+        self._log(logging.INFO, "rename(old=\x1b[4;34m%r\x1b[0m, new=\x1b[4;34m%r\x1b[0m) by \x1b[3;4m%s\x1b[0m", old, new, PROCESS_STR)
+        old = normalize("NFC", old)
+        new = normalize("NFC", new)
+        self._check_writable(old)
+        if old == new:
+            return 0
+        attr = self.getattr(old)
+        if attr.get("_strm"):
+            raise PermissionError(errno.EPERM, old)
+        isdir = S_ISDIR(attr["st_mode"])
+        try:
+            dst_attr = self.getattr(new)
+        except FileNotFoundError:
+            pass
+        else:
+            if S_ISDIR(dst_attr["st_mode"]):
+                if not isdir:
+                    raise IsADirectoryError(errno.EISDIR, new)
+                if self.readdir(new)[2:]:
+                    raise OSError(errno.ENOTEMPTY, new)
+            elif isdir:
+                raise NotADirectoryError(errno.ENOTDIR, new)
+        src_dir, src_name = splitpath(old)
+        dst_dir, dst_name = splitpath(new)
+        prefix = old + "/"
+        writing = False
+        with self._writers_lock:
+            for p, writer in list(self._path_to_writer.items()):
+                if p == old or p.startswith(prefix):
+                    del self._path_to_writer[p]
+                    writer.path = new + p[len(old):]
+                    self._path_to_writer[writer.path] = writer
+                    writing = writing or p == old
+        if isdir:
+            # NOTE: until renamed remotely, list the source instead
+            self._pending_dirs[new] = self._listing_path(old) if self._pending_dirs else old
+            try:
+                listing = self._get_cache(old)
+            except KeyError:
+                pass
+            else:
+                self._set_cache(new, listing)
+            self._drop_cache(old, tree=True)
+            # NOTE: the pending changes inside go along with the directory
+            pending_dirs = self._pending_dirs
+            for p in list(pending_dirs):
+                if p.startswith(prefix):
+                    pending_dirs[new + p[len(old):]] = pending_dirs.pop(p)
+            with self._overlay_lock:
+                overlay = self._overlay
+                for p in list(overlay):
+                    if p == old or p.startswith(prefix):
+                        overlay.setdefault(new + p[len(old):], {}).update(overlay.pop(p))
+            # NOTE: the paths under the destination probed before may exist now
+            self._clear_negative_tree(new)
+        entry = dict(attr)
+        removed: dict = {}
+        self._patch(src_dir, src_name, removed)
+        self._patch(dst_dir, dst_name, entry)
+        remote = self._remote_path(new)
+        changes = [(src_dir, src_name, removed, "")]
+        if not writing:
+            # NOTE: otherwise the upload on release will settle the new entry
+            changes.append((dst_dir, dst_name, entry, remote))
+        if writing and attr.get("_attr") is None and not cast(WriteBack, self.writeback).is_uploading(old):
+            # NOTE: created and never uploaded, there is nothing to rename remotely, 
+            #       the upload on release goes to the new path
+            def rename(src: str, dst: str, /):
+                pass
+        else:
+            def rename(src: str, dst: str, /):
+                self.fs.rename(src, dst, replace=True)
+        future = self._schedule(changes, rename, self._remote_path(old), remote, paths=(old, new))
+        if isdir:
+            def done(_, /):
+                self._pending_dirs.pop(new, None)
+                self._drop_cache(new, tree=True)
+            future.add_done_callback(done)
+        return 0
+
+    def chmod(self, /, path: str, mode: int) -> int:
+        self._check_writable(path)
+        return 0
+
+    def chown(self, /, path: str, uid: int, gid: int) -> int:
+        self._check_writable(path)
+        return 0
+
+    def destroy(self, /, path: str):
+        if (writeback := self.writeback) is not None:
+            writeback.flush()
+
     def run(self, /, *args, **kwds):
         return FUSE(self, *args, **kwds)
-
-# TODO: 支持写入操作，而不是只读
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["WriteBack", "SpoolFile", "LocalFile"]
+
+import logging
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import wait as wait_futures, Future, ThreadPoolExecutor
+from os import close as os_close, ftruncate, makedirs, open as os_open, pread, pwrite, remove, rmdir, O_RDONLY, O_RDWR
+from tempfile import mkdtemp, mkstemp
+from threading import Condition, Lock
+from time import sleep
+from typing import Any
+
+from .log import logger
+
+
+class LocalFile:
+    "按位置读取的本地文件，接口与 ``BlockFile`` 相同"
+    def __init__(self, /, path: str):
+        self.path = path
+        self.fd = os_open(path, O_RDONLY)
+
+    def __del__(self, /):
+        self.close()
+
+    def read(self, offset: int, size: int, /) -> bytes:
+        return pread(self.fd, size, offset)
+
+    def close(self, /):
+        fd, self.fd = self.fd, -1
+        if fd >= 0:
+            os_close(fd)
+
+
+class WriteBack:
+    """写回：写入先暂存到本地（spool），关闭文件后在后台并发上传，元数据操作（创建目录、改名、删除）在后台按顺序执行
+
+    - 暂存文件占用的字节数超过 ``max_bytes`` 时，新的写入会等待正在进行的上传腾出空间（背压），
+      如果没有正在进行的上传，则直接放行（不会死锁，只是暂时超出上限）
+    - 同一个路径的上传按提交的顺序执行；上传会等待在它之前提交的元数据操作完成，
+      元数据操作会等待在它之前提交的、位于它涉及的路径下的上传完成
+    - 上传失败时会重试 ``retries`` 次，仍然失败的暂存文件不会被删除，以便手动恢复
+    - ``stats`` 记录了上传次数、上传的字节数、失败次数和写入因背压而等待的次数
+
+    :param spool_dir: 暂存文件所在的目录（会在其中创建临时目录），为空时使用系统的临时目录
+    :param max_bytes: 暂存文件最多占用的字节数
+    :param max_workers: 最大的并发上传数
+    :param retries: 上传失败时的重试次数
+    """
+    def __init__(
+        self, 
+        /, 
+        spool_dir: str = "", 
+        max_bytes: int = 1 << 30, 
+        max_workers: int = 4, 
+        retries: int = 3, 
+    ):
+        if spool_dir:
+            makedirs(spool_dir, exist_ok=True)
+        self.spool_dir = mkdtemp(prefix="fuse-spool-", dir=spool_dir or None)
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self._used = 0
+        self._uploading = 0
+        self._cond = Condition()
+        self._upload_executor = ThreadPoolExecutor(max(max_workers, 1), thread_name_prefix="fuse-upload")
+        self._meta_executor = ThreadPoolExecutor(1, thread_name_prefix="fuse-meta")
+        self._uploads: dict[str, Future] = {}
+        self._last_meta: None | Future = None
+        self._lock = Lock()
+        self.stats: dict[str, int] = dict.fromkeys(
+            ("uploads", "upload_bytes", "upload_errors", "meta_ops", "meta_errors", "waits", "spool_bytes"), 0)
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(spool_dir={self.spool_dir!r}, used={self._used}, max_bytes={self.max_bytes})"
+
+    def new_file(self, /) -> str:
+        "创建一个空的暂存文件，返回它的路径"
+        fd, path = mkstemp(dir=self.spool_dir)
+        os_close(fd)
+        return path
+
+    def reserve(self, n: int, /):
+        "申请 n 字节的暂存空间，超出上限时等待上传腾出空间"
+        if n <= 0:
+            return
+        with self._cond:
+            if self._used + n > self.max_bytes and self._uploading:
+                self.stats["waits"] += 1
+                while self._used + n > self.max_bytes and self._uploading:
+                    self._cond.wait()
+            self._used += n
+            self.stats["spool_bytes"] = self._used
+
+    def free(self, n: int, /):
+        "归还 n 字节的暂存空间"
+        if n <= 0:
+            return
+        with self._cond:
+            self._used = max(self._used - n, 0)
+            self.stats["spool_bytes"] = self._used
+            self._cond.notify_all()
+
+    def upload(
+        self, 
+        key: str, 
+        local: str, 
+        size: int, 
+        upload: Callable[[str], Any], 
+        /, 
+        callback: None | Callable[[None | BaseException], Any] = None, 
+    ) -> Future:
+        """在后台上传暂存文件，成功后删除它并归还暂存空间
+
+        :param key: 路径，用于排序（同一个路径的上传按顺序执行）
+        :param local: 暂存文件的路径
+        :param size: 暂存文件的大小（占用的暂存空间）
+        :param upload: 上传函数，接受暂存文件的路径
+        :param callback: 完成后的回调，接受异常（成功时为 None），在删除暂存文件之前调用
+
+        :return: 上传的 ``Future``
+        """
+        with self._cond:
+            self._uploading += size
+        with self._lock:
+            prev = self._uploads.get(key)
+            future = self._upload_executor.submit(
+                self._run_upload, (self._last_meta, prev), local, size, upload, callback)
+            self._uploads[key] = future
+        def done(_, /):
+            with self._lock:
+                if self._uploads.get(key) is future:
+                    del self._uploads[key]
+        future.add_done_callback(done)
+        return future
+
+    def is_uploading(self, key: str, /) -> bool:
+        "是否有这个路径的上传尚未完成"
+        with self._lock:
+            return key in self._uploads
+
+    def _run_upload(
+        self, 
+        deps: Iterable[None | Future], 
+        local: str, 
+        size: int, 
+        upload: Callable[[str], Any], 
+        callback: None | Callable[[None | BaseException], Any], 
+        /, 
+    ):
+        wait_futures([f for f in deps if f is not None])
+        error: None | BaseException = None
+        try:
+            for i in range(self.retries + 1):
+                try:
+                    upload(local)
+                    error = None
+                    break
+                except Exception as e:
+                    error = e
+                    logger.log(
+                        logging.WARNING, 
+                        "upload failed (%d/%d): %r\n  |_ %s: %s", 
+                        i + 1, self.retries + 1, local, type(e).__qualname__, e, 
+                    )
+                    if i < self.retries:
+                        sleep(min(2 ** i, 30))
+            if error is None:
+                self.stats["uploads"] += 1
+                self.stats["upload_bytes"] += size
+            else:
+                self.stats["upload_errors"] += 1
+                logger.log(logging.ERROR, "upload gave up, the spooled data is kept in: %r", local)
+            if callback is not None:
+                try:
+                    callback(error)
+                except Exception as e:
+                    logger.log(logging.ERROR, "upload callback failed: %r\n  |_ %s: %s", local, type(e).__qualname__, e)
+            if error is None:
+                try:
+                    remove(local)
+                except OSError:
+                    pass
+        finally:
+            with self._cond:
+                self._uploading -= size
+            self.free(size)
+
+    def schedule(
+        self, 
+        func: Callable[..., Any], 
+        /, 
+        *args, 
+        paths: Iterable[str] = (), 
+    ) -> Future:
+        """在后台按顺序执行元数据操作
+
+        :param func: 操作
+        :param args: 操作的参数
+        :param paths: 操作涉及的路径，会先等待这些路径（以及它们之下）的上传完成
+
+        :return: 操作的 ``Future``
+        """
+        prefixes = tuple(p.rstrip("/") + "/" for p in paths)
+        with self._lock:
+            deps = [
+                f for k, f in self._uploads.items()
+                if k.startswith(prefixes) or (k + "/") in prefixes
+            ]
+            future = self._last_meta = self._meta_executor.submit(self._run_meta, deps, func, args)
+        return future
+
+    def _run_meta(self, deps: list[Future], func: Callable[..., Any], args: tuple, /):
+        wait_futures(deps)
+        try:
+            result = func(*args)
+        except BaseException:
+            self.stats["meta_errors"] += 1
+            raise
+        self.stats["meta_ops"] += 1
+        return result
+
+    def flush(self, /, timeout: None | float = None):
+        "等待已经提交的上传和元数据操作完成"
+        with self._lock:
+            futures = list(self._uploads.values())
+            if self._last_meta is not None:
+                futures.append(self._last_meta)
+        wait_futures(futures, timeout)
+
+    def close(self, /):
+        "等待后台任务完成，然后删除暂存目录（如果还有上传失败的文件，则保留）"
+        self.flush()
+        self._upload_executor.shutdown()
+        self._meta_executor.shutdown()
+        try:
+            rmdir(self.spool_dir)
+        except OSError:
+            pass
+
+
+class SpoolFile:
+    """写入中的文件，数据暂存在本地
+
+    - 打开已有的文件时不会立即下载，第一次读写（或截断为非 0 的长度）时才用 ``fetch()`` 把原来的内容复制到本地，
+      先截断为 0（例如以 ``O_TRUNC`` 打开）则不必下载
+    - 同一个路径的多个写入句柄共用一个对象，``refs`` 是引用计数
+
+    :param writeback: 写回
+    :param path: 文件的路径（fuse 中的路径）
+    :param fetch: 获取原来的内容的函数，返回字节串的迭代器，为 None 时是空文件
+    """
+    def __init__(
+        self, 
+        /, 
+        writeback: WriteBack, 
+        path: str, 
+        fetch: None | Callable[[], Iterable[bytes]] = None, 
+    ):
+        self.writeback = writeback
+        self.path = path
+        self.local = writeback.new_file()
+        self.fd = os_open(self.local, O_RDWR)
+        self.size = 0
+        self.dirty = False
+        self.refs = 1
+        self._fetch = fetch
+        self._lock = Lock()
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(path={self.path!r}, local={self.local!r}, size={self.size})"
+
+    def _materialize(self, /):
+        if (fetch := self._fetch) is None:
+            return
+        offset = reserved = 0
+        try:
+            for chunk in fetch():
+                self.writeback.reserve(len(chunk))
+                reserved += len(chunk)
+                offset += pwrite(self.fd, chunk, offset)
+        except BaseException:
+            # NOTE: 丢弃只复制了一部分的内容，保留 ``_fetch``，下次读写时重新获取，
+            #       否则之后的写入会在残缺的内容上进行，并在关闭后覆盖远端的文件
+            ftruncate(self.fd, 0)
+            self.writeback.free(reserved)
+            raise
+        self._fetch = None
+        self.size = offset
+
+    def read(self, offset: int, size: int, /) -> bytes:
+        with self._lock:
+            self._materialize()
+            return pread(self.fd, size, offset)
+
+    def write(self, data: bytes, offset: int, /) -> int:
+        with self._lock:
+            self._materialize()
+            end = offset + len(data)
+            if end > self.size:
+                self.writeback.reserve(end - self.size)
+            n = pwrite(self.fd, data, offset)
+            if offset + n > self.size:
+                self.size = offset + n
+            self.dirty = True
+            return n
+
+    def truncate(self, length: int, /):
+        with self._lock:
+            if length:
+                self._materialize()
+            else:
+                self._fetch = None
+            if length > self.size:
+                self.writeback.reserve(length - self.size)
+            else:
+                self.writeback.free(self.size - length)
+            ftruncate(self.fd, length)
+            self.size = length
+            self.dirty = True
+
+    def close(self, /):
+        fd, self.fd = self.fd, -1
+        if fd >= 0:
+            os_close(fd)
+
+    def discard(self, /):
+        "关闭并删除暂存文件，归还暂存空间"
+        self.close()
+        self.writeback.free(self.size)
+        try:
+            remove(self.local)
+        except OSError:
+            pass
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["make_strm_tree"]
+
+import logging
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import wait as wait_futures, Future, ThreadPoolExecutor, FIRST_COMPLETED
+from os import makedirs, remove, replace, fdopen
+from os.path import join as joinpath, split as splitpath, splitext
+from shutil import copyfileobj, rmtree
+from sqlite3 import connect
+from tempfile import mkstemp
+from time import perf_counter
+from typing import Any
+
+from alist import AlistPath
+
+from .log import logger
+
+
+#: 清单文件的默认名字，位于输出目录中
+MANIFEST_NAME = ".strm-manifest.sqlite"
+
+
+def _atomic_write(path: str, data: bytes | Callable[[Any], Any], /):
+    "先写入同目录下的临时文件，再替换目标文件，``data`` 可以是字节串，或者是接受一个文件对象并向其中写入的函数"
+    dir_, name = splitpath(path)
+    fd, tmp = mkstemp(prefix="." + name + ".", suffix=".tmp", dir=dir_)
+    try:
+        with fdopen(fd, "wb") as f:
+            if isinstance(data, bytes):
+                f.write(data)
+            else:
+                data(f)
+        replace(tmp, path)
+    except BaseException:
+        try:
+            remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _remove(path: str, kind: str, /):
+    try:
+        if kind == "d":
+            rmtree(path)
+        else:
+            remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def make_strm_tree(
+    listdir: Callable[[str], Iterable[AlistPath]], 
+    top: str, 
+    output_dir: str, 
+    /, 
+    predicate: None | Callable[[AlistPath], bool] = None, 
+    strm_predicate: None | Callable[[AlistPath], bool] = None, 
+    strm_make: None | Callable[[AlistPath], str] = None, 
+    sidecar_max_size: int = 16 << 20, 
+    max_workers: int = 8, 
+    manifest: str = "", 
+    delete: bool = True, 
+    force: bool = False, 
+    callback: None | Callable[[dict[str, int]], Any] = None, 
+) -> dict[str, int]:
+    """把远程的目录树导出为本地的 strm 目录树（不需要挂载），规则与 fuse 的 strm 相同
+
+    - 目录和 ``predicate`` 为真的文件会被导出；``strm_predicate`` 为真的文件（优先级更高）导出为同名的 .strm 文件，
+      内容是 ``strm_make(path)``（未指定时为 ``path.get_url()``）；其它不超过 ``sidecar_max_size`` 的文件（字幕、海报、nfo 等）会被下载
+    - 并发地罗列目录，罗列、生成链接和写入文件都在工作线程中完成，写入是原子的（先写临时文件再替换）
+    - 清单（SQLite）记录每一项的版本（大小、修改时间和签名），再次运行时只更新变化了的项，
+      远程已经不存在（或者不再满足断言）的项会从本地删除；罗列失败的目录保持原样，下次运行时重试
+
+    :param listdir: 罗列目录的函数，接受远程路径，返回路径对象的列表，例如 ``partial(fs.listdir_path, refresh=False)``
+    :param top: 远程的顶层目录
+    :param output_dir: 本地的输出目录
+    :param predicate: 断言，为假时跳过文件或目录
+    :param strm_predicate: strm 断言，为真时文件导出为 .strm 文件
+    :param strm_make: 生成 strm 内容（链接）的函数
+    :param sidecar_max_size: 下载的其它文件的最大字节数，<= 0 时不下载
+    :param max_workers: 最大并发数
+    :param manifest: 清单文件，为空时使用输出目录中的 ``.strm-manifest.sqlite``
+    :param delete: 是否删除远程已经不存在的项
+    :param force: 是否忽略清单，重新生成所有项
+    :param callback: 每处理完一个目录，用统计信息调用一次
+
+    :return: 统计信息
+    """
+    top = "/" + top.strip("/")
+    makedirs(output_dir, exist_ok=True)
+    if not manifest:
+        manifest = joinpath(output_dir, MANIFEST_NAME)
+    con = connect(manifest)
+    con.executescript("""\
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY, 
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    dir TEXT NOT NULL, 
+    name TEXT NOT NULL, 
+    kind TEXT NOT NULL, 
+    version TEXT NOT NULL, 
+    PRIMARY KEY (dir, name)
+);""")
+    row = con.execute("SELECT value FROM meta WHERE key='top'").fetchone()
+    if row is None:
+        with con:
+            con.execute("INSERT INTO meta (key, value) VALUES ('top', ?)", (top,))
+    elif row[0] != top:
+        con.close()
+        raise ValueError(f"manifest {manifest!r} belongs to another directory: {row[0]!r}")
+
+    stats = dict.fromkeys(("dirs", "strm", "sidecar", "unchanged", "removed", "errors"), 0)
+
+    def load(rel: str, /) -> dict[str, tuple[str, str]]:
+        "清单中某个目录下的 {名字: (类型, 版本)}，类型 d 是目录，s 是 strm，f 是下载的文件"
+        if force:
+            return {}
+        return {name: (kind, version) for name, kind, version in con.execute(
+            "SELECT name, kind, version FROM entries WHERE dir = ?", (rel,))}
+
+    def work(
+        remote: str, 
+        rel: str, 
+        old: dict[str, tuple[str, str]], 
+        /, 
+    ) -> tuple[list[tuple[str, str, str]], list[tuple[str, str]], list[tuple[str, str]], dict[str, int]]:
+        "处理一个目录，返回 (需要更新的清单项, 需要删除的清单项, 子目录, 统计)"
+        counts = dict.fromkeys(stats, 0)
+        local_dir = joinpath(output_dir, rel)
+        makedirs(local_dir, exist_ok=True)
+        upserts: list[tuple[str, str, str]] = []
+        subdirs: list[tuple[str, str]] = []
+        seen: set[str] = set()
+        for path in listdir(remote):
+            name = path.name
+            if path.is_dir():
+                if predicate and not predicate(path):
+                    continue
+                kind, version = "d", ""
+            elif strm_predicate and strm_predicate(path):
+                kind = "s"
+                name = splitext(name)[0] + ".strm"
+                version = "%s|%s|%s" % (path.get("size"), path.get("mtime"), path.get("sign") or "")
+            elif predicate and not predicate(path):
+                continue
+            elif 0 < sidecar_max_size and int(path.get("size") or 0) <= sidecar_max_size:
+                kind = "f"
+                version = "%s|%s" % (path.get("size"), path.get("mtime"))
+            else:
+                continue
+            seen.add(name)
+            local = joinpath(local_dir, name)
+            if kind == "d":
+                subdirs.append((path["path"], f"{rel}/{name}" if rel else name))
+            prev = old.get(name)
+            if prev == (kind, version):
+                counts["unchanged"] += 1
+                continue
+            try:
+                if prev is not None and prev[0] != kind:
+                    _remove(local, prev[0])
+                if kind == "d":
+                    makedirs(local, exist_ok=True)
+                elif kind == "s":
+                    if strm_make is None:
+                        url = path.get_url(ensure_ascii=False)
+                    else:
+                        url = strm_make(path) or ""
+                    if not url:
+                        raise ValueError("empty url")
+                    _atomic_write(local, url.encode("utf-8"))
+                    counts["strm"] += 1
+                else:
+                    def download(f, path=path, /):
+                        with path.open("rb") as src:
+                            copyfileobj(src, f, 1 << 20)
+                    _atomic_write(local, download)
+                    counts["sidecar"] += 1
+            except Exception as e:
+                # NOTE: 不更新清单，下次运行时重试
+                counts["errors"] += 1
+                logger.log(logging.ERROR, "can't export: %r\n  |_ %s: %s", path["path"], type(e).__qualname__, e)
+                continue
+            upserts.append((name, kind, version))
+        removed: list[tuple[str, str]] = []
+        if delete:
+            for name, (kind, _) in old.items():
+                if name not in seen:
+                    _remove(joinpath(local_dir, name), kind)
+                    removed.append((name, kind))
+            counts["removed"] += len(removed)
+        counts["dirs"] += 1
+        return upserts, removed, subdirs, counts
+
+    last_commit = perf_counter()
+    try:
+        with ThreadPoolExecutor(max(max_workers, 1)) as executor:
+            pending: dict[Future, tuple[str, str]] = {executor.submit(work, top, "", load("")): (top, "")}
+            try:
+                while pending:
+                    done, _ = wait_futures(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        remote, rel = pending.pop(future)
+                        try:
+                            upserts, removed, subdirs, counts = future.result()
+                        except BaseException as e:
+                            if not isinstance(e, Exception):
+                                raise
+                            stats["errors"] += 1
+                            logger.log(logging.ERROR, "can't list: %r\n  |_ %s: %s", remote, type(e).__qualname__, e)
+                            continue
+                        for name, kind in removed:
+                            con.execute("DELETE FROM entries WHERE dir = ? AND name = ?", (rel, name))
+                            if kind == "d":
+                                sub = f"{rel}/{name}" if rel else name
+                                # NOTE: 删除整棵子树，"0" 是 "/" 的下一个字符
+                                con.execute(
+                                    "DELETE FROM entries WHERE dir = ? OR (dir > ? AND dir < ?)", 
+                                    (sub, sub + "/", sub + "0"), 
+                                )
+                        con.executemany(
+                            "INSERT OR REPLACE INTO entries (dir, name, kind, version) VALUES (?, ?, ?, ?)", 
+                            [(rel, *item) for item in upserts], 
+                        )
+                        for subremote, subrel in subdirs:
+                            pending[executor.submit(work, subremote, subrel, load(subrel))] = (subremote, subrel)
+                        for k, v in counts.items():
+                            stats[k] += v
+                        if perf_counter() - last_commit >= 1:
+                            con.commit()
+                            last_commit = perf_counter()
+                        if callback is not None:
+                            callback(stats)
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        con.commit()
+        con.close()
+    return stats
@@ -9,6 +9,8 @@ KEYS = (
     "name", "path", "is_dir", "size", "ctime", "mtime", "atime", "hash_info", 
     "modified", "created", "sign", "thumb", "type", 
 )
+#: 需要额外计算（url）或请求（raw_url）才能得到的 key，只有被选中时才会去获取
+EXTRA_KEYS = ("url", "raw_url")
 
 if __name__ == "__main__":
     from argparse import ArgumentParser, RawTextHelpFormatter
@@ -30,14 +32,27 @@ def main(args):
         print(".".join(map(str, __version__)))
         raise SystemExit(0)
 
-    from sys import stdout
+    from sys import stderr, stdout
+    from time import perf_counter
     from typing import Callable
 
     from alist import AlistFileSystem
+    from alist.component.lister import ConcurrentLister
 
     fs = AlistFileSystem.login(args.origin, args.username, args.password)
     keys = args.keys or KEYS
     output_type = args.output_type
+    output_file = args.output_file
+    checkpoint = args.checkpoint
+    if output_type == "sqlite" and not output_file:
+        parser.error("-t/--output-type sqlite requires -O/--output-file")
+    if checkpoint:
+        if not output_file:
+            parser.error("-c/--checkpoint requires -O/--output-file")
+        if output_type == "json":
+            parser.error("-c/--checkpoint does not support -t/--output-type json")
+        if args.depth_first:
+            parser.error("-c/--checkpoint does not support -dfs/--depth-first")
 
     select = args.select
     if select:
@@ -48,20 +63,232 @@ def main(args):
     else:
         predicate = None
 
-    path_it = fs.iter(
-        args.path, 
-        topdown=True if args.depth_first else None, 
-        min_depth=args.min_depth, 
-        max_depth=args.max_depth, 
-        predicate=predicate, 
-        refresh=args.refresh, 
-        password=args.directory_password, 
-    )
+    password = args.directory_password
+    refresh = args.refresh
+    min_depth = args.min_depth
+    max_depth = args.max_depth
+    need_url = "url" in keys
+    need_raw_url = "raw_url" in keys
 
-    output_file = args.output_file
+    def project(path) -> dict:
+        "只取出选中的 key，url 和 raw_url 只在选中时才去获取"
+        record = {k: path.get(k) for k in keys}
+        if need_url:
+            record["url"] = fs.get_url(path)
+        if need_raw_url and not path.is_dir():
+            record["raw_url"] = path.get_raw_url()
+        return record
+
+    # NOTE: 检查点是一个 SQLite 数据库，记录已发现的目录，以及其中哪些已经罗列完成并写入了输出
+    con = None
+    resumed = False
+    if checkpoint:
+        import sqlite3
+
+        con = sqlite3.connect(checkpoint)
+        con.executescript("""\
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY, 
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY, 
+    depth INTEGER NOT NULL, 
+    done INTEGER NOT NULL DEFAULT 0
+);""")
+        top = fs.abspath(args.path)
+        row = con.execute("SELECT value FROM meta WHERE key='top'").fetchone()
+        if row is None:
+            with con:
+                con.execute("INSERT INTO meta (key, value) VALUES ('top', ?)", (top,))
+        elif row[0] != top:
+            parser.error(f"checkpoint {checkpoint!r} belongs to another directory: {row[0]!r}")
+        resumed = con.execute("SELECT 1 FROM dirs LIMIT 1").fetchone() is not None
+
+    dumps: Callable[..., bytes]
+    try:
+        from orjson import dumps
+    except ImportError:
+        odumps: Callable[..., str]
+        try:
+            from ujson import dumps as odumps
+        except ImportError:
+            from json import dumps as odumps
+        dumps = lambda obj: bytes(odumps(obj, ensure_ascii=False), "utf-8")
+
+    # NOTE: 输出都是带缓冲的，每批（一个目录的罗列结果）只写入一次，只在更新检查点前和结束时才落盘
+    buffering = 1 << 20
+    write_records: Callable[[list[dict]], None]
+    if output_type == "sqlite":
+        import sqlite3
+
+        db = sqlite3.connect(output_file)
+        db.execute("PRAGMA journal_mode = WAL")
+        if not resumed:
+            db.execute("DROP TABLE IF EXISTS data")
+        columns = ", ".join('"%s"%s' % (k, " TEXT PRIMARY KEY" if k == "path" else "") for k in keys)
+        db.execute(f"CREATE TABLE IF NOT EXISTS data ({columns})")
+        sql = "INSERT OR REPLACE INTO data VALUES (%s)" % ", ".join("?" * len(keys))
+        def adapt(value, /):
+            if isinstance(value, (dict, list, tuple)):
+                return str(dumps(value), "utf-8")
+            return value
+        def write_records(records: list[dict], /):
+            db.executemany(sql, [tuple(adapt(record[k]) for k in keys) for record in records])
+        flush = db.commit
+        def close():
+            db.commit()
+            db.close()
+    elif output_type == "csv":
+        from csv import DictWriter
+
+        if output_file:
+            file = open(output_file, "a" if resumed else "w", newline="", encoding="utf-8", buffering=buffering)
+        else:
+            file = stdout # type: ignore
+        writer = DictWriter(file, fieldnames=keys)
+        if not output_file or not file.tell():
+            writer.writeheader()
+        write_records = writer.writerows
+        flush = file.flush
+        close = file.close if output_file else file.flush
+    else:
+        if output_file:
+            bfile = open(output_file, "ab" if resumed else "wb", buffering=buffering)
+        else:
+            bfile = stdout.buffer
+        if output_type == "json":
+            first = True
+            def write_records(records: list[dict], /):
+                nonlocal first
+                if records:
+                    bfile.write((b"[" if first else b", ") + b", ".join(map(dumps, records)))
+                    first = False
+            def close():
+                bfile.write(b"[]" if first else b"]")
+                if output_file:
+                    bfile.close()
+                else:
+                    bfile.flush()
+        else:
+            def write_records(records: list[dict], /):
+                bfile.write(b"".join(dumps(record) + b"\n" for record in records))
+            close = bfile.close if output_file else bfile.flush
+        flush = bfile.flush
+
+    def iter_batches():
+        """逐批产出 (记录列表, 其中目录的数目)
+
+        广度优先时，由 ``ConcurrentLister`` 并发地罗列目录，罗列、筛选和取值都在工作线程中完成，
+        主线程只负责写入输出和维护检查点：某个目录的记录写入输出后，才会被标记为已完成，
+        标记每隔 1 秒（或 1000 个目录）批量提交一次，提交前会先把输出落盘，
+        所以中断后继续时，最多只会重复输出最后 1 秒内完成的那些目录的记录
+        """
+        if args.depth_first:
+            batch: list[dict] = []
+            ndirs = 0
+            for path in fs.iter(
+                args.path, 
+                topdown=True, 
+                min_depth=min_depth, 
+                max_depth=max_depth, 
+                predicate=predicate, 
+                refresh=refresh, 
+                password=password, 
+                max_workers=args.max_workers, 
+            ):
+                batch.append(project(path))
+                ndirs += path.is_dir()
+                if len(batch) >= 1000:
+                    yield batch, ndirs
+                    batch = []
+                    ndirs = 0
+            if batch:
+                yield batch, ndirs
+            return
+
+        def work(item: tuple[int, str], /) -> tuple[list[dict], int, list[tuple[int, str]]]:
+            depth, dir_ = item
+            depth += 1
+            records: list[dict] = []
+            ndirs = 0
+            subdirs: list[tuple[int, str]] = []
+            for path in fs.listdir_path(dir_, password, refresh=refresh):
+                pred = True if predicate is None else predicate(path)
+                if pred is None:
+                    continue
+                elif pred:
+                    if depth >= min_depth:
+                        records.append(project(path))
+                        ndirs += path.is_dir()
+                    if pred is 1:
+                        continue
+                if path.is_dir() and (max_depth < 0 or depth < max_depth):
+                    subdirs.append((depth, path["path"]))
+            return records, ndirs, subdirs
+
+        found: list[tuple[str, int]] = []
+        done: list[tuple[str]] = []
+        last_commit = perf_counter()
+        def commit():
+            nonlocal last_commit
+            if con is None:
+                return
+            flush()
+            with con:
+                con.executemany("INSERT OR IGNORE INTO dirs (path, depth) VALUES (?, ?)", found)
+                con.executemany("UPDATE dirs SET done=1 WHERE path=?", done)
+            found.clear()
+            done.clear()
+            last_commit = perf_counter()
+
+        lister = ConcurrentLister(work, max_workers=args.max_workers)
+        try:
+            if resumed:
+                pending = con.execute("SELECT depth, path FROM dirs WHERE done=0 ORDER BY depth").fetchall() # type: ignore
+                for item in pending:
+                    lister.submit(tuple(item))
+            else:
+                top = fs.as_path(fs.attr(args.path, password))
+                if min_depth <= 0:
+                    pred = True if predicate is None else predicate(top)
+                    if pred is None:
+                        return
+                    elif pred:
+                        yield [project(top)], int(top.is_dir())
+                        if pred is 1:
+                            return
+                if not top.is_dir() or max_depth == 0:
+                    return
+                found.append((top["path"], 0))
+                lister.submit((0, top["path"]))
+            while lister:
+                (_, dir_), ret = lister.get()
+                if isinstance(ret, BaseException):
+                    if not isinstance(ret, OSError):
+                        raise ret
+                    # NOTE: 失败的目录保持未完成，下次继续时会重试
+                    print(f"\r\x1b[K[ERROR] {dir_!r}: {type(ret).__qualname__}: {ret}", file=stderr)
+                    continue
+                records, ndirs, subdirs = ret
+                for item in subdirs:
+                    lister.submit(item)
+                yield records, ndirs
+                if con is not None:
+                    # NOTE: 子目录和此目录的完成标记一起提交，如果在写入输出时中断，则都不会提交，
+                    #       继续时重新罗列此目录，而不会把子目录重复提交
+                    found.extend((path, depth) for depth, path in subdirs)
+                    done.append((dir_,))
+                    if len(done) >= 1000 or perf_counter() - last_commit >= 1:
+                        commit()
+        finally:
+            lister.close()
+            commit()
+
+    batches = iter_batches()
     if output_file:
         from collections import deque
-        from time import perf_counter
 
         def format_time(t):
             m, s = divmod(t, 60)
@@ -83,71 +310,37 @@ def main(args):
             start_t = last_t = perf_counter()
             write(f"\r\x1b[K🗂️  {total} = 📂 {ndirs} + 📝 {nfiles}".encode())
             push((total, start_t))
-            for p in it:
-                total += 1
-                if p.is_dir():
-                    ndirs += 1
-                else:
-                    nfiles += 1
+            for records, n in it:
+                total += len(records)
+                ndirs += n
+                nfiles += len(records) - n
                 cur_t = perf_counter()
                 if cur_t - last_t > 0.1:
                     speed = (total - dq[0][0]) / (cur_t - dq[0][1])
                     write(f"\r\x1b[K🗂️  {total} = 📂 {ndirs} + 📝 {nfiles} | 🕙 {format_time(cur_t-start_t)} | 🚀 {speed:.3f} it/s".encode())
                     push((total, cur_t))
                     last_t = cur_t
-                yield p
+                yield records, n
             cur_t = perf_counter()
             speed = total / (cur_t - start_t)
             write(f"\r\x1b[K🗂️  {total} = 📂 {ndirs} + 📝 {nfiles} | 🕙 {format_time(cur_t-start_t)} | 🚀 {speed:.3f} it/s".encode())
-        file = open(output_file, "w")
-        path_it = iter(progress(path_it))
+        it = progress(batches)
     else:
-        file = stdout # type: ignore
-
-    records = ({k: p.get(k) for k in keys} for p in path_it)
-
-    dumps: Callable[..., bytes]
-    if output_type in ("log", "json"):
-        try:
-            from orjson import dumps
-        except ImportError:
-            odumps: Callable[..., str]
-            try:
-                from ujson import dumps as odumps
-            except ImportError:
-                from json import dumps as odumps
-            dumps = lambda obj: bytes(odumps(obj, ensure_ascii=False), "utf-8")
-        if output_file:
-            write = file.buffer.write
-        else:
-            write = file.buffer.raw.write # type: ignore
+        it = batches
 
     try:
-        if output_type == "json":
-            write(b"[")
-            for i, record in enumerate(records):
-                if i:
-                    write(b", ")
-                write(dumps(record))
-            write(b"]")
-        elif output_type == "log":
-            for record in records:
-                write(dumps(record))
-                write(b"\n")
-        else:
-            from csv import DictWriter
-
-            writer = DictWriter(file, fieldnames=keys)
-            writer.writeheader()
-            for record in records:
-                writer.writerow(record)
+        for records, _ in it:
+            write_records(records)
     except KeyboardInterrupt:
         pass
     except BrokenPipeError:
-        from sys import stderr
         stderr.close()
     finally:
-        file.close()
+        # NOTE: 先关闭遍历（会提交检查点），再关闭输出
+        batches.close()
+        close()
+        if con is not None:
+            con.close()
 
 
 parser.add_argument("path", nargs="?", default="/", help="文件夹路径，默认值 '/'，即根目录")
@@ -156,18 +349,23 @@ parser.add_argument("-u", "--username", default="", help="用户名，默认为
 parser.add_argument("-p", "--password", default="", help="密码，默认为空")
 parser.add_argument("-dp", "--directory-password", default="", help="文件夹的密码，默认为空")
 parser.add_argument("-r", "--refresh", action="store_true", help="是否刷新（拉取最新而非使用缓存）")
-parser.add_argument("-k", "--keys", nargs="*", choices=KEYS, help=f"选择输出的 key，默认输出所有可选值")
+parser.add_argument("-k", "--keys", nargs="*", choices=KEYS+EXTRA_KEYS, help=f"选择输出的 key，默认输出 {KEYS}，{EXTRA_KEYS} 需要额外获取，只在选中时才会输出")
 parser.add_argument("-s", "--select", help="提供一个表达式（会注入一个变量 path，类型是 alist.AlistPath），用于对路径进行筛选")
-parser.add_argument("-t", "--output-type", choices=("log", "json", "csv"), default="log", help="""\
+parser.add_argument("-t", "--output-type", choices=("log", "json", "csv", "sqlite"), default="log", help="""\
 输出类型，默认为 log
-- log   每行输出一条数据，每条数据输出为一个 json 的 object
-- json  输出一个 json 的 list，每条数据输出为一个 json 的 object
-- csv   输出一个 csv，第 1 行为表头，以后每行输出一条数据
+- log     每行输出一条数据，每条数据输出为一个 json 的 object
+- json    输出一个 json 的 list，每条数据输出为一个 json 的 object
+- csv     输出一个 csv，第 1 行为表头，以后每行输出一条数据
+- sqlite  输出到一个 SQLite 数据库的 data 表，每条数据为一行（需要指定 -O/--output-file）
 """)
 parser.add_argument("-O", "--output-file", help="保存到文件，此时命令行会输出进度条")
 parser.add_argument("-m", "--min-depth", default=0, type=int, help="最小深度，默认值 0，小于或等于 0 时不限")
 parser.add_argument("-M", "--max-depth", default=-1, type=int, help="最大深度，默认值 -1，小于 0 时不限")
 parser.add_argument("-dfs", "--depth-first", action="store_true", help="使用深度优先搜索，否则使用广度优先")
+parser.add_argument("-w", "--max-workers", default=8, type=int, help="并发罗列目录的最大线程数，默认值 8")
+parser.add_argument("-c", "--checkpoint", help="""\
+检查点文件（SQLite 数据库），记录已罗列完成的目录，需要指定 -O/--output-file
+中断后用同样的参数再次运行，会跳过已完成的目录，并追加到原来的输出中""")
 parser.add_argument("-v", "--version", action="store_true", help="输出版本号")
 parser.set_defaults(func=main)
 
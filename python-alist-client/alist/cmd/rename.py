@@ -1,3 +1,127 @@
 #!/usr/bin/env python3
 # encoding: utf-8
 
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__: list[str] = []
+__doc__ = """\
+    alist 批量改名
+
+同一目录中的改名会合并成 1 次批量改名请求（如果一条正则规则就能完成，则改用正则改名），不同目录的并发执行
+
+1. 用正则表达式改名（Python 语法），比如把 /电视剧 下所有的 .mkv 改成 .mp4：
+
+.. code: console
+
+    /usr/bin/env python3 -m alist rename /电视剧 -R -e '\\.mkv$' -s '.mp4'
+
+2. 用 Python 表达式改名，变量 name 是原名字，结果为 None 或原名字时不改：
+
+.. code: console
+
+    /usr/bin/env python3 -m alist rename /电视剧 -x 'name.lower()'
+
+3. 从文件（- 表示标准输入）读取改名对，每行一对，原路径和目标之间用制表符隔开，目标是不含 / 的名字时，表示在原目录中改名：
+
+.. code: console
+
+    /usr/bin/env python3 -m alist rename -f pairs.tsv
+"""
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser, RawTextHelpFormatter
+    from pathlib import Path
+    from sys import path
+
+    path[0] = str(Path(__file__).parents[2])
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+else:
+    from argparse import RawTextHelpFormatter
+    from .init import subparsers
+
+    parser = subparsers.add_parser("rename", description=__doc__, formatter_class=RawTextHelpFormatter)
+
+
+def main(args):
+    if args.version:
+        from alist import __version__
+        print(".".join(map(str, __version__)))
+        raise SystemExit(0)
+
+    from sys import stderr, stdin
+
+    from alist import AlistClient, AlistFileSystem
+
+    if token := args.token:
+        client = AlistClient.from_auth(token, origin=args.origin)
+    else:
+        client = AlistClient(args.origin, args.username, args.password)
+    fs = AlistFileSystem(client)
+
+    def onerror(e: OSError):
+        print(f"[ERROR] {type(e).__qualname__}: {e}", file=stderr)
+
+    if pairs_file := args.pairs_file:
+        def iter_pairs():
+            with (stdin if pairs_file == "-" else open(pairs_file, encoding="utf-8")) as f:
+                for line in f:
+                    line = line.rstrip("\r\n")
+                    if not line:
+                        continue
+                    src, sep, dst = line.partition("\t")
+                    if not sep:
+                        raise ValueError(f"invalid line (expect 'src<TAB>dst'): {line!r}")
+                    yield src, dst
+        pairs = list(iter_pairs())
+        if args.dry_run:
+            for src, dst in pairs:
+                print(src, "->", dst)
+            return
+        renamed = fs.batch_rename(
+            pairs, 
+            password=args.directory_password, 
+            max_workers=args.max_workers, 
+            batch_size=args.batch_size, 
+            onerror=onerror, 
+        )
+    else:
+        if args.expr:
+            rule = eval("lambda name:" + args.expr)
+        elif args.regex:
+            rule = (args.regex, args.replace)
+        else:
+            parser.error("one of -e/--regex, -x/--expr or -f/--pairs-file is required")
+        renamed = fs.rename_by_rule(
+            rule, 
+            args.path, 
+            recursive=args.recursive, 
+            password=args.directory_password, 
+            max_workers=args.max_workers, 
+            batch_size=args.batch_size, 
+            onerror=onerror, 
+            dry_run=args.dry_run, 
+        )
+    for src, dst in renamed.items():
+        print(src, "->", dst)
+
+
+parser.add_argument("path", nargs="?", default="/", help="对此目录中的项按规则改名，默认为 /")
+parser.add_argument("-o", "--origin", default="http://localhost:5244", help="alist 服务器地址，默认 http://localhost:5244")
+parser.add_argument("-u", "--username", default="admin", help="用户名，默认为 admin")
+parser.add_argument("-p", "--password", default="", help="密码，默认为空")
+parser.add_argument("-t", "--token", default="", help="alist 的 token，优先级高于 -u/--username 和 -p/--password")
+parser.add_argument("-e", "--regex", default="", help="用于改名的正则表达式（Python 语法），对能搜索到它的名字进行替换")
+parser.add_argument("-s", "--replace", default="", help="与 -e/--regex 配合使用的替换模板（Python 语法，如 \\1 或 \\g<name>），默认为空")
+parser.add_argument("-x", "--expr", default="", help="用于改名的 Python 表达式，变量 name 是原名字，优先级高于 -e/--regex")
+parser.add_argument("-f", "--pairs-file", default="", help="从文件读取改名对（- 表示标准输入），优先级高于 -e/--regex 和 -x/--expr")
+parser.add_argument("-R", "--recursive", action="store_true", help="递归处理所有后代目录")
+parser.add_argument("-dp", "--directory-password", default="", help="目录的访问密码")
+parser.add_argument("-m", "--max-workers", default=8, type=int, help="最大并发数，默认为 8")
+parser.add_argument("-b", "--batch-size", default=1000, type=int, help="每次批量改名请求最多包含的改名数，<= 0 时不限，默认为 1000")
+parser.add_argument("-n", "--dry-run", action="store_true", help="只输出改名的计划，而不执行")
+parser.add_argument("-v", "--version", action="store_true", help="输出版本号")
+parser.set_defaults(func=main)
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    main(args)
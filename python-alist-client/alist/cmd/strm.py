@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__: list[str] = []
+__doc__ = """\
+    alist 导出 strm 目录树（不需要挂载）
+
+规则与 fuse 命令的 strm 相同：strm 断言为真的文件导出为 .strm 文件（内容是链接），其它满足断言的小文件（字幕、海报、nfo 等）会被下载，
+输出目录中的清单记录了每一项的版本，再次运行时只更新变化了的项，并删除远程已经不存在的项
+
+1. 把 /电影 中的视频导出为 strm，其它不超过 16 MB 的文件原样下载：
+
+.. code: console
+
+    /usr/bin/env python3 -m alist strm /电影 ./电影 -p2 '*.mkv *.mp4'
+
+2. 用 302 服务的链接作为 strm 的内容，并且不下载其它文件：
+
+.. code: console
+
+    /usr/bin/env python3 -m alist strm /电影 ./电影 -p2 '*.mkv *.mp4' -sm 'http://my.302.server' -ss 0
+"""
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser, RawTextHelpFormatter
+    from pathlib import Path
+    from sys import path
+
+    path[0] = str(Path(__file__).parents[2])
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+else:
+    from argparse import RawTextHelpFormatter
+    from .init import subparsers
+
+    parser = subparsers.add_parser("strm", description=__doc__, formatter_class=RawTextHelpFormatter)
+
+
+def main(args):
+    if args.version:
+        from alist import __version__
+        print(".".join(map(str, __version__)))
+        raise SystemExit(0)
+
+    import logging
+    import re
+
+    from functools import partial
+    from pathlib import Path
+    from sys import stderr
+    from time import perf_counter
+
+    from alist import AlistFileSystem
+    from alist.cmd.fuse.util.log import logger
+    from alist.cmd.fuse.util.predicate import make_predicate
+    from alist.cmd.fuse.util.strm import parse as make_strm_converter
+    from alist.cmd.fuse.util.strmtree import make_strm_tree
+
+    logger.setLevel(logging.ERROR)
+
+    if predicate := args.predicate or None:
+        predicate = make_predicate(predicate, {"re": re}, type=args.predicate_type)
+
+    if strm_predicate := args.strm_predicate or None:
+        strm_predicate = make_predicate(strm_predicate, {"re": re}, type=args.strm_predicate_type)
+
+    if strm_make := args.strm_make or None:
+        strm_make_type = args.strm_make_type
+        if strm_make_type == "file":
+            strm_make = Path(strm_make)
+        strm_make = make_strm_converter(
+            strm_make, 
+            {"re": re}, 
+            code_type=strm_make_type, 
+        )
+
+    fs = AlistFileSystem.login(args.origin, args.username, args.password)
+    top = fs.abspath(args.path)
+    listdir = partial(fs.listdir_path, password=args.directory_password, refresh=args.refresh)
+
+    start_t = perf_counter()
+    last_t = 0.
+    def progress(stats: dict[str, int], /):
+        nonlocal last_t
+        cur_t = perf_counter()
+        if cur_t - last_t > 0.1:
+            print("\r\x1b[K" + " | ".join(f"{k}: {v}" for k, v in stats.items()), end="", file=stderr, flush=True)
+            last_t = cur_t
+
+    try:
+        stats = make_strm_tree(
+            listdir, 
+            top, 
+            args.output_dir, 
+            predicate=predicate, 
+            strm_predicate=strm_predicate, 
+            strm_make=strm_make, 
+            sidecar_max_size=args.sidecar_max_size, 
+            max_workers=args.max_workers, 
+            manifest=args.manifest, 
+            delete=not args.no_delete, 
+            force=args.force, 
+            callback=progress, 
+        )
+    except KeyboardInterrupt:
+        raise SystemExit(130)
+    print("\r\x1b[K" + " | ".join(f"{k}: {v}" for k, v in stats.items()) + f" | elapsed: {perf_counter() - start_t:.3f} s", file=stderr)
+
+
+parser.add_argument("path", help="远程的目录")
+parser.add_argument("output_dir", help="本地的输出目录")
+parser.add_argument("-o", "--origin", default="http://localhost:5244", help="alist 服务器地址，默认 http://localhost:5244")
+parser.add_argument("-u", "--username", default="", help="用户名，默认为空")
+parser.add_argument("-p", "--password", default="", help="密码，默认为空")
+parser.add_argument("-dp", "--directory-password", default="", help="目录的访问密码")
+parser.add_argument("-r", "--refresh", action="store_true", help="罗列目录时强制刷新（只有启用 '创建目录或上传' 权限的用户才可刷新）")
+parser.add_argument("-p1", "--predicate", help="断言，当断言的结果为 True 时，文件或目录会被导出，参见 fuse 命令的同名参数")
+parser.add_argument(
+    "-t1", "--predicate-type", default="ignore", 
+    choices=("ignore", "ignore-file", "expr", "lambda", "stmt", "module", "file", "re"), 
+    help="断言类型，默认值为 'ignore'，参见 fuse 命令的同名参数", 
+)
+parser.add_argument("-p2", "--strm-predicate", help="strm 断言（优先级高于 -p1/--predicate），当断言的结果为 True 时，文件会被导出为带有 .strm 后缀的文本文件，内容是链接")
+parser.add_argument(
+    "-t2", "--strm-predicate-type", default="filter", 
+    choices=("filter", "filter-file", "expr", "lambda", "stmt", "module", "file", "re"), 
+    help="断言类型，默认值为 'filter'，参见 fuse 命令的同名参数", 
+)
+parser.add_argument("-sm", "--strm-make", help="自定义 strm 的内容")
+parser.add_argument(
+    "-st", "--strm-make-type", default="base-url", 
+    choices=("base-url", "expr", "fstring", "lambda", "stmt", "module", "file", "resub"), 
+    help="自定义 strm 的操作类型，默认值 'base-url'，参见 fuse 命令的同名参数", 
+)
+parser.add_argument("-ss", "--sidecar-max-size", default=16 << 20, type=int, help="其它满足断言的文件，不超过此字节数的会被下载，等于 0 则不下载，默认值是 16777216 (16 MB)")
+parser.add_argument("-w", "--max-workers", default=8, type=int, help="最大并发数，默认值是 8")
+parser.add_argument("-m", "--manifest", default="", help="清单文件（SQLite 数据库），默认为输出目录中的 .strm-manifest.sqlite")
+parser.add_argument("-f", "--force", action="store_true", help="忽略清单，重新生成所有项（例如修改了 -sm/--strm-make 之后）")
+parser.add_argument("-nd", "--no-delete", action="store_true", help="不删除远程已经不存在的项")
+parser.add_argument("-v", "--version", action="store_true", help="输出版本号")
+parser.set_defaults(func=main)
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    main(args)
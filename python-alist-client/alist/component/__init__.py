@@ -4,10 +4,30 @@
 __author__ = "ChenyangGao <https://chenyanggao.github.io>"
 __all__: list[str] = []
 
+from . import upload
+__all__.extend(upload.__all__)
+from .upload import *
+
 from . import client
 __all__.extend(client.__all__)
 from .client import *
 
+from . import cache
+__all__.extend(cache.__all__)
+from .cache import *
+
+from . import storage
+__all__.extend(storage.__all__)
+from .storage import *
+
+from . import lister
+__all__.extend(lister.__all__)
+from .lister import *
+
+from . import transfer
+__all__.extend(transfer.__all__)
+from .transfer import *
+
 from . import fs
 __all__.extend(fs.__all__)
 from .fs import *
@@ -7,3 +7,7 @@ __all__: list[str] = []
 from . import task
 __all__.extend(task.__all__)
 from .task import *
+
+from . import poller
+__all__.extend(poller.__all__)
+from .poller import *
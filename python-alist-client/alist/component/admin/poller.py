@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+from __future__ import annotations
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["AlistTaskHandle", "AlistTaskPoller"]
+
+import errno
+
+from asyncio import get_running_loop, sleep as async_sleep, wrap_future, AbstractEventLoop, Future as AsyncFuture
+from collections.abc import Callable, Coroutine, Generator
+from concurrent.futures import Future
+from threading import Event, Lock, Thread
+from typing import Any, Final, Literal
+
+from iterutils import run_gen_step
+
+from ..client import check_response, AlistClient
+
+
+#: 任务的状态码（参考 AList 的 tache.State）
+TASK_STATE_SUCCEEDED: Final = 2
+TASK_STATE_CANCELED: Final = 4
+
+
+class AlistTaskHandle:
+    """AList 后台任务的句柄，可以等待其完成
+
+    - 同步模式下，``future`` 是 ``concurrent.futures.Future``，可以用 ``result(timeout)`` 阻塞等待
+    - 异步模式下，``future`` 是 ``asyncio.Future``，可以直接 ``await`` 句柄
+    - 任务成功时，结果是最终的任务信息（``dict``）；失败或被取消时，会抛出 ``OSError``
+    - 句柄的状态由所属的 ``AlistTaskPoller`` 统一批量更新，句柄自身不发请求
+
+    :param poller: 所属的轮询器
+    :param task: 任务信息，至少要有 "id" 或 "name"
+    :param future: 用来传递结果的 future
+    """
+    def __init__(
+        self, 
+        /, 
+        poller: AlistTaskPoller, 
+        task: dict, 
+        future: Future | AsyncFuture, 
+    ):
+        self.poller = poller
+        self.id: str = task.get("id") or ""
+        self.name: str = task.get("name") or ""
+        self.info = task
+        self.future = future
+        self.misses = 0
+
+    def __await__(self, /) -> Generator[Any, None, dict]:
+        future = self.future
+        if isinstance(future, Future):
+            future = wrap_future(future)
+        return future.__await__()
+
+    def __repr__(self, /) -> str:
+        return f"<{type(self).__qualname__}(id={self.id!r}, name={self.name!r}, category={self.category!r}, done={self.done()!r})>"
+
+    @property
+    def category(self, /) -> str:
+        return self.poller.category
+
+    @property
+    def dst_path(self, /) -> str:
+        return self.info.get("dst_path") or ""
+
+    @property
+    def progress(self, /) -> float:
+        return self.info.get("progress") or 0
+
+    def add_done_callback(self, fn: Callable[[AlistTaskHandle], Any], /):
+        "任务结束后，调用 ``fn(self)``"
+        self.future.add_done_callback(lambda _: fn(self))
+
+    def done(self, /) -> bool:
+        return self.future.done()
+
+    def exception(self, /, timeout: None | float = None) -> None | BaseException:
+        if isinstance(self.future, Future):
+            return self.future.exception(timeout)
+        return self.future.exception()
+
+    def result(self, /, timeout: None | float = None) -> dict:
+        "获取结果（同步模式下会等待，异步模式下如果尚未结束则报错，请改用 await）"
+        if isinstance(self.future, Future):
+            return self.future.result(timeout)
+        return self.future.result()
+
+    def cancel(
+        self, 
+        /, 
+        async_: Literal[False, True] = False, 
+    ) -> dict | Coroutine[Any, Any, dict]:
+        "请求服务器取消此任务，取消的结果会在下一次轮询时反映到句柄上"
+        poller = self.poller
+        return check_response(poller.client.task_cancel( # type: ignore
+            self.id, 
+            category=poller.category, 
+            request=poller.async_request if async_ else poller.request, 
+            async_=async_, 
+            **poller.request_kwargs, 
+        ))
+
+
+class AlistTaskPoller:
+    """共享的后台任务轮询器：无论跟踪了多少个任务，每一轮都只罗列一次未完成和已完成的任务列表
+
+    - 任务按 id 匹配（没有 id 时按名字匹配），结束的任务在同一轮中被批量解决
+    - 轮询间隔从 ``min_interval`` 开始，如果一轮下来没有任何任务发生变化（进度或状态），
+      就乘以 ``backoff``，直到 ``max_interval``；一旦有变化，就重置为 ``min_interval``
+    - 同步模式使用一个后台线程，异步模式使用一个协程任务，在没有待跟踪的任务时自动退出，需要时再启动
+    - 连续 ``max_misses`` 轮在两个列表中都找不到的任务（例如已被清除），会以 ``FileNotFoundError`` 结束
+
+    :param client: 客户端
+    :param category: 任务分类，参见 ``AlistClient.task_undone``
+    :param min_interval: 最小轮询间隔（秒）
+    :param max_interval: 最大轮询间隔（秒）
+    :param backoff: 没有变化时，轮询间隔的增长倍数
+    :param max_misses: 找不到任务的最大连续轮数
+    :param max_failures: 请求连续失败的最大次数，超过后所有待跟踪的任务都以此异常结束
+    :param request: 同步请求函数
+    :param async_request: 异步请求函数
+    :param request_kwargs: 其它请求参数
+    :param async_: 是否异步
+    """
+    def __init__(
+        self, 
+        /, 
+        client: str | AlistClient, 
+        category: str = "copy", 
+        min_interval: float = 0.5, 
+        max_interval: float = 10, 
+        backoff: float = 1.5, 
+        max_misses: int = 3, 
+        max_failures: int = 5, 
+        request: None | Callable = None, 
+        async_request: None | Callable = None, 
+        request_kwargs: None | dict = None, 
+        async_: bool = False, 
+    ):
+        if isinstance(client, str):
+            client = AlistClient.from_auth(client)
+        self.client = client
+        self.category = category
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = max(backoff, 1)
+        self.max_misses = max_misses
+        self.max_failures = max_failures
+        self.request = request
+        self.async_request = async_request
+        self.request_kwargs = request_kwargs or {}
+        self.async_ = async_
+        self.handles: list[AlistTaskHandle] = []
+        self.polls = 0
+        self._lock = Lock()
+        self._worker: Any = None
+        self._loop: None | AbstractEventLoop = None
+        self._stop = Event()
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(category={self.category!r}, pending={len(self.handles)}, polls={self.polls}, async_={self.async_!r})"
+
+    def __len__(self, /) -> int:
+        return len(self.handles)
+
+    def track(self, task: dict, /) -> AlistTaskHandle:
+        """跟踪一个任务，返回其句柄
+
+        :param task: 任务信息（例如 ``fs_copy`` 响应中 "tasks" 里的项），至少要有 "id" 或 "name"
+
+        :return: 任务句柄
+        """
+        if not (task.get("id") or task.get("name")):
+            raise ValueError(f"task requires an id or a name: {task!r}")
+        if self.async_:
+            loop = get_running_loop()
+            if self._loop is not loop:
+                # NOTE: 之前的事件循环中的任务，不能在新的事件循环中解决
+                self._loop = loop
+                self._worker = None
+                self.handles.clear()
+            handle = AlistTaskHandle(self, task, loop.create_future())
+            self.handles.append(handle)
+            if self._worker is None or self._worker.done():
+                self._worker = loop.create_task(self._async_run())
+        else:
+            handle = AlistTaskHandle(self, task, Future())
+            with self._lock:
+                self.handles.append(handle)
+                if self._worker is None:
+                    stop = self._stop = Event()
+                    self._worker = Thread(target=self._run, args=(stop,), daemon=True)
+                    self._worker.start()
+        return handle
+
+    def completed(self, task: dict, /) -> AlistTaskHandle:
+        "创建一个已经成功结束的句柄（例如服务器直接完成了复制，没有创建任务）"
+        if self.async_:
+            future: Future | AsyncFuture = get_running_loop().create_future()
+        else:
+            future = Future()
+        future.set_result(task)
+        return AlistTaskHandle(self, task, future)
+
+    def fetch(
+        self, 
+        /, 
+        async_: Literal[False, True] = False, 
+    ) -> tuple[list[dict], list[dict]] | Coroutine[Any, Any, tuple[list[dict], list[dict]]]:
+        "获取未完成和已完成的任务列表（先获取未完成的，这样在两次请求之间结束的任务也会出现在已完成列表中）"
+        def gen_step():
+            client, category = self.client, self.category
+            request = self.async_request if async_ else self.request
+            undone = yield client.task_undone(
+                category, 
+                request=request, 
+                async_=async_, 
+                **self.request_kwargs, 
+            )
+            done = yield client.task_done(
+                category, 
+                request=request, 
+                async_=async_, 
+                **self.request_kwargs, 
+            )
+            return check_response(undone)["data"] or [], check_response(done)["data"] or []
+        return run_gen_step(gen_step, async_=async_)
+
+    def _update(
+        self, 
+        handles: list[AlistTaskHandle], 
+        undone: list[dict], 
+        done: list[dict], 
+        /, 
+    ) -> tuple[bool, list[tuple[AlistTaskHandle, bool, Any]]]:
+        """根据一轮的罗列结果更新句柄，返回 (是否有变化, 需要解决的句柄)
+
+        需要解决的句柄表示为 ``(handle, 是否成功, 结果或异常)``
+        """
+        done_ids = {t["id"]: t for t in done}
+        done_names = {t["name"]: t for t in done}
+        undone_ids = {t["id"]: t for t in undone}
+        undone_names = {t["name"]: t for t in undone}
+        changed = False
+        settled: list[tuple[AlistTaskHandle, bool, Any]] = []
+        for handle in handles:
+            if handle.id:
+                tid = handle.id
+                task = done_ids.get(tid)
+                running = undone_ids.get(tid) if task is None else None
+            else:
+                name = handle.name
+                task = done_names.get(name)
+                running = undone_names.get(name) if task is None else None
+            if task is not None:
+                info = handle.info = {**handle.info, **task}
+                state = info.get("state")
+                if state == TASK_STATE_SUCCEEDED:
+                    settled.append((handle, True, info))
+                elif state == TASK_STATE_CANCELED:
+                    settled.append((handle, False, OSError(errno.ECANCELED, info)))
+                else:
+                    settled.append((handle, False, OSError(errno.EIO, info)))
+            elif running is not None:
+                handle.misses = 0
+                info = handle.info
+                if (info.get("state"), info.get("progress")) != (running.get("state"), running.get("progress")):
+                    changed = True
+                handle.info = {**info, **running}
+            else:
+                handle.misses += 1
+                if handle.misses >= self.max_misses:
+                    settled.append((handle, False, FileNotFoundError(
+                        errno.ENOENT, f"task not found: {handle.info!r}")))
+        return changed or bool(settled), settled
+
+    @staticmethod
+    def _settle(settled: list[tuple[AlistTaskHandle, bool, Any]], /):
+        for handle, ok, value in settled:
+            future = handle.future
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _next_interval(self, interval: float, changed: bool, /) -> float:
+        if changed:
+            return self.min_interval
+        return min(interval * self.backoff, self.max_interval)
+
+    def _run(self, stop: Event, /):
+        interval = self.min_interval
+        failures = 0
+        while not stop.wait(interval):
+            with self._lock:
+                handles = self.handles = [h for h in self.handles if not h.done()]
+                if not handles:
+                    self._worker = None
+                    return
+                handles = handles[:]
+            self.polls += 1
+            try:
+                undone, done = self.fetch()
+            except Exception as e:
+                failures += 1
+                if failures >= self.max_failures:
+                    self._settle([(h, False, e) for h in handles])
+                interval = self._next_interval(interval, False)
+                continue
+            failures = 0
+            changed, settled = self._update(handles, undone, done)
+            self._settle(settled)
+            interval = self._next_interval(interval, changed)
+
+    async def _async_run(self, /):
+        interval = self.min_interval
+        failures = 0
+        while True:
+            await async_sleep(interval)
+            handles = self.handles = [h for h in self.handles if not h.done()]
+            if not handles:
+                return
+            handles = handles[:]
+            self.polls += 1
+            try:
+                undone, done = await self.fetch(async_=True)
+            except Exception as e:
+                failures += 1
+                if failures >= self.max_failures:
+                    self._settle([(h, False, e) for h in handles])
+                interval = self._next_interval(interval, False)
+                continue
+            failures = 0
+            changed, settled = self._update(handles, undone, done)
+            self._settle(settled)
+            interval = self._next_interval(interval, changed)
+
+    def close(self, /):
+        "停止轮询，尚未结束的句柄会被取消"
+        if self.async_:
+            worker = self._worker
+            if worker is not None:
+                worker.cancel()
+            self._worker = None
+            handles, self.handles = self.handles, []
+        else:
+            self._stop.set()
+            with self._lock:
+                self._worker = None
+                handles, self.handles = self.handles, []
+        for handle in handles:
+            handle.future.cancel()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+from __future__ import annotations
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["AlistMetaCache"]
+
+import sqlite3
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from os import PathLike
+from posixpath import basename, dirname
+from threading import RLock
+from time import time
+from typing import Any
+
+from orjson import dumps, loads
+
+
+def _subpath_range(path: str, /) -> tuple[str, str]:
+    "所有后代路径都位于左闭右开区间 [path + '/', path + '0') 内（'0' 紧跟在 '/' 之后）"
+    if path == "/":
+        return "/", "0"
+    return path + "/", path + "0"
+
+
+def _without_password(attr: dict, /) -> dict:
+    "去掉目录的密码（不把明文的密码写入数据库）"
+    if "password" in attr:
+        attr = dict(attr)
+        del attr["password"]
+    return attr
+
+
+def _is_subpath(path: str, top: str, /) -> bool:
+    return top == "/" or path.startswith(top + "/")
+
+
+class AlistMetaCache:
+    """AList 文件系统的元数据缓存，缓存路径的属性和目录的罗列结果
+
+    - 内存中采用 TTL + LRU 淘汰策略，属性和目录各自最多保留 ``maxsize`` 项
+    - 如果指定了 ``dbfile``，则会同时写入 SQLite 数据库，内存未命中时再去数据库查找，可以跨进程或重启后复用
+    - ``raw_url`` 是会过期的签名链接，不予缓存；目录的密码 ``password`` 只留在内存中，不写入数据库
+    - 已缓存的目录罗列结果，也可以直接回答其中子项的属性查询
+    - ``ttl <= 0`` 表示永不过期
+
+    :param maxsize: 内存中最多缓存的属性（和目录）条数，<= 0 时不限
+    :param ttl: 缓存的存活时间（秒）
+    :param dbfile: SQLite 数据库文件路径，为 None 时仅使用内存
+    """
+    def __init__(
+        self, 
+        /, 
+        maxsize: int = 65536, 
+        ttl: float = 60, 
+        dbfile: None | str | PathLike = None, 
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.attrs: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.dirs: OrderedDict[str, tuple[float, dict[str, dict]]] = OrderedDict()
+        self.hits: dict[str, int] = {"attr": 0, "list": 0}
+        self.misses: dict[str, int] = {"attr": 0, "list": 0}
+        self._lock = RLock()
+        self.con: None | sqlite3.Connection = None
+        if dbfile is not None:
+            con = self.con = sqlite3.connect(dbfile, check_same_thread=False, isolation_level=None)
+            con.executescript("""\
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS attr (
+    path TEXT PRIMARY KEY, 
+    expire REAL NOT NULL, 
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS list (
+    path TEXT PRIMARY KEY, 
+    expire REAL NOT NULL, 
+    data BLOB NOT NULL
+);""")
+
+    def __del__(self, /):
+        self.close()
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(maxsize={self.maxsize!r}, ttl={self.ttl!r}, attrs={len(self.attrs)}, dirs={len(self.dirs)})"
+
+    def _expire(self, /) -> float:
+        ttl = self.ttl
+        return time() + ttl if ttl > 0 else float("inf")
+
+    def _shrink(self, cache: OrderedDict, /):
+        maxsize = self.maxsize
+        if maxsize > 0:
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+
+    def _db_get(self, table: str, path: str, /) -> Any:
+        con = self.con
+        if con is None:
+            return None
+        row = con.execute(f"SELECT expire, data FROM {table} WHERE path=?", (path,)).fetchone()
+        if row is None:
+            return None
+        expire, data = row
+        if expire < time():
+            con.execute(f"DELETE FROM {table} WHERE path=?", (path,))
+            return None
+        return expire, loads(data)
+
+    def _db_set(self, table: str, path: str, expire: float, data: Any, /):
+        if self.con is not None:
+            if table == "attr":
+                data = _without_password(data)
+            else:
+                data = [_without_password(attr) for attr in data]
+            self.con.execute(
+                f"INSERT OR REPLACE INTO {table}(path, expire, data) VALUES (?, ?, ?)", 
+                (path, min(expire, 1e18), dumps(data)), 
+            )
+
+    def _db_delete(self, table: str, path: str, /, recursive: bool = False):
+        con = self.con
+        if con is None:
+            return
+        if recursive:
+            start, stop = _subpath_range(path)
+            con.execute(f"DELETE FROM {table} WHERE path=? OR (path>=? AND path<?)", (path, start, stop))
+        else:
+            con.execute(f"DELETE FROM {table} WHERE path=?", (path,))
+
+    def _get_dir(self, path: str, /) -> None | dict[str, dict]:
+        dirs = self.dirs
+        try:
+            expire, children = dirs[path]
+        except KeyError:
+            if (row := self._db_get("list", path)) is None:
+                return None
+            expire, data = row
+            children = {attr["name"]: attr for attr in data}
+            dirs[path] = (expire, children)
+            self._shrink(dirs)
+            return children
+        if expire < time():
+            del dirs[path]
+            self._db_delete("list", path)
+            return None
+        dirs.move_to_end(path)
+        return children
+
+    def _put_dir(self, path: str, expire: float, children: dict[str, dict], /):
+        dirs = self.dirs
+        dirs[path] = (expire, children)
+        dirs.move_to_end(path)
+        self._shrink(dirs)
+        self._db_set("list", path, expire, list(children.values()))
+
+    def _get_attr(self, path: str, /) -> None | dict:
+        attrs = self.attrs
+        try:
+            expire, attr = attrs[path]
+        except KeyError:
+            if (row := self._db_get("attr", path)) is not None:
+                attrs[path] = row
+                self._shrink(attrs)
+                return row[1]
+        else:
+            if expire >= time():
+                attrs.move_to_end(path)
+                return attr
+            del attrs[path]
+            self._db_delete("attr", path)
+        if path != "/":
+            children = self._get_dir(dirname(path))
+            if children is not None:
+                return children.get(basename(path))
+        return None
+
+    def get_attr(self, path: str, /) -> None | dict:
+        "获取路径的属性（先查属性缓存，再查父目录的罗列缓存），未命中时返回 None"
+        with self._lock:
+            attr = self._get_attr(path)
+            if attr is None:
+                self.misses["attr"] += 1
+                return None
+            self.hits["attr"] += 1
+            return dict(attr)
+
+    def set_attr(self, path: str, attr: Mapping, /):
+        "缓存路径的属性（``raw_url`` 是会过期的签名链接，不予缓存）"
+        attr = dict(attr)
+        attr.pop("raw_url", None)
+        attr["path"] = path
+        with self._lock:
+            expire = self._expire()
+            attrs = self.attrs
+            attrs[path] = (expire, attr)
+            attrs.move_to_end(path)
+            self._shrink(attrs)
+            self._db_set("attr", path, expire, attr)
+            if path != "/":
+                dir_ = dirname(path)
+                children = self._get_dir(dir_)
+                if children is not None:
+                    children[attr["name"]] = attr
+                    self._db_set("list", dir_, self.dirs[dir_][0], list(children.values()))
+
+    def get_list(self, path: str, /) -> None | list[dict]:
+        "获取目录的罗列结果，未命中时返回 None"
+        with self._lock:
+            children = self._get_dir(path)
+            if children is None:
+                self.misses["list"] += 1
+                return None
+            self.hits["list"] += 1
+            return [dict(attr) for attr in children.values()]
+
+    def set_list(self, path: str, data: Iterable[Mapping], /):
+        "缓存目录的完整罗列结果"
+        children: dict[str, dict] = {}
+        for attr in data:
+            attr = children[attr["name"]] = dict(attr)
+            attr.pop("raw_url", None)
+        with self._lock:
+            self._put_dir(path, self._expire(), children)
+
+    def discard(self, path: str, /, recursive: bool = True):
+        """移除路径的缓存，并从父目录的罗列缓存中就地删去此项
+
+        :param path: 路径
+        :param recursive: 是否同时移除所有后代路径的缓存
+        """
+        with self._lock:
+            attrs, dirs = self.attrs, self.dirs
+            attrs.pop(path, None)
+            dirs.pop(path, None)
+            self._db_delete("attr", path, recursive)
+            self._db_delete("list", path, recursive)
+            if recursive:
+                for cache in (attrs, dirs):
+                    for key in [k for k in cache if _is_subpath(k, path)]:
+                        del cache[key]
+            if path != "/":
+                dir_ = dirname(path)
+                children = self._get_dir(dir_)
+                if children is not None and children.pop(basename(path), None) is not None:
+                    self._db_set("list", dir_, dirs[dir_][0], list(children.values()))
+
+    def invalidate_dir(self, path: str, /):
+        "使目录的罗列缓存失效（目录中新增了未知属性的项时使用）"
+        with self._lock:
+            self.dirs.pop(path, None)
+            self._db_delete("list", path)
+
+    def invalidate(self, path: str, /):
+        "使目录的罗列缓存及其所有后代的缓存失效，但保留目录自身的属性"
+        with self._lock:
+            attrs, dirs = self.attrs, self.dirs
+            dirs.pop(path, None)
+            self._db_delete("list", path, True)
+            if (con := self.con) is not None:
+                con.execute("DELETE FROM attr WHERE path>=? AND path<?", _subpath_range(path))
+            for cache in (attrs, dirs):
+                for key in [k for k in cache if k != path and _is_subpath(k, path)]:
+                    del cache[key]
+
+    def touch(self, path: str, /):
+        """路径上新出现了一个（属性未知的）项，其中间的祖先目录也可能是刚被创建的
+
+        会移除路径的缓存，并使父目录的罗列缓存失效，如果父目录也不在缓存中，则继续向上
+        """
+        with self._lock:
+            self.discard(path)
+            while path != "/":
+                path = dirname(path)
+                self.invalidate_dir(path)
+                if self._get_attr(path) is not None:
+                    break
+
+    def rename(self, src_path: str, dst_path: str, /):
+        """路径被改名或移动后，就地修补缓存
+
+        源路径的属性会被转移到目标路径下（如果目标目录的罗列已缓存，则加入其中），
+        如果是目录，由于后代的路径都发生了改变，所以丢弃其后代的缓存
+        """
+        if src_path == dst_path:
+            return
+        with self._lock:
+            attr = self._get_attr(src_path)
+            if attr is not None:
+                attr = dict(attr)
+            self.discard(src_path)
+            self.discard(dst_path)
+            if attr is None:
+                self.invalidate_dir(dirname(dst_path))
+            else:
+                attr["name"] = basename(dst_path)
+                self.set_attr(dst_path, attr)
+
+    def rename_many(self, dir_: str, pairs: Iterable[tuple[str, str]], /):
+        """同一目录中的一批项被改名后，就地修补缓存
+
+        效果与对每一对调用 ``rename()`` 相同，但父目录的罗列只会被改写一次，
+        后代的缓存只会被扫描一次，而且对数据库的修改在同一个事务中完成
+
+        :param dir_: 所在目录
+        :param pairs: (原名, 新名) 的序列
+        """
+        pairs = [(src, dst) for src, dst in pairs if src != dst]
+        if not pairs:
+            return
+        prefix = dir_.rstrip("/") + "/"
+        names = {name for pair in pairs for name in pair}
+        with self._lock:
+            attrs, dirs = self.attrs, self.dirs
+            con = self.con
+            if con is not None:
+                con.execute("BEGIN")
+            try:
+                children = self._get_dir(dir_)
+                moved: list[tuple[str, None | dict]] = []
+                for src_name, new_name in pairs:
+                    src_path = prefix + src_name
+                    try:
+                        attr: None | dict = dict(attrs[src_path][1])
+                    except KeyError:
+                        attr = None if children is None else children.get(src_name)
+                        if attr is not None:
+                            attr = dict(attr)
+                    moved.append((new_name, attr))
+                for cache in (attrs, dirs):
+                    for key in [k for k in cache if k.startswith(prefix) and k[len(prefix):].partition("/")[0] in names]:
+                        del cache[key]
+                for name in names:
+                    self._db_delete("attr", prefix + name, True)
+                    self._db_delete("list", prefix + name, True)
+                if children is not None:
+                    for name in names:
+                        children.pop(name, None)
+                expire = self._expire()
+                complete = True
+                for new_name, attr in moved:
+                    if attr is None:
+                        complete = False
+                        continue
+                    dst_path = prefix + new_name
+                    attr["name"] = new_name
+                    attr["path"] = dst_path
+                    attrs[dst_path] = (expire, attr)
+                    self._db_set("attr", dst_path, expire, attr)
+                    if children is not None:
+                        children[new_name] = attr
+                self._shrink(attrs)
+                if children is not None:
+                    if complete:
+                        self._db_set("list", dir_, dirs[dir_][0], list(children.values()))
+                    else:
+                        self.invalidate_dir(dir_)
+            except BaseException:
+                if con is not None:
+                    con.execute("ROLLBACK")
+                raise
+            else:
+                if con is not None:
+                    con.execute("COMMIT")
+
+    def clear(self, /):
+        "清空所有缓存"
+        with self._lock:
+            self.attrs.clear()
+            self.dirs.clear()
+            if self.con is not None:
+                self.con.execute("DELETE FROM attr")
+                self.con.execute("DELETE FROM list")
+
+    def close(self, /):
+        con = self.__dict__.get("con")
+        if con is not None:
+            self.con = None
+            con.close()
+
+    def stats(self, /) -> dict:
+        "缓存的命中统计"
+        hits, misses = self.hits, self.misses
+        def rate(hit: int, miss: int) -> float:
+            total = hit + miss
+            return hit / total if total else 0.0
+        hit, miss = sum(hits.values()), sum(misses.values())
+        return {
+            "attrs": len(self.attrs), 
+            "dirs": len(self.dirs), 
+            "hits": dict(hits), 
+            "misses": dict(misses), 
+            "hit_rate": rate(hit, miss), 
+            "attr_hit_rate": rate(hits["attr"], misses["attr"]), 
+            "list_hit_rate": rate(hits["list"], misses["list"]), 
+        }
+
+    def reset_stats(self, /):
+        for key in self.hits:
+            self.hits[key] = self.misses[key] = 0
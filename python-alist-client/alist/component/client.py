@@ -19,15 +19,13 @@ from hmac import new as hmac_new
 from http.cookiejar import CookieJar
 from inspect import iscoroutinefunction
 from os import fsdecode, fstat, PathLike
+from stat import S_ISREG
 from typing import cast, overload, Any, Literal, Self
 from urllib.parse import quote
 
-from asynctools import ensure_aiter, to_list
+from asynctools import ensure_aiter
 from ed2k import ed2k_hash, ed2k_hash_async
-from filewrap import (
-    bio_chunk_iter, bio_chunk_async_iter, 
-    Buffer, SupportsRead, 
-)
+from filewrap import Buffer, SupportsRead
 from httpfile import HTTPFileReader
 from http_request import complete_url, encode_multipart_data, encode_multipart_data_async, SupportsGeturl
 from http_response import get_total_length, get_content_length, is_chunked
@@ -35,6 +33,11 @@ from iterutils import run_gen_step
 from property import locked_cacheproperty
 from yarl import URL
 
+from .upload import (
+    make_hashers, make_hash_headers, hash_iter, hash_async_iter, 
+    read_chunk_iter, read_chunk_async_iter, UPLOAD_CHUNKSIZE, 
+)
+
 
 # 默认的请求函数
 _httpx_request = None
@@ -2177,6 +2180,8 @@ class AlistClient:
         path: str, 
         as_task: bool = False, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
+        chunksize: int = UPLOAD_CHUNKSIZE, 
         async_: Literal[False] = False, 
         **request_kwargs, 
     ) -> dict:
@@ -2190,6 +2195,8 @@ class AlistClient:
         path: str, 
         as_task: bool = False, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
+        chunksize: int = UPLOAD_CHUNKSIZE, 
         async_: Literal[True], 
         **request_kwargs, 
     ) -> Coroutine[Any, Any, dict]:
@@ -2202,6 +2209,8 @@ class AlistClient:
         path: str, 
         as_task: bool = False, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
+        chunksize: int = UPLOAD_CHUNKSIZE, 
         async_: Literal[False, True] = False, 
         **request_kwargs, 
     ) -> dict | Coroutine[Any, Any, dict]:
@@ -2216,39 +2225,54 @@ class AlistClient:
             1. 上传文件成功不会自动更新缓存（但新增文件夹会更新缓存）
             2. 上传时路径中包含斜杠 \\，视为路径分隔符 /
             3. 这个接口不需要预先确定上传的字节数，可以真正实现流式上传
+
+        .. note::
+            文件（或路径）会按 ``chunksize`` 分块读取（优先用 ``readinto`` 读入复用的缓冲区），并在后台预读，
+            异步可迭代对象会逐块发送，都不会事先读入内存
+
+        :param file: 待上传的文件、路径、链接、数据或数据块的迭代器
+        :param path: 上传到的路径
+        :param as_task: 是否作为任务
+        :param hashes: 如果是 {算法名: 十六进制摘要}，则作为请求头告知服务器（支持 md5、sha1、sha256）；
+            否则是需要在上传的同时计算的哈希算法名，结果会放在响应的 "hashes" 字段中
+        :param chunksize: 读取文件时每块的字节数
+        :param async_: 是否异步
+        :param request_kwargs: 其它请求参数
+
+        :return: 接口响应
         """
         def gen_step():
             nonlocal file
+            if headers := request_kwargs.get("headers"):
+                headers = {**headers, "File-Path": quote(path)}
+            else:
+                headers = {"File-Path": quote(path)}
+            request_kwargs["headers"] = headers
+            if as_task:
+                headers["As-Task"] = "true"
+            if isinstance(hashes, Mapping):
+                headers.update(make_hash_headers(hashes))
+                hashers = {}
+            else:
+                hashers = make_hashers(hashes)
+            opened = None
             if hasattr(file, "getbuffer"):
                 try:
                     file = getattr(file, "getbuffer")()
                 except TypeError:
                     pass
             if isinstance(file, Buffer):
-                pass
+                for h in hashers.values():
+                    h.update(file)
             elif isinstance(file, SupportsRead):
                 if not async_ and iscoroutinefunction(file.read):
                     raise TypeError(f"{file!r} with async read in non-async mode")
             elif isinstance(file, (str, PathLike)):
                 filepath = fsdecode(file)
                 if async_:
-                    try:
-                        from aiofile import async_open
-                    except ImportError:
-                        file = yield to_thread(open, filepath, "rb")
-                    else:
-                        async def request():
-                            async with async_open(filepath, "rb") as file:
-                                return await self.fs_form(
-                                    file=file, # type: ignore
-                                    path=path, 
-                                    as_task=as_task, 
-                                    async_=True, 
-                                    **request_kwargs, 
-                                )
-                        return (yield request)
+                    file = opened = yield partial(to_thread, open, filepath, "rb")
                 else:
-                    file = open(filepath, "rb")
+                    file = opened = open(filepath, "rb")
             elif isinstance(file, (URL, SupportsGeturl)):
                 if isinstance(file, URL):
                     url = str(file)
@@ -2262,20 +2286,24 @@ class AlistClient:
                             from httpx import AsyncClient
                             async with AsyncClient() as client:
                                 async with client.stream("GET", url) as resp:
-                                    return await self.fs_put(
+                                    return await self.fs_form(
                                         resp.aiter_bytes(), 
                                         path, 
                                         as_task=as_task, 
+                                        hashes=hashes, 
+                                        chunksize=chunksize, 
                                         async_=True, 
                                         **request_kwargs, 
                                     )
                     else:
                         async def request():
                             async with async_request("GET", url) as resp:
-                                return await self.fs_put(
+                                return await self.fs_form(
                                     resp.content, 
                                     path, 
                                     as_task=as_task, 
+                                    hashes=hashes, 
+                                    chunksize=chunksize, 
                                     async_=True, 
                                     **request_kwargs, 
                                 )
@@ -2284,36 +2312,45 @@ class AlistClient:
                     from urllib.request import urlopen
 
                     with urlopen(url) as resp:
-                        return self.fs_put(
+                        return self.fs_form(
                             resp, 
                             path, 
                             as_task=as_task, 
+                            hashes=hashes, 
+                            chunksize=chunksize, 
                             **request_kwargs, 
                         )
             elif async_:
-                file = ensure_aiter(file)
+                file = hash_async_iter(file, hashers) if hashers else ensure_aiter(file)
             elif isinstance(file, AsyncIterable):
                 raise TypeError(f"async iterable {file!r} in non-async mode")
+            elif hashers:
+                file = hash_iter(file, hashers)
 
-            if headers := request_kwargs.get("headers"):
-                headers = {**headers, "File-Path": quote(path)}
-            else:
-                headers = {"File-Path": quote(path)}
-            request_kwargs["headers"] = headers
-            if as_task:
-                headers["As-Task"] = "true"
+            if isinstance(file, SupportsRead):
+                if async_:
+                    file = read_chunk_async_iter(file, chunksize=chunksize, hashers=hashers)
+                else:
+                    file = read_chunk_iter(file, chunksize=chunksize, hashers=hashers)
             if async_:
                 update_headers, request_kwargs["data"] = encode_multipart_data_async({}, {"file": file}) # type: ignore
             else:
                 update_headers, request_kwargs["data"] = encode_multipart_data({}, {"file": file}) # type: ignore
             headers.update(update_headers)
-            return (yield partial(
-                self.request, 
-                "/api/fs/form", 
-                "PUT", 
-                async_=async_, 
-                **request_kwargs, 
-            ))
+            try:
+                resp = yield partial(
+                    self.request, 
+                    "/api/fs/form", 
+                    "PUT", 
+                    async_=async_, 
+                    **request_kwargs, 
+                )
+            finally:
+                if opened is not None:
+                    opened.close()
+            if hashers and isinstance(resp, dict):
+                resp["hashes"] = {name: h.hexdigest() for name, h in hashers.items()}
+            return resp
         return run_gen_step(gen_step, async_=async_)
 
     @overload
@@ -2326,6 +2363,8 @@ class AlistClient:
         as_task: bool = False, 
         filesize: int = -1, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
+        chunksize: int = UPLOAD_CHUNKSIZE, 
         async_: Literal[False] = False, 
         **request_kwargs, 
     ) -> dict:
@@ -2340,6 +2379,8 @@ class AlistClient:
         as_task: bool = False, 
         filesize: int = -1, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
+        chunksize: int = UPLOAD_CHUNKSIZE, 
         async_: Literal[True], 
         **request_kwargs, 
     ) -> Coroutine[Any, Any, dict]:
@@ -2353,6 +2394,8 @@ class AlistClient:
         as_task: bool = False, 
         filesize: int = -1, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
+        chunksize: int = UPLOAD_CHUNKSIZE, 
         async_: Literal[False, True] = False, 
         **request_kwargs, 
     ) -> dict | Coroutine[Any, Any, dict]:
@@ -2367,9 +2410,26 @@ class AlistClient:
             1. 上传文件成功不会自动更新缓存（但新增文件夹会更新缓存）
             2. 上传时路径中包含斜杠 \\，视为路径分隔符 /
             3. put 接口是流式上传，但是不支持 chunked（所以在上传前，就需要能直接确定总上传的字节数）
+
+        .. note::
+            如果无法不经读取就确定上传的字节数（例如没有 ``fileno`` 的文件、没有指定 ``filesize`` 的迭代器），
+            则改用 ``fs_form``，这样也不会事先把数据读入内存
+
+        :param file: 待上传的文件、路径、链接、数据或数据块的迭代器
+        :param path: 上传到的路径
+        :param as_task: 是否作为任务
+        :param filesize: 上传的字节数，< 0 时自动确定
+        :param hashes: 如果是 {算法名: 十六进制摘要}，则作为请求头告知服务器（支持 md5、sha1、sha256）；
+            否则是需要在上传的同时计算的哈希算法名，结果会放在响应的 "hashes" 字段中
+        :param chunksize: 读取文件时每块的字节数
+        :param async_: 是否异步
+        :param request_kwargs: 其它请求参数
+
+        :return: 接口响应
         """
         def gen_step():
             nonlocal file, filesize
+            opened = None
             if hasattr(file, "getbuffer"):
                 try:
                     file = getattr(file, "getbuffer")()
@@ -2384,37 +2444,19 @@ class AlistClient:
                 if not async_ and iscoroutinefunction(file.read):
                     raise TypeError(f"{file!r} with async read in non-async mode")
                 if filesize < 0:
+                    # NOTE: 只有普通文件的大小是可信的（例如 socket 的大小总是 0）
                     try:
-                        filesize = fstat(getattr(file, "fileno")()).st_size
+                        stat = fstat(getattr(file, "fileno")())
+                        if S_ISREG(stat.st_mode):
+                            filesize = stat.st_size
                     except Exception:
-                        file = cast(Buffer, (yield file.read))
-                        if not isinstance(file, Sized):
-                            file = memoryview(file)
-                        filesize = len(file)
+                        pass
             elif isinstance(file, (str, PathLike)):
                 filepath = fsdecode(file)
                 if async_:
-                    try:
-                        from aiofile import async_open
-                    except ImportError:
-                        file = yield partial(to_thread, open, filepath, "rb")
-                    else:
-                        async def request():
-                            nonlocal filesize
-                            async with async_open(filepath, "rb") as file:
-                                if filesize < 0:
-                                    filesize = fstat(file.file.fileno()).st_size
-                                return await self.fs_put(
-                                    file, # type: ignore
-                                    path, 
-                                    as_task=as_task, 
-                                    filesize=filesize, 
-                                    async_=True, 
-                                    **request_kwargs, 
-                                )
-                        return (yield request)
+                    file = opened = yield partial(to_thread, open, filepath, "rb")
                 else:
-                    file = open(filepath, "rb")
+                    file = opened = open(filepath, "rb")
                 if filesize < 0:
                     filesize = fstat(file.fileno()).st_size # type: ignore
             elif isinstance(file, (URL, SupportsGeturl)):
@@ -2427,39 +2469,51 @@ class AlistClient:
                         from aiohttp import request as async_request
                     except ImportError:
                         async def request():
-                            nonlocal file, filesize
                             from httpx import AsyncClient
                             async with AsyncClient() as client:
                                 async with client.stream("GET", url) as resp:
                                     size = filesize if filesize >= 0 else get_content_length(resp)
                                     if size is None or is_chunked(resp):
-                                        file = await resp.aread()
-                                        filesize = len(file)
-                                    else:
-                                        file = resp.aiter_bytes()
+                                        return await self.fs_form(
+                                            resp.aiter_bytes(), 
+                                            path, 
+                                            as_task=as_task, 
+                                            hashes=hashes, 
+                                            chunksize=chunksize, 
+                                            async_=True, 
+                                            **request_kwargs, 
+                                        )
                                     return await self.fs_put(
-                                        file, 
+                                        resp.aiter_bytes(), 
                                         path, 
                                         as_task=as_task, 
-                                        filesize=filesize, 
+                                        filesize=size, 
+                                        hashes=hashes, 
+                                        chunksize=chunksize, 
                                         async_=True, 
                                         **request_kwargs, 
                                     )
                     else:
                         async def request():
-                            nonlocal file, filesize
                             async with async_request("GET", url) as resp:
                                 size = filesize if filesize >= 0 else get_content_length(resp)
                                 if size is None or is_chunked(resp):
-                                    file = await resp.read()
-                                    filesize = len(file)
-                                else:
-                                    file = resp.content
+                                    return await self.fs_form(
+                                        resp.content, 
+                                        path, 
+                                        as_task=as_task, 
+                                        hashes=hashes, 
+                                        chunksize=chunksize, 
+                                        async_=True, 
+                                        **request_kwargs, 
+                                    )
                                 return await self.fs_put(
-                                    file, 
+                                    resp.content, 
                                     path, 
                                     as_task=as_task, 
-                                    filesize=filesize, 
+                                    filesize=size, 
+                                    hashes=hashes, 
+                                    chunksize=chunksize, 
                                     async_=True, 
                                     **request_kwargs, 
                                 )
@@ -2470,30 +2524,37 @@ class AlistClient:
                     with urlopen(url) as resp:
                         size = filesize if filesize >= 0 else get_content_length(resp)
                         if size is None or is_chunked(resp):
-                            file = cast(bytes, resp.read())
-                            filesize = len(file)
-                        else:
-                            file = resp
+                            return self.fs_form(
+                                resp, 
+                                path, 
+                                as_task=as_task, 
+                                hashes=hashes, 
+                                chunksize=chunksize, 
+                                **request_kwargs, 
+                            )
                         return self.fs_put(
-                            file, 
+                            resp, 
                             path, 
                             as_task=as_task, 
-                            filesize=filesize, 
+                            filesize=size, 
+                            hashes=hashes, 
+                            chunksize=chunksize, 
                             **request_kwargs, 
                         )
-            elif async_:
-                if filesize < 0:
-                    chunks = yield partial(to_list, file)
-                    filesize = sum(map(len, chunks))
-                    file = ensure_aiter(chunks)
-                else:
-                    file = ensure_aiter(file)
-            elif isinstance(file, AsyncIterable):
+            elif not async_ and isinstance(file, AsyncIterable):
                 raise TypeError(f"async iterable {file!r} in non-async mode")
-            elif filesize < 0:
-                chunks = list(file)
-                filesize = sum(map(len, chunks))
-                file = iter(chunks)
+            if filesize < 0:
+                # NOTE: put 接口需要事先确定字节数，改用支持 chunked 的表单接口，避免把数据读入内存
+                return (yield partial(
+                    self.fs_form, 
+                    file, 
+                    path, 
+                    as_task=as_task, 
+                    hashes=hashes, 
+                    chunksize=chunksize, 
+                    async_=async_, 
+                    **request_kwargs, 
+                ))
 
             if headers := request_kwargs.get("headers"):
                 headers = {**headers, "File-Path": quote(path)}
@@ -2503,21 +2564,40 @@ class AlistClient:
             if as_task:
                 headers["As-Task"] = "true"
             headers["Content-Length"] = str(filesize)
+            if isinstance(hashes, Mapping):
+                headers.update(make_hash_headers(hashes))
+                hashers = {}
+            else:
+                hashers = make_hashers(hashes)
 
-            if isinstance(file, SupportsRead):
+            if isinstance(file, Buffer):
+                for h in hashers.values():
+                    h.update(file)
+            elif isinstance(file, SupportsRead):
                 if async_:
-                    file = bio_chunk_async_iter(file)
+                    file = read_chunk_async_iter(file, filesize, chunksize, hashers=hashers)
                 else:
-                    file = bio_chunk_iter(file)
+                    file = read_chunk_iter(file, filesize, chunksize, hashers=hashers)
+            elif async_:
+                file = hash_async_iter(file, hashers) if hashers else ensure_aiter(file)
+            elif hashers:
+                file = hash_iter(file, hashers)
             request_kwargs["data"] = file
 
-            return (yield partial(
-                self.request, 
-                "/api/fs/put", 
-                "PUT", 
-                async_=async_, 
-                **request_kwargs, 
-            ))
+            try:
+                resp = yield partial(
+                    self.request, 
+                    "/api/fs/put", 
+                    "PUT", 
+                    async_=async_, 
+                    **request_kwargs, 
+                )
+            finally:
+                if opened is not None:
+                    opened.close()
+            if hashers and isinstance(resp, dict):
+                resp["hashes"] = {name: h.hexdigest() for name, h in hashers.items()}
+            return resp
         return run_gen_step(gen_step, async_=async_)
 
     # [public](https://docs.oplist.org/guide/api/public.html)
@@ -5695,6 +5775,10 @@ class AlistClient:
     def fs(self, /) -> AlistFileSystem:
         return AlistFileSystem(self)
 
+    @cached_property
+    def storage_index(self, /) -> AlistStorageIndex:
+        return AlistStorageIndex(self)
+
     @cached_property
     def upload_tasklist(self, /) -> AlistUploadTaskList:
         return AlistUploadTaskList(self)
@@ -5721,6 +5805,7 @@ class AlistClient:
 
 
 from .fs import AlistFileSystem
+from .storage import AlistStorageIndex
 from .admin.task import (
     AlistCopyTaskList, AlistOfflineDownloadTaskList, 
     AlistOfflineDownloadTransferTaskList, AlistUploadTaskList, 
@@ -8,23 +8,25 @@ __all__ = ["AttrDict", "PathType", "AlistPath", "AlistFileSystem"]
 
 import errno
 
+from asyncio import wait as async_wait, wrap_future
 from collections import deque
 from collections.abc import (
     AsyncIterable, AsyncIterator, Callable, Coroutine, ItemsView, 
     Iterable, Iterator, KeysView, Mapping, ValuesView, 
 )
+from concurrent.futures import wait as wait_futures, Future
 from datetime import datetime
 from functools import cached_property, partial
 from io import BytesIO, TextIOWrapper
 from itertools import chain, pairwise
 from mimetypes import guess_type
 from os import (
-    fsdecode, fspath, lstat, makedirs, remove, scandir, stat_result, 
-    path as ospath, DirEntry, PathLike, 
+    fsdecode, fspath, lstat, makedirs, remove, scandir, stat as os_stat, stat_result, 
+    utime, walk as os_walk, path as ospath, DirEntry, PathLike, 
 )
 from pathlib import Path
 from posixpath import basename, commonpath, dirname, join as joinpath, normpath, relpath, split as splitpath, splitext
-from re import compile as re_compile, escape as re_escape
+from re import compile as re_compile, error as re_error, escape as re_escape, S
 from shutil import SameFileError, COPY_BUFSIZE # type: ignore
 from stat import S_IFDIR, S_IFREG
 from typing import cast, overload, Any, IO, Literal, Never, Optional, Self, TypeAlias
@@ -40,14 +42,25 @@ from filewrap import Buffer, SupportsRead, SupportsWrite
 from glob_pattern import translate_iter
 from httpfile import HTTPFileReader
 from http_request import SupportsGeturl
-from iterutils import run_gen_step, run_gen_step_iter, Yield, YieldFrom
+from iterutils import run_gen_step, run_gen_step_iter, Return, Yield, YieldFrom
 from yarl import URL
 
+from .admin.poller import AlistTaskHandle, AlistTaskPoller
+from .cache import AlistMetaCache
 from .client import check_response, AlistClient
+from .lister import ConcurrentLister
+from .transfer import TransferEngine
 
 
 PathType: TypeAlias = str | PathLike[str] | AttrDict
 
+CRE_GLOB_WILDCARD_split = re_compile(r"\[[^]]*\]|[*?]").split
+
+#: Python 与 Go（RE2）语义不同、或者 RE2 不支持的正则语法：环视、反向引用、\Z、固化分组
+CRE_NOT_RE2_search = re_compile(r"\\[1-9Z]|\(\?(?:[=!>]|<[=!]|P=)").search
+#: 在 Python 中匹配 Unicode、在 Go 中只匹配 ASCII 的字符类
+CRE_CHARCLASS_search = re_compile(r"\\[dDwWsSbB]").search
+CRE_TEMPLATE_sub = re_compile(r"\\(?:g<(\w+)>|(\d{1,2})|(.))|\$", flags=S).sub
 
 class method:
 
@@ -74,6 +87,106 @@ def parse_as_timestamp(s: None | str = None, /) -> float:
         return 0.0
 
 
+def normalize_list_content(data: list[dict], dir_: str, /, password: str = "") -> list[AttrDict]:
+    "把 ``fs_list`` 响应中的 ``content`` 就地整理成属性字典"
+    for i, attr in enumerate(data):
+        attr["ctime"] = parse_as_timestamp(attr.get("created"))
+        attr["mtime"] = parse_as_timestamp(attr.get("modified"))
+        attr["path"] = joinpath(dir_, attr["name"])
+        attr["password"] = password
+        data[i] = AttrDict(attr)
+    return data
+
+
+def _glob_search_plan(
+    pattern: str, 
+    /, 
+    ignore_case: bool = False, 
+) -> None | tuple[list[str], str, str]:
+    """为 glob 制定搜索计划，如果不能用搜索接口来表达，则返回 None
+
+    :return: 3 元组 (固定前缀的各部分, 用于验证的正则表达式（相对于前缀目录）, 搜索关键词)
+    """
+    splitted_pats = tuple(translate_iter(pattern))
+    if not splitted_pats:
+        return None
+    i = 0
+    prefix: list[str] = []
+    # NOTE: 忽略大小写时，固定前缀也需要模糊匹配，所以不能直接定位目录
+    if not ignore_case:
+        for i, (_, typ, orig) in enumerate(splitted_pats):
+            if typ != "orig":
+                break
+            prefix.append(orig)
+        else:
+            return None
+    rest = splitted_pats[i:]
+    # NOTE: 只有递归匹配（**）时，搜索才比罗列目录更快
+    if not any(typ == "dstar" for _, typ, _ in rest):
+        return None
+    _, typ, orig = rest[-1]
+    if typ == "orig":
+        keywords = orig
+    elif typ == "pat":
+        part = pattern.rstrip("/").rpartition("/")[-1]
+        keywords = max(CRE_GLOB_WILDCARD_split(part), key=len).strip(" .")
+        if len(keywords) < 2:
+            return None
+    else:
+        return None
+    # NOTE: 有的数据库（例如 PostgreSQL）的搜索区分大小写，忽略大小写时，只用不含字母的关键词
+    if ignore_case and keywords.lower() != keywords.upper():
+        return None
+    regex = "".join(
+        "(?:/%s)?" % pat if typ == "dstar" else "/" + pat 
+        for pat, typ, _ in rest
+    )
+    if ignore_case:
+        regex = "(?i:%s)" % regex
+    return prefix, regex, keywords
+
+
+
+
+def _go_regex_rename(
+    pattern: str, 
+    repl: str, 
+    /, 
+) -> None | tuple[str, str]:
+    """把 Python 风格的改名规则 ``(pattern, repl)`` 转换成 ``fs_regex_rename`` 所用的 Go 风格，不能转换时返回 None
+
+    AList 会对目录中每个（可以搜索到 ``pattern`` 的）名字执行 Go 的 ``ReplaceAllString``，
+    这与 ``re.sub(pattern, repl, name)`` 一致，除了空匹配和上面列出的语法
+    """
+    if CRE_NOT_RE2_search(pattern):
+        return None
+    try:
+        if re_compile(pattern).search("") is not None:
+            return None
+    except re_error:
+        return None
+    escapes = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v", "a": "\a", "b": "\b"}
+    failed = False
+    def replace(m, /) -> str:
+        nonlocal failed
+        group, index, char = m.groups()
+        if group is not None:
+            return "${%s}" % group
+        if index is not None:
+            return "${%s}" % index
+        if char is not None:
+            if char in escapes:
+                return escapes[char]
+            if char.isascii() and char.isalpha():
+                failed = True
+            return char.replace("$", "$$")
+        return "$$"
+    go_repl = CRE_TEMPLATE_sub(replace, repl)
+    if failed:
+        return None
+    return pattern, go_repl
+
+
 class AlistPath(Mapping, PathLike[str]):
     "AList path information."
     fs: AlistFileSystem
@@ -122,7 +235,7 @@ class AlistPath(Mapping, PathLike[str]):
     ) -> Self | Coroutine[Any, Any, Self]:
         def gen_step():
             yield self.get_attr(async_=async_, **kwargs)
-            return self
+            return Return(self, may_call=False)
         return run_gen_step(gen_step, async_=async_)
 
     def __contains__(self, key, /) -> bool:
@@ -866,7 +979,7 @@ class AlistPath(Mapping, PathLike[str]):
 
     @property
     def raw_url(self, /) -> str:
-        return self["raw_url"]
+        return self.get_raw_url()
 
     @overload
     def read_bytes(
@@ -1582,6 +1695,7 @@ class AlistFileSystem:
     request_kwargs: dict
     request: None | Callable
     async_request: None | Callable
+    cache: None | AlistMetaCache
 
     def __init__(
         self, 
@@ -1592,6 +1706,7 @@ class AlistFileSystem:
         request_kwargs: Optional[dict] = None, 
         request: None | Callable = None, 
         async_request: None | Callable = None, 
+        cache: None | bool | AlistMetaCache = None, 
     ):
         if path in ("", "/", ".", ".."):
             path = "/"
@@ -1599,6 +1714,10 @@ class AlistFileSystem:
             path = "/" + normpath("/" + fspath(path)).lstrip("/")
         if request_kwargs is None:
             request_kwargs = {}
+        if cache is True:
+            cache = AlistMetaCache()
+        elif not cache:
+            cache = None
         self.__dict__.update(
             client=client, 
             path=path, 
@@ -1606,6 +1725,7 @@ class AlistFileSystem:
             request_kwargs=request_kwargs, 
             request=request, 
             async_request=async_request, 
+            cache=cache, 
         )
 
     def __contains__(self, path: PathType, /) -> bool:
@@ -1646,6 +1766,14 @@ class AlistFileSystem:
             self.__dict__["refresh"] = bool(val)
         elif attr == "token":
             self.__dict__["token"] = str(val)
+        elif attr == "cache":
+            if val is True:
+                val = AlistMetaCache()
+            elif not val:
+                val = None
+            elif not isinstance(val, AlistMetaCache):
+                raise TypeError(f"expected AlistMetaCache, got {type(val)!r}")
+            self.__dict__["cache"] = val
         else:
             raise TypeError(f"can't set attribute: {attr!r}")
 
@@ -1792,15 +1920,21 @@ class AlistFileSystem:
                 "new_name": new_name, 
             } for src_name, new_name in rename_pairs]
         }
-        return check_response(
-            self.client.fs_batch_rename( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_batch_rename( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            if (cache := self.cache) is not None:
+                cache.rename_many(src_dir, (
+                    (obj["src_name"], obj["new_name"]) for obj in payload["rename_objects"]))
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_copy(
@@ -1842,15 +1976,21 @@ class AlistFileSystem:
         else:
             dst_dir = self.abspath(dst_dir)
         payload = {"src_dir": src_dir, "dst_dir": dst_dir, "names": names}
-        return check_response(
-            self.client.fs_copy( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_copy( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            if (cache := self.cache) is not None:
+                for name in names:
+                    cache.touch(joinpath(dst_dir, name))
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_dirs(
@@ -1916,6 +2056,7 @@ class AlistFileSystem:
         path: PathType, 
         as_task: bool = False, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
         async_: Literal[False] = False, 
     ) -> dict:
         ...
@@ -1928,6 +2069,7 @@ class AlistFileSystem:
         path: PathType, 
         as_task: bool = False, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
         async_: Literal[True], 
     ) -> Coroutine[Any, Any, dict]:
         ...
@@ -1939,23 +2081,30 @@ class AlistFileSystem:
         path: PathType, 
         as_task: bool = False, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
         async_: Literal[False, True] = False, 
     ) -> dict | Coroutine[Any, Any, dict]:
         if isinstance(path, (AttrDict, AlistPath)):
             path = cast(str, path["path"])
         else:
             path = self.abspath(path)
-        return check_response(
-            self.client.fs_form(
-                file, # type: ignore
-                path, 
-                as_task=as_task, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, # type: ignore
-                **self.request_kwargs, 
-            ), 
-            path=path, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_form(
+                    file, # type: ignore
+                    path, 
+                    as_task=as_task, 
+                    hashes=hashes, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, # type: ignore
+                    **self.request_kwargs, 
+                ), 
+                path=path, 
+            )
+            if (cache := self.cache) is not None:
+                cache.touch(path)
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_get(
@@ -2106,15 +2255,20 @@ class AlistFileSystem:
         payload = {"path": path}
         if path == "/":
             return {"code": 200, "payload": payload}
-        return check_response(
-            self.client.fs_mkdir( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_mkdir( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            if (cache := self.cache) is not None:
+                cache.touch(path)
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_move(
@@ -2160,15 +2314,21 @@ class AlistFileSystem:
         if src_dir == dst_dir:
             return {"code": 200}
         payload = {"src_dir": src_dir, "dst_dir": dst_dir, "names": names}
-        return check_response(
-            self.client.fs_move( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_move( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            if (cache := self.cache) is not None:
+                for name in names:
+                    cache.rename(joinpath(src_dir, name), joinpath(dst_dir, name))
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_put(
@@ -2180,6 +2340,7 @@ class AlistFileSystem:
         as_task: bool = False, 
         filesize: int = -1, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
         async_: Literal[False] = False, 
     ) -> dict:
         ...
@@ -2193,6 +2354,7 @@ class AlistFileSystem:
         as_task: bool = False, 
         filesize: int = -1, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
         async_: Literal[True], 
     ) -> Coroutine[Any, Any, dict]:
         ...
@@ -2205,24 +2367,31 @@ class AlistFileSystem:
         as_task: bool = False, 
         filesize: int = -1, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
         async_: Literal[False, True] = False, 
     ) -> dict | Coroutine[Any, Any, dict]:
         if isinstance(path, (AttrDict, AlistPath)):
             path = cast(str, path["path"])
         else:
             path = self.abspath(path)
-        return check_response(
-            self.client.fs_put(
-                file, # type: ignore
-                path, 
-                as_task=as_task, 
-                filesize=filesize, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, # type: ignore
-                **self.request_kwargs, 
-            ), 
-            path=path, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_put(
+                    file, # type: ignore
+                    path, 
+                    as_task=as_task, 
+                    filesize=filesize, 
+                    hashes=hashes, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, # type: ignore
+                    **self.request_kwargs, 
+                ), 
+                path=path, 
+            )
+            if (cache := self.cache) is not None:
+                cache.touch(path)
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_recursive_move(
@@ -2261,15 +2430,21 @@ class AlistFileSystem:
         else:
             dst_dir = self.abspath(dst_dir)
         payload = {"src_dir": src_dir, "dst_dir": dst_dir}
-        return check_response(
-            self.client.fs_recursive_move( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_recursive_move( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            if (cache := self.cache) is not None:
+                cache.invalidate(src_dir)
+                cache.invalidate(dst_dir)
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_regex_rename(
@@ -2311,15 +2486,20 @@ class AlistFileSystem:
             "src_name_regex": src_name_regex, 
             "new_name_regex": new_name_regex, 
         }
-        return check_response(
-            self.client.fs_regex_rename( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_regex_rename( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            if (cache := self.cache) is not None:
+                cache.invalidate(src_dir)
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_remove(
@@ -2356,15 +2536,21 @@ class AlistFileSystem:
         else:
             src_dir = self.abspath(src_dir)
         payload = {"names": names, "dir": src_dir}
-        return check_response(
-            self.client.fs_remove( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_remove( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            if (cache := self.cache) is not None:
+                for name in names:
+                    cache.discard(joinpath(src_dir, name))
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_remove_empty_directory(
@@ -2396,15 +2582,20 @@ class AlistFileSystem:
         else:
             src_dir = self.abspath(src_dir)
         payload = {"src_dir": src_dir}
-        return check_response(
-            self.client.fs_remove_empty_directory( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_remove_empty_directory( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            if (cache := self.cache) is not None:
+                cache.invalidate(src_dir)
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_rename(
@@ -2439,15 +2630,20 @@ class AlistFileSystem:
         else:
             path = self.abspath(path)
         payload = {"path": path, "name": name}
-        return check_response(
-            self.client.fs_rename( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.fs_rename( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            if (cache := self.cache) is not None:
+                cache.rename(path, joinpath(dirname(path), name))
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_search(
@@ -2536,15 +2732,21 @@ class AlistFileSystem:
         async_: Literal[False, True] = False, 
     ) -> dict | Coroutine[Any, Any, dict]:
         payload = {"id": id}
-        return check_response(
-            self.client.admin_storage_delete( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.admin_storage_delete( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            self.client.storage_index.invalidate()
+            if (cache := self.cache) is not None:
+                cache.clear()
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_storage_disable(
@@ -2569,15 +2771,21 @@ class AlistFileSystem:
         async_: Literal[False, True] = False, 
     ) -> dict | Coroutine[Any, Any, dict]:
         payload = {"id": id}
-        return check_response(
-            self.client.admin_storage_disable( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.admin_storage_disable( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            self.client.storage_index.invalidate()
+            if (cache := self.cache) is not None:
+                cache.clear()
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_storage_enable(
@@ -2602,15 +2810,21 @@ class AlistFileSystem:
         async_: Literal[False, True] = False, 
     ) -> dict | Coroutine[Any, Any, dict]:
         payload = {"id": id}
-        return check_response(
-            self.client.admin_storage_enable( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                self.client.admin_storage_enable( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            self.client.storage_index.invalidate()
+            if (cache := self.cache) is not None:
+                cache.clear()
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     @overload
     def fs_storage_list(
@@ -2669,15 +2883,21 @@ class AlistFileSystem:
         payload: dict, 
         async_: Literal[False, True] = False, 
     ) -> dict | Coroutine[Any, Any, dict]:
-        return check_response(
-                self.client.admin_storage_update( # type: ignore
-                payload, 
-                request=self.async_request if async_ else self.request, 
-                async_=async_, 
-                **self.request_kwargs, 
-            ), 
-            payload=payload, 
-        )
+        def gen_step():
+            resp = yield check_response(
+                    self.client.admin_storage_update( # type: ignore
+                    payload, 
+                    request=self.async_request if async_ else self.request, 
+                    async_=async_, 
+                    **self.request_kwargs, 
+                ), 
+                payload=payload, 
+            )
+            self.client.storage_index.invalidate()
+            if (cache := self.cache) is not None:
+                cache.clear()
+            return resp
+        return run_gen_step(gen_step, async_=async_)
 
     def abspath(
         self, 
@@ -2756,12 +2976,25 @@ class AlistFileSystem:
                 path = cast(str, attr["path"])
             else:
                 path = self.abspath(path)
-            attr = AttrDict((yield self.fs_get(
-                path, 
-                password, 
-                headers=headers, 
-                async_=async_, 
-            ))["data"])
+            cache = self.cache
+            if cache is not None and not refresh:
+                cached = cache.get_attr(path)
+                if cached is not None:
+                    attr = AttrDict(cached)
+                    if password:
+                        attr["password"] = password
+                    return attr
+            try:
+                attr = AttrDict((yield self.fs_get(
+                    path, 
+                    password, 
+                    headers=headers, 
+                    async_=async_, 
+                ))["data"])
+            except FileNotFoundError:
+                if cache is not None:
+                    cache.discard(path)
+                raise
             access_time = datetime.now()
             attr["accessed"] = access_time.astimezone().strftime("%Y-%m-%dT%H:%M:%S.%f%z")
             attr["ctime"] = parse_as_timestamp(attr.get("created"))
@@ -2769,6 +3002,8 @@ class AlistFileSystem:
             attr["atime"] = access_time.timestamp()
             attr["path"] = path
             attr["password"] = password
+            if cache is not None:
+                cache.set_attr(path, attr)
             return attr
         return run_gen_step(gen_step, async_=async_)
 
@@ -2942,11 +3177,12 @@ class AlistFileSystem:
                         [src_name], 
                         async_=async_, 
                     )
-                    tasks = resp["data"]["tasks"]
+                    tasks = (resp["data"] or {}).get("tasks")
                     if not tasks:
                         return dst_path
                     task = tasks[0]
                     task["dst_path"] = dst_path
+                    task["category"] = "copy"
                     return task
                 else:
                     src_storage = yield self.storage_of(
@@ -2970,6 +3206,7 @@ class AlistFileSystem:
                         )
                         task = resp["data"]["task"]
                         task["dst_path"] = dst_path
+                        task["category"] = "upload"
                         return task
 
                     if not (yield self.exists(
@@ -3137,13 +3374,19 @@ class AlistFileSystem:
                     )
                     if src_name == dst_name:
                         if as_task:
-                            yield self.fs_copy(
+                            resp = yield self.fs_copy(
                                 src_dir, 
                                 dst_dir, 
                                 [src_name], 
                                 async_=async_, 
                             )
-                            return dst_path
+                            tasks = (resp["data"] or {}).get("tasks")
+                            if not tasks:
+                                return dst_path
+                            task = tasks[0]
+                            task["dst_path"] = dst_path
+                            task["category"] = "copy"
+                            return task
                     yield self.fs_mkdir(
                         dst_path, 
                         async_=async_, 
@@ -3194,6 +3437,134 @@ class AlistFileSystem:
             return result
         return run_gen_step(gen_step, async_=async_)
 
+    def get_task_poller(
+        self, 
+        /, 
+        category: str = "copy", 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> AlistTaskPoller:
+        """获取此文件系统共享的任务轮询器（每个分类、每种模式各一个）
+
+        :param category: 任务分类，例如 "copy"、"upload"
+        :param async_: 是否异步
+
+        :return: 任务轮询器
+        """
+        pollers = self.__dict__.setdefault("task_pollers", {})
+        try:
+            return pollers[(category, async_)]
+        except KeyError:
+            poller = pollers[(category, async_)] = AlistTaskPoller(
+                self.client, 
+                category, 
+                request=self.request, 
+                async_request=self.async_request, 
+                request_kwargs=self.request_kwargs, 
+                async_=async_, 
+            )
+            return poller
+
+    def track_tasks(
+        self, 
+        /, 
+        result: Any, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> list[AlistTaskHandle]:
+        """把 ``copy``、``copytree`` 的返回值（或者 ``fs_copy``、``fs_put`` 返回的任务信息）转换为任务句柄
+
+        所有句柄由共享的轮询器统一跟踪，每一轮只罗列一次任务列表，所以同时等待成千上万个任务的开销，和等待一个相当
+
+        .. code:: python
+
+            handles = fs.track_tasks(fs.copytree("/a", "/b"))
+            for handle in handles:
+                print(handle.result()["dst_path"])
+
+            # 异步模式
+            handles = fs.track_tasks(await fs.copytree("/a", "/b", async_=True), async_=True)
+            await asyncio.gather(*handles)
+
+        :param result: 返回值，如果是字符串，说明已经直接完成了，如果是任务信息，就去跟踪这个任务，如果是字典或列表，就递归处理
+        :param async_: 是否异步（必须在事件循环中调用）
+
+        :return: 任务句柄的列表
+        """
+        handles: list[AlistTaskHandle] = []
+        def collect(result):
+            if not result:
+                return
+            if isinstance(result, str):
+                handles.append(self.get_task_poller(async_=async_).completed(
+                    {"dst_path": result, "state": 2}))
+            elif isinstance(result, dict):
+                if "id" in result and "name" in result:
+                    poller = self.get_task_poller(result.get("category") or "copy", async_=async_)
+                    handles.append(poller.track(result))
+                else:
+                    for val in result.values():
+                        collect(val)
+            elif isinstance(result, (list, tuple)):
+                for val in result:
+                    collect(val)
+        collect(result)
+        return handles
+
+    @overload
+    def wait_tasks(
+        self, 
+        /, 
+        result: Any, 
+        timeout: None | float = None, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> list[AlistTaskHandle]:
+        ...
+    @overload
+    def wait_tasks(
+        self, 
+        /, 
+        result: Any, 
+        timeout: None | float = None, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[Any, Any, list[AlistTaskHandle]]:
+        ...
+    def wait_tasks(
+        self, 
+        /, 
+        result: Any, 
+        timeout: None | float = None, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> list[AlistTaskHandle] | Coroutine[Any, Any, list[AlistTaskHandle]]:
+        """等待 ``copy``、``copytree`` 创建的任务全部结束（或者超时）
+
+        :param result: ``copy``、``copytree`` 的返回值，或者由 ``track_tasks`` 得到的句柄列表
+        :param timeout: 超时秒数，为 None 时一直等待
+        :param async_: 是否异步
+
+        :return: 任务句柄的列表，可以用 ``handle.done()`` 和 ``handle.exception()`` 检查各个任务的结果
+        """
+        if async_:
+            async def request():
+                if isinstance(result, list) and all(isinstance(h, AlistTaskHandle) for h in result):
+                    handles = result
+                else:
+                    handles = self.track_tasks(result, async_=True)
+                if handles:
+                    await async_wait([wrap_future(h.future) if isinstance(h.future, Future) else h.future for h in handles], timeout=timeout)
+                return handles
+            return request()
+        if isinstance(result, list) and all(isinstance(h, AlistTaskHandle) for h in result):
+            handles = result
+        else:
+            handles = self.track_tasks(result)
+        if handles:
+            wait_futures([h.future for h in handles], timeout=timeout) # type: ignore
+        return handles
+
     @overload
     def download(
         self, 
@@ -3271,7 +3642,15 @@ class AlistFileSystem:
                 )
                 if attr["is_dir"]:
                     raise IsADirectoryError(errno.EISDIR, path)
-                url = attr["raw_url"]
+                if "raw_url" not in attr:
+                    # NOTE: 缓存中的属性不含 raw_url
+                    attr = yield self.attr(
+                        path, 
+                        password, 
+                        refresh=True, 
+                        async_=async_, 
+                    )
+                url = attr["raw_url"]
 
             if not isinstance(file, SupportsWrite):
                 filepath = fspath(file)
@@ -3338,6 +3717,137 @@ class AlistFileSystem:
             return task
         return run_gen_step(gen_step, async_=async_)
 
+    def _download_tree_concurrent(
+        self, 
+        /, 
+        path: PathType = "", 
+        to_dir: bytes | str | PathLike = "", 
+        write_mode: Literal["a", "w", "x", "i"] = "a", 
+        no_root: bool = False, 
+        onerror: None | bool | Callable[[BaseException], Any] = True, 
+        predicate: None | Callable[[AlistPath], bool] = None, 
+        password: str = "", 
+        refresh: None | bool = None, 
+        max_workers: int = 8, 
+        max_bytes: int = 0, 
+        engine: None | TransferEngine = None, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[AlistPath, str, DownloadTask]] | AsyncIterator[tuple[AlistPath, str, AsyncDownloadTask]]:
+        """并发版本的 ``download_tree``
+
+        目录被并发罗列，每罗列完一个目录，就先创建对应的本地目录，再把其中需要下载的文件提交给传输引擎。
+        本地文件与远程文件的大小相同，且修改时间不早于远程时，会被跳过；下载完成后，会把本地文件的修改时间设为远程的修改时间，
+        所以再次运行时，未变化的文件都会被跳过。结果按下载完成的先后产出
+        """
+        def gen_step():
+            nonlocal to_dir, password, engine
+            attr = yield self.attr(path, password, async_=async_)
+            if not password:
+                password = attr.get("password", "")
+            to_dir = fsdecode(to_dir)
+            if to_dir:
+                makedirs(to_dir, exist_ok=True)
+            own_engine = engine is None
+            if engine is None:
+                engine = TransferEngine(max_workers, max_bytes, async_=async_)
+            stats = engine.stats
+            batch = engine.batch()
+            def download(attr: AttrDict, download_path: str, mode: Literal["a", "w", "x", "i"], /):
+                def gen_step():
+                    task = yield self.download(
+                        attr, 
+                        download_path, 
+                        write_mode=mode, 
+                        submit=False, 
+                        password=password, 
+                        async_=async_, 
+                    )
+                    if task is None:
+                        return TransferEngine.SKIPPED
+                    yield task.run
+                    task.result()
+                    if mtime := attr.get("mtime"):
+                        utime(download_path, (mtime, mtime))
+                    return task
+                return run_gen_step(gen_step, async_=async_)
+            def submit(attr: AttrDict, download_path: str, /):
+                mode = write_mode
+                remote_size = attr["size"]
+                try:
+                    st = lstat(download_path)
+                except OSError:
+                    pass
+                else:
+                    if mode == "i" or remote_size == st.st_size and st.st_mtime >= attr.get("mtime", 0):
+                        stats.add_skipped(remote_size)
+                        return
+                    elif remote_size <= st.st_size:
+                        mode = "w"
+                batch.submit((attr, download_path), remote_size, partial(download, attr, download_path, mode))
+            lister = None
+            try:
+                if attr["is_dir"]:
+                    if not no_root:
+                        to_dir = ospath.join(to_dir, attr["name"])
+                        if to_dir:
+                            makedirs(to_dir, exist_ok=True)
+                    lister = yield self._make_lister(
+                        engine.max_workers, 
+                        0, 
+                        password, 
+                        refresh, 
+                        async_=async_, 
+                    )
+                    lister.submit((to_dir, attr))
+                    while lister:
+                        (local_dir, _), ls = yield lister.get
+                        if isinstance(ls, BaseException):
+                            if not isinstance(ls, OSError):
+                                raise ls
+                            if callable(onerror):
+                                yield partial(onerror, ls)
+                            elif onerror:
+                                raise ls
+                            continue
+                        for subattr in ls:
+                            if predicate is not None and not predicate(self.as_path(subattr)):
+                                continue
+                            local_path = ospath.join(local_dir, subattr["name"])
+                            if subattr["is_dir"]:
+                                try:
+                                    makedirs(local_path, exist_ok=True)
+                                    stats.add_dir()
+                                except OSError as e:
+                                    if callable(onerror):
+                                        yield partial(onerror, e)
+                                    elif onerror:
+                                        raise
+                                    continue
+                                lister.submit((local_path, subattr))
+                            else:
+                                submit(subattr, local_path)
+                elif predicate is None or predicate(self.as_path(attr)):
+                    submit(attr, ospath.join(to_dir, attr["name"]))
+                while batch:
+                    (attr, download_path), task = yield batch.get
+                    if isinstance(task, BaseException):
+                        if isinstance(task, (KeyboardInterrupt, GeneratorExit)):
+                            raise task
+                        if callable(onerror):
+                            yield partial(onerror, task)
+                        elif onerror:
+                            raise task
+                    elif task is not TransferEngine.SKIPPED:
+                        yield Yield((self.as_path(attr), download_path, task))
+            finally:
+                if lister is not None:
+                    lister.close()
+                batch.close()
+                if own_engine:
+                    engine.shutdown()
+        return run_gen_step_iter(gen_step, async_=async_)
+
     # TODO: 增加条件化重试机制
     # TODO: 后台开启一个下载管理器，可以管理各个下载任务，所有任务完成后，下载管理器关闭，下载任务可以排队
     # TODO: 下载管理器，多线程使用 ThreadPoolExecutor，异步使用 TaskGroup
@@ -3355,6 +3865,9 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_bytes: int = 0, 
+        engine: None | TransferEngine = None, 
         async_: Literal[False] = False, 
     ) -> Iterator[tuple[AlistPath, str, DownloadTask]]:
         ...
@@ -3372,6 +3885,9 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_bytes: int = 0, 
+        engine: None | TransferEngine = None, 
         async_: Literal[True], 
     ) -> AsyncIterator[tuple[AlistPath, str, AsyncDownloadTask]]:
         ...
@@ -3388,8 +3904,26 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_bytes: int = 0, 
+        engine: None | TransferEngine = None, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[tuple[AlistPath, str, DownloadTask]] | AsyncIterator[tuple[AlistPath, str, AsyncDownloadTask]]:
+        if engine is not None or max_workers > 1:
+            return self._download_tree_concurrent(
+                path, 
+                to_dir, 
+                write_mode=write_mode, 
+                no_root=no_root, 
+                onerror=onerror, 
+                predicate=predicate, 
+                password=password, 
+                refresh=refresh, 
+                max_workers=max_workers, 
+                max_bytes=max_bytes, 
+                engine=engine, 
+                async_=async_, 
+            )
         def gen_step():
             nonlocal to_dir
             attr = yield self.attr(
@@ -3654,6 +4188,10 @@ class AlistFileSystem:
         async_: Literal[False, True] = False, 
     ) -> int | Coroutine[Any, Any, int]:
         def gen_step():
+            if (cache := self.cache) is not None and not (self.refresh if refresh is None else refresh):
+                data = cache.get_list(path["path"] if isinstance(path, (AttrDict, AlistPath)) else self.abspath(path))
+                if data is not None:
+                    return len(data)
             resp = yield self.fs_list(
                 path, 
                 password=password, 
@@ -3711,6 +4249,9 @@ class AlistFileSystem:
             attr = yield self.attr(path, password, headers=headers, async_=async_)
             if attr["is_dir"]:
                 raise IsADirectoryError(errno.EISDIR, path)
+            if "raw_url" not in attr:
+                # NOTE: 缓存中的属性不含 raw_url
+                attr = yield self.attr(path, password, headers=headers, refresh=True, async_=async_)
             return attr["raw_url"]
         return run_gen_step(gen_step, async_=async_)
 
@@ -3737,6 +4278,149 @@ class AlistFileSystem:
             ensure_ascii=ensure_ascii, 
         )
 
+    @overload
+    def get_search_index(
+        self, 
+        /, 
+        refresh: bool = False, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> str:
+        ...
+    @overload
+    def get_search_index(
+        self, 
+        /, 
+        refresh: bool = False, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[Any, Any, str]:
+        ...
+    def get_search_index(
+        self, 
+        /, 
+        refresh: bool = False, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> str | Coroutine[Any, Any, str]:
+        "获取服务器所用的搜索索引，例如 \"database\"、\"bleve\"、\"meilisearch\"，未启用时为 \"none\"（结果会被缓存）"
+        def gen_step():
+            if not refresh and "search_index" in self.__dict__:
+                return self.__dict__["search_index"]
+            resp = yield self.client.public_settings(
+                request=self.async_request if async_ else self.request, 
+                async_=async_, 
+                **self.request_kwargs, 
+            )
+            index = check_response(resp)["data"].get("search_index") or "none"
+            self.__dict__["search_index"] = index
+            return index
+        return run_gen_step(gen_step, async_=async_)
+
+    def _search_uncovered(
+        self, 
+        /, 
+        top: str, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> None | list[str] | Coroutine[Any, Any, None | list[str]]:
+        """找出 ``top`` 之下未被搜索索引覆盖的存储（``disable_index``）的挂载路径
+
+        如果 ``top`` 自身就在未被索引的存储中，则返回 None。没有管理员权限时无从得知，认为都被索引了
+        """
+        def gen_step():
+            index = self.client.storage_index
+            try:
+                if index.expired:
+                    yield self.list_storages(async_=async_)
+            except OSError:
+                return []
+            storage = index.find(top)
+            if storage is not None and storage.get("disable_index"):
+                return None
+            prefix = "/" if top == "/" else top + "/"
+            return [
+                s["mount_path"] for s in index.storages 
+                if s.get("disable_index") and s["mount_path"].startswith(prefix)
+            ]
+        return run_gen_step(gen_step, async_=async_)
+
+    def _glob_by_search(
+        self, 
+        /, 
+        pattern: str, 
+        dirname: PathType, 
+        ignore_case: bool, 
+        password: str, 
+        plan: tuple[list[str], str, str], 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[AlistPath] | AsyncIterator[AlistPath]:
+        "按照 ``_glob_search_plan`` 制定的计划，用服务端搜索来执行 glob"
+        prefix, regex, keywords = plan
+        def gen_step():
+            nonlocal dirname, password
+            index = yield self.get_search_index(async_=async_)
+            if index == "none":
+                return YieldFrom(self.glob(
+                    pattern, 
+                    dirname, 
+                    ignore_case, 
+                    password, 
+                    use_search=False, 
+                    async_=async_, 
+                ))
+            if pattern.startswith("/"):
+                top = "/"
+            elif isinstance(dirname, (AttrDict, AlistPath)):
+                if not password:
+                    password = dirname.get("password", "")
+                top = cast(str, dirname["path"])
+            else:
+                top = self.abspath(dirname)
+            top = joinpath(top, *prefix)
+            try:
+                attr = yield self.attr(top, password, async_=async_)
+            except FileNotFoundError:
+                return
+            if not attr["is_dir"]:
+                return
+            uncovered = yield self._search_uncovered(top, async_=async_)
+            if uncovered is None:
+                return YieldFrom(self.glob(
+                    pattern, 
+                    dirname, 
+                    ignore_case, 
+                    password, 
+                    use_search=False, 
+                    async_=async_, 
+                ))
+            match = re_compile(re_escape("" if top == "/" else top) + regex).fullmatch
+            # NOTE: 未被索引的存储中可能嵌套着被索引的存储，所以两边的结果需要去重
+            seen: set[str] = set()
+            def predicate(path: str, /) -> bool:
+                if path in seen or not match(path):
+                    return False
+                seen.add(path)
+                return True
+            for mount_path in uncovered:
+                yield YieldFrom(self.iter(
+                    mount_path, 
+                    min_depth=0, 
+                    max_depth=-1, 
+                    predicate=lambda p: predicate(p["path"]), 
+                    password=password, 
+                    async_=async_, 
+                ))
+            yield from self._search_step(
+                keywords, 
+                top, 
+                password=password, 
+                predicate=predicate, 
+                async_=async_, 
+            )
+        return run_gen_step_iter(gen_step, async_=async_)
+
     @overload
     def glob(
         self, 
@@ -3745,6 +4429,7 @@ class AlistFileSystem:
         dirname: PathType = "", 
         ignore_case: bool = False, 
         password: str = "", 
+        use_search: bool = True, 
         *, 
         async_: Literal[False] = False, 
     ) -> Iterator[AlistPath]:
@@ -3757,6 +4442,7 @@ class AlistFileSystem:
         dirname: PathType = "", 
         ignore_case: bool = False, 
         password: str = "", 
+        use_search: bool = True, 
         *, 
         async_: Literal[True], 
     ) -> AsyncIterator[AlistPath]:
@@ -3768,9 +4454,28 @@ class AlistFileSystem:
         dirname: PathType = "", 
         ignore_case: bool = False, 
         password: str = "", 
+        use_search: bool = True, 
         *, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[AlistPath] | AsyncIterator[AlistPath]:
+        """通配符匹配
+
+        如果服务器启用了搜索索引，模式中含有递归匹配（**），且最后一部分含有可搜索的字面量（扩展名或者名字片段），
+        则会在离得最近的固定前缀目录中，使用服务端搜索（``fs_search``）来获取候选项，并发地翻页，
+        然后再用完整的模式进行验证；未被索引的存储（``disable_index``）则逐个罗列目录。否则回退到逐个罗列目录
+
+        .. note::
+            服务端的搜索索引可能有延迟，刚刚上传的文件可能还搜不到，此时请指定 ``use_search=False``
+
+        :param pattern: 模式
+        :param dirname: 开始匹配的目录（如果模式以 "/" 开头，则忽略此参数）
+        :param ignore_case: 是否忽略大小写
+        :param password: 密码
+        :param use_search: 是否允许使用服务端搜索
+        :param async_: 是否异步
+
+        :return: 迭代器，产出匹配的路径
+        """
         if pattern == "*":
             return self.iter(
                 dirname, 
@@ -3784,6 +4489,15 @@ class AlistFileSystem:
                 max_depth=-1, 
                 async_=async_, 
             )
+        if use_search and (plan := _glob_search_plan(pattern, ignore_case=ignore_case)) is not None:
+            return self._glob_by_search(
+                pattern, 
+                dirname, 
+                ignore_case, 
+                password, 
+                plan, 
+                async_=async_, 
+            )
         def gen_step():
             nonlocal pattern, dirname, password
             if not pattern:
@@ -3793,7 +4507,7 @@ class AlistFileSystem:
                         password, 
                         async_=async_, 
                     )
-                    yield Yield(self.as_path(attr))
+                    yield Yield(self.as_path(attr), may_call=False)
                 except FileNotFoundError:
                     pass
                 return
@@ -3838,7 +4552,7 @@ class AlistFileSystem:
                             password, 
                             async_=async_, 
                         )
-                        yield Yield(self.as_path(attr))
+                        yield Yield(self.as_path(attr), may_call=False)
                     except FileNotFoundError:
                         pass
                     return
@@ -4085,37 +4799,46 @@ class AlistFileSystem:
                 return attr["hash_info"] is None
         return run_gen_step(gen_step, async_=async_)
 
-    @overload
-    def iter_bfs(
+    def _make_lister(
         self, 
         /, 
-        top: PathType = "", 
-        min_depth: int = 1, 
-        max_depth: int = 1, 
-        predicate: None | Callable[[AlistPath], Literal[None, 1, False, True]] = None, 
-        onerror: bool | Callable[[OSError], bool] = False, 
-        refresh: None | bool = None, 
+        max_workers: int = 8, 
+        max_workers_per_storage: int = 0, 
         password: str = "", 
-        *, 
-        async_: Literal[False] = False, 
-    ) -> Iterator[AlistPath]:
-        ...
-    @overload
-    def iter_bfs(
-        self, 
-        /, 
-        top: PathType = "", 
-        min_depth: int = 1, 
-        max_depth: int = 1, 
-        predicate: None | Callable[[AlistPath], Literal[None, 1, False, True]] = None, 
-        onerror: bool | Callable[[OSError], bool] = False, 
         refresh: None | bool = None, 
-        password: str = "", 
         *, 
-        async_: Literal[True], 
-    ) -> AsyncIterator[AlistPath]:
-        ...
-    def iter_bfs(
+        async_: Literal[False, True] = False, 
+    ) -> ConcurrentLister | Coroutine[Any, Any, ConcurrentLister]:
+        "创建一个并发罗列目录的工作池，提交的项形如 ``(depth, attr)``"
+        def gen_step():
+            key: None | Callable = None
+            if max_workers_per_storage > 0:
+                try:
+                    index = self.client.storage_index
+                    if index.expired:
+                        yield self.list_storages(async_=async_)
+                    mount_path_of = index.mount_path_of
+                    def key(item, /) -> str:
+                        return mount_path_of(item[1]["path"])
+                except OSError:
+                    # NOTE: 没有管理员权限时无法罗列存储，近似认为各个存储都挂载在根目录下
+                    def key(item, /) -> str:
+                        path = item[1]["path"]
+                        idx = path.find("/", 1)
+                        return path if idx < 0 else path[:idx]
+            listdir_attr = self.listdir_attr
+            def listdir(item, /):
+                return listdir_attr(item[1], password, refresh=refresh, async_=async_)
+            return ConcurrentLister(
+                listdir, 
+                max_workers=max_workers, 
+                key=key, 
+                max_workers_per_key=max_workers_per_storage, 
+                async_=async_, 
+            )
+        return run_gen_step(gen_step, async_=async_)
+
+    def _iter_bfs_concurrent(
         self, 
         /, 
         top: PathType = "", 
@@ -4125,13 +4848,18 @@ class AlistFileSystem:
         onerror: bool | Callable[[OSError], bool] = False, 
         refresh: None | bool = None, 
         password: str = "", 
+        max_workers: int = 8, 
+        max_workers_per_storage: int = 0, 
         *, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[AlistPath] | AsyncIterator[AlistPath]:
+        """并发版本的 ``iter_bfs``，多个目录被同时罗列，结果按罗列完成的先后产出，而不是严格地逐层产出
+
+        一个目录的子目录在它的罗列结果被消费后立即提交，层与层之间没有屏障（这样一个慢的存储不会拖住其它存储），
+        所以较深的目录可能先于较浅的兄弟目录产出，但每个目录总是在它的父目录之后产出
+        """
         def gen_step():
-            nonlocal min_depth, max_depth, password
-            dq: deque[tuple[int, AlistPath]] = deque()
-            push, pop = dq.append, dq.popleft
+            nonlocal password
             try:
                 attr = yield self.attr(top, password, async_=async_)
                 if not password:
@@ -4142,27 +4870,41 @@ class AlistFileSystem:
                 elif onerror:
                     raise
                 return
-            push((0, self.as_path(attr)))
-            while dq:
-                depth, path = pop()
-                if min_depth <= 0:
-                    if predicate is None:
-                        pred = True
-                    else:
-                        pred = yield partial(predicate, path)
-                    if pred is None:
-                        return
-                    elif pred:
-                        yield Yield(path)
-                        if pred is 1:
-                            return
-                    min_depth = 1
-                if depth == 0 and (not path.is_dir() or 0 <= max_depth <= depth):
+            path = self.as_path(attr)
+            if min_depth <= 0:
+                if predicate is None:
+                    pred = True
+                else:
+                    pred = yield partial(predicate, path)
+                if pred is None:
                     return
-                depth += 1
-                try:
-                    subpaths = yield self.listdir_path(path, password, refresh=refresh, async_=async_)
-                    for path in subpaths:
+                elif pred:
+                    yield Yield(path, may_call=False)
+                    if pred is 1:
+                        return
+            if not path.is_dir() or 0 <= max_depth <= 0:
+                return
+            lister = yield self._make_lister(
+                max_workers, 
+                max_workers_per_storage, 
+                password, 
+                refresh, 
+                async_=async_, 
+            )
+            try:
+                lister.submit((1, attr))
+                while lister:
+                    (depth, _), ls = yield lister.get
+                    if isinstance(ls, BaseException):
+                        if not isinstance(ls, OSError):
+                            raise ls
+                        if callable(onerror):
+                            yield partial(onerror, ls)
+                        elif onerror:
+                            raise ls
+                        continue
+                    for attr in ls:
+                        path = self.as_path(attr)
                         if predicate is None:
                             pred = True
                         else:
@@ -4171,51 +4913,16 @@ class AlistFileSystem:
                             continue
                         elif pred:
                             if depth >= min_depth:
-                                yield Yield(path)
+                                yield Yield(path, may_call=False)
                             if pred is 1:
                                 continue
-                        if path.is_dir() and (max_depth < 0 or depth < max_depth):
-                            push((depth, path))
-                except OSError as e:
-                    if callable(onerror):
-                        yield partial(onerror, e)
-                    elif onerror:
-                        raise
+                        if attr["is_dir"] and (max_depth < 0 or depth < max_depth):
+                            lister.submit((depth + 1, attr))
+            finally:
+                lister.close()
         return run_gen_step_iter(gen_step, async_=async_)
 
-    @overload
-    def iter_dfs(
-        self, 
-        /, 
-        top: PathType = "", 
-        topdown: bool = True, 
-        min_depth: int = 1, 
-        max_depth: int = 1, 
-        predicate: Optional[Callable[[AlistPath], Literal[None, 1, False, True]]] = None, 
-        onerror: bool | Callable[[OSError], bool] = False, 
-        refresh: None | bool = None, 
-        password: str = "", 
-        *, 
-        async_: Literal[False] = False, 
-    ) -> Iterator[AlistPath]:
-        ...
-    @overload
-    def iter_dfs(
-        self, 
-        /, 
-        top: PathType = "", 
-        topdown: bool = True, 
-        min_depth: int = 1, 
-        max_depth: int = 1, 
-        predicate: Optional[Callable[[AlistPath], Literal[None, 1, False, True]]] = None, 
-        onerror: bool | Callable[[OSError], bool] = False, 
-        refresh: None | bool = None, 
-        password: str = "", 
-        *, 
-        async_: Literal[True], 
-    ) -> AsyncIterator[AlistPath]:
-        ...
-    def iter_dfs(
+    def _iter_dfs_concurrent(
         self, 
         /, 
         top: PathType = "", 
@@ -4226,10 +4933,286 @@ class AlistFileSystem:
         onerror: bool | Callable[[OSError], bool] = False, 
         refresh: None | bool = None, 
         password: str = "", 
+        max_workers: int = 8, 
+        max_workers_per_storage: int = 0, 
         *, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[AlistPath] | AsyncIterator[AlistPath]:
-        def gen_step():
+        """并发版本的 ``iter_dfs``，产出的顺序与串行版本一致
+
+        进入一个目录时，会把它所有待进入的子目录一起提交罗列，等到真正进入时，罗列结果大多已经就绪了
+        """
+        def gen_step():
+            nonlocal min_depth, max_depth, password
+            if not max_depth:
+                return
+            try:
+                attr = yield self.attr(top, password, async_=async_)
+                if not password:
+                    password = attr.get("password", "")
+            except OSError as e:
+                if callable(onerror):
+                    yield partial(onerror, e)
+                elif onerror:
+                    raise
+                return
+            if min_depth <= 0:
+                path = self.as_path(attr)
+                if predicate is None:
+                    pred = True
+                else:
+                    pred = yield partial(predicate, path)
+                if pred is None:
+                    return
+                elif pred:
+                    yield Yield(path, may_call=False)
+                    if pred is 1:
+                        return
+                min_depth = 1
+            if not attr["is_dir"]:
+                return
+            lister = yield self._make_lister(
+                max_workers, 
+                max_workers_per_storage, 
+                password, 
+                refresh, 
+                async_=async_, 
+            )
+            # NOTE: 已经罗列完成但尚未被进入的目录
+            done: dict[str, Any] = {}
+            def walk(attr: AttrDict, min_depth: int, max_depth: int, /):
+                def gen_step():
+                    nonlocal min_depth, max_depth
+                    global_yield_me: Literal[1, False, True] = True
+                    if min_depth > 1:
+                        global_yield_me = False
+                        min_depth -= 1
+                    if max_depth > 0:
+                        max_depth -= 1
+                    top = attr["path"]
+                    while top not in done:
+                        (_, attr_), ls = yield lister.get
+                        done[attr_["path"]] = ls
+                    ls = done.pop(top)
+                    if isinstance(ls, BaseException):
+                        if not isinstance(ls, OSError):
+                            raise ls
+                        if callable(onerror):
+                            yield partial(onerror, ls)
+                        elif onerror:
+                            raise ls
+                        return
+                    todo: list[tuple[AttrDict, Literal[1, False, True], bool]] = []
+                    for subattr in ls:
+                        yield_me = global_yield_me
+                        if yield_me and predicate is not None:
+                            pred = yield partial(predicate, self.as_path(subattr))
+                            if pred is None:
+                                continue
+                            yield_me = pred
+                        descend = yield_me is not 1 and subattr["is_dir"] and max_depth != 0
+                        if descend:
+                            lister.submit((0, subattr))
+                        todo.append((subattr, yield_me, descend))
+                    for subattr, yield_me, descend in todo:
+                        if yield_me and topdown:
+                            yield Yield(self.as_path(subattr), may_call=False)
+                        if descend:
+                            yield YieldFrom(walk(subattr, min_depth, max_depth))
+                        if yield_me and not topdown:
+                            yield Yield(self.as_path(subattr), may_call=False)
+                return run_gen_step_iter(gen_step, async_=async_)
+            try:
+                lister.submit((0, attr))
+                yield YieldFrom(walk(attr, min_depth, max_depth))
+            finally:
+                lister.close()
+        return run_gen_step_iter(gen_step, async_=async_)
+
+    @overload
+    def iter_bfs(
+        self, 
+        /, 
+        top: PathType = "", 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: None | Callable[[AlistPath], Literal[None, 1, False, True]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: None | bool = None, 
+        password: str = "", 
+        *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
+        async_: Literal[False] = False, 
+    ) -> Iterator[AlistPath]:
+        ...
+    @overload
+    def iter_bfs(
+        self, 
+        /, 
+        top: PathType = "", 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: None | Callable[[AlistPath], Literal[None, 1, False, True]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: None | bool = None, 
+        password: str = "", 
+        *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[AlistPath]:
+        ...
+    def iter_bfs(
+        self, 
+        /, 
+        top: PathType = "", 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: None | Callable[[AlistPath], Literal[None, 1, False, True]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: None | bool = None, 
+        password: str = "", 
+        *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[AlistPath] | AsyncIterator[AlistPath]:
+        if max_workers > 1:
+            return self._iter_bfs_concurrent(
+                top, 
+                min_depth=min_depth, 
+                max_depth=max_depth, 
+                predicate=predicate, 
+                onerror=onerror, 
+                refresh=refresh, 
+                password=password, 
+                max_workers=max_workers, 
+                max_workers_per_storage=max_workers_per_storage, 
+                async_=async_, 
+            )
+        def gen_step():
+            nonlocal min_depth, max_depth, password
+            dq: deque[tuple[int, AlistPath]] = deque()
+            push, pop = dq.append, dq.popleft
+            try:
+                attr = yield self.attr(top, password, async_=async_)
+                if not password:
+                    password = attr.get("password", "")
+            except OSError as e:
+                if callable(onerror):
+                    yield partial(onerror, e)
+                elif onerror:
+                    raise
+                return
+            push((0, self.as_path(attr)))
+            while dq:
+                depth, path = pop()
+                if min_depth <= 0:
+                    if predicate is None:
+                        pred = True
+                    else:
+                        pred = yield partial(predicate, path)
+                    if pred is None:
+                        return
+                    elif pred:
+                        yield Yield(path, may_call=False)
+                        if pred is 1:
+                            return
+                    min_depth = 1
+                if depth == 0 and (not path.is_dir() or 0 <= max_depth <= depth):
+                    return
+                depth += 1
+                try:
+                    subpaths = yield self.listdir_path(path, password, refresh=refresh, async_=async_)
+                    for path in subpaths:
+                        if predicate is None:
+                            pred = True
+                        else:
+                            pred = yield partial(predicate, path)
+                        if pred is None:
+                            continue
+                        elif pred:
+                            if depth >= min_depth:
+                                yield Yield(path, may_call=False)
+                            if pred is 1:
+                                continue
+                        if path.is_dir() and (max_depth < 0 or depth < max_depth):
+                            push((depth, path))
+                except OSError as e:
+                    if callable(onerror):
+                        yield partial(onerror, e)
+                    elif onerror:
+                        raise
+        return run_gen_step_iter(gen_step, async_=async_)
+
+    @overload
+    def iter_dfs(
+        self, 
+        /, 
+        top: PathType = "", 
+        topdown: bool = True, 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: Optional[Callable[[AlistPath], Literal[None, 1, False, True]]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: None | bool = None, 
+        password: str = "", 
+        *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
+        async_: Literal[False] = False, 
+    ) -> Iterator[AlistPath]:
+        ...
+    @overload
+    def iter_dfs(
+        self, 
+        /, 
+        top: PathType = "", 
+        topdown: bool = True, 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: Optional[Callable[[AlistPath], Literal[None, 1, False, True]]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: None | bool = None, 
+        password: str = "", 
+        *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[AlistPath]:
+        ...
+    def iter_dfs(
+        self, 
+        /, 
+        top: PathType = "", 
+        topdown: bool = True, 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: Optional[Callable[[AlistPath], Literal[None, 1, False, True]]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: None | bool = None, 
+        password: str = "", 
+        *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[AlistPath] | AsyncIterator[AlistPath]:
+        if max_workers > 1:
+            return self._iter_dfs_concurrent(
+                top, 
+                topdown=topdown, 
+                min_depth=min_depth, 
+                max_depth=max_depth, 
+                predicate=predicate, 
+                onerror=onerror, 
+                refresh=refresh, 
+                password=password, 
+                max_workers=max_workers, 
+                max_workers_per_storage=max_workers_per_storage, 
+                async_=async_, 
+            )
+        def gen_step():
             nonlocal min_depth, max_depth
             if not max_depth:
                 return
@@ -4248,7 +5231,7 @@ class AlistFileSystem:
                 if pred is None:
                     return
                 elif pred:
-                    yield Yield(path)
+                    yield Yield(path, may_call=False)
                     if pred is 1:
                         return
                 if path.is_file():
@@ -4272,7 +5255,7 @@ class AlistFileSystem:
                         continue
                     yield_me = pred
                 if yield_me and topdown:
-                    yield Yield(path)
+                    yield Yield(path, may_call=False)
                 if yield_me is not 1 and path.is_dir():
                     yield YieldFrom(self.iter(
                         path, 
@@ -4286,7 +5269,7 @@ class AlistFileSystem:
                         async_=async_, 
                     ))
                 if yield_me and not topdown:
-                    yield Yield(path)
+                    yield Yield(path, may_call=False)
         return run_gen_step_iter(gen_step, async_=async_)
 
     @overload
@@ -4302,6 +5285,8 @@ class AlistFileSystem:
         refresh: None | bool = None, 
         password: str = "", 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False] = False, 
     ) -> Iterator[AlistPath]:
         ...
@@ -4318,6 +5303,8 @@ class AlistFileSystem:
         refresh: None | bool = None, 
         password: str = "", 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[True], 
     ) -> AsyncIterator[AlistPath]:
         ...
@@ -4333,6 +5320,8 @@ class AlistFileSystem:
         refresh: None | bool = None, 
         password: str = "", 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[AlistPath] | AsyncIterator[AlistPath]:
         if topdown is None:
@@ -4344,6 +5333,8 @@ class AlistFileSystem:
                 onerror=onerror, 
                 refresh=refresh, 
                 password=password, 
+                max_workers=max_workers, 
+                max_workers_per_storage=max_workers_per_storage, 
                 async_=async_, # type: ignore
             )
         else:
@@ -4356,9 +5347,110 @@ class AlistFileSystem:
                 onerror=onerror, 
                 refresh=refresh, 
                 password=password, 
+                max_workers=max_workers, 
+                max_workers_per_storage=max_workers_per_storage, 
                 async_=async_, # type: ignore
             )
 
+    def _iterdir_concurrent(
+        self, 
+        /, 
+        path: PathType = "", 
+        password: str = "", 
+        refresh: None | bool = None, 
+        per_page: int = 100, 
+        max_workers: int = 8, 
+        ordered: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[AttrDict] | AsyncIterator[AttrDict]:
+        """并发地逐页拉取目录中的项
+
+        第 1 页的响应中有 ``total``，据此算出页数后，其余的页交给 ``ConcurrentLister`` 并发拉取。
+        按序产出时，已提交但尚未产出的页最多为 ``2 * max_workers``，以限制重排缓冲区的大小。
+        如果预计的最后一页是满的（目录在此期间有新增），会继续串行拉取，直到遇到不满的页
+        """
+        def gen_step():
+            nonlocal path, password
+            dir_ = path
+            if isinstance(path, (AttrDict, AlistPath)):
+                if not password:
+                    password = path.get("password", "")
+                path = cast(str, path["path"])
+            else:
+                path = self.abspath(path)
+            refresh_ = self.refresh if refresh is None else refresh
+            cache = self.cache
+            if cache is not None and not refresh_:
+                cached = cache.get_list(path)
+                if cached is not None:
+                    for attr in cached:
+                        attr["password"] = password
+                    return YieldFrom([AttrDict(attr) for attr in cached])
+            resp = yield self.fs_list(
+                dir_, 
+                password, 
+                refresh=refresh_, 
+                page=1, 
+                per_page=per_page, 
+                async_=async_, 
+            )
+            data = resp["data"]
+            content = data["content"] or []
+            yield YieldFrom(normalize_list_content(content, path, password))
+            if len(content) < per_page:
+                return
+            last_page = max(-(-(data.get("total") or 0) // per_page), 1)
+            # NOTE: 服务器在第 1 页时已经刷新过，其余的页不再要求刷新，否则每一页都会触发一次完整的罗列
+            def fetch(page: int, /):
+                return self.fs_list(
+                    dir_, 
+                    password, 
+                    refresh=False, 
+                    page=page, 
+                    per_page=per_page, 
+                    async_=async_, 
+                )
+            lister = ConcurrentLister(fetch, max_workers=max_workers, async_=async_)
+            window = 2 * max_workers if ordered else max_workers
+            next_submit = next_emit = 2
+            last_full = last_page == 1
+            buffer: dict[int, list[AttrDict]] = {}
+            try:
+                while True:
+                    while next_submit <= last_page and (
+                        next_submit - next_emit if ordered else lister.outstanding
+                    ) < window:
+                        lister.submit(next_submit)
+                        next_submit += 1
+                    if not lister:
+                        break
+                    page, resp = yield lister.get
+                    if isinstance(resp, BaseException):
+                        raise resp
+                    content = resp["data"]["content"] or []
+                    if page == last_page:
+                        last_full = len(content) >= per_page
+                    items = normalize_list_content(content, path, password)
+                    if ordered:
+                        buffer[page] = items
+                        while next_emit in buffer:
+                            yield YieldFrom(buffer.pop(next_emit))
+                            next_emit += 1
+                    else:
+                        next_emit += 1
+                        yield YieldFrom(items)
+            finally:
+                lister.close()
+            page = last_page
+            while last_full:
+                page += 1
+                resp = yield fetch(page)
+                content = resp["data"]["content"] or []
+                yield YieldFrom(normalize_list_content(content, path, password))
+                last_full = len(content) >= per_page
+        return run_gen_step_iter(gen_step, async_=async_)
+
     @overload
     def iterdir(
         self, 
@@ -4369,6 +5461,8 @@ class AlistFileSystem:
         page: int = 1, 
         per_page: int = 0, 
         *, 
+        max_workers: int = 1, 
+        ordered: bool = True, 
         async_: Literal[False] = False, 
     ) -> Iterator[AttrDict]:
         ...
@@ -4382,6 +5476,8 @@ class AlistFileSystem:
         page: int = 1, 
         per_page: int = 0, 
         *, 
+        max_workers: int = 1, 
+        ordered: bool = True, 
         async_: Literal[True], 
     ) -> AsyncIterator[AttrDict]:
         ...
@@ -4394,9 +5490,35 @@ class AlistFileSystem:
         page: int = 1, 
         per_page: int = 0, 
         *, 
+        max_workers: int = 1, 
+        ordered: bool = True, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[AttrDict] | AsyncIterator[AttrDict]:
+        """迭代目录中的项
+
+        :param path: 目录路径
+        :param password: 密码
+        :param refresh: 是否刷新
+        :param page: 第几页，从 1 开始，<= 0 时（且 ``per_page > 0``）会逐页拉取直到最后一页
+        :param per_page: 每页多少条，<= 0 时拉取全部
+        :param max_workers: 逐页拉取时的并发数，> 1 时会先根据第 1 页响应中的 ``total`` 算出页数，再在窗口内并发拉取其余的页
+        :param ordered: 并发拉取时，是否按页码顺序产出（否则按拉取完成的先后）
+        :param async_: 是否异步
+
+        :return: 迭代器，产出目录中各项的属性
+        """
+        if max_workers > 1 and page <= 0 and per_page > 0:
+            return self._iterdir_concurrent(
+                path, 
+                password, 
+                refresh=refresh, 
+                per_page=per_page, 
+                max_workers=max_workers, 
+                ordered=ordered, 
+                async_=async_, 
+            )
         def gen_step():
+            nonlocal page
             if page > 0 or per_page <= 0:
                 yield YieldFrom(self.listdir_attr(
                     path, 
@@ -4407,6 +5529,7 @@ class AlistFileSystem:
                     async_=async_, 
                 ))
             else:
+                page = 1
                 while True:
                     data = yield self.listdir_attr(
                         path, 
@@ -4443,7 +5566,9 @@ class AlistFileSystem:
     ) -> list[dict] | Coroutine[Any, Any, list[dict]]:
         def gen_step():
             resp = yield self.fs_storage_list(async_=async_)
-            return resp["data"]["content"] or []
+            storages = resp["data"]["content"] or []
+            self.client.storage_index.set(storages)
+            return storages
         return run_gen_step(gen_step, async_=async_)
 
     @overload
@@ -4487,6 +5612,17 @@ class AlistFileSystem:
         async_: Literal[False, True] = False, 
     ) -> list[str] | Coroutine[Any, Any, list[str]]:
         def gen_step():
+            if self.cache is not None:
+                data = yield self.listdir_attr(
+                    path, 
+                    password, 
+                    page=page, 
+                    per_page=per_page, 
+                    refresh=refresh, 
+                    async_=async_, 
+                )
+                key = "path" if full_path else "name"
+                return [attr[key] for attr in data]
             resp = yield self.fs_list(
                 path, 
                 password, 
@@ -4546,8 +5682,24 @@ class AlistFileSystem:
             if page <= 0 or per_page < 0:
                 page = 1
                 per_page = 0
+            dir_ = path
+            if isinstance(path, (AttrDict, AlistPath)):
+                if not password:
+                    password = path.get("password", "")
+                path = cast(str, path["path"])
+            else:
+                path = self.abspath(path)
+            cache = self.cache
+            if cache is not None and not (self.refresh if refresh is None else refresh):
+                cached = cache.get_list(path)
+                if cached is not None:
+                    if per_page:
+                        cached = cached[(page-1)*per_page:page*per_page]
+                    for attr in cached:
+                        attr["password"] = password
+                    return [AttrDict(attr) for attr in cached]
             resp = yield self.fs_list(
-                path, 
+                dir_, 
                 password, 
                 refresh=refresh, 
                 page=page, 
@@ -4556,19 +5708,12 @@ class AlistFileSystem:
             )
             data = resp["data"]["content"]
             if not data:
+                if cache is not None and not per_page:
+                    cache.set_list(path, ())
                 return []
-            if isinstance(path, (AttrDict, AlistPath)):
-                if not password:
-                    password = path.get("password", "")
-                path = cast(str, path["path"])
-            else:
-                path = self.abspath(path)
-            for i, attr in enumerate(data):
-                attr["ctime"] = parse_as_timestamp(attr.get("created"))
-                attr["mtime"] = parse_as_timestamp(attr.get("modified"))
-                attr["path"] = joinpath(path, attr["name"])
-                attr["password"] = password
-                data[i] = AttrDict(attr)
+            normalize_list_content(data, path, password)
+            if cache is not None and not per_page:
+                cache.set_list(path, data)
             return data
         return run_gen_step(gen_step, async_=async_)
 
@@ -5451,20 +6596,316 @@ class AlistFileSystem:
         async_: Literal[False, True] = False, 
     ) -> str | Coroutine[Any, Any, str]:
         def gen_step():
-            nonlocal src_path, dst_path, src_password
-            dst_path = cast(str, (yield self.rename(src_path, dst_path, src_password, dst_password, async_=async_)))
-            if isinstance(src_path, (AttrDict, AlistPath)):
-                if not src_password:
-                    src_password = src_path.get("password", "")
-                src_path = cast(str, src_path["path"])
-            else:
-                src_path = self.abspath(src_path)
-            if dirname(src_path) != dirname(dst_path):
-                try:
-                    yield self.removedirs(dirname(src_path), src_password, async_=async_)
-                except OSError:
-                    pass
-            return dst_path
+            nonlocal src_path, dst_path, src_password
+            dst_path = cast(str, (yield self.rename(src_path, dst_path, src_password, dst_password, async_=async_)))
+            if isinstance(src_path, (AttrDict, AlistPath)):
+                if not src_password:
+                    src_password = src_path.get("password", "")
+                src_path = cast(str, src_path["path"])
+            else:
+                src_path = self.abspath(src_path)
+            if dirname(src_path) != dirname(dst_path):
+                try:
+                    yield self.removedirs(dirname(src_path), src_password, async_=async_)
+                except OSError:
+                    pass
+            return dst_path
+        return run_gen_step(gen_step, async_=async_)
+
+    def _batch_rename_step(
+        self, 
+        /, 
+        jobs: Iterable[tuple[None | str, list[tuple[str, str]], None | tuple[str, str]]], 
+        password: str = "", 
+        max_workers: int = 8, 
+        batch_size: int = 1000, 
+        onerror: bool | Callable[[OSError], bool] = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ):
+        """执行改名作业，返回已完成的改名 {原路径: 新路径}，供 gen_step 使用 ``yield from``
+
+        每个作业形如 ``(目录, [(原名, 新名), ...], 正则规则)``：有正则规则的，用 1 次 ``fs_regex_rename`` 完成，
+        否则每 ``batch_size`` 对发 1 次 ``fs_batch_rename``；目录为 None 的，其中是跨目录的 (原路径, 新路径)，调用 ``rename``
+
+        作业按所在目录的深度，从深到浅分层执行（先改后代，再改祖先，这样原路径不会失效），同一层的作业并发执行
+        """
+        def run(job, /):
+            dir_, pairs, regex = job
+            def gen_step():
+                if dir_ is None:
+                    for src_path, dst_path in pairs:
+                        yield self.rename(src_path, dst_path, password, password, async_=async_)
+                    return pairs
+                if regex is None:
+                    size = batch_size if batch_size > 0 else len(pairs)
+                    for i in range(0, len(pairs), size):
+                        yield self.fs_batch_rename(pairs[i:i+size], dir_, async_=async_)
+                else:
+                    yield self.fs_regex_rename(*regex, dir_, async_=async_)
+                    if (cache := self.cache) is not None:
+                        cache.rename_many(dir_, pairs)
+                return [(joinpath(dir_, src), joinpath(dir_, dst)) for src, dst in pairs]
+            return run_gen_step(gen_step, async_=async_)
+        levels: dict[int, list] = {}
+        for job in jobs:
+            dir_ = job[0]
+            if dir_ is None:
+                dir_ = dirname(job[1][0][0])
+            levels.setdefault(0 if dir_ == "/" else dir_.count("/"), []).append(job)
+        renamed: dict[str, str] = {}
+        if not levels:
+            return renamed
+        lister = ConcurrentLister(run, max_workers=max_workers, async_=async_)
+        try:
+            for _, level in sorted(levels.items(), reverse=True):
+                for job in level:
+                    lister.submit(job)
+                while lister:
+                    _, ret = yield lister.get
+                    if isinstance(ret, BaseException):
+                        if not isinstance(ret, OSError):
+                            raise ret
+                        if callable(onerror):
+                            yield partial(onerror, ret)
+                        elif onerror:
+                            raise ret
+                    else:
+                        renamed.update(ret)
+        finally:
+            lister.close()
+        return renamed
+
+    @overload
+    def batch_rename(
+        self, 
+        /, 
+        pairs: Mapping[PathType, PathType] | Iterable[tuple[PathType, PathType]], 
+        password: str = "", 
+        max_workers: int = 8, 
+        batch_size: int = 1000, 
+        onerror: bool | Callable[[OSError], bool] = True, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> dict[str, str]:
+        ...
+    @overload
+    def batch_rename(
+        self, 
+        /, 
+        pairs: Mapping[PathType, PathType] | Iterable[tuple[PathType, PathType]], 
+        password: str = "", 
+        max_workers: int = 8, 
+        batch_size: int = 1000, 
+        onerror: bool | Callable[[OSError], bool] = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[Any, Any, dict[str, str]]:
+        ...
+    def batch_rename(
+        self, 
+        /, 
+        pairs: Mapping[PathType, PathType] | Iterable[tuple[PathType, PathType]], 
+        password: str = "", 
+        max_workers: int = 8, 
+        batch_size: int = 1000, 
+        onerror: bool | Callable[[OSError], bool] = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> dict[str, str] | Coroutine[Any, Any, dict[str, str]]:
+        """批量改名：同一目录中的改名合并成 ``fs_batch_rename`` 请求，不同目录的并发执行
+
+        - 目标如果是不含 "/" 的字符串，则视为原目录中的新名字
+        - 明确给出的改名不会改用 ``fs_regex_rename``，因为正则规则会作用于服务器上此刻的所有文件，可能波及不在这批中的文件
+        - 跨目录的改名（即移动），逐个调用 ``rename``
+        - 缓存会按目录批量修补
+
+        :param pairs: (原路径, 目标路径或新名字) 的序列，或者从原路径到目标的映射
+        :param password: 跨目录改名时，所用的密码
+        :param max_workers: 最大并发数（同时改名的目录数）
+        :param batch_size: 每次 ``fs_batch_rename`` 请求最多包含的改名数，<= 0 时不限
+        :param onerror: 某个目录改名失败时的处理：如果是 True，则抛出异常；如果是 False，则忽略；如果是调用，则以异常为参数调用之
+        :param async_: 是否异步
+
+        :return: 已完成的改名，从原路径到新路径的字典
+        """
+        def gen_step():
+            groups: dict[str, dict[str, str]] = {}
+            jobs: list[tuple[None | str, list[tuple[str, str]], None | tuple[str, str]]] = []
+            for src, dst in (pairs.items() if isinstance(pairs, Mapping) else pairs):
+                if isinstance(src, (AttrDict, AlistPath)):
+                    src = cast(str, src["path"])
+                else:
+                    src = self.abspath(src)
+                if isinstance(dst, (AttrDict, AlistPath)):
+                    dst = cast(str, dst["path"])
+                elif isinstance(dst, str) and dst and "/" not in dst:
+                    dst = joinpath(dirname(src), dst)
+                else:
+                    dst = self.abspath(dst)
+                if src == dst:
+                    continue
+                src_dir, src_name = splitpath(src)
+                dst_dir, dst_name = splitpath(dst)
+                if src_dir == dst_dir:
+                    groups.setdefault(src_dir, {})[src_name] = dst_name
+                else:
+                    jobs.append((None, [(src, dst)], None))
+            jobs.extend((dir_, list(group.items()), None) for dir_, group in groups.items())
+            return (yield from self._batch_rename_step(
+                jobs, 
+                password, 
+                max_workers=max_workers, 
+                batch_size=batch_size, 
+                onerror=onerror, 
+                async_=async_, 
+            ))
+        return run_gen_step(gen_step, async_=async_)
+
+    @overload
+    def rename_by_rule(
+        self, 
+        /, 
+        rule: Callable[[str], None | str] | tuple[str, str], 
+        top: PathType = "", 
+        recursive: bool = False, 
+        password: str = "", 
+        max_workers: int = 8, 
+        batch_size: int = 1000, 
+        onerror: bool | Callable[[OSError], bool] = True, 
+        dry_run: bool = False, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> dict[str, str]:
+        ...
+    @overload
+    def rename_by_rule(
+        self, 
+        /, 
+        rule: Callable[[str], None | str] | tuple[str, str], 
+        top: PathType = "", 
+        recursive: bool = False, 
+        password: str = "", 
+        max_workers: int = 8, 
+        batch_size: int = 1000, 
+        onerror: bool | Callable[[OSError], bool] = True, 
+        dry_run: bool = False, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[Any, Any, dict[str, str]]:
+        ...
+    def rename_by_rule(
+        self, 
+        /, 
+        rule: Callable[[str], None | str] | tuple[str, str], 
+        top: PathType = "", 
+        recursive: bool = False, 
+        password: str = "", 
+        max_workers: int = 8, 
+        batch_size: int = 1000, 
+        onerror: bool | Callable[[OSError], bool] = True, 
+        dry_run: bool = False, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> dict[str, str] | Coroutine[Any, Any, dict[str, str]]:
+        """按规则批量改名目录中的项（并发罗列和改名各个目录）
+
+        - 规则是一个函数时，接受名字，返回新名字（返回 None 或原名则不改）
+        - 规则是 ``(pattern, repl)`` 时，对能搜索到 ``pattern`` 的名字执行 ``re.sub(pattern, repl, name)``；
+          如果这条规则可以原样交给服务器执行（转换为 Go 的正则语法），那么每个目录只需 1 次 ``fs_regex_rename``，
+          否则（以及规则是函数时）用 ``fs_batch_rename``
+        - 递归时，从最深的目录开始改名，所以也可以改目录的名字
+
+        :param rule: 改名规则
+        :param top: 顶层目录
+        :param recursive: 是否递归处理所有后代目录
+        :param password: 访问密码
+        :param max_workers: 最大并发数
+        :param batch_size: 每次 ``fs_batch_rename`` 请求最多包含的改名数，<= 0 时不限
+        :param onerror: 某个目录罗列或改名失败时的处理：如果是 True，则抛出异常；如果是 False，则忽略；如果是调用，则以异常为参数调用之
+        :param dry_run: 如果为 True，则只计算出改名的计划，而不执行
+        :param async_: 是否异步
+
+        :return: （已完成或计划中的）改名，从原路径到新路径的字典
+        """
+        if isinstance(top, (AttrDict, AlistPath)):
+            if not password:
+                password = top.get("password", "")
+            top = cast(str, top["path"])
+        else:
+            top = self.abspath(top)
+        convert: Callable[[str], None | str]
+        go_rule: None | tuple[str, str] = None
+        ascii_only = False
+        if callable(rule):
+            convert = rule
+        else:
+            pattern, repl = rule
+            cre = re_compile(pattern)
+            go_rule = _go_regex_rename(pattern, repl)
+            ascii_only = CRE_CHARCLASS_search(pattern) is not None
+            def convert(name: str, /) -> None | str:
+                if cre.search(name) is None:
+                    return None
+                return cre.sub(repl, name)
+        def gen_step():
+            listings: dict[str, list[str]] = {}
+            lister = ConcurrentLister(
+                lambda dir_: self.listdir_attr(dir_, password, async_=async_), 
+                max_workers=max_workers, 
+                async_=async_, 
+            )
+            try:
+                lister.submit(top)
+                while lister:
+                    dir_, ls = yield lister.get
+                    if isinstance(ls, BaseException):
+                        if not isinstance(ls, OSError):
+                            raise ls
+                        if callable(onerror):
+                            yield partial(onerror, ls)
+                        elif onerror:
+                            raise ls
+                        continue
+                    listings[dir_] = [attr["name"] for attr in ls]
+                    if recursive:
+                        for attr in ls:
+                            if attr["is_dir"]:
+                                lister.submit(attr["path"])
+            finally:
+                lister.close()
+            jobs: list[tuple[None | str, list[tuple[str, str]], None | tuple[str, str]]] = []
+            for dir_, names in listings.items():
+                pairs: list[tuple[str, str]] = []
+                regex = go_rule
+                for name in names:
+                    new_name = convert(name)
+                    if new_name is None:
+                        continue
+                    if new_name == name:
+                        # NOTE: 服务器会对每个匹配的名字都执行改名，即使新名字与原名相同
+                        regex = None
+                        continue
+                    pairs.append((name, new_name))
+                if not pairs:
+                    continue
+                if len(pairs) == 1 or ascii_only and not all(name.isascii() for name in names):
+                    regex = None
+                jobs.append((dir_, pairs, regex))
+            if dry_run:
+                return {
+                    joinpath(dir_, name): joinpath(dir_, new_name) 
+                    for dir_, pairs, _ in jobs 
+                    for name, new_name in pairs
+                }
+            return (yield from self._batch_rename_step(
+                jobs, 
+                password, 
+                max_workers=max_workers, 
+                batch_size=batch_size, 
+                onerror=onerror, 
+                async_=async_, 
+            ))
         return run_gen_step(gen_step, async_=async_)
 
     @overload
@@ -5511,6 +6952,7 @@ class AlistFileSystem:
         dirname: PathType = "", 
         ignore_case: bool = False, 
         password: str = "", 
+        use_search: bool = True, 
         *, 
         async_: Literal[False] = False, 
     ) -> Iterator[AlistPath]:
@@ -5523,6 +6965,7 @@ class AlistFileSystem:
         dirname: PathType = "", 
         ignore_case: bool = False, 
         password: str = "", 
+        use_search: bool = True, 
         *, 
         async_: Literal[True], 
     ) -> AsyncIterator[AlistPath]:
@@ -5534,6 +6977,7 @@ class AlistFileSystem:
         dirname: PathType = "", 
         ignore_case: bool = False, 
         password: str = "", 
+        use_search: bool = True, 
         *, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[AlistPath] | AsyncIterator[AlistPath]:
@@ -5543,7 +6987,7 @@ class AlistFileSystem:
             pattern = joinpath("/", "**", pattern.lstrip("/"))
         else:
             pattern = joinpath("**", pattern)
-        return self.glob(pattern, dirname, password=password, ignore_case=ignore_case, async_=async_)
+        return self.glob(pattern, dirname, password=password, ignore_case=ignore_case, use_search=use_search, async_=async_)
 
     @overload
     def rmdir(
@@ -5690,6 +7134,137 @@ class AlistFileSystem:
                 )
             )
 
+    def _search_step(
+        self, 
+        /, 
+        keywords: str, 
+        top: str, 
+        scope: Literal[0, 1, 2] = 0, 
+        password: str = "", 
+        per_page: int = 1000, 
+        max_workers: int = 4, 
+        predicate: None | Callable[[str], bool] = None, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ):
+        """逐页搜索，产出（通过 ``predicate`` 筛选的）路径，供 gen_step 使用 ``yield from``
+
+        第 1 页的响应中有 ``total``，据此算出页数后，其余的页交给 ``ConcurrentLister`` 并发拉取，按完成的先后产出
+        """
+        def make_paths(content: None | list[dict], /) -> list[AlistPath]:
+            paths = []
+            for item in content or ():
+                path = joinpath(item["parent"], item["name"])
+                if predicate is None or predicate(path):
+                    paths.append(AlistPath(self, path, password, name=item["name"], is_dir=item["is_dir"], size=item["size"]))
+            return paths
+        def fetch(page: int, /):
+            return self.fs_search(
+                keywords, 
+                top, 
+                scope=scope, 
+                page=page, 
+                per_page=per_page, 
+                password=password, 
+                async_=async_, 
+            )
+        resp = yield fetch(1)
+        data = resp["data"]
+        content = data["content"]
+        yield YieldFrom(make_paths(content))
+        if per_page <= 0 or not content or len(content) < per_page:
+            return
+        last_page = -(-(data.get("total") or 0) // per_page)
+        if last_page <= 1:
+            return
+        if max_workers <= 1:
+            for page in range(2, last_page + 1):
+                resp = yield fetch(page)
+                yield YieldFrom(make_paths(resp["data"]["content"]))
+            return
+        lister = ConcurrentLister(fetch, max_workers=max_workers, async_=async_)
+        try:
+            for page in range(2, last_page + 1):
+                lister.submit(page)
+            while lister:
+                _, resp = yield lister.get
+                if isinstance(resp, BaseException):
+                    raise resp
+                yield YieldFrom(make_paths(resp["data"]["content"]))
+        finally:
+            lister.close()
+
+    @overload
+    def search(
+        self, 
+        /, 
+        keywords: str, 
+        dirname: PathType = "", 
+        scope: Literal[0, 1, 2] = 0, 
+        password: str = "", 
+        per_page: int = 1000, 
+        max_workers: int = 4, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> Iterator[AlistPath]:
+        ...
+    @overload
+    def search(
+        self, 
+        /, 
+        keywords: str, 
+        dirname: PathType = "", 
+        scope: Literal[0, 1, 2] = 0, 
+        password: str = "", 
+        per_page: int = 1000, 
+        max_workers: int = 4, 
+        *, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[AlistPath]:
+        ...
+    def search(
+        self, 
+        /, 
+        keywords: str, 
+        dirname: PathType = "", 
+        scope: Literal[0, 1, 2] = 0, 
+        password: str = "", 
+        per_page: int = 1000, 
+        max_workers: int = 4, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[AlistPath] | AsyncIterator[AlistPath]:
+        """使用服务端的搜索索引进行搜索（需要服务器启用了搜索索引），各页被并发拉取
+
+        :param keywords: 关键词
+        :param dirname: 搜索的目录
+        :param scope: 范围：0:全部 1:文件夹 2:文件
+        :param password: 密码
+        :param per_page: 每页数目
+        :param max_workers: 并发拉取的最大页数，<= 1 时逐页拉取
+        :param async_: 是否异步
+
+        :return: 迭代器，产出搜索到的路径（各页按拉取完成的先后产出）
+        """
+        def gen_step():
+            nonlocal dirname, password
+            if isinstance(dirname, (AttrDict, AlistPath)):
+                if not password:
+                    password = dirname.get("password", "")
+                dirname = cast(str, dirname["path"])
+            else:
+                dirname = self.abspath(dirname)
+            yield from self._search_step(
+                keywords, 
+                dirname, 
+                scope=scope, 
+                password=password, 
+                per_page=per_page, 
+                max_workers=max_workers, 
+                async_=async_, 
+            )
+        return run_gen_step_iter(gen_step, async_=async_)
+
     @overload
     def stat(
         self, 
@@ -5773,7 +7348,9 @@ class AlistFileSystem:
             else:
                 path = self.abspath(path)
             try:
-                storages = yield self.list_storages(async_=async_)
+                index = self.client.storage_index
+                if index.expired:
+                    yield self.list_storages(async_=async_)
             except PermissionError:
                 if path == "/":
                     return "/"
@@ -5789,14 +7366,7 @@ class AlistFileSystem:
                         pass
                 return path
             else:
-                storage = "/"
-                for s in storages:
-                    mount_path = s["mount_path"]
-                    if path == mount_path:
-                        return mount_path
-                    elif commonpath((path, mount_path)) == mount_path and len(mount_path) > len(storage):
-                        storage = mount_path
-                return storage
+                return index.mount_path_of(path)
         return run_gen_step(gen_step, async_=async_)
 
     def tree(
@@ -5905,6 +7475,7 @@ class AlistFileSystem:
         overwrite: bool = False, 
         remove_done: bool = False, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
         async_: Literal[False] = False, 
     ) -> str:
         ...
@@ -5920,6 +7491,7 @@ class AlistFileSystem:
         overwrite: bool = False, 
         remove_done: bool = False, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
         async_: Literal[True], 
     ) -> Coroutine[Any, Any, str]:
         ...
@@ -5934,6 +7506,7 @@ class AlistFileSystem:
         overwrite: bool = False, 
         remove_done: bool = False, 
         *, 
+        hashes: str | Iterable[str] | Mapping[str, str] = (), 
         async_: Literal[False, True] = False, 
     ) -> str | Coroutine[Any, Any, str]:
         def gen_step():
@@ -5967,10 +7540,12 @@ class AlistFileSystem:
                     yield self.fs_remove(dir_, [name], async_=async_)
                 else:
                     raise FileExistsError(errno.EEXIST, path)
-            yield self.fs_form(
+            # NOTE: 能直接确定大小时用 put 接口（带上 Content-Length），否则会自动改用表单接口，都是流式的
+            yield self.fs_put(
                 file, # type: ignore
                 path, 
                 as_task=as_task, 
+                hashes=hashes, 
                 async_=async_, # type: ignore
             )
             if remove_done and isinstance(file, (str, PathLike)):
@@ -5981,6 +7556,199 @@ class AlistFileSystem:
             return path
         return run_gen_step(gen_step, async_=async_)
 
+    def _upload_tree_concurrent(
+        self, 
+        /, 
+        local_path: str | PathLike[str] = ".", 
+        path: PathType = "", 
+        password: str = "", 
+        as_task: bool = False, 
+        no_root: bool = False, 
+        overwrite: bool = False, 
+        remove_done: bool = False, 
+        predicate: None | Callable[[Path], bool] = None, 
+        onerror: bool | Callable[[OSError], bool] = True, 
+        max_workers: int = 8, 
+        max_bytes: int = 0, 
+        engine: None | TransferEngine = None, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[str] | AsyncIterator[str]:
+        """并发版本的 ``upload_tree``
+
+        先遍历本地目录树，并（并发地）罗列远程对应的目录树作为对照，然后逐层创建缺失的远程目录，
+        最后把文件提交给传输引擎。远程文件的大小相同，且修改时间不早于本地时，会被跳过。结果按上传完成的先后产出
+        """
+        def gen_step():
+            nonlocal path, password, engine
+            try:
+                attr = yield self.attr(path, password, async_=async_)
+                path = cast(str, attr["path"])
+                if not password:
+                    password = attr["password"]
+                if not attr["is_dir"]:
+                    raise NotADirectoryError(errno.ENOTDIR, path)
+            except OSError as e:
+                if callable(onerror):
+                    yield partial(onerror, e)
+                elif onerror:
+                    raise
+                return
+            own_engine = engine is None
+            if engine is None:
+                engine = TransferEngine(max_workers, max_bytes, async_=async_)
+            stats = engine.stats
+            local_top = fsdecode(local_path)
+            # NOTE: 需要上传的文件 [(本地路径, 远程路径, 本地属性)]，和需要存在的远程目录
+            files: list[tuple[str, str, stat_result]] = []
+            dirs: list[str] = []
+            if ospath.isdir(local_top):
+                top = path if no_root else joinpath(path, ospath.basename(ospath.abspath(local_top)))
+                dirs.append(top)
+                def walk_onerror(e: OSError):
+                    if callable(onerror):
+                        onerror(e)
+                    elif onerror:
+                        raise e
+                for root, dirnames, filenames in os_walk(local_top, onerror=walk_onerror):
+                    remote_dir = normpath(joinpath(top, ospath.relpath(root, local_top).replace(ospath.sep, "/")))
+                    if predicate is not None:
+                        dirnames[:] = (n for n in dirnames if predicate(Path(root, n)))
+                        filenames = [n for n in filenames if predicate(Path(root, n))]
+                    dirs.extend(joinpath(remote_dir, n) for n in dirnames)
+                    for name in filenames:
+                        file = ospath.join(root, name)
+                        try:
+                            files.append((file, joinpath(remote_dir, name), os_stat(file)))
+                        except OSError as e:
+                            walk_onerror(e)
+            else:
+                top = path
+                try:
+                    files.append((local_top, joinpath(path, ospath.basename(local_top)), os_stat(local_top)))
+                except OSError as e:
+                    if callable(onerror):
+                        yield partial(onerror, e)
+                    elif onerror:
+                        raise
+                    return
+            # NOTE: 罗列远程的目录树，只进入本地也存在的目录
+            dirset = set(dirs)
+            remote: dict[str, AttrDict] = {}
+            existing_dirs: set[str] = set()
+            lister = None
+            batch = engine.batch()
+            try:
+                if dirs:
+                    try:
+                        top_attr = yield self.attr(top, password, async_=async_)
+                    except FileNotFoundError:
+                        pass
+                    else:
+                        lister = yield self._make_lister(
+                            engine.max_workers, 
+                            0, 
+                            password, 
+                            async_=async_, 
+                        )
+                        lister.submit((0, top_attr))
+                        while lister:
+                            (_, dir_attr), ls = yield lister.get
+                            if isinstance(ls, BaseException):
+                                if not isinstance(ls, OSError):
+                                    raise ls
+                                if callable(onerror):
+                                    yield partial(onerror, ls)
+                                elif onerror:
+                                    raise ls
+                                continue
+                            existing_dirs.add(dir_attr["path"])
+                            for subattr in ls:
+                                remote[subattr["path"]] = subattr
+                                if subattr["is_dir"] and subattr["path"] in dirset:
+                                    lister.submit((0, subattr))
+                else:
+                    ls = yield self.listdir_attr(path, password, async_=async_)
+                    remote.update((a["path"], a) for a in ls)
+                # NOTE: 逐层创建缺失的目录，同一层的目录并发创建
+                levels: dict[int, list[str]] = {}
+                for dir_ in dirs:
+                    if dir_ not in existing_dirs:
+                        levels.setdefault(dir_.count("/"), []).append(dir_)
+                if levels:
+                    mkdir = ConcurrentLister(
+                        lambda dir_: self.fs_mkdir(dir_, async_=async_), 
+                        max_workers=engine.max_workers, 
+                        async_=async_, 
+                    )
+                    try:
+                        for _, level in sorted(levels.items()):
+                            for dir_ in level:
+                                mkdir.submit(dir_)
+                            while mkdir:
+                                dir_, resp = yield mkdir.get
+                                if isinstance(resp, BaseException):
+                                    if callable(onerror):
+                                        yield partial(onerror, resp)
+                                    elif onerror:
+                                        raise resp
+                                else:
+                                    stats.add_dir()
+                    finally:
+                        mkdir.close()
+                def upload(file: str, remote_path: str, exists: bool, /):
+                    def gen_step():
+                        if exists:
+                            dir_, name = splitpath(remote_path)
+                            yield self.fs_remove(dir_, [name], async_=async_)
+                        yield self.fs_put(
+                            file, 
+                            remote_path, 
+                            as_task=as_task, 
+                            async_=async_, 
+                        )
+                        if remove_done:
+                            try:
+                                remove(file)
+                            except OSError:
+                                pass
+                        return remote_path
+                    return run_gen_step(gen_step, async_=async_)
+                for file, remote_path, st in files:
+                    exists = remote_path in remote
+                    if exists:
+                        rattr = remote[remote_path]
+                        if not rattr["is_dir"] and rattr["size"] == st.st_size and rattr["mtime"] >= st.st_mtime:
+                            stats.add_skipped(st.st_size)
+                            continue
+                        elif not overwrite:
+                            e = FileExistsError(errno.EEXIST, remote_path)
+                            if callable(onerror):
+                                yield partial(onerror, e)
+                            elif onerror:
+                                raise e
+                            continue
+                    batch.submit(remote_path, st.st_size, partial(upload, file, remote_path, exists))
+                while batch:
+                    remote_path, ret = yield batch.get
+                    if isinstance(ret, BaseException):
+                        if isinstance(ret, (KeyboardInterrupt, GeneratorExit)):
+                            raise ret
+                        if callable(onerror):
+                            yield partial(onerror, ret)
+                        elif onerror:
+                            raise ret
+                    else:
+                        yield Yield(ret)
+                return top
+            finally:
+                if lister is not None:
+                    lister.close()
+                batch.close()
+                if own_engine:
+                    engine.shutdown()
+        return run_gen_step_iter(gen_step, async_=async_)
+
     @overload
     def upload_tree(
         self, 
@@ -5995,6 +7763,9 @@ class AlistFileSystem:
         predicate: None | Callable[[Path], bool] = None, 
         onerror: bool | Callable[[OSError], bool] = True, 
         *, 
+        max_workers: int = 1, 
+        max_bytes: int = 0, 
+        engine: None | TransferEngine = None, 
         async_: Literal[False] = False, 
     ) -> Iterator[str]:
         ...
@@ -6012,6 +7783,9 @@ class AlistFileSystem:
         predicate: None | Callable[[Path], bool] = None, 
         onerror: bool | Callable[[OSError], bool] = True, 
         *, 
+        max_workers: int = 1, 
+        max_bytes: int = 0, 
+        engine: None | TransferEngine = None, 
         async_: Literal[True], 
     ) -> AsyncIterator[str]:
         ...
@@ -6028,8 +7802,27 @@ class AlistFileSystem:
         predicate: None | Callable[[Path], bool] = None, 
         onerror: bool | Callable[[OSError], bool] = True, 
         *, 
+        max_workers: int = 1, 
+        max_bytes: int = 0, 
+        engine: None | TransferEngine = None, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[str] | AsyncIterator[str]:
+        if engine is not None or max_workers > 1:
+            return self._upload_tree_concurrent(
+                local_path, 
+                path, 
+                password=password, 
+                as_task=as_task, 
+                no_root=no_root, 
+                overwrite=overwrite, 
+                remove_done=remove_done, 
+                predicate=predicate, 
+                onerror=onerror, 
+                max_workers=max_workers, 
+                max_bytes=max_bytes, 
+                engine=engine, 
+                async_=async_, 
+            )
         def gen_step():
             nonlocal path, password
             try:
@@ -6088,6 +7881,154 @@ class AlistFileSystem:
 
     unlink = remove
 
+    def _walk_attr_bfs_concurrent(
+        self, 
+        /, 
+        top: PathType = "", 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        password: str = "", 
+        refresh: None | bool = None, 
+        max_workers: int = 8, 
+        max_workers_per_storage: int = 0, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[AttrDict], list[AttrDict]]] | AsyncIterator[tuple[str, list[AttrDict], list[AttrDict]]]:
+        """并发版本的 ``walk_attr_bfs``，多个目录被同时罗列，结果按罗列完成的先后产出，而不是严格地逐层产出
+
+        一个目录的子目录在它的罗列结果被消费后立即提交，层与层之间没有屏障（这样一个慢的存储不会拖住其它存储），
+        所以较深的目录可能先于较浅的兄弟目录产出，但每个目录总是在它的父目录之后产出
+        """
+        def gen_step():
+            nonlocal password
+            attr = yield self.attr(top, password, async_=async_)
+            password = attr["password"]
+            if not (min_depth <= 1 or max_depth < 0 or 1 < max_depth):
+                return
+            lister = yield self._make_lister(
+                max_workers, 
+                max_workers_per_storage, 
+                password, 
+                refresh, 
+                async_=async_, 
+            )
+            try:
+                lister.submit((1, attr))
+                while lister:
+                    (depth, parent), ls = yield lister.get
+                    if isinstance(ls, BaseException):
+                        if not isinstance(ls, OSError):
+                            raise ls
+                        if callable(onerror):
+                            yield partial(onerror, ls)
+                        elif onerror:
+                            raise ls
+                        continue
+                    iter_me = min_depth <= 0 or depth >= min_depth
+                    push_me = max_depth < 0 or depth < max_depth
+                    dirs: list[AttrDict] = []
+                    files: list[AttrDict] = []
+                    for attr in ls:
+                        if attr["is_dir"]:
+                            dirs.append(attr)
+                            if push_me and (min_depth <= depth + 1 or max_depth < 0 or depth + 1 < max_depth):
+                                lister.submit((depth + 1, attr))
+                        else:
+                            files.append(attr)
+                    if iter_me:
+                        yield Yield((parent["path"], dirs, files))
+            finally:
+                lister.close()
+        return run_gen_step_iter(gen_step, async_=async_)
+
+    def _walk_attr_dfs_concurrent(
+        self, 
+        /, 
+        top: PathType = "", 
+        topdown: bool = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        password: str = "", 
+        refresh: None | bool = None, 
+        max_workers: int = 8, 
+        max_workers_per_storage: int = 0, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[AttrDict], list[AttrDict]]] | AsyncIterator[tuple[str, list[AttrDict], list[AttrDict]]]:
+        """并发版本的 ``walk_attr_dfs``，产出的顺序与串行版本一致
+
+        进入一个目录时，会把它所有待进入的子目录一起提交罗列，等到真正进入时，罗列结果大多已经就绪了
+        """
+        def gen_step():
+            nonlocal password
+            if not max_depth:
+                return
+            try:
+                attr = yield self.attr(top, password, async_=async_)
+                if not password:
+                    password = attr.get("password", "")
+            except OSError as e:
+                if callable(onerror):
+                    yield partial(onerror, e)
+                elif onerror:
+                    raise
+                return
+            lister = yield self._make_lister(
+                max_workers, 
+                max_workers_per_storage, 
+                password, 
+                refresh, 
+                async_=async_, 
+            )
+            # NOTE: 已经罗列完成但尚未被进入的目录
+            done: dict[str, Any] = {}
+            def walk(attr: AttrDict, min_depth: int, max_depth: int, /):
+                def gen_step():
+                    nonlocal min_depth, max_depth
+                    if min_depth > 0:
+                        min_depth -= 1
+                    if max_depth > 0:
+                        max_depth -= 1
+                    yield_me = min_depth <= 0
+                    top = attr["path"]
+                    while top not in done:
+                        (_, attr_), ls = yield lister.get
+                        done[attr_["path"]] = ls
+                    ls = done.pop(top)
+                    if isinstance(ls, BaseException):
+                        if not isinstance(ls, OSError):
+                            raise ls
+                        if callable(onerror):
+                            yield partial(onerror, ls)
+                        elif onerror:
+                            raise ls
+                        return
+                    dirs: list[AttrDict] = []
+                    files: list[AttrDict] = []
+                    for subattr in ls:
+                        if subattr["is_dir"]:
+                            dirs.append(subattr)
+                            if max_depth:
+                                lister.submit((0, subattr))
+                        else:
+                            files.append(subattr)
+                    if yield_me and topdown:
+                        yield Yield((top, dirs, files))
+                    if max_depth:
+                        for subattr in dirs:
+                            yield YieldFrom(walk(subattr, min_depth, max_depth))
+                    if yield_me and not topdown:
+                        yield Yield((top, dirs, files))
+                return run_gen_step_iter(gen_step, async_=async_)
+            try:
+                lister.submit((0, attr))
+                yield YieldFrom(walk(attr, min_depth, max_depth))
+            finally:
+                lister.close()
+        return run_gen_step_iter(gen_step, async_=async_)
+
     @overload
     def walk_attr_bfs(
         self, 
@@ -6099,6 +8040,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[AttrDict], list[AttrDict]]]:
         ...
@@ -6113,6 +8056,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[True], 
     ) -> AsyncIterator[tuple[str, list[AttrDict], list[AttrDict]]]:
         ...
@@ -6126,8 +8071,22 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[tuple[str, list[AttrDict], list[AttrDict]]] | AsyncIterator[tuple[str, list[AttrDict], list[AttrDict]]]:
+        if max_workers > 1:
+            return self._walk_attr_bfs_concurrent(
+                top, 
+                min_depth=min_depth, 
+                max_depth=max_depth, 
+                onerror=onerror, 
+                password=password, 
+                refresh=refresh, 
+                max_workers=max_workers, 
+                max_workers_per_storage=max_workers_per_storage, 
+                async_=async_, 
+            )
         def gen_step():
             nonlocal password
             attr = yield self.attr(top, password, async_=async_)
@@ -6176,6 +8135,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[AttrDict], list[AttrDict]]]:
         ...
@@ -6191,6 +8152,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[True], 
     ) -> AsyncIterator[tuple[str, list[AttrDict], list[AttrDict]]]:
         ...
@@ -6205,8 +8168,23 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[tuple[str, list[AttrDict], list[AttrDict]]] | AsyncIterator[tuple[str, list[AttrDict], list[AttrDict]]]:
+        if max_workers > 1:
+            return self._walk_attr_dfs_concurrent(
+                top, 
+                topdown=topdown, 
+                min_depth=min_depth, 
+                max_depth=max_depth, 
+                onerror=onerror, 
+                password=password, 
+                refresh=refresh, 
+                max_workers=max_workers, 
+                max_workers_per_storage=max_workers_per_storage, 
+                async_=async_, 
+            )
         def gen_step():
             nonlocal top, password, min_depth, max_depth
             if not max_depth:
@@ -6266,6 +8244,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[str], list[str]]]:
         ...
@@ -6281,6 +8261,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[True], 
     ) -> AsyncIterator[tuple[str, list[str], list[str]]]:
         ...
@@ -6295,6 +8277,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[tuple[str, list[str], list[str]]] | AsyncIterator[tuple[str, list[str], list[str]]]:
         if async_:
@@ -6308,6 +8292,8 @@ class AlistFileSystem:
                     onerror=onerror, 
                     password=password, 
                     refresh=refresh, 
+                    max_workers=max_workers, 
+                    max_workers_per_storage=max_workers_per_storage, 
                     async_=True, 
                 )
             )
@@ -6322,6 +8308,8 @@ class AlistFileSystem:
                     onerror=onerror, 
                     password=password, 
                     refresh=refresh, 
+                    max_workers=max_workers, 
+                    max_workers_per_storage=max_workers_per_storage, 
                 )
             )
 
@@ -6337,6 +8325,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[AttrDict], list[AttrDict]]]:
         ...
@@ -6352,6 +8342,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[True], 
     ) -> AsyncIterator[tuple[str, list[AttrDict], list[AttrDict]]]:
         ...
@@ -6366,6 +8358,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[tuple[str, list[AttrDict], list[AttrDict]]] | AsyncIterator[tuple[str, list[AttrDict], list[AttrDict]]]:
         if topdown is None:
@@ -6376,6 +8370,8 @@ class AlistFileSystem:
                 onerror=onerror, 
                 password=password, 
                 refresh=refresh, 
+                max_workers=max_workers, 
+                max_workers_per_storage=max_workers_per_storage, 
                 async_=async_, # type: ignore
             )
         else:
@@ -6387,6 +8383,8 @@ class AlistFileSystem:
                 onerror=onerror, 
                 password=password, 
                 refresh=refresh, 
+                max_workers=max_workers, 
+                max_workers_per_storage=max_workers_per_storage, 
                 async_=async_, # type: ignore
             )
 
@@ -6402,6 +8400,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[AlistPath], list[AlistPath]]]:
         ...
@@ -6417,6 +8417,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[True], 
     ) -> AsyncIterator[tuple[str, list[AlistPath], list[AlistPath]]]:
         ...
@@ -6431,6 +8433,8 @@ class AlistFileSystem:
         password: str = "", 
         refresh: None | bool = None, 
         *, 
+        max_workers: int = 1, 
+        max_workers_per_storage: int = 0, 
         async_: Literal[False, True] = False, 
     ) -> Iterator[tuple[str, list[AlistPath], list[AlistPath]]] | AsyncIterator[tuple[str, list[AlistPath], list[AlistPath]]]:
         if async_:
@@ -6444,6 +8448,8 @@ class AlistFileSystem:
                     onerror=onerror, 
                     password=password, 
                     refresh=refresh, 
+                    max_workers=max_workers, 
+                    max_workers_per_storage=max_workers_per_storage, 
                     async_=True, 
                 )
             )
@@ -6458,6 +8464,8 @@ class AlistFileSystem:
                     onerror=onerror, 
                     password=password, 
                     refresh=refresh, 
+                    max_workers=max_workers, 
+                    max_workers_per_storage=max_workers_per_storage, 
                 )
             )
 
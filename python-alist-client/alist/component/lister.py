@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+from __future__ import annotations
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["ConcurrentLister"]
+
+from asyncio import create_task, CancelledError, Event, Queue as AsyncQueue
+from collections import defaultdict, deque
+from collections.abc import Callable, Coroutine, Hashable
+from queue import Empty, Full, Queue
+from threading import Condition, Thread
+from typing import Any
+
+
+class ConcurrentLister:
+    """并发地罗列目录的工作池：提交待罗列的项，按完成顺序取回结果
+
+    - 同步模式使用线程，异步模式使用协程任务，总并发数不超过 ``max_workers``
+    - 可以用 ``key`` 对提交的项进行分组（比如按所在的存储），每组的并发数不超过 ``max_workers_per_key``，
+      各组之间轮流调度，所以一个慢的后端不会拖住其它的后端
+    - 结果通过一个有界队列传递，消费者来不及处理时，工作者会暂停罗列（背压）
+
+    :param listdir: 罗列函数，接受一个项，返回罗列结果（异步模式下返回可等待对象）
+    :param max_workers: 最大并发数
+    :param key: 分组函数，为 None 时不分组
+    :param max_workers_per_key: 每组的最大并发数，<= 0 时不限
+    :param maxsize: 结果队列的最大长度，<= 0 时为 ``2 * max_workers``
+    :param async_: 是否异步
+    """
+    def __init__(
+        self, 
+        /, 
+        listdir: Callable, 
+        max_workers: int = 8, 
+        key: None | Callable[[Any], Hashable] = None, 
+        max_workers_per_key: int = 0, 
+        maxsize: int = 0, 
+        async_: bool = False, 
+    ):
+        if max_workers <= 0:
+            max_workers = 1
+        if maxsize <= 0:
+            maxsize = 2 * max_workers
+        self.listdir = listdir
+        self.max_workers = max_workers
+        self.key = key
+        self.max_workers_per_key = max_workers_per_key
+        self.async_ = async_
+        self.pending: defaultdict[Hashable, deque] = defaultdict(deque)
+        self.keys: deque[Hashable] = deque()
+        self.running: defaultdict[Hashable, int] = defaultdict(int)
+        self.outstanding = 0
+        self.closed = False
+        self.workers: list = []
+        self.results: Queue | AsyncQueue
+        if async_:
+            self.results = AsyncQueue(maxsize)
+            self.wakeup = Event()
+        else:
+            self.results = Queue(maxsize)
+            self.cond = Condition()
+
+    def __bool__(self, /) -> bool:
+        return self.outstanding > 0
+
+    def __del__(self, /):
+        self.close()
+
+    def _take(self, /) -> None | tuple[Hashable, Any]:
+        "按组轮流取出下一个可以执行的项（及其分组），没有时返回 None"
+        keys, pending, running = self.keys, self.pending, self.running
+        limit = self.max_workers_per_key
+        for _ in range(len(keys)):
+            k = keys[0]
+            keys.rotate(-1)
+            if limit <= 0 or running[k] < limit:
+                dq = pending[k]
+                item = dq.popleft()
+                if not dq:
+                    keys.remove(k)
+                    del pending[k]
+                running[k] += 1
+                return k, item
+        return None
+
+    def _push(self, k, item, /):
+        pending = self.pending
+        if k not in pending:
+            self.keys.append(k)
+        pending[k].append(item)
+
+    def _release(self, k, /):
+        running = self.running
+        running[k] -= 1
+        if not running[k]:
+            del running[k]
+
+    def _work(self, /):
+        cond, listdir, results = self.cond, self.listdir, self.results
+        while True:
+            with cond:
+                while True:
+                    if self.closed:
+                        return
+                    if (task := self._take()) is not None:
+                        break
+                    cond.wait()
+            k, item = task
+            try:
+                result = listdir(item)
+            except BaseException as e:
+                result = e
+            finally:
+                with cond:
+                    self._release(k)
+                    cond.notify_all()
+            while not self.closed:
+                try:
+                    results.put((item, result), timeout=0.1) # type: ignore
+                    break
+                except Full:
+                    pass
+
+    async def _async_work(self, /):
+        wakeup, listdir, results = self.wakeup, self.listdir, self.results
+        while True:
+            # NOTE: 在事件循环中，检查和等待之间没有切换，所以不会错过唤醒
+            while (task := self._take()) is None:
+                if self.closed:
+                    return
+                wakeup.clear()
+                await wakeup.wait()
+            if self.closed:
+                return
+            k, item = task
+            try:
+                result = await listdir(item)
+            except CancelledError:
+                raise
+            except BaseException as e:
+                result = e
+            finally:
+                self._release(k)
+                wakeup.set()
+            await results.put((item, result))
+
+    def submit(self, item, /):
+        "提交一个待罗列的项"
+        if self.closed:
+            raise RuntimeError("lister is closed")
+        k = self.key(item) if self.key else None
+        self.outstanding += 1
+        workers = self.workers
+        if self.async_:
+            self._push(k, item)
+            if len(workers) < min(self.max_workers, self.outstanding):
+                workers.append(create_task(self._async_work()))
+            self.wakeup.set()
+        else:
+            with self.cond:
+                self._push(k, item)
+                self.cond.notify()
+            if len(workers) < min(self.max_workers, self.outstanding):
+                thread = Thread(target=self._work, daemon=True)
+                thread.start()
+                workers.append(thread)
+
+    def get(self, /) -> tuple[Any, Any] | Coroutine[Any, Any, tuple[Any, Any]]:
+        """按完成顺序取回一个结果 ``(item, result)``，如果罗列时抛出了异常，则 ``result`` 就是这个异常
+
+        异步模式下返回协程。调用前需要确保 ``bool(self)`` 为真，否则会一直等待
+        """
+        if self.async_:
+            async def get():
+                ret = await self.results.get()
+                self.outstanding -= 1
+                return ret
+            return get()
+        ret = self.results.get()
+        self.outstanding -= 1
+        return ret
+
+    def close(self, /):
+        "关闭工作池，丢弃尚未开始的项（这是一个同步方法，可以在生成器的 finally 中调用）"
+        if self.__dict__.get("closed", True):
+            return
+        self.closed = True
+        if self.async_:
+            self.pending.clear()
+            self.keys.clear()
+            for task in self.workers:
+                task.cancel()
+        else:
+            with self.cond:
+                self.pending.clear()
+                self.keys.clear()
+                self.cond.notify_all()
+            results = self.results
+            while True:
+                try:
+                    results.get_nowait()
+                except Empty:
+                    break
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+from __future__ import annotations
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["AlistStorageIndex"]
+
+from asyncio import Lock as AsyncLock
+from collections.abc import Coroutine, Iterable
+from threading import Lock
+from time import time
+from typing import overload, Any, Literal
+
+from .client import check_response, AlistClient
+
+
+class AlistStorageIndex:
+    """存储的索引：按挂载路径建立前缀树，在 O(路径深度) 内找到任一路径所属的存储，无需发请求
+
+    - 罗列存储的结果会缓存 ``ttl`` 秒，过期后，下一次查询时才会重新罗列（并发的查询只会罗列一次）
+    - 增删改存储后，需要调用 ``invalidate()``，``AlistFileSystem`` 的 ``fs_storage_*`` 方法会自动调用
+    - 每个 ``AlistClient`` 有一个共享的索引 ``client.storage_index``
+
+    :param client: 客户端
+    :param ttl: 缓存的存活时间（秒），<= 0 时永不过期（除非调用 ``invalidate()``）
+    """
+    def __init__(
+        self, 
+        /, 
+        client: str | AlistClient, 
+        ttl: float = 60, 
+    ):
+        if isinstance(client, str):
+            client = AlistClient.from_auth(client)
+        self.client = client
+        self.ttl = ttl
+        self.storages: list[dict] = []
+        self.expire = 0.0
+        # NOTE: 前缀树的节点形如 [storage, children]，storage 是挂载在此路径上的存储（没有则为 None）
+        self._root: list = [None, {}]
+        self._lock = Lock()
+        self._async_lock: None | AsyncLock = None
+
+    def __contains__(self, path: str, /) -> bool:
+        return self.find(path) is not None
+
+    def __len__(self, /) -> int:
+        return len(self.storages)
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(client={self.client!r}, ttl={self.ttl!r}, storages={len(self.storages)}, expired={self.expired!r})"
+
+    @property
+    def expired(self, /) -> bool:
+        return self.expire <= time()
+
+    def set(self, storages: Iterable[dict], /):
+        "用存储列表重建索引"
+        storages = list(storages)
+        root: list = [None, {}]
+        for storage in storages:
+            node = root
+            for part in storage["mount_path"].split("/"):
+                if part:
+                    node = node[1].setdefault(part, [None, {}])
+            node[0] = storage
+        ttl = self.ttl
+        self.storages = storages
+        self._root = root
+        self.expire = time() + ttl if ttl > 0 else float("inf")
+
+    def invalidate(self, /):
+        "使索引过期，下一次查询时会重新罗列存储"
+        self.expire = 0.0
+
+    def find(self, path: str, /) -> None | dict:
+        "找到路径所属的存储（挂载路径是其自身或祖先的存储中，最深的那个），只查询现有的索引，不会发请求"
+        node = self._root
+        storage = node[0]
+        for part in path.split("/"):
+            if not part:
+                continue
+            node = node[1].get(part)
+            if node is None:
+                break
+            if node[0] is not None:
+                storage = node[0]
+        return storage
+
+    def mount_path_of(self, path: str, /) -> str:
+        "找到路径所属的存储的挂载路径，只查询现有的索引，不会发请求，找不到时返回 '/'"
+        storage = self.find(path)
+        return "/" if storage is None else storage["mount_path"]
+
+    @overload
+    def refresh(
+        self, 
+        /, 
+        force: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
+        **request_kwargs, 
+    ) -> list[dict]:
+        ...
+    @overload
+    def refresh(
+        self, 
+        /, 
+        force: bool = True, 
+        *, 
+        async_: Literal[True], 
+        **request_kwargs, 
+    ) -> Coroutine[Any, Any, list[dict]]:
+        ...
+    def refresh(
+        self, 
+        /, 
+        force: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+        **request_kwargs, 
+    ) -> list[dict] | Coroutine[Any, Any, list[dict]]:
+        """重新罗列存储，并重建索引
+
+        :param force: 如果为 False，则仅在索引过期时才罗列
+        :param async_: 是否异步
+        :param request_kwargs: 其它请求参数
+
+        :return: 存储列表
+        """
+        payload = {"page": 1, "per_page": 0}
+        if async_:
+            async def request():
+                lock = self._async_lock
+                if lock is None:
+                    lock = self._async_lock = AsyncLock()
+                expire = self.expire
+                async with lock:
+                    # NOTE: 等待锁的期间，如果已经被别人刷新过了，就不必再刷新
+                    if (force and self.expire == expire) or self.expired:
+                        resp = await self.client.admin_storage_list(payload, async_=True, **request_kwargs)
+                        self.set(check_response(resp)["data"]["content"] or [])
+                    return self.storages
+            return request()
+        expire = self.expire
+        with self._lock:
+            if (force and self.expire == expire) or self.expired:
+                resp = self.client.admin_storage_list(payload, **request_kwargs)
+                self.set(check_response(resp)["data"]["content"] or [])
+            return self.storages
+
+    @overload
+    def get(
+        self, 
+        /, 
+        path: str, 
+        *, 
+        async_: Literal[False] = False, 
+        **request_kwargs, 
+    ) -> None | dict:
+        ...
+    @overload
+    def get(
+        self, 
+        /, 
+        path: str, 
+        *, 
+        async_: Literal[True], 
+        **request_kwargs, 
+    ) -> Coroutine[Any, Any, None | dict]:
+        ...
+    def get(
+        self, 
+        /, 
+        path: str, 
+        *, 
+        async_: Literal[False, True] = False, 
+        **request_kwargs, 
+    ) -> None | dict | Coroutine[Any, Any, None | dict]:
+        """获取路径所属的存储，仅在索引过期时才会罗列存储
+
+        :param path: 路径
+        :param async_: 是否异步
+        :param request_kwargs: 其它请求参数
+
+        :return: 存储的信息，找不到时返回 None
+        """
+        if not self.expired:
+            if async_:
+                async def request():
+                    return self.find(path)
+                return request()
+            return self.find(path)
+        if async_:
+            async def request():
+                await self.refresh(False, async_=True, **request_kwargs)
+                return self.find(path)
+            return request()
+        self.refresh(False, **request_kwargs)
+        return self.find(path)
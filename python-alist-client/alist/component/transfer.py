@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+from __future__ import annotations
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["TransferStats", "TransferEngine", "TransferBatch"]
+
+from asyncio import get_running_loop, CancelledError, Queue as AsyncQueue
+from collections import deque
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future, ThreadPoolExecutor
+from inspect import isawaitable
+from queue import Queue
+from threading import Lock
+from time import perf_counter
+from typing import Any, Final
+
+
+def _format_size(n: float, /) -> str:
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if n < 1024:
+            break
+        n /= 1024
+    return f"{n:.2f} {unit}"
+
+
+class TransferStats:
+    """传输的统计信息：完成、跳过、失败的文件数和字节数，以及总的吞吐率
+
+    计时从第一个任务开始时算起，到最后一个任务结束时为止，``throughput`` 是已传输字节数除以这段时间
+    """
+    def __init__(self, /):
+        self._lock = Lock()
+        self.reset()
+
+    def __repr__(self, /) -> str:
+        return (
+            f"{type(self).__qualname__}(files={self.files}, bytes={self.bytes}, "
+            f"skipped={self.skipped}, failed={self.failed}, dirs={self.dirs}, "
+            f"elapsed={self.elapsed:.3f}, throughput={_format_size(self.throughput)}/s)"
+        )
+
+    def reset(self, /):
+        with self._lock:
+            self.files = 0
+            self.bytes = 0
+            self.skipped = 0
+            self.skipped_bytes = 0
+            self.failed = 0
+            self.dirs = 0
+            self.start: float = 0.0
+            self.stop: float = 0.0
+
+    def begin(self, /):
+        "记录一个任务开始了"
+        if not self.start:
+            with self._lock:
+                if not self.start:
+                    self.start = perf_counter()
+
+    def add_done(self, size: int = 0, /):
+        with self._lock:
+            self.stop = perf_counter()
+            self.files += 1
+            self.bytes += size
+
+    def add_skipped(self, size: int = 0, /):
+        with self._lock:
+            self.skipped += 1
+            self.skipped_bytes += size
+
+    def add_failed(self, /):
+        with self._lock:
+            self.stop = perf_counter()
+            self.failed += 1
+
+    def add_dir(self, /):
+        with self._lock:
+            self.dirs += 1
+
+    @property
+    def elapsed(self, /) -> float:
+        return max(self.stop - self.start, 0.0)
+
+    @property
+    def throughput(self, /) -> float:
+        "吞吐率（字节/秒）"
+        elapsed = self.elapsed
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self, /) -> dict:
+        return {
+            "files": self.files, 
+            "bytes": self.bytes, 
+            "skipped": self.skipped, 
+            "skipped_bytes": self.skipped_bytes, 
+            "failed": self.failed, 
+            "dirs": self.dirs, 
+            "elapsed": self.elapsed, 
+            "throughput": self.throughput, 
+        }
+
+
+class TransferEngine:
+    """并发传输引擎：在连接数和在途字节数的预算内，并发执行提交的传输任务
+
+    - 同步模式使用线程池，异步模式使用协程任务
+    - 任务按提交的先后开始（先进先出，大文件不会被小文件饿死），当正在运行的任务数达到 ``max_workers``，
+      或者在途字节数加上下一个任务的大小超过 ``max_bytes`` 时，后面的任务需要等待
+    - 单个任务的大小超过 ``max_bytes`` 时，只有在没有其它任务运行时才会开始
+    - 任务通过 ``batch()`` 创建的批次提交，各批次的结果互不混杂，但预算和统计是全局的，
+      所以同一个引擎可以被多个 ``upload_tree``/``download_tree`` 同时使用（异步模式下需在同一个事件循环中）
+
+    :param max_workers: 最大并发数（连接预算）
+    :param max_bytes: 在途字节数的预算，<= 0 时不限
+    :param async_: 是否异步
+    """
+    #: 任务返回此值时，表示任务被跳过了，计入跳过的统计
+    SKIPPED: Final = object()
+
+    def __init__(
+        self, 
+        /, 
+        max_workers: int = 8, 
+        max_bytes: int = 0, 
+        async_: bool = False, 
+    ):
+        if max_workers <= 0:
+            max_workers = 1
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.async_ = async_
+        self.stats = TransferStats()
+        self.pending: deque[tuple[TransferBatch, Any, int, Callable]] = deque()
+        self.running = 0
+        self.inflight_bytes = 0
+        self._lock = Lock()
+        self._executor: None | ThreadPoolExecutor = None
+
+    def __del__(self, /):
+        self.shutdown()
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(max_workers={self.max_workers!r}, max_bytes={self.max_bytes!r}, running={self.running}, pending={len(self.pending)})"
+
+    def _can_start(self, size: int, /) -> bool:
+        if not self.running:
+            return True
+        if self.running >= self.max_workers:
+            return False
+        max_bytes = self.max_bytes
+        return max_bytes <= 0 or self.inflight_bytes + size <= max_bytes
+
+    def _take(self, /) -> list[tuple[TransferBatch, Any, int, Callable]]:
+        "在预算内取出可以开始的任务（调用时需持有锁）"
+        pending = self.pending
+        started = []
+        while pending and self._can_start(pending[0][2]):
+            job = pending.popleft()
+            self.running += 1
+            self.inflight_bytes += job[2]
+            started.append(job)
+        return started
+
+    def _launch(self, started: list[tuple[TransferBatch, Any, int, Callable]], /):
+        "启动任务（不能持有锁，因为完成回调可能被立即调用）"
+        for batch, key, size, func in started:
+            self.stats.begin()
+            callback = lambda fu, batch=batch, key=key, size=size: self._done(batch, key, size, fu)
+            if self.async_:
+                get_running_loop().create_task(self._async_call(func)).add_done_callback(callback)
+            else:
+                executor = self._executor
+                if executor is None:
+                    executor = self._executor = ThreadPoolExecutor(self.max_workers)
+                executor.submit(func).add_done_callback(callback)
+
+    @staticmethod
+    async def _async_call(func: Callable, /):
+        ret = func()
+        if isawaitable(ret):
+            ret = await ret
+        return ret
+
+    def _done(self, batch: TransferBatch, key, size: int, fu: Future, /):
+        with self._lock:
+            self.running -= 1
+            self.inflight_bytes -= size
+            started = self._take()
+        self._launch(started)
+        if fu.cancelled():
+            batch._results.put_nowait((key, CancelledError()))
+            return
+        exc = fu.exception()
+        if exc is None:
+            result = fu.result()
+            if result is self.SKIPPED:
+                self.stats.add_skipped(size)
+            else:
+                self.stats.add_done(size)
+        else:
+            result = exc
+            self.stats.add_failed()
+        batch._results.put_nowait((key, result))
+
+    def _submit(self, batch: TransferBatch, key, size: int, func: Callable, /):
+        with self._lock:
+            self.pending.append((batch, key, size, func))
+            started = self._take()
+        self._launch(started)
+
+    def _discard(self, batch: TransferBatch, /) -> int:
+        "丢弃批次中尚未开始的任务，返回丢弃的数目"
+        with self._lock:
+            pending = self.pending
+            n = len(pending)
+            self.pending = deque(t for t in pending if t[0] is not batch)
+            return n - len(self.pending)
+
+    def batch(self, /) -> TransferBatch:
+        "创建一个新的批次，用来提交任务和取回结果"
+        return TransferBatch(self)
+
+    def shutdown(self, /):
+        "关闭线程池（如果有的话），已经开始的任务会继续执行完成"
+        executor = self.__dict__.get("_executor")
+        if executor is not None:
+            self._executor = None
+            executor.shutdown(wait=False)
+
+
+class TransferBatch:
+    """传输引擎中的一批任务，按完成顺序取回这批任务的结果
+
+    :param engine: 所属的传输引擎
+    """
+    def __init__(self, engine: TransferEngine, /):
+        self.engine = engine
+        self.outstanding = 0
+        self._results: Queue | AsyncQueue = AsyncQueue() if engine.async_ else Queue()
+
+    def __bool__(self, /) -> bool:
+        return self.outstanding > 0
+
+    def submit(self, key, size: int, func: Callable, /):
+        """提交一个传输任务
+
+        :param key: 用于标识任务，会随结果一起返回
+        :param size: 任务传输的字节数，用于字节预算和统计
+        :param func: 执行传输的函数，无参数，异步模式下可以返回可等待对象
+        """
+        self.outstanding += 1
+        self.engine._submit(self, key, size, func)
+
+    def get(self, /) -> tuple[Any, Any] | Coroutine[Any, Any, tuple[Any, Any]]:
+        """按完成顺序取回一个结果 ``(key, result)``，如果任务抛出了异常，则 ``result`` 就是这个异常
+
+        异步模式下返回协程。调用前需要确保 ``bool(self)`` 为真，否则会一直等待
+        """
+        if self.engine.async_:
+            async def get():
+                ret = await self._results.get()
+                self.outstanding -= 1
+                return ret
+            return get()
+        ret = self._results.get()
+        self.outstanding -= 1
+        return ret
+
+    def close(self, /):
+        "丢弃这批中尚未开始的任务（已经开始的任务会继续执行完成）"
+        self.outstanding -= self.engine._discard(self)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+from __future__ import annotations
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = [
+    "HASH_HEADERS", "UPLOAD_CHUNKSIZE", "make_hashers", "make_hash_headers", "hash_iter", "hash_async_iter",
+    "read_chunk_iter", "read_chunk_async_iter",
+]
+
+from asyncio import create_task, to_thread, Queue as AsyncQueue
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Mapping
+from hashlib import new as hash_new
+from inspect import iscoroutinefunction
+from queue import Queue
+from threading import Thread
+from typing import Any, Final
+
+from filewrap import Buffer, SupportsRead
+
+
+#: 上传时，告知服务器文件哈希值所用的请求头（AList 的 ``fs/put`` 接口会转交给需要哈希值的驱动）
+HASH_HEADERS: Final = {"md5": "X-File-Md5", "sha1": "X-File-Sha1", "sha256": "X-File-Sha256"}
+#: 上传时，每次从文件中读取的字节数
+UPLOAD_CHUNKSIZE: Final = 1 << 20
+
+
+def make_hashers(hashes: str | Iterable[str] = (), /) -> dict[str, Any]:
+    "根据算法名创建哈希对象，返回 {算法名: 哈希对象}"
+    if isinstance(hashes, str):
+        hashes = (hashes,)
+    return {name: hash_new(name) for name in hashes}
+
+
+def make_hash_headers(hashes: Mapping[str, str], /) -> dict[str, str]:
+    "把已知的哈希值 {算法名: 十六进制摘要} 转换为上传时的请求头"
+    headers: dict[str, str] = {}
+    for name, value in hashes.items():
+        try:
+            headers[HASH_HEADERS[name.lower()]] = value
+        except KeyError:
+            raise ValueError(f"unsupported hash type: {name!r}, expected one of {tuple(HASH_HEADERS)!r}") from None
+    return headers
+
+
+def _update_hashers(hashers: None | Mapping[str, Any], data: Buffer, /):
+    if hashers:
+        for h in hashers.values():
+            h.update(data)
+
+
+def hash_iter(
+    it: Iterable[Buffer], 
+    /, 
+    hashers: None | Mapping[str, Any] = None, 
+) -> Iterator[Buffer]:
+    "原样产出各个数据块，同时更新哈希"
+    for chunk in it:
+        _update_hashers(hashers, chunk)
+        yield chunk
+
+
+async def hash_async_iter(
+    it: Iterable[Buffer] | AsyncIterable[Buffer], 
+    /, 
+    hashers: None | Mapping[str, Any] = None, 
+) -> AsyncIterator[Buffer]:
+    "原样产出各个数据块，同时更新哈希"
+    if isinstance(it, AsyncIterable):
+        async for chunk in it:
+            _update_hashers(hashers, chunk)
+            yield chunk
+    else:
+        for chunk in it:
+            _update_hashers(hashers, chunk)
+            yield chunk
+
+
+def _make_read(
+    file: SupportsRead[Buffer], 
+    reuse: bool, 
+    /, 
+) -> tuple[Callable, bool]:
+    "返回 (读取函数, 是否是 readinto)"
+    readinto = getattr(file, "readinto", None)
+    if reuse and callable(readinto) and not iscoroutinefunction(readinto):
+        return readinto, True
+    return file.read, False
+
+
+def read_chunk_iter(
+    file: SupportsRead[Buffer], 
+    /, 
+    size: int = -1, 
+    chunksize: int = UPLOAD_CHUNKSIZE, 
+    prefetch: int = 2, 
+    hashers: None | Mapping[str, Any] = None, 
+    reuse: bool = True, 
+) -> Iterator[Buffer]:
+    """从文件中逐块读取数据，同时更新哈希（只读一遍）
+
+    - 如果 ``reuse`` 为真且文件支持 ``readinto``，则读入 ``prefetch + 1`` 个轮流复用的缓冲区，不再为每块分配内存；
+      产出的数据块只在下一次迭代前有效，这对逐块同步发送的 HTTP 客户端是成立的
+    - 如果 ``prefetch`` > 0，则由一个后台线程预读至多 ``prefetch`` 块，这样磁盘读取与网络发送是重叠的
+
+    :param file: 文件
+    :param size: 最多读取的字节数，< 0 时读到文件末尾
+    :param chunksize: 每块的字节数
+    :param prefetch: 预读的块数，<= 0 时不预读（在迭代时读取）
+    :param hashers: 需要更新的哈希对象，参见 ``make_hashers``
+    :param reuse: 是否复用缓冲区
+
+    :return: 数据块的迭代器
+    """
+    if chunksize <= 0:
+        chunksize = UPLOAD_CHUNKSIZE
+    read, use_readinto = _make_read(file, reuse)
+    def fill(buf: None | memoryview, remaining: int, /) -> Buffer:
+        n = chunksize if remaining < 0 else min(chunksize, remaining)
+        if buf is None:
+            data = read(n)
+        else:
+            data = buf[:read(buf[:n]) or 0]
+        _update_hashers(hashers, data)
+        return data
+    if prefetch <= 0:
+        buf = memoryview(bytearray(chunksize)) if use_readinto else None
+        remaining = size
+        while remaining:
+            data = fill(buf, remaining)
+            if not len(data): # type: ignore
+                break
+            if remaining > 0:
+                remaining -= len(data) # type: ignore
+            yield data
+        return
+    # NOTE: free 中是可以填充的缓冲区（用 read 读取时，数据是新分配的，其中的 None 只用来限制预读的块数），
+    #       filled 中是填充好的 (缓冲区, 数据)，None 表示结束，异常表示出错
+    free: Queue = Queue()
+    filled: Queue = Queue()
+    for _ in range(prefetch + 1 if use_readinto else prefetch):
+        free.put(memoryview(bytearray(chunksize)) if use_readinto else None)
+    stopped = False
+    def produce():
+        remaining = size
+        try:
+            while remaining:
+                buf = free.get()
+                if stopped:
+                    return
+                data = fill(buf, remaining)
+                if not len(data): # type: ignore
+                    break
+                if remaining > 0:
+                    remaining -= len(data) # type: ignore
+                filled.put((buf, data))
+            filled.put(None)
+        except BaseException as e:
+            filled.put(e)
+    Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = filled.get()
+            if item is None:
+                break
+            elif isinstance(item, BaseException):
+                raise item
+            buf, data = item
+            if use_readinto:
+                yield data
+                free.put(buf)
+            else:
+                free.put(buf)
+                yield data
+    finally:
+        stopped = True
+        free.put(None)
+
+
+async def read_chunk_async_iter(
+    file: SupportsRead[Buffer], 
+    /, 
+    size: int = -1, 
+    chunksize: int = UPLOAD_CHUNKSIZE, 
+    prefetch: int = 2, 
+    hashers: None | Mapping[str, Any] = None, 
+) -> AsyncIterator[Buffer]:
+    """从文件中逐块读取数据，同时更新哈希（只读一遍）
+
+    - 如果文件的 ``read`` 是异步的，则直接等待它，否则在线程中读取（优先用 ``readinto``）
+    - 如果 ``prefetch`` > 0，则由一个协程任务预读至多 ``prefetch`` 块，这样磁盘读取与网络发送是重叠的
+    - 不复用缓冲区：异步的传输层（例如 asyncio 的 socket transport）可能会保留尚未发出的数据块的引用
+
+    :param file: 文件
+    :param size: 最多读取的字节数，< 0 时读到文件末尾
+    :param chunksize: 每块的字节数
+    :param prefetch: 预读的块数，<= 0 时不预读（在迭代时读取）
+    :param hashers: 需要更新的哈希对象，参见 ``make_hashers``
+
+    :return: 数据块的异步迭代器
+    """
+    if chunksize <= 0:
+        chunksize = UPLOAD_CHUNKSIZE
+    if iscoroutinefunction(file.read):
+        async def read(n: int, /) -> Buffer:
+            return await file.read(n) # type: ignore
+    else:
+        readinto = getattr(file, "readinto", None)
+        if callable(readinto):
+            def readinto_new(n: int, /) -> Buffer:
+                buf = bytearray(n)
+                k = readinto(buf) or 0
+                if k < n:
+                    del buf[k:]
+                return buf
+            async def read(n: int, /) -> Buffer:
+                return await to_thread(readinto_new, n)
+        else:
+            async def read(n: int, /) -> Buffer:
+                return await to_thread(file.read, n)
+    async def fill(remaining: int, /) -> Buffer:
+        n = chunksize if remaining < 0 else min(chunksize, remaining)
+        data = await read(n)
+        if len(data): # type: ignore
+            # NOTE: 较大的数据块在计算哈希时会释放 GIL，所以也放到线程中
+            if hashers:
+                if len(data) >= 1 << 16: # type: ignore
+                    await to_thread(_update_hashers, hashers, data)
+                else:
+                    _update_hashers(hashers, data)
+        return data
+    if prefetch <= 0:
+        remaining = size
+        while remaining:
+            data = await fill(remaining)
+            if not len(data): # type: ignore
+                break
+            if remaining > 0:
+                remaining -= len(data) # type: ignore
+            yield data
+        return
+    filled: AsyncQueue = AsyncQueue(prefetch)
+    async def produce():
+        remaining = size
+        try:
+            while remaining:
+                data = await fill(remaining)
+                if not len(data): # type: ignore
+                    break
+                if remaining > 0:
+                    remaining -= len(data) # type: ignore
+                await filled.put(data)
+            await filled.put(None)
+        except BaseException as e:
+            await filled.put(e)
+    task = create_task(produce())
+    try:
+        while True:
+            item = await filled.get()
+            if item is None:
+                break
+            elif isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        task.cancel()
@@ -13,10 +13,9 @@ from mimetypes import init
 init()
 from mimetypes import types_map
 
-from asyncio import run, to_thread, Semaphore, TaskGroup
+from asyncio import run, to_thread
 from collections import deque
 from collections.abc import Callable, Container, Coroutine, Iterable
-from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing, aclosing
 from functools import partial
 from inspect import isawaitable
@@ -26,7 +25,7 @@ from re import compile as re_compile
 from shutil import rmtree
 from typing import cast, overload, Any, Literal
 
-from alist.component import AlistClient, AlistPath
+from alist.component import AlistClient, AlistPath, TransferEngine
 from orjson import dumps, loads
 from httpx import TimeoutException
 from retrytools import retry
@@ -44,20 +43,13 @@ def storage_of(
     path: str, 
 ) -> None | dict:
     """从 alist 获取某个路径所属的存储
+
+    .. note::
+        使用客户端共享的存储索引 ``client.storage_index``，仅在索引过期时才会罗列存储
     """
     if isinstance(client, str):
         client = AlistClient.from_auth(client)
-    path = path.rstrip("/")
-    resp = client.admin_storage_list()
-    storages = resp["data"]["content"]
-    selected_storage = None
-    for storage in storages:
-        if storage["mount_path"] == path:
-            return storage
-        elif path.startswith(storage["mount_path"] + "/"):
-            if not selected_storage or len(selected_storage["mount_path"]) < storage["mount_path"]:
-                selected_storage = storage
-    return selected_storage
+    return client.storage_index.get(path)
 
 
 def alist_update_115_cookies(
@@ -89,6 +81,7 @@ def alist_update_115_cookies(
             storage["addition"] = dumps(addition).decode("utf-8")
             storage.pop("status", None)
             client.admin_storage_update(storage)
+            client.storage_index.invalidate()
             logger.debug("update 115 cookies: %r", storage)
 
 
@@ -168,6 +161,7 @@ def alist_batch_add_115_share_links(
         print("-" * 40)
         print(client.admin_storage_create(payload))
         print(payload)
+    client.storage_index.invalidate()
 
 
 @overload
@@ -309,7 +303,6 @@ def alist_batch_download(
             from subprocess import run
             run([executable, "-m", "pip", "install", "-U", "aiofile"], check=True)
             from aiofile import async_open
-        async_semaphore = Semaphore(max_workers)
         async def alist_batch_download_async(path: AlistPath, local_path: str):
             use_strm = strm_predicate is not None and strm_predicate(path)
             try:
@@ -332,7 +325,7 @@ def alist_batch_download(
                             async with async_open(local_path, encoding="utf-8") as f:
                                 if (await f.read()) == url:
                                     logger and logger.info(f"\x1b[1;33mSKIPPED\x1b[0m: \x1b[4;34m{local_path!r}\x1b[0m")
-                                    return
+                                    return TransferEngine.SKIPPED
                         except FileNotFoundError:
                             pass
                     else:
@@ -345,7 +338,7 @@ def alist_batch_download(
                             if path["ctime"] < file_stat.st_ctime:
                                 if filesize == file_stat.st_size:
                                     logger and logger.info(f"\x1b[1;33mSKIPPED\x1b[0m: \x1b[4;34m{local_path!r}\x1b[0m")
-                                    return
+                                    return TransferEngine.SKIPPED
                                 elif filesize < file_stat.st_size:
                                     skipsize = filesize
                 if use_strm:
@@ -354,26 +347,27 @@ def alist_batch_download(
                     logger and logger.info(f"\x1b[1;2;32mCREATED\x1b[0m: \x1b[4;34m{local_path!r}\x1b[0m")
                 else:
                     headers = {"Range": f"bytes={skipsize}-"}
-                    async with async_semaphore:
-                        async with aclosing(await client.request(url, "GET", headers=headers, parse=None, async_=True)) as resp:
-                            if (
-                                resp.headers["Content-Type"] == "application/json; charset=utf-8" 
-                                and resp.headers.get("Accept-Range") != "bytes"
-                            ):
-                                resp.read()
-                                raise OSError(resp.json())
-                            async with async_open(local_path, mode="ab" if skipsize else "wb") as file:
-                                write = file.write
-                                async for chunk in resp.aiter_bytes(1 << 16):
-                                    await write(chunk)
+                    async with aclosing(await client.request(url, "GET", headers=headers, parse=None, async_=True)) as resp:
+                        if (
+                            resp.headers["Content-Type"] == "application/json; charset=utf-8" 
+                            and resp.headers.get("Accept-Range") != "bytes"
+                        ):
+                            resp.read()
+                            raise OSError(resp.json())
+                        async with async_open(local_path, mode="ab" if skipsize else "wb") as file:
+                            write = file.write
+                            async for chunk in resp.aiter_bytes(1 << 16):
+                                await write(chunk)
                     logger and logger.info(f"\x1b[1;32mDOWNLOADED\x1b[0m: \x1b[4;34m{local_path!r}\x1b[0m")
                 if sync:
                     seen[local_path[local_local_reldirlen:]] = True
             except:
                 logger and logger.exception(f"\x1b[1;31mFAILED\x1b[0m: \x1b[4;34m{local_path!r}\x1b[0m")
+                raise
         async def request():
-            async with TaskGroup() as tg:
-                create_task = tg.create_task
+            engine = TransferEngine(max_workers, async_=True)
+            batch = engine.batch()
+            try:
                 local_reldir = "."
                 async for path in client.fs.iter(
                     remote_dir, 
@@ -397,7 +391,17 @@ def alist_batch_download(
                             while dir0:
                                 seen[dir0 + sep] = True
                                 dir0 = dirname(dir0)
-                    create_task(alist_batch_download_async(path, joinpath(local_dir, local_relpath)))
+                    local_path = joinpath(local_dir, local_relpath)
+                    batch.submit(
+                        local_path, 
+                        0 if strm_predicate is not None and strm_predicate(path) else path["size"], 
+                        partial(alist_batch_download_async, path, local_path), 
+                    )
+                while batch:
+                    await batch.get()
+            finally:
+                batch.close()
+            logger and logger.info("%r", engine.stats)
             if sync:
                 await to_thread(clean)
         return request()
@@ -421,7 +425,7 @@ def alist_batch_download(
                         try:
                             if open(local_path, encoding="utf-8").read() == url:
                                 logger and logger.info(f"\x1b[1;33mSKIPPED\x1b[0m: \x1b[4;34m{local_path!r}\x1b[0m")
-                                return
+                                return TransferEngine.SKIPPED
                         except FileNotFoundError:
                             pass
                     else:
@@ -434,7 +438,7 @@ def alist_batch_download(
                             if path["ctime"] < file_stat.st_ctime:
                                 if filesize == file_stat.st_size:
                                     logger and logger.info(f"\x1b[1;33mSKIPPED\x1b[0m: \x1b[4;34m{local_path!r}\x1b[0m")
-                                    return
+                                    return TransferEngine.SKIPPED
                                 elif filesize < file_stat.st_size:
                                     skipsize = filesize
                 if use_strm:
@@ -458,35 +462,44 @@ def alist_batch_download(
                     seen[local_path[local_local_reldirlen:]] = True
             except:
                 logger and logger.exception(f"\x1b[1;31mFAILED\x1b[0m: \x1b[4;34m{local_path!r}\x1b[0m")
-        executor = ThreadPoolExecutor(max_workers=max_workers)
+                raise
+        engine = TransferEngine(max_workers)
+        batch = engine.batch()
         try:
-            with executor:
-                submit = executor.submit
-                local_reldir = ""
-                for path in client.fs.iter(
-                    remote_dir, 
-                    max_depth=-1, 
-                    predicate=full_predicate, 
-                    password=password, 
-                    refresh=refresh, 
-                    onerror=onerror, 
-                ):
-                    local_relpath = normpath(path.relative_to(remote_dir))
-                    if local_reldir != (local_reldir := dirname(local_relpath)):
-                        dir_ = joinpath(local_dir, local_reldir)
-                        try:
-                            makedirs(dir_, exist_ok=True)
-                        except FileExistsError:
-                            remove(dir_)
-                            makedirs(dir_, exist_ok=True)
-                        if sync:    
-                            dir0 = local_reldir
-                            while dir0:
-                                seen[dir0 + sep] = True
-                                dir0 = dirname(dir0)
-                    submit(alist_batch_download_sync, path, joinpath(local_dir, local_relpath))
+            local_reldir = ""
+            for path in client.fs.iter(
+                remote_dir, 
+                max_depth=-1, 
+                predicate=full_predicate, 
+                password=password, 
+                refresh=refresh, 
+                onerror=onerror, 
+            ):
+                local_relpath = normpath(path.relative_to(remote_dir))
+                if local_reldir != (local_reldir := dirname(local_relpath)):
+                    dir_ = joinpath(local_dir, local_reldir)
+                    try:
+                        makedirs(dir_, exist_ok=True)
+                    except FileExistsError:
+                        remove(dir_)
+                        makedirs(dir_, exist_ok=True)
+                    if sync:    
+                        dir0 = local_reldir
+                        while dir0:
+                            seen[dir0 + sep] = True
+                            dir0 = dirname(dir0)
+                local_path = joinpath(local_dir, local_relpath)
+                batch.submit(
+                    local_path, 
+                    0 if strm_predicate is not None and strm_predicate(path) else path["size"], 
+                    partial(alist_batch_download_sync, path, local_path), 
+                )
+            while batch:
+                batch.get()
         finally:
-            executor.shutdown(wait=False, cancel_futures=True)
+            batch.close()
+            engine.shutdown()
+        logger and logger.info("%r", engine.stats)
         if sync:
             clean()
         return seen
@@ -56,18 +56,11 @@ def get_charset(content_type: str, default: str = "utf-8") -> str:
 
 async def storage_of(client: AlistClient, path: str) -> None | dict:
     """从 alist 获取某个路径所属的存储
+
+    .. note::
+        使用客户端共享的存储索引 ``client.storage_index``，仅在索引过期或存储被改动后才会罗列存储
     """
-    path = path.rstrip("/")
-    resp = await client.admin_storage_list(async_=True)
-    storages = resp["data"]["content"]
-    selected_storage = None
-    for storage in storages:
-        if storage["mount_path"] == path:
-            return storage
-        elif path.startswith(storage["mount_path"] + "/"):
-            if not selected_storage or len(selected_storage["mount_path"]) < storage["mount_path"]:
-                selected_storage = storage
-    return selected_storage
+    return await client.storage_index.get(path, async_=True)
 
 
 async def relogin_115(session: AsyncClient, cookies: str) -> None | str:
@@ -114,20 +107,33 @@ async def update_115_cookies(
     storage = await storage_of(client, path)
     if not storage or storage["driver"] not in ("115 Cloud", "115 Share"):
         return False
-    addition = loads(storage["addition"])
-    cookies = addition["cookie"]
-    cookies_dict = cookies_str_to_dict(cookies)
+    storage_id = storage["id"]
+    cookies_old = loads(storage["addition"])["cookie"]
+    cookies_dict = cookies_str_to_dict(cookies_old)
     if "UID" not in cookies_dict:
         return False
     user_id, ssoent, _ = cookies_dict["UID"].split("_")
     async with RELOGIN_115_LOCK_STORE.setdefault((user_id, ssoent), Lock()):
-        cookies = await relogin_115(session, cookies)
+        cookies = await relogin_115(session, cookies_old)
         if not cookies:
             return False
+        # NOTE: 索引中的存储最多可能过时 60 秒，而更新会写回整个存储，所以写回前先重新罗列存储，
+        #       在最新的存储上修改，以免用旧的字段覆盖别处刚做的修改
+        storages = await client.storage_index.refresh(async_=True)
+        storage = next((s for s in storages if s["id"] == storage_id), None)
+        if storage is None:
+            return False
+        # NOTE: 索引中的存储是共享的，修改前先复制一份
+        storage = dict(storage)
+        addition = loads(storage["addition"])
+        if addition["cookie"] != cookies_old:
+            # NOTE: 已经被别处更新过了
+            return True
         addition["cookie"] = cookies
         storage["addition"] = dumps(addition).decode("utf-8")
         storage.pop("status", None)
-        client.admin_storage_update(storage)
+        await client.admin_storage_update(storage, async_=True)
+        client.storage_index.invalidate()
         return True
 
 
@@ -336,6 +342,13 @@ def make_application(
                                     break
                         elif path == "api/admin/setting/reset_token" and resp["code"] == 200:
                             alist_token = client.headers["Authorization"] = item["data"]
+                        elif (
+                            path.startswith("api/admin/storage/") and 
+                            path not in ("api/admin/storage/list", "api/admin/storage/get") and 
+                            resp["code"] == 200
+                        ):
+                            # NOTE: 存储被增删改了，使存储索引过期
+                            client.storage_index.invalidate()
                         elif path == "api/fs/list":
                             if (
                                 alist_token and
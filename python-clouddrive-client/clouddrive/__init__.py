@@ -19,19 +19,22 @@ __all__ = [
 
 import errno
 
+from asyncio import create_task, to_thread, wait
 from collections import deque
 from collections.abc import (
     AsyncIterator, Callable, Coroutine, ItemsView, Iterable, Iterator, KeysView, Mapping, Sequence, ValuesView
 )
 from functools import cached_property, partial, update_wrapper
 from inspect import isawaitable
-from io import BytesIO, TextIOWrapper, UnsupportedOperation, DEFAULT_BUFFER_SIZE
+from io import BytesIO, TextIOWrapper, UnsupportedOperation
 from mimetypes import guess_type
 from os import fsdecode, fspath, makedirs, scandir, stat_result, path as ospath, PathLike
 from posixpath import basename, commonpath, dirname, join as joinpath, normpath, relpath, split as splitpath, splitext
+from queue import Empty, Queue
 from re import compile as re_compile, escape as re_escape
 from shutil import copyfileobj, SameFileError
 from stat import S_IFDIR, S_IFREG
+from threading import Event, Thread
 from time import time
 from typing import cast, overload, Any, IO, Literal, Never, Optional
 from types import MappingProxyType
@@ -42,14 +45,18 @@ from warnings import warn
 from dateutil.parser import parse as dt_parse
 from google.protobuf.json_format import MessageToDict # type: ignore
 from grpc import StatusCode, RpcError # type: ignore
+from grpclib.const import Status as GRPCStatus # type: ignore
+from grpclib.exceptions import GRPCError # type: ignore
 
 from .client import Client, CLOUDDRIVE_API_MAP
+from .lister import ConcurrentLister
 import CloudDrive_pb2 # type: ignore
 
 from filewrap import SupportsRead, SupportsWrite
 from glob_pattern import translate_iter
 from httpfile import HTTPFileReader
 from http_response import get_content_length
+from iterutils import collect, run_gen_step, run_gen_step_iter, with_iter_next, Return, Yield, YieldFrom
 from urlopen import urlopen
 
 
@@ -57,40 +64,114 @@ AttrDict = dict
 PathType = str | PathLike[str] | AttrDict
 
 
+def raise_for_code(fargs, e, /) -> Never:
+    """Convert an error of grpc (`RpcError`) or grpclib (`GRPCError`) into an `OSError`."""
+    if isinstance(e, GRPCError):
+        code, details = StatusCode[e.status.name], e.message
+    elif hasattr(e, "code"):
+        code, details = e.code(), e.details()
+    else:
+        raise e
+    match code:
+        case StatusCode.PERMISSION_DENIED:
+            raise PermissionError(errno.EPERM, fargs, details) from e
+        case StatusCode.NOT_FOUND:
+            raise FileNotFoundError(errno.ENOENT, fargs, details) from e
+        case StatusCode.ALREADY_EXISTS:
+            raise FileExistsError(errno.EEXIST, fargs, details) from e
+        case StatusCode.UNIMPLEMENTED:
+            raise UnsupportedOperation(errno.ENOSYS, fargs, details) from e
+        case StatusCode.UNAUTHENTICATED:
+            raise PermissionError(errno.EACCES, fargs, details) from e
+        case _:
+            raise OSError(errno.EIO, fargs, details) from e
+
+
 def check_response(func, /):
-    def raise_for_code(fargs, e):
-        if not hasattr(e, "code"):
-            raise
-        match e.code():
-            case StatusCode.PERMISSION_DENIED:
-                raise PermissionError(errno.EPERM, fargs, e.details()) from e
-            case StatusCode.NOT_FOUND:
-                raise FileNotFoundError(errno.ENOENT, fargs, e.details()) from e
-            case StatusCode.ALREADY_EXISTS:
-                raise FileExistsError(errno.EEXIST, fargs, e.details()) from e
-            case StatusCode.UNIMPLEMENTED:
-                raise UnsupportedOperation(errno.ENOSYS, fargs, e.details()) from e
-            case StatusCode.UNAUTHENTICATED:
-                raise PermissionError(errno.EACCES, fargs, e.details()) from e
-            case _:
-                raise OSError(errno.EIO, fargs, e.details()) from e
     def wrapper(*args, **kwds):
         try:
             resp = func(*args, **kwds)
-        except RpcError as e:
+        except (RpcError, GRPCError) as e:
             raise_for_code((func, args, kwds), e)
         else:
             if isawaitable(resp):
                 async def async_check(resp):
                     try:
                         return await resp
-                    except RpcError as e:
+                    except (RpcError, GRPCError) as e:
                         raise_for_code((func, args, kwds), e)
                 return async_check(resp)
             return resp
     return update_wrapper(wrapper, func)
 
 
+class ReadAhead:
+    """Read `file` by chunks in a background thread, at most `depth` chunks ahead, 
+    so that reading from disk overlaps sending over the network.
+
+    The iteration may happen in another thread (e.g. the request consumer of grpc), 
+    so it is stopped by `close()` instead of closing the generator: after `close()` 
+    returns, the background thread has exited and won't touch `file` any more.
+    """
+    def __init__(
+        self, 
+        file: SupportsRead[bytes], 
+        /, 
+        chunk_size: int = 1 << 20, 
+        depth: int = 4, 
+    ):
+        self._queue: Queue = Queue(max(depth, 1))
+        self._stop = Event()
+        self._thread = Thread(target=self._produce, args=(file, chunk_size), daemon=True)
+        self._thread.start()
+
+    def __iter__(self, /) -> Iterator[bytes]:
+        queue = self._queue
+        while True:
+            data = queue.get()
+            if isinstance(data, BaseException):
+                raise data
+            if not data:
+                break
+            yield data
+
+    def _produce(self, file: SupportsRead[bytes], chunk_size: int, /):
+        queue, stop = self._queue, self._stop
+        try:
+            while not stop.is_set():
+                data = file.read(chunk_size)
+                queue.put(data)
+                if not data:
+                    break
+        except BaseException as e:
+            queue.put(e)
+
+    def _drain(self, /):
+        queue = self._queue
+        try:
+            while True:
+                queue.get_nowait()
+        except Empty:
+            pass
+
+    def close(self, /):
+        self._stop.set()
+        thread = self._thread
+        # NOTE: unblock the producer if it's waiting on a full queue, until it exits
+        while thread.is_alive():
+            self._drain()
+            thread.join(0.01)
+        self._drain()
+        # NOTE: unblock the consumer if it's waiting on an empty queue
+        self._queue.put_nowait(b"")
+
+    def __enter__(self, /):
+        return self
+
+    def __exit__(self, /, *exc_info):
+        self.close()
+
+
 def parse_as_timestamp(s: Optional[str] = None, /) -> float:
     if not s:
         return 0.0
@@ -233,9 +314,29 @@ class CloudDrivePath(Mapping, PathLike[str]):
     def __and__(self, path: str | PathLike[str], /) -> CloudDrivePath:
         return type(self)(self.fs, commonpath((self, self.fs.abspath(path))))
 
-    def __call__(self, /) -> CloudDrivePath:
-        self.__dict__.update(self.fs.attr(self))
-        return self
+    @overload
+    def __call__(
+        self, 
+        /, 
+        async_: Literal[False] = False, 
+    ) -> CloudDrivePath:
+        ...
+    @overload
+    def __call__(
+        self, 
+        /, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, CloudDrivePath]:
+        ...
+    def __call__(
+        self, 
+        /, 
+        async_: Literal[False, True] = False, 
+    ) -> CloudDrivePath | Coroutine[None, None, CloudDrivePath]:
+        def gen_step():
+            self.__dict__.update((yield self.fs.attr(self, async_=async_)))
+            return Return(self, may_call=False)
+        return run_gen_step(gen_step, async_=async_)
 
     def __contains__(self, key, /) -> bool:
         return key in self.__dict__
@@ -337,6 +438,20 @@ class CloudDrivePath(Mapping, PathLike[str]):
             return None
         return type(self)(self.fs, dst)
 
+    @overload
+    def download(
+        self, 
+        /, 
+        local_dir: bytes | str | PathLike = "", 
+        no_root: bool = False, 
+        write_mode: Literal["", "x", "w", "a"] = "w", 
+        download: Optional[Callable[[str, SupportsWrite[bytes]], Any]] = None, 
+        refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[False] = False, 
+    ):
+        ...
+    @overload
     def download(
         self, 
         /, 
@@ -345,6 +460,20 @@ class CloudDrivePath(Mapping, PathLike[str]):
         write_mode: Literal["", "x", "w", "a"] = "w", 
         download: Optional[Callable[[str, SupportsWrite[bytes]], Any]] = None, 
         refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine:
+        ...
+    def download(
+        self, 
+        /, 
+        local_dir: bytes | str | PathLike = "", 
+        no_root: bool = False, 
+        write_mode: Literal["", "x", "w", "a"] = "w", 
+        download: Optional[Callable[[str, SupportsWrite[bytes]], Any]] = None, 
+        refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[False, True] = False, 
     ):
         return self.fs.download_tree(
             self, 
@@ -353,10 +482,32 @@ class CloudDrivePath(Mapping, PathLike[str]):
             no_root=no_root, 
             write_mode=write_mode, 
             download=download, 
+            async_=async_, # type: ignore
         )
 
-    def exists(self, /) -> bool:
-        return self.fs.exists(self)
+    @overload
+    def exists(
+        self, 
+        /, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> bool:
+        ...
+    @overload
+    def exists(
+        self, 
+        /, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, bool]:
+        ...
+    def exists(
+        self, 
+        /, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> bool | Coroutine[None, None, bool]:
+        return self.fs.exists(self, async_=async_) # type: ignore
 
     def get_url(
         self, 
@@ -389,12 +540,55 @@ class CloudDrivePath(Mapping, PathLike[str]):
     def is_symlink(self, /) -> bool:
         return False
 
-    def isdir(self, /) -> bool:
-        return self.fs.isdir(self)
+    @overload
+    def isdir(
+        self, 
+        /, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> bool:
+        ...
+    @overload
+    def isdir(
+        self, 
+        /, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, bool]:
+        ...
+    def isdir(
+        self, 
+        /, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> bool | Coroutine[None, None, bool]:
+        return self.fs.isdir(self, async_=async_) # type: ignore
 
-    def isfile(self, /) -> bool:
-        return self.fs.isfile(self)
+    @overload
+    def isfile(
+        self, 
+        /, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> bool:
+        ...
+    @overload
+    def isfile(
+        self, 
+        /, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, bool]:
+        ...
+    def isfile(
+        self, 
+        /, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> bool | Coroutine[None, None, bool]:
+        return self.fs.isfile(self, async_=async_) # type: ignore
 
+    @overload
     def iter(
         self, 
         /, 
@@ -404,7 +598,39 @@ class CloudDrivePath(Mapping, PathLike[str]):
         predicate: Optional[Callable[[CloudDrivePath], Optional[bool]]] = None, 
         onerror: bool | Callable[[OSError], bool] = False, 
         refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False] = False, 
     ) -> Iterator[CloudDrivePath]:
+        ...
+    @overload
+    def iter(
+        self, 
+        /, 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: Optional[Callable[[CloudDrivePath], Optional[bool]]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[CloudDrivePath]:
+        ...
+    def iter(
+        self, 
+        /, 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: Optional[Callable[[CloudDrivePath], Optional[bool]]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[CloudDrivePath] | AsyncIterator[CloudDrivePath]:
         return self.fs.iter(
             self, 
             topdown=topdown, 
@@ -413,6 +639,8 @@ class CloudDrivePath(Mapping, PathLike[str]):
             predicate=predicate, 
             onerror=onerror, 
             refresh=refresh, 
+            max_workers=max_workers, 
+            async_=async_, # type: ignore
         )
 
     def joinpath(self, *paths: str | PathLike[str]) -> CloudDrivePath:
@@ -424,26 +652,86 @@ class CloudDrivePath(Mapping, PathLike[str]):
             return self
         return type(self)(self.fs, path_new)
 
+    @overload
     def listdir(
         self, 
         /, 
         refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> list[str]:
-        return self.fs.listdir(self, refresh=refresh)
+        ...
+    @overload
+    def listdir(
+        self, 
+        /, 
+        refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, list[str]]:
+        ...
+    def listdir(
+        self, 
+        /, 
+        refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> list[str] | Coroutine[None, None, list[str]]:
+        return self.fs.listdir(self, refresh=refresh, async_=async_) # type: ignore
 
+    @overload
     def listdir_attr(
         self, 
         /, 
         refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> list[dict]:
-        return self.fs.listdir_attr(self, refresh=refresh)
+        ...
+    @overload
+    def listdir_attr(
+        self, 
+        /, 
+        refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, list[dict]]:
+        ...
+    def listdir_attr(
+        self, 
+        /, 
+        refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> list[dict] | Coroutine[None, None, list[dict]]:
+        return self.fs.listdir_attr(self, refresh=refresh, async_=async_) # type: ignore
 
+    @overload
     def listdir_path(
         self, 
         /, 
         refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> list[CloudDrivePath]:
-        return self.fs.listdir_path(self, refresh=refresh)
+        ...
+    @overload
+    def listdir_path(
+        self, 
+        /, 
+        refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, list[CloudDrivePath]]:
+        ...
+    def listdir_path(
+        self, 
+        /, 
+        refresh: Optional[bool] = None, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> list[CloudDrivePath] | Coroutine[None, None, list[CloudDrivePath]]:
+        return self.fs.listdir_path(self, refresh=refresh, async_=async_) # type: ignore
 
     def match(
         self, 
@@ -462,8 +750,34 @@ class CloudDrivePath(Mapping, PathLike[str]):
             return None
         return guess_type(self.path)[0] or "application/octet-stream"
 
-    def mkdir(self, /, exist_ok: bool = True):
-        self.fs.makedirs(self, exist_ok=exist_ok)
+    @overload
+    def mkdir(
+        self, 
+        /, 
+        exist_ok: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> None:
+        ...
+    @overload
+    def mkdir(
+        self, 
+        /, 
+        exist_ok: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, None]:
+        ...
+    def mkdir(
+        self, 
+        /, 
+        exist_ok: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> None | Coroutine[None, None, None]:
+        def gen_step():
+            yield self.fs.makedirs(self, exist_ok=exist_ok, async_=async_)
+        return run_gen_step(gen_step, async_=async_)
 
     def move(self, /, dst_path: str | PathLike[str]) -> CloudDrivePath:
         dst = self.fs.move(self, dst_path)
@@ -649,6 +963,7 @@ class CloudDrivePath(Mapping, PathLike[str]):
     def url(self, /) -> str:
         return self.fs.get_url(self)
 
+    @overload
     def walk(
         self, 
         /, 
@@ -657,7 +972,37 @@ class CloudDrivePath(Mapping, PathLike[str]):
         max_depth: int = -1, 
         onerror: None | bool | Callable = None, 
         refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[str], list[str]]]:
+        ...
+    @overload
+    def walk(
+        self, 
+        /, 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[tuple[str, list[str], list[str]]]:
+        ...
+    def walk(
+        self, 
+        /, 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[str], list[str]]] | AsyncIterator[tuple[str, list[str], list[str]]]:
         return self.fs.walk(
             self, 
             topdown=topdown, 
@@ -665,8 +1010,11 @@ class CloudDrivePath(Mapping, PathLike[str]):
             max_depth=max_depth, 
             onerror=onerror, 
             refresh=refresh, 
+            max_workers=max_workers, 
+            async_=async_, # type: ignore
         )
 
+    @overload
     def walk_attr(
         self, 
         /, 
@@ -675,7 +1023,37 @@ class CloudDrivePath(Mapping, PathLike[str]):
         max_depth: int = -1, 
         onerror: None | bool | Callable = None, 
         refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[dict], list[dict]]]:
+        ...
+    @overload
+    def walk_attr(
+        self, 
+        /, 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[tuple[str, list[dict], list[dict]]]:
+        ...
+    def walk_attr(
+        self, 
+        /, 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[dict], list[dict]]] | AsyncIterator[tuple[str, list[dict], list[dict]]]:
         return self.fs.walk_attr(
             self, 
             topdown=topdown, 
@@ -683,8 +1061,11 @@ class CloudDrivePath(Mapping, PathLike[str]):
             max_depth=max_depth, 
             onerror=onerror, 
             refresh=refresh, 
+            max_workers=max_workers, 
+            async_=async_, # type: ignore
         )
 
+    @overload
     def walk_path(
         self, 
         /, 
@@ -693,14 +1074,46 @@ class CloudDrivePath(Mapping, PathLike[str]):
         max_depth: int = -1, 
         onerror: None | bool | Callable = None, 
         refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[CloudDrivePath], list[CloudDrivePath]]]:
-        return self.fs.walk_path(
-            self, 
-            topdown=topdown, 
-            min_depth=min_depth, 
-            max_depth=max_depth, 
-            onerror=onerror, 
+        ...
+    @overload
+    def walk_path(
+        self, 
+        /, 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[tuple[str, list[CloudDrivePath], list[CloudDrivePath]]]:
+        ...
+    def walk_path(
+        self, 
+        /, 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[CloudDrivePath], list[CloudDrivePath]]] | AsyncIterator[tuple[str, list[CloudDrivePath], list[CloudDrivePath]]]:
+        return self.fs.walk_path(
+            self, 
+            topdown=topdown, 
+            min_depth=min_depth, 
+            max_depth=max_depth, 
+            onerror=onerror, 
             refresh=refresh, 
+            max_workers=max_workers, 
+            async_=async_, # type: ignore
         )
 
     def with_name(self, name: str, /) -> CloudDrivePath:
@@ -742,6 +1155,10 @@ class CloudDriveFileSystem:
     client: CloudDriveClient
     path: str
     refresh: bool
+    #: bytes carried by each request when uploading
+    upload_chunk_size: int = 1 << 20
+    #: upload by the client-streaming `WriteToFileStream`, it will be set to False if the server doesn't support it
+    upload_stream: bool = True
 
     def __init__(
         self, 
@@ -818,15 +1235,15 @@ class CloudDriveFileSystem:
         self.__dict__["refresh"] = value
 
     @check_response
-    def _attr(self, path: str, /):
-        return self.client.FindFileByPath(CloudDrive_pb2.FindFileByPathRequest(path=path))
+    def _attr(self, path: str, /, async_: Literal[False, True] = False):
+        return self.client.FindFileByPath(CloudDrive_pb2.FindFileByPathRequest(path=path), async_=async_)
 
     @check_response
-    def _delete(self, path: str, /, *paths: str):
+    def _delete(self, path: str, /, *paths: str, async_: Literal[False, True] = False):
         if paths:
-            return self.client.DeleteFiles(CloudDrive_pb2.MultiFileRequest(path=[path, *paths]))
+            return self.client.DeleteFiles(CloudDrive_pb2.MultiFileRequest(path=[path, *paths]), async_=async_)
         else:
-            return self.client.DeleteFile(CloudDrive_pb2.FileRequest(path=path))
+            return self.client.DeleteFile(CloudDrive_pb2.FileRequest(path=path), async_=async_)
 
     @check_response
     def _delete_cloud(self, name: str, username: str, /):
@@ -834,16 +1251,36 @@ class CloudDriveFileSystem:
                 cloudName=name, userName=username))
 
     @check_response
-    def _iterdir(self, path: str, /, refresh: bool = False):
-        it = self.client.GetSubFiles(CloudDrive_pb2.ListSubFileRequest(path=path, forceRefresh=refresh))
+    def _iterdir(self, path: str, /, refresh: bool = False, async_: Literal[False, True] = False):
+        req = CloudDrive_pb2.ListSubFileRequest(path=path, forceRefresh=refresh)
+        if async_:
+            return self._iterdir_async(req)
+        it = self.client.GetSubFiles(req)
         it = iter(check_response(iter(it).__next__), None)
         return (a for m in it for a in m.subFiles)
 
+    async def _iterdir_async(self, req, /) -> AsyncIterator:
+        """Iterate over the files in a directory by the grpclib stub.
+
+        The streaming replies of `GetSubFiles` are consumed one by one as they arrive
+        (calling the grpclib method directly would collect all of them into a list first), 
+        and breaking off the iteration cancels the call.
+        """
+        client = self.client
+        try:
+            async with client.async_stub.GetSubFiles.open(metadata=client.metadata) as stream:
+                await stream.send_message(req, end=True)
+                async for reply in stream:
+                    for attr in reply.subFiles:
+                        yield attr
+        except GRPCError as e:
+            raise_for_code((self._iterdir, (req.path,), {"refresh": req.forceRefresh}), e)
+
     @check_response
-    def _mkdir(self, path: str, /):
+    def _mkdir(self, path: str, /, async_: Literal[False, True] = False):
         dirname, name = splitpath(path)
         return self.client.CreateFolder(
-            CloudDrive_pb2.CreateFolderRequest(parentPath=dirname, folderName=name))
+            CloudDrive_pb2.CreateFolderRequest(parentPath=dirname, folderName=name), async_=async_)
 
     @check_response
     def _move(self, paths: Sequence[str], dst_dir: str, /):
@@ -883,27 +1320,129 @@ class CloudDriveFileSystem:
             return self.client.RenameFile(CloudDrive_pb2.RenameFileRequest(theFilePath=path, newName=name))
 
     @check_response
-    def _upload(self, path: str, file=None, /):
+    def _upload(self, path: str, file=None, /, async_: Literal[False, True] = False):
+        if async_:
+            return self._upload_async(path, file)
         client = self.client
         dir_, name = splitpath(path)
         fh = client.CreateFile(CloudDrive_pb2.CreateFileRequest(parentPath=dir_, fileName=name)).fileHandle
         try:
             if file is not None:
-                offset = 0
-                while data := file.read(DEFAULT_BUFFER_SIZE):
-                    client.WriteToFile(CloudDrive_pb2.WriteFileRequest(
-                        fileHandle=fh, 
-                        startPos=offset, 
-                        length=len(data), 
-                        buffer=data, 
-                        closeFile=False, 
-                    ))
-                    offset += len(data)
+                self._write_file(fh, file)
             return client.CloseFile(CloudDrive_pb2.CloseFileRequest(fileHandle=fh))
         except:
             client.CloseFile(CloudDrive_pb2.CloseFileRequest(fileHandle=fh))
             raise
 
+    async def _upload_async(self, path: str, file=None, /):
+        client = self.client
+        dir_, name = splitpath(path)
+        fh = (await client.CreateFile(
+            CloudDrive_pb2.CreateFileRequest(parentPath=dir_, fileName=name), async_=True)).fileHandle
+        try:
+            if file is not None:
+                await self._write_file_async(fh, file)
+            return await client.CloseFile(CloudDrive_pb2.CloseFileRequest(fileHandle=fh), async_=True)
+        except:
+            await client.CloseFile(CloudDrive_pb2.CloseFileRequest(fileHandle=fh), async_=True)
+            raise
+
+    def _write_file(self, fh: int, file: SupportsRead[bytes], /) -> int:
+        """Write the data of `file` to an opened file handle, and return the number of bytes written.
+
+        The data is read ahead in a background thread by chunks of `upload_chunk_size` bytes, and sent 
+        in one client-streaming `WriteToFileStream` call. If the server doesn't implement it, 
+        fall back to one unary `WriteToFile` call per chunk (the file must be seekable to retry).
+        """
+        client = self.client
+        chunk_size = self.upload_chunk_size
+        def make_request(offset: int, data: bytes, /):
+            return CloudDrive_pb2.WriteFileRequest(
+                fileHandle=fh, 
+                startPos=offset, 
+                length=len(data), 
+                buffer=data, 
+                closeFile=False, 
+            )
+        if self.upload_stream:
+            try:
+                start = file.tell() if file.seekable() else -1 # type: ignore
+            except (AttributeError, OSError):
+                start = -1
+            sent = 0
+            def iter_requests(chunks: Iterable[bytes], /):
+                nonlocal sent
+                for data in chunks:
+                    yield make_request(sent, data)
+                    sent += len(data)
+            # NOTE: the requests are consumed in a thread of grpc, which may still be running after the call fails, 
+            #       so the reader must be stopped (and its thread joined) before the file is rewound
+            with ReadAhead(file, chunk_size) as reader:
+                try:
+                    client.WriteToFileStream(iter_requests(reader))
+                    return sent
+                except RpcError as e:
+                    if e.code() != StatusCode.UNIMPLEMENTED or start < 0:
+                        raise
+            self.__dict__["upload_stream"] = False
+            file.seek(start) # type: ignore
+        offset = 0
+        with ReadAhead(file, chunk_size) as reader:
+            for data in reader:
+                client.WriteToFile(make_request(offset, data))
+                offset += len(data)
+        return offset
+
+    async def _write_file_async(self, fh: int, file: SupportsRead[bytes], /) -> int:
+        """Asynchronous version of `_write_file`.
+
+        The chunks are sent through a client-streaming call opened on the grpclib stub, 
+        and the next chunk is read from `file` (in a worker thread) while the current one is being sent.
+        """
+        client = self.client
+        read = partial(to_thread, file.read, self.upload_chunk_size)
+        def make_request(offset: int, data: bytes, /):
+            return CloudDrive_pb2.WriteFileRequest(
+                fileHandle=fh, 
+                startPos=offset, 
+                length=len(data), 
+                buffer=data, 
+                closeFile=False, 
+            )
+        offset = 0
+        if self.upload_stream:
+            try:
+                start = file.tell() if file.seekable() else -1 # type: ignore
+            except (AttributeError, OSError):
+                start = -1
+            try:
+                async with client.async_stub.WriteToFileStream.open(metadata=client.metadata) as stream:
+                    data = await read()
+                    while data:
+                        task = create_task(read())
+                        try:
+                            await stream.send_message(make_request(offset, data))
+                        except BaseException:
+                            # NOTE: a read in a worker thread can't be cancelled, wait for it to finish 
+                            #       before the file may be rewound
+                            await wait((task,))
+                            raise
+                        offset += len(data)
+                        data = await task
+                    await stream.end()
+                    await stream.recv_message()
+                return offset
+            except GRPCError as e:
+                if e.status is not GRPCStatus.UNIMPLEMENTED or start < 0:
+                    raise
+            self.__dict__["upload_stream"] = False
+            file.seek(start) # type: ignore
+            offset = 0
+        while data := await read():
+            await client.WriteToFile(make_request(offset, data), async_=True)
+            offset += len(data)
+        return offset
+
     def abspath(self, path: str | PathLike[str] = "", /) -> str:
         if path == "/":
             return "/"
@@ -926,26 +1465,50 @@ class CloudDriveFileSystem:
             return CloudDrivePath(**{**path, "fs": self})
         return CloudDrivePath(fs=self, path=self.abspath(path))
 
+    @overload
     def attr(
         self, 
         /, 
         path: str | PathLike[str] = "", 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> dict:
+        ...
+    @overload
+    def attr(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, dict]:
+        ...
+    def attr(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> dict | Coroutine[None, None, dict]:
         if isinstance(path, CloudDrivePath):
             path = path.path
         elif _check:
             path = self.abspath(path)
         path = cast(str, path)
-        attr = MessageToDict(self._attr(path))
-        last_update = time()
-        attr["path"] = attr.get("fullPathName") or path
-        attr["ctime"] = parse_as_timestamp(attr.get("createTime"))
-        attr["mtime"] = parse_as_timestamp(attr.get("writeTime"))
-        attr["atime"] = parse_as_timestamp(attr.get("accessTime"))
-        attr.setdefault("isDirectory", False)
-        attr["last_update"] = last_update
-        return attr
+        def gen_step():
+            attr = MessageToDict((yield self._attr(path, async_=async_)))
+            last_update = time()
+            attr["path"] = attr.get("fullPathName") or path
+            attr["ctime"] = parse_as_timestamp(attr.get("createTime"))
+            attr["mtime"] = parse_as_timestamp(attr.get("writeTime"))
+            attr["atime"] = parse_as_timestamp(attr.get("accessTime"))
+            attr.setdefault("isDirectory", False)
+            attr["last_update"] = last_update
+            return attr
+        return run_gen_step(gen_step, async_=async_)
 
     def chdir(
         self, 
@@ -988,6 +1551,20 @@ class CloudDriveFileSystem:
     ) -> Optional[str]:
         raise UnsupportedOperation(errno.ENOSYS, "copytree")
 
+    @overload
+    def download(
+        self, 
+        /, 
+        path: str | PathLike[str], 
+        local_path_or_file: bytes | str | PathLike | SupportsWrite[bytes] | TextIOWrapper = "", 
+        write_mode: Literal["", "x", "w", "a"] = "w", 
+        download: Optional[Callable[[str, SupportsWrite[bytes]], Any]] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
+    ):
+        ...
+    @overload
     def download(
         self, 
         /, 
@@ -996,38 +1573,62 @@ class CloudDriveFileSystem:
         write_mode: Literal["", "x", "w", "a"] = "w", 
         download: Optional[Callable[[str, SupportsWrite[bytes]], Any]] = None, 
         _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine:
+        ...
+    def download(
+        self, 
+        /, 
+        path: str | PathLike[str], 
+        local_path_or_file: bytes | str | PathLike | SupportsWrite[bytes] | TextIOWrapper = "", 
+        write_mode: Literal["", "x", "w", "a"] = "w", 
+        download: Optional[Callable[[str, SupportsWrite[bytes]], Any]] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
     ):
+        """Download a file.
+
+        In the asynchronous mode, `download` may return an awaitable; if it is not specified, 
+        the data is fetched over HTTP in a worker thread.
+        """
         if isinstance(path, CloudDrivePath):
             path = path.path
         elif _check:
             path = self.abspath(path)
         path = cast(str, path)
-        attr = self.attr(path, _check=False)
-        if hasattr(local_path_or_file, "write"):
-            file = local_path_or_file
-            if isinstance(file, TextIOWrapper):
-                file = file.buffer
-        else:
-            local_path = fspath(local_path_or_file)
-            mode: str = write_mode
-            if mode:
-                mode += "b"
-            elif ospath.lexists(local_path):
-                return
+        def gen_step():
+            yield self.attr(path, _check=False, async_=async_)
+            if hasattr(local_path_or_file, "write"):
+                file = local_path_or_file
+                if isinstance(file, TextIOWrapper):
+                    file = file.buffer
             else:
-                mode = "wb"
-            if local_path:
-                file = open(local_path, mode)
+                local_path = fspath(local_path_or_file)
+                mode: str = write_mode
+                if mode:
+                    mode += "b"
+                elif ospath.lexists(local_path):
+                    return
+                else:
+                    mode = "wb"
+                if local_path:
+                    file = open(local_path, mode)
+                else:
+                    file = open(basename(path), mode)
+            file = cast(SupportsWrite[bytes], file)
+            url = self.client.download_baseurl + quote(path, safe="?&=")
+            if download:
+                yield partial(download, url, file)
             else:
-                file = open(basename(path), mode)
-        file = cast(SupportsWrite[bytes], file)
-        url = self.client.download_baseurl + quote(path, safe="?&=")
-        if download:
-            download(url, file)
-        else:
-            with urlopen(url) as fsrc:
-                copyfileobj(fsrc, file)
+                def fetch():
+                    with urlopen(url) as fsrc:
+                        copyfileobj(fsrc, file)
+                yield to_thread(fetch) if async_ else fetch
+        return run_gen_step(gen_step, async_=async_)
 
+    @overload
     def download_tree(
         self, 
         /, 
@@ -1038,68 +1639,131 @@ class CloudDriveFileSystem:
         download: Optional[Callable[[str, SupportsWrite[bytes]], Any]] = None, 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
+    ):
+        ...
+    @overload
+    def download_tree(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        local_dir: bytes | str | PathLike = "", 
+        no_root: bool = False, 
+        write_mode: Literal["", "x", "w", "a"] = "w", 
+        download: Optional[Callable[[str, SupportsWrite[bytes]], Any]] = None, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine:
+        ...
+    def download_tree(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        local_dir: bytes | str | PathLike = "", 
+        no_root: bool = False, 
+        write_mode: Literal["", "x", "w", "a"] = "w", 
+        download: Optional[Callable[[str, SupportsWrite[bytes]], Any]] = None, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
     ):
-        is_dir: bool
-        if isinstance(path, CloudDrivePath):
-            is_dir = path.is_dir()
-            path = path.path
-        elif _check:
-            path = self.abspath(path)
-            is_dir = self._attr(path).isDirectory
-        else:
-            is_dir = True
         if refresh is None:
             refresh = self.refresh
-        path = cast(str, path)
         refresh = cast(bool, refresh)
-        local_dir = fsdecode(local_dir)
-        if local_dir:
-            makedirs(local_dir, exist_ok=True)
-        if is_dir:
-            if not no_root:
-                local_dir = ospath.join(local_dir, basename(path))
-                if local_dir:
-                    makedirs(local_dir, exist_ok=True)
-            for pathobj in self.listdir_path(path, refresh=refresh, _check=False):
-                name = pathobj.name
-                if pathobj.is_dir():
-                    self.download_tree(
-                        pathobj.name, 
-                        ospath.join(local_dir, name), 
-                        no_root=True, 
-                        write_mode=write_mode, 
-                        download=download, 
-                        refresh=refresh, 
-                        _check=False, 
-                    )
-                else:
-                    self.download(
-                        pathobj.name, 
-                        ospath.join(local_dir, name), 
-                        write_mode=write_mode, 
-                        download=download, 
-                        _check=False, 
-                    )
-        else:
-            self.download(
-                path, 
-                ospath.join(local_dir, basename(path)), 
-                write_mode=write_mode, 
-                download=download, 
-                _check=False, 
-            )
+        def gen_step():
+            nonlocal path, local_dir
+            is_dir: bool
+            if isinstance(path, CloudDrivePath):
+                if not path.is_attr_loaded:
+                    path.__dict__.update((yield self.attr(path, async_=async_)))
+                is_dir = path.is_dir()
+                path = path.path
+            elif _check:
+                path = self.abspath(path)
+                is_dir = (yield self._attr(path, async_=async_)).isDirectory
+            else:
+                is_dir = True
+            path = cast(str, path)
+            local_dir = fsdecode(local_dir)
+            if local_dir:
+                makedirs(local_dir, exist_ok=True)
+            if is_dir:
+                if not no_root:
+                    local_dir = ospath.join(local_dir, basename(path))
+                    if local_dir:
+                        makedirs(local_dir, exist_ok=True)
+                for pathobj in (yield self.listdir_path(path, refresh=refresh, _check=False, async_=async_)):
+                    name = pathobj.name
+                    if pathobj.is_dir():
+                        yield self.download_tree(
+                            pathobj, 
+                            ospath.join(local_dir, name), 
+                            no_root=True, 
+                            write_mode=write_mode, 
+                            download=download, 
+                            refresh=refresh, 
+                            _check=False, 
+                            async_=async_, 
+                        )
+                    else:
+                        yield self.download(
+                            pathobj, 
+                            ospath.join(local_dir, name), 
+                            write_mode=write_mode, 
+                            download=download, 
+                            _check=False, 
+                            async_=async_, 
+                        )
+            else:
+                yield self.download(
+                    path, 
+                    ospath.join(local_dir, basename(path)), 
+                    write_mode=write_mode, 
+                    download=download, 
+                    _check=False, 
+                    async_=async_, 
+                )
+        return run_gen_step(gen_step, async_=async_)
 
+    @overload
     def exists(
         self, 
         /, 
         path: str | PathLike[str] = "", 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> bool:
-        try:
-            self.attr(path, _check=_check)
-            return True
-        except FileNotFoundError:
-            return False
+        ...
+    @overload
+    def exists(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, bool]:
+        ...
+    def exists(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> bool | Coroutine[None, None, bool]:
+        def gen_step():
+            try:
+                yield self.attr(path, _check=_check, async_=async_)
+                return True
+            except FileNotFoundError:
+                return False
+        return run_gen_step(gen_step, async_=async_)
 
     def getcwd(self, /) -> str:
         return self.path
@@ -1223,31 +1887,79 @@ class CloudDriveFileSystem:
             return iter(())
         return glob_step_match(path, i)
 
+    @overload
     def isdir(
         self, 
         /, 
         path: str | PathLike[str], 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> bool:
-        try:
-            return self.attr(path, _check=_check)["isDirectory"]
-        except FileNotFoundError:
-            return False
-        except KeyError:
-            return False
+        ...
+    @overload
+    def isdir(
+        self, 
+        /, 
+        path: str | PathLike[str], 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, bool]:
+        ...
+    def isdir(
+        self, 
+        /, 
+        path: str | PathLike[str], 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> bool | Coroutine[None, None, bool]:
+        def gen_step():
+            try:
+                return (yield self.attr(path, _check=_check, async_=async_))["isDirectory"]
+            except FileNotFoundError:
+                return False
+            except KeyError:
+                return False
+        return run_gen_step(gen_step, async_=async_)
 
+    @overload
     def isfile(
         self, 
         /, 
         path: str | PathLike[str], 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> bool:
-        try:
-            return not self.attr(path, _check=_check)["isDirectory"]
-        except FileNotFoundError:
-            return False
-        except KeyError:
-            return True
+        ...
+    @overload
+    def isfile(
+        self, 
+        /, 
+        path: str | PathLike[str], 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, bool]:
+        ...
+    def isfile(
+        self, 
+        /, 
+        path: str | PathLike[str], 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> bool | Coroutine[None, None, bool]:
+        def gen_step():
+            try:
+                return not (yield self.attr(path, _check=_check, async_=async_))["isDirectory"]
+            except FileNotFoundError:
+                return False
+            except KeyError:
+                return True
+        return run_gen_step(gen_step, async_=async_)
 
     def is_empty(
         self, 
@@ -1296,39 +2008,118 @@ class CloudDriveFileSystem:
         onerror: bool | Callable[[OSError], bool] = False, 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
-    ) -> Iterator[CloudDrivePath]:
-        dq: deque[tuple[int, CloudDrivePath]] = deque()
-        push, pop = dq.append, dq.popleft
-        path = self.as_path(top)
-        if not path.is_attr_loaded:
-            path()
-        push((0, path))
-        while dq:
-            depth, path = pop()
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[CloudDrivePath] | AsyncIterator[CloudDrivePath]:
+        def gen_step():
+            nonlocal min_depth
+            dq: deque[tuple[int, CloudDrivePath]] = deque()
+            push, pop = dq.append, dq.popleft
+            path = self.as_path(top)
+            if not path.is_attr_loaded:
+                path.__dict__.update((yield self.attr(path, async_=async_)))
+            push((0, path))
+            while dq:
+                depth, path = pop()
+                if min_depth <= 0:
+                    pred = (yield partial(predicate, path)) if predicate else True
+                    if pred is None:
+                        return
+                    elif pred:
+                        yield Yield(path, may_call=False)
+                    min_depth = 1
+                if depth == 0 and (not path.is_dir() or 0 <= max_depth <= depth):
+                    return
+                depth += 1
+                try:
+                    # NOTE: the items are processed as soon as they arrive, instead of waiting for the whole listing
+                    with with_iter_next(
+                        self.iterdir(path, refresh=refresh, _check=False, async_=async_), 
+                        async_=async_, 
+                    ) as get_next:
+                        while True:
+                            path = CloudDrivePath(self, **(yield get_next))
+                            pred = (yield partial(predicate, path)) if predicate else True
+                            if pred is None:
+                                continue
+                            elif pred and depth >= min_depth:
+                                yield Yield(path, may_call=False)
+                            if path.is_dir() and (max_depth < 0 or depth < max_depth):
+                                push((depth, path))
+                except OSError as e:
+                    if callable(onerror):
+                        yield partial(onerror, e)
+                    elif onerror:
+                        raise
+        return run_gen_step_iter(gen_step, async_=async_)
+
+    def _iter_bfs_concurrent(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: Optional[Callable[[CloudDrivePath], Optional[bool]]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        max_workers: int = 8, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[CloudDrivePath] | AsyncIterator[CloudDrivePath]:
+        """Concurrent version of `_iter_bfs`, up to `max_workers` directories are listed at the same time
+        (by threads, or by tasks which share the single HTTP/2 connection of the grpclib channel), 
+        so the items come out in the order in which the listings are completed, not strictly level by level.
+
+        The subdirectories of a directory are submitted as soon as its listing is consumed, there is no barrier 
+        between levels (so a slow directory does not hold up the others), a deeper directory may come out 
+        before a shallower sibling, but a directory always comes out after its parent.
+        """
+        def listdir(item, /):
+            return self.listdir_attr(item[1], refresh=refresh, _check=False, async_=async_)
+        def gen_step():
+            try:
+                attr = yield self.attr(top, _check=_check, async_=async_)
+            except OSError as e:
+                if callable(onerror):
+                    yield partial(onerror, e)
+                elif onerror:
+                    raise
+                return
+            path = CloudDrivePath(self, **attr)
             if min_depth <= 0:
-                pred = predicate(path) if predicate else True
+                pred = (yield partial(predicate, path)) if predicate else True
                 if pred is None:
                     return
                 elif pred:
-                    yield path
-                min_depth = 1
-            if depth == 0 and (not path.is_dir() or 0 <= max_depth <= depth):
+                    yield Yield(path, may_call=False)
+            if not path.is_dir() or 0 <= max_depth <= 0:
                 return
-            depth += 1
+            lister = ConcurrentLister(listdir, max_workers=max_workers, async_=async_)
             try:
-                for path in self.listdir_path(path, refresh=refresh, _check=False):
-                    pred = predicate(path) if predicate else True
-                    if pred is None:
+                lister.submit((1, path.path))
+                while lister:
+                    (depth, _), ls = yield lister.get
+                    if isinstance(ls, BaseException):
+                        if not isinstance(ls, OSError):
+                            raise ls
+                        if callable(onerror):
+                            yield partial(onerror, ls)
+                        elif onerror:
+                            raise ls
                         continue
-                    elif pred and depth >= min_depth:
-                        yield path
-                    if path.is_dir() and (max_depth < 0 or depth < max_depth):
-                        push((depth, path))
-            except OSError as e:
-                if callable(onerror):
-                    onerror(e)
-                elif onerror:
-                    raise
+                    for attr in ls:
+                        path = CloudDrivePath(self, **attr)
+                        pred = (yield partial(predicate, path)) if predicate else True
+                        if pred is None:
+                            continue
+                        elif pred and depth >= min_depth:
+                            yield Yield(path, may_call=False)
+                        if attr["isDirectory"] and (max_depth < 0 or depth < max_depth):
+                            lister.submit((depth + 1, attr["path"]))
+            finally:
+                lister.close()
+        return run_gen_step_iter(gen_step, async_=async_)
 
     def _iter_dfs(
         self, 
@@ -1341,58 +2132,65 @@ class CloudDriveFileSystem:
         onerror: bool | Callable[[OSError], bool] = False, 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
-    ) -> Iterator[CloudDrivePath]:
-        if not max_depth:
-            return
-        global_yield_me = True
-        if min_depth > 1:
-            global_yield_me = False
-            min_depth -= 1
-        elif min_depth <= 0:
-            path = self.as_path(top)
-            if not path.is_attr_loaded:
-                path()
-            pred = predicate(path) if predicate else True
-            if pred is None:
-                return
-            elif pred:
-                yield path
-            if path.is_file():
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[CloudDrivePath] | AsyncIterator[CloudDrivePath]:
+        def gen_step():
+            nonlocal min_depth, max_depth
+            if not max_depth:
                 return
-            min_depth = 1
-        if max_depth > 0:
-            max_depth -= 1
-        try:
-            ls = self.listdir_path(top, refresh=refresh, _check=False)
-        except OSError as e:
-            if callable(onerror):
-                onerror(e)
-            elif onerror:
-                raise
-            return
-        for path in ls:
-            yield_me = global_yield_me
-            if yield_me and predicate:
-                pred = predicate(path)
+            global_yield_me = True
+            if min_depth > 1:
+                global_yield_me = False
+                min_depth -= 1
+            elif min_depth <= 0:
+                path = self.as_path(top)
+                if not path.is_attr_loaded:
+                    path.__dict__.update((yield self.attr(path, async_=async_)))
+                pred = (yield partial(predicate, path)) if predicate else True
                 if pred is None:
-                    continue
-                yield_me = pred
-            if yield_me and topdown:
-                yield path
-            if path.is_dir():
-                yield from self.iter(
-                    path, 
-                    topdown=topdown, 
-                    min_depth=min_depth, 
-                    max_depth=max_depth, 
-                    predicate=predicate, 
-                    onerror=onerror, 
-                    refresh=refresh, 
-                    _check=_check, 
-                )
-            if yield_me and not topdown:
-                yield path
+                    return
+                elif pred:
+                    yield Yield(path, may_call=False)
+                if path.is_file():
+                    return
+                min_depth = 1
+            if max_depth > 0:
+                max_depth -= 1
+            try:
+                ls = yield self.listdir_path(top, refresh=refresh, _check=_check, async_=async_)
+            except OSError as e:
+                if callable(onerror):
+                    yield partial(onerror, e)
+                elif onerror:
+                    raise
+                return
+            for path in ls:
+                yield_me = global_yield_me
+                if yield_me and predicate:
+                    pred = yield partial(predicate, path)
+                    if pred is None:
+                        continue
+                    yield_me = pred
+                if yield_me and topdown:
+                    yield Yield(path, may_call=False)
+                if path.is_dir():
+                    yield YieldFrom(self._iter_dfs(
+                        path, 
+                        topdown=topdown, 
+                        min_depth=min_depth, 
+                        max_depth=max_depth, 
+                        predicate=predicate, 
+                        onerror=onerror, 
+                        refresh=refresh, 
+                        _check=_check, 
+                        async_=async_, 
+                    ), may_call=False)
+                if yield_me and not topdown:
+                    yield Yield(path, may_call=False)
+        return run_gen_step_iter(gen_step, async_=async_)
 
+    @overload
     def iter(
         self, 
         /, 
@@ -1404,8 +2202,62 @@ class CloudDriveFileSystem:
         onerror: bool | Callable[[OSError], bool] = False, 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False] = False, 
     ) -> Iterator[CloudDrivePath]:
+        ...
+    @overload
+    def iter(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: Optional[Callable[[CloudDrivePath], Optional[bool]]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[CloudDrivePath]:
+        ...
+    def iter(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 1, 
+        max_depth: int = 1, 
+        predicate: Optional[Callable[[CloudDrivePath], Optional[bool]]] = None, 
+        onerror: bool | Callable[[OSError], bool] = False, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[CloudDrivePath] | AsyncIterator[CloudDrivePath]:
+        """Iterate over the paths in a directory tree.
+
+        If `topdown` is None, it's breadth-first, and the directories are listed
+        by up to `max_workers` workers concurrently when `max_workers > 1`;
+        otherwise it's depth-first (`max_workers` is ignored).
+        """
         if topdown is None:
+            if max_workers > 1:
+                return self._iter_bfs_concurrent(
+                    top, 
+                    min_depth=min_depth, 
+                    max_depth=max_depth, 
+                    predicate=predicate, 
+                    onerror=onerror, 
+                    refresh=refresh, 
+                    _check=_check, 
+                    max_workers=max_workers, 
+                    async_=async_, 
+                )
             return self._iter_bfs(
                 top, 
                 min_depth=min_depth, 
@@ -1414,6 +2266,7 @@ class CloudDriveFileSystem:
                 onerror=onerror, 
                 refresh=refresh, 
                 _check=_check, 
+                async_=async_, 
             )
         else:
             return self._iter_dfs(
@@ -1425,15 +2278,40 @@ class CloudDriveFileSystem:
                 onerror=onerror, 
                 refresh=refresh, 
                 _check=_check, 
+                async_=async_, 
             )
 
+    @overload
     def iterdir(
         self, 
         /, 
         path: str | PathLike[str] = "", 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> Iterator[dict]:
+        ...
+    @overload
+    def iterdir(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[dict]:
+        ...
+    def iterdir(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[dict] | AsyncIterator[dict]:
         if isinstance(path, CloudDrivePath):
             path = path.path
         elif _check:
@@ -1442,26 +2320,58 @@ class CloudDriveFileSystem:
             refresh = self.refresh
         path = cast(str, path)
         refresh = cast(bool, refresh)
-        last_update = time()
-        for attr in map(MessageToDict, self._iterdir(path, refresh=refresh)):
-            attr["path"] = attr.get("fullPathName") or joinpath(path, attr["name"])
-            attr["ctime"] = parse_as_timestamp(attr.get("createTime"))
-            attr["mtime"] = parse_as_timestamp(attr.get("writeTime"))
-            attr["atime"] = parse_as_timestamp(attr.get("accessTime"))
-            attr.setdefault("isDirectory", False)
-            attr["last_update"] = last_update
-            yield attr
+        def gen_step():
+            last_update = time()
+            def normalize(attr, /) -> dict:
+                attr = MessageToDict(attr)
+                attr["path"] = attr.get("fullPathName") or joinpath(path, attr["name"])
+                attr["ctime"] = parse_as_timestamp(attr.get("createTime"))
+                attr["mtime"] = parse_as_timestamp(attr.get("writeTime"))
+                attr["atime"] = parse_as_timestamp(attr.get("accessTime"))
+                attr.setdefault("isDirectory", False)
+                attr["last_update"] = last_update
+                return attr
+            it = self._iterdir(path, refresh=refresh, async_=async_)
+            if async_:
+                yield YieldFrom((normalize(a) async for a in it), may_call=False)
+            else:
+                yield YieldFrom(map(normalize, it), may_call=False)
+        return run_gen_step_iter(gen_step, async_=async_)
 
     def list_storage(self, /) -> list[dict]:
         return self.listdir_attr("/")
 
+    @overload
     def listdir(
         self, 
         /, 
         path: str | PathLike[str] = "", 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> list[str]:
+        ...
+    @overload
+    def listdir(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, list[str]]:
+        ...
+    def listdir(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> list[str] | Coroutine[None, None, list[str]]:
         if isinstance(path, CloudDrivePath):
             path = path.path
         elif _check:
@@ -1470,46 +2380,123 @@ class CloudDriveFileSystem:
             refresh = self.refresh
         path = cast(str, path)
         refresh = cast(bool, refresh)
+        if async_:
+            return collect(a.name async for a in self._iterdir(path, refresh, async_=True))
         return [a.name for a in self._iterdir(path, refresh)]
 
+    @overload
     def listdir_attr(
         self, 
         /, 
         path: str | PathLike[str] = "", 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> list[dict]:
-        return list(self.iterdir(path, refresh, _check=_check))
+        ...
+    @overload
+    def listdir_attr(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, list[dict]]:
+        ...
+    def listdir_attr(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> list[dict] | Coroutine[None, None, list[dict]]:
+        return collect(self.iterdir(path, refresh, _check=_check, async_=async_)) # type: ignore
 
+    @overload
     def listdir_path(
         self, 
         /, 
         path: str | PathLike[str] = "", 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> list[CloudDrivePath]:
-        return [
-            CloudDrivePath(self, **attr)
-            for attr in self.iterdir(path, refresh, _check=_check)
-        ]
+        ...
+    @overload
+    def listdir_path(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, list[CloudDrivePath]]:
+        ...
+    def listdir_path(
+        self, 
+        /, 
+        path: str | PathLike[str] = "", 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> list[CloudDrivePath] | Coroutine[None, None, list[CloudDrivePath]]:
+        it = self.iterdir(path, refresh, _check=_check, async_=async_)
+        if async_:
+            return collect(CloudDrivePath(self, **attr) async for attr in it) # type: ignore
+        return [CloudDrivePath(self, **attr) for attr in it] # type: ignore
 
+    @overload
+    def makedirs(
+        self, 
+        /, 
+        path: str | PathLike[str], 
+        exist_ok: bool = False, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
+    ) -> str:
+        ...
+    @overload
+    def makedirs(
+        self, 
+        /, 
+        path: str | PathLike[str], 
+        exist_ok: bool = False, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, str]:
+        ...
     def makedirs(
         self, 
         /, 
         path: str | PathLike[str], 
         exist_ok: bool = False, 
         _check: bool = True, 
-    ) -> str:
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> str | Coroutine[None, None, str]:
         if isinstance(path, CloudDrivePath):
             path = path.path
         elif _check:
             path = self.abspath(path)
         path = cast(str, path)
-        if path == "/":
-            return "/"
-        if not exist_ok and self.exists(path, _check=False):
-            raise FileExistsError(errno.EEXIST, path)
-        return self._mkdir(path).folderCreated.fullPathName
+        def gen_step():
+            if path == "/":
+                return "/"
+            if not exist_ok and (yield self.exists(path, _check=False, async_=async_)):
+                raise FileExistsError(errno.EEXIST, path)
+            resp = yield self._mkdir(path, async_=async_)
+            return resp.folderCreated.fullPathName
+        return run_gen_step(gen_step, async_=async_)
 
     def mkdir(
         self, 
@@ -1991,6 +2978,7 @@ class CloudDriveFileSystem:
                 path = cast(str, d["resultFilePaths"][0])
         return path
 
+    @overload
     def upload(
         self, 
         /, 
@@ -1998,45 +2986,74 @@ class CloudDriveFileSystem:
         path: str | PathLike[str] = "", 
         overwrite_or_ignore: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> str:
-        file: SupportsRead[bytes]
-        if hasattr(local_path_or_file, "read"):
-            file = cast(SupportsRead[bytes], local_path_or_file)
-            if isinstance(file, TextIOWrapper):
-                file = file.buffer
-            if not path:
-                try:
-                    path = ospath.basename(file.name) # type: ignore
-                except AttributeError as e:
-                    raise OSError(errno.EINVAL, "Please specify the upload path") from e
-        else:
-            file = open(local_path_or_file, "rb")
-            if not path:
-                path = ospath.basename(local_path_or_file)
-        if isinstance(path, CloudDrivePath):
-            path = path.path
-        elif _check:
-            path = self.abspath(path)
-            self.makedirs(dirname(path), exist_ok=True, _check=False)
-        path = cast(str, path)
-        try:
-            attr = self._attr(path)
-        except FileNotFoundError:
-            pass
-        else:
-            if overwrite_or_ignore is None:
-                raise FileExistsError(errno.EEXIST, path)
-            elif attr.isDirectory:
-                raise IsADirectoryError(errno.EISDIR, path)
-            elif not overwrite_or_ignore:
-                return path
-            self._delete(path)
-        resp = self._upload(path, file)
-        d = MessageToDict(resp)
-        if "resultFilePaths" in d:
-            path = cast(str, d["resultFilePaths"][0])
-        return path
+        ...
+    @overload
+    def upload(
+        self, 
+        /, 
+        local_path_or_file: str | PathLike | SupportsRead[bytes] | TextIOWrapper, 
+        path: str | PathLike[str] = "", 
+        overwrite_or_ignore: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, str]:
+        ...
+    def upload(
+        self, 
+        /, 
+        local_path_or_file: str | PathLike | SupportsRead[bytes] | TextIOWrapper, 
+        path: str | PathLike[str] = "", 
+        overwrite_or_ignore: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> str | Coroutine[None, None, str]:
+        def gen_step():
+            nonlocal path
+            file: SupportsRead[bytes]
+            if hasattr(local_path_or_file, "read"):
+                file = cast(SupportsRead[bytes], local_path_or_file)
+                if isinstance(file, TextIOWrapper):
+                    file = file.buffer
+                if not path:
+                    try:
+                        path = ospath.basename(file.name) # type: ignore
+                    except AttributeError as e:
+                        raise OSError(errno.EINVAL, "Please specify the upload path") from e
+            else:
+                file = open(local_path_or_file, "rb")
+                if not path:
+                    path = ospath.basename(local_path_or_file)
+            if isinstance(path, CloudDrivePath):
+                path = path.path
+            elif _check:
+                path = self.abspath(path)
+                yield self.makedirs(dirname(path), exist_ok=True, _check=False, async_=async_)
+            path = cast(str, path)
+            try:
+                attr = yield self._attr(path, async_=async_)
+            except FileNotFoundError:
+                pass
+            else:
+                if overwrite_or_ignore is None:
+                    raise FileExistsError(errno.EEXIST, path)
+                elif attr.isDirectory:
+                    raise IsADirectoryError(errno.EISDIR, path)
+                elif not overwrite_or_ignore:
+                    return path
+                yield self._delete(path, async_=async_)
+            resp = yield self._upload(path, file, async_=async_)
+            d = MessageToDict(resp)
+            if "resultFilePaths" in d:
+                path = cast(str, d["resultFilePaths"][0])
+            return path
+        return run_gen_step(gen_step, async_=async_)
 
+    @overload
     def upload_tree(
         self, 
         /, 
@@ -2045,47 +3062,80 @@ class CloudDriveFileSystem:
         no_root: bool = False, 
         overwrite_or_ignore: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        async_: Literal[False] = False, 
     ) -> str:
+        ...
+    @overload
+    def upload_tree(
+        self, 
+        /, 
+        local_path: str | PathLike[str], 
+        path: str | PathLike[str] = "", 
+        no_root: bool = False, 
+        overwrite_or_ignore: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[True], 
+    ) -> Coroutine[None, None, str]:
+        ...
+    def upload_tree(
+        self, 
+        /, 
+        local_path: str | PathLike[str], 
+        path: str | PathLike[str] = "", 
+        no_root: bool = False, 
+        overwrite_or_ignore: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> str | Coroutine[None, None, str]:
         if isinstance(path, CloudDrivePath):
             path = path.path
         elif _check:
             path = self.abspath(path)
         path = cast(str, path)
-        try:
-            if not self._attr(path).isDirectory:
-                raise NotADirectoryError(errno.ENOTDIR, path)
-        except FileNotFoundError:
-            self.makedirs(path, exist_ok=True, _check=False)
-        try:
-            it = scandir(local_path)
-        except NotADirectoryError:
-            return self.upload(
-                local_path, 
-                joinpath(path, ospath.basename(local_path)), 
-                overwrite_or_ignore=overwrite_or_ignore, 
-                _check=False, 
-            )
-        else:
-            if not no_root:
-                path = joinpath(path, ospath.basename(local_path))
-                self.makedirs(path, exist_ok=True, _check=False)
-            for entry in it:
-                if entry.is_dir():
-                    self.upload_tree(
-                        entry.path, 
-                        joinpath(path, entry.name), 
-                        no_root=True, 
-                        overwrite_or_ignore=overwrite_or_ignore, 
-                        _check=False, 
-                    )
-                else:
-                    self.upload(
-                        entry.path, 
-                        joinpath(path, entry.name), 
-                        overwrite_or_ignore=overwrite_or_ignore, 
-                        _check=False, 
-                    )
-            return path
+        def gen_step():
+            nonlocal path
+            try:
+                if not (yield self._attr(path, async_=async_)).isDirectory:
+                    raise NotADirectoryError(errno.ENOTDIR, path)
+            except FileNotFoundError:
+                yield self.makedirs(path, exist_ok=True, _check=False, async_=async_)
+            try:
+                it = scandir(local_path)
+            except NotADirectoryError:
+                return (yield self.upload(
+                    local_path, 
+                    joinpath(path, ospath.basename(local_path)), 
+                    overwrite_or_ignore=overwrite_or_ignore, 
+                    _check=False, 
+                    async_=async_, 
+                ))
+            else:
+                if not no_root:
+                    path = joinpath(path, ospath.basename(local_path))
+                    yield self.makedirs(path, exist_ok=True, _check=False, async_=async_)
+                for entry in it:
+                    if entry.is_dir():
+                        yield self.upload_tree(
+                            entry.path, 
+                            joinpath(path, entry.name), 
+                            no_root=True, 
+                            overwrite_or_ignore=overwrite_or_ignore, 
+                            _check=False, 
+                            async_=async_, 
+                        )
+                    else:
+                        yield self.upload(
+                            entry.path, 
+                            joinpath(path, entry.name), 
+                            overwrite_or_ignore=overwrite_or_ignore, 
+                            _check=False, 
+                            async_=async_, 
+                        )
+                return path
+        return run_gen_step(gen_step, async_=async_)
 
     unlink = remove
 
@@ -2098,40 +3148,96 @@ class CloudDriveFileSystem:
         onerror: None | bool | Callable = None, 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
-    ) -> Iterator[tuple[str, list[dict], list[dict]]]:
-        dq: deque[tuple[int, str]] = deque()
-        push, pop = dq.append, dq.popleft
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[dict], list[dict]]] | AsyncIterator[tuple[str, list[dict], list[dict]]]:
+        if isinstance(top, CloudDrivePath):
+            top = top.path
+        elif _check:
+            top = self.abspath(top)
+        top = cast(str, top)
+        def gen_step():
+            dq: deque[tuple[int, str]] = deque()
+            push, pop = dq.append, dq.popleft
+            push((0, top))
+            while dq:
+                depth, parent = pop()
+                depth += 1
+                try:
+                    push_me = max_depth < 0 or depth < max_depth
+                    ls = yield self.listdir_attr(parent, refresh=refresh, _check=False, async_=async_)
+                    if min_depth <= 0 or depth >= min_depth:
+                        dirs: list[dict] = []
+                        files: list[dict] = []
+                        for attr in ls:
+                            if attr["isDirectory"]:
+                                dirs.append(attr)
+                                if push_me:
+                                    push((depth, attr["path"]))
+                            else:
+                                files.append(attr)
+                        yield Yield((parent, dirs, files))
+                    elif push_me:
+                        for attr in ls:
+                            if attr["isDirectory"]:
+                                push((depth, attr["path"]))
+                except OSError as e:
+                    if callable(onerror):
+                        yield partial(onerror, e)
+                    elif onerror:
+                        raise
+        return run_gen_step_iter(gen_step, async_=async_)
+
+    def _walk_bfs_concurrent(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        max_workers: int = 8, 
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[dict], list[dict]]] | AsyncIterator[tuple[str, list[dict], list[dict]]]:
+        "Concurrent version of `_walk_bfs`, the directories come out in the order in which they are listed, not strictly level by level (a directory always comes out after its parent)."
         if isinstance(top, CloudDrivePath):
             top = top.path
         elif _check:
             top = self.abspath(top)
         top = cast(str, top)
-        push((0, top))
-        while dq:
-            depth, parent = pop()
-            depth += 1
+        def listdir(item, /):
+            return self.listdir_attr(item[1], refresh=refresh, _check=False, async_=async_)
+        def gen_step():
+            lister = ConcurrentLister(listdir, max_workers=max_workers, async_=async_)
             try:
-                push_me = max_depth < 0 or depth < max_depth
-                if min_depth <= 0 or depth >= min_depth:
+                lister.submit((1, top))
+                while lister:
+                    (depth, parent), ls = yield lister.get
+                    if isinstance(ls, BaseException):
+                        if not isinstance(ls, OSError):
+                            raise ls
+                        if callable(onerror):
+                            yield partial(onerror, ls)
+                        elif onerror:
+                            raise ls
+                        continue
+                    push_me = max_depth < 0 or depth < max_depth
                     dirs: list[dict] = []
                     files: list[dict] = []
-                    for attr in self.iterdir(parent, refresh=refresh, _check=False):
+                    for attr in ls:
                         if attr["isDirectory"]:
                             dirs.append(attr)
                             if push_me:
-                                push((depth, attr["path"]))
+                                lister.submit((depth + 1, attr["path"]))
                         else:
                             files.append(attr)
-                    yield parent, dirs, files
-                elif push_me:
-                    for attr in self.iterdir(parent, refresh=refresh, _check=False):
-                        if attr["isDirectory"]:
-                            push((depth, attr["path"]))
-            except OSError as e:
-                if callable(onerror):
-                    onerror(e)
-                elif onerror:
-                    raise
+                    if min_depth <= 0 or depth >= min_depth:
+                        yield Yield((parent, dirs, files))
+            finally:
+                lister.close()
+        return run_gen_step_iter(gen_step, async_=async_)
 
     def _walk_dfs(
         self, 
@@ -2143,48 +3249,54 @@ class CloudDriveFileSystem:
         onerror: None | bool | Callable = None, 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
-    ) -> Iterator[tuple[str, list[dict], list[dict]]]:
-        if not max_depth:
-            return
-        if min_depth > 0:
-            min_depth -= 1
-        if max_depth > 0:
-            max_depth -= 1
-        yield_me = min_depth <= 0
+        *, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[dict], list[dict]]] | AsyncIterator[tuple[str, list[dict], list[dict]]]:
         if isinstance(top, CloudDrivePath):
             top = top.path
         elif _check:
             top = self.abspath(top)
         top = cast(str, top)
-        try:
-            dirs: list[dict] = []
-            files: list[dict] = []
-            for attr in self.iterdir(top, refresh=refresh, _check=False):
-                if attr["isDirectory"]:
-                    dirs.append(attr)
-                else:
-                    files.append(attr)
-            if yield_me and topdown:
-                yield top, dirs, files
-            for attr in dirs:
-                yield from self._walk_dfs(
-                    attr["path"], 
-                    topdown=topdown, 
-                    min_depth=min_depth, 
-                    max_depth=max_depth, 
-                    onerror=onerror, 
-                    refresh=refresh, 
-                    _check=False, 
-                )
-            if yield_me and not topdown:
-                yield top, dirs, files
-        except OSError as e:
-            if callable(onerror):
-                onerror(e)
-            elif onerror:
-                raise
-            return
+        def gen_step():
+            nonlocal min_depth, max_depth
+            if not max_depth:
+                return
+            if min_depth > 0:
+                min_depth -= 1
+            if max_depth > 0:
+                max_depth -= 1
+            yield_me = min_depth <= 0
+            try:
+                dirs: list[dict] = []
+                files: list[dict] = []
+                for attr in (yield self.listdir_attr(top, refresh=refresh, _check=False, async_=async_)):
+                    if attr["isDirectory"]:
+                        dirs.append(attr)
+                    else:
+                        files.append(attr)
+                if yield_me and topdown:
+                    yield Yield((top, dirs, files))
+                for attr in dirs:
+                    yield YieldFrom(self._walk_dfs(
+                        attr["path"], 
+                        topdown=topdown, 
+                        min_depth=min_depth, 
+                        max_depth=max_depth, 
+                        onerror=onerror, 
+                        refresh=refresh, 
+                        _check=False, 
+                        async_=async_, 
+                    ), may_call=False)
+                if yield_me and not topdown:
+                    yield Yield((top, dirs, files))
+            except OSError as e:
+                if callable(onerror):
+                    yield partial(onerror, e)
+                elif onerror:
+                    raise
+        return run_gen_step_iter(gen_step, async_=async_)
 
+    @overload
     def walk(
         self, 
         /, 
@@ -2192,21 +3304,62 @@ class CloudDriveFileSystem:
         topdown: Optional[bool] = True, 
         min_depth: int = 0, 
         max_depth: int = -1, 
-        onerror: None | bool | Callable = None,
+        onerror: None | bool | Callable = None, 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[str], list[str]]]:
-        for path, dirs, files in self.walk_attr(
-            top, 
-            topdown=topdown, 
-            min_depth=min_depth, 
-            max_depth=max_depth, 
-            onerror=onerror, 
-            refresh=refresh, 
-            _check=_check, 
-        ):
-            yield path, [a["name"] for a in dirs], [a["name"] for a in files]
+        ...
+    @overload
+    def walk(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[tuple[str, list[str], list[str]]]:
+        ...
+    def walk(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[str], list[str]]] | AsyncIterator[tuple[str, list[str], list[str]]]:
+        def gen_step():
+            with with_iter_next(self.walk_attr( # type: ignore
+                top, 
+                topdown=topdown, 
+                min_depth=min_depth, 
+                max_depth=max_depth, 
+                onerror=onerror, 
+                refresh=refresh, 
+                _check=_check, 
+                max_workers=max_workers, 
+                async_=async_, 
+            ), async_=async_) as get_next:
+                while True:
+                    path, dirs, files = yield get_next
+                    yield Yield((path, [a["name"] for a in dirs], [a["name"] for a in files]))
+        return run_gen_step_iter(gen_step, async_=async_)
 
+    @overload
     def walk_attr(
         self, 
         /, 
@@ -2217,8 +3370,59 @@ class CloudDriveFileSystem:
         onerror: None | bool | Callable = None, 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[dict], list[dict]]]:
+        ...
+    @overload
+    def walk_attr(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[tuple[str, list[dict], list[dict]]]:
+        ...
+    def walk_attr(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[dict], list[dict]]] | AsyncIterator[tuple[str, list[dict], list[dict]]]:
+        """Walk a directory tree, like `os.walk`.
+
+        If `topdown` is None, it's breadth-first, and the directories are listed
+        by up to `max_workers` workers concurrently when `max_workers > 1`;
+        otherwise it's depth-first (`max_workers` is ignored).
+        """
         if topdown is None:
+            if max_workers > 1:
+                return self._walk_bfs_concurrent(
+                    top, 
+                    min_depth=min_depth, 
+                    max_depth=max_depth, 
+                    onerror=onerror, 
+                    refresh=refresh, 
+                    _check=_check, 
+                    max_workers=max_workers, 
+                    async_=async_, 
+                )
             return self._walk_bfs(
                 top, 
                 min_depth=min_depth, 
@@ -2226,6 +3430,7 @@ class CloudDriveFileSystem:
                 onerror=onerror, 
                 refresh=refresh, 
                 _check=_check, 
+                async_=async_, 
             )
         else:
             return self._walk_dfs(
@@ -2236,8 +3441,10 @@ class CloudDriveFileSystem:
                 onerror=onerror, 
                 refresh=refresh, 
                 _check=_check, 
+                async_=async_, 
             )
 
+    @overload
     def walk_path(
         self, 
         /, 
@@ -2248,21 +3455,61 @@ class CloudDriveFileSystem:
         onerror: None | bool | Callable = None, 
         refresh: Optional[bool] = None, 
         _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False] = False, 
     ) -> Iterator[tuple[str, list[CloudDrivePath], list[CloudDrivePath]]]:
-        for path, dirs, files in self.walk_attr(
-            top, 
-            topdown=topdown, 
-            min_depth=min_depth, 
-            max_depth=max_depth, 
-            onerror=onerror, 
-            refresh=refresh, 
-            _check=_check, 
-        ):
-            yield (
-                path, 
-                [CloudDrivePath(self, **a) for a in dirs], 
-                [CloudDrivePath(self, **a) for a in files], 
-            )
+        ...
+    @overload
+    def walk_path(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[True], 
+    ) -> AsyncIterator[tuple[str, list[CloudDrivePath], list[CloudDrivePath]]]:
+        ...
+    def walk_path(
+        self, 
+        /, 
+        top: str | PathLike[str] = "", 
+        topdown: Optional[bool] = True, 
+        min_depth: int = 0, 
+        max_depth: int = -1, 
+        onerror: None | bool | Callable = None, 
+        refresh: Optional[bool] = None, 
+        _check: bool = True, 
+        *, 
+        max_workers: int = 1, 
+        async_: Literal[False, True] = False, 
+    ) -> Iterator[tuple[str, list[CloudDrivePath], list[CloudDrivePath]]] | AsyncIterator[tuple[str, list[CloudDrivePath], list[CloudDrivePath]]]:
+        def gen_step():
+            with with_iter_next(self.walk_attr( # type: ignore
+                top, 
+                topdown=topdown, 
+                min_depth=min_depth, 
+                max_depth=max_depth, 
+                onerror=onerror, 
+                refresh=refresh, 
+                _check=_check, 
+                max_workers=max_workers, 
+                async_=async_, 
+            ), async_=async_) as get_next:
+                while True:
+                    path, dirs, files = yield get_next
+                    yield Yield((
+                        path, 
+                        [CloudDrivePath(self, **a) for a in dirs], 
+                        [CloudDrivePath(self, **a) for a in files], 
+                    ))
+        return run_gen_step_iter(gen_step, async_=async_)
 
     def write_bytes(
         self, 
@@ -2307,7 +3554,7 @@ class CloudDriveFileSystem:
 
 class CloudDriveDownloadTaskList:
     "任务列表：下载"
-    __slots__ = "client",
+    __slots__ = "client", 
 
     def __init__(self, /, client: CloudDriveClient):
         self.client = client
@@ -2361,7 +3608,7 @@ class CloudDriveDownloadTaskList:
 
 class CloudDriveUploadTaskList:
     "任务列表：复制"
-    __slots__ = "client",
+    __slots__ = "client", 
 
     def __init__(self, /, client: CloudDriveClient):
         self.client = client
@@ -2416,7 +3663,7 @@ class CloudDriveUploadTaskList:
         if keys is None:
             return self.client.CancelAllUploadFiles(async_=async_)
         if isinstance(keys, str):
-            keys = keys,
+            keys = keys, 
         return self.client.CancelUploadFiles(CloudDrive_pb2.MultpleUploadFileKeyRequest(keys=keys), async_=async_)
 
     @overload
@@ -2516,7 +3763,7 @@ class CloudDriveUploadTaskList:
         if keys is None:
             return self.client.PauseAllUploadFiles(async_=async_)
         if isinstance(keys, str):
-            keys = keys,
+            keys = keys, 
         return self.client.PauseUploadFiles(CloudDrive_pb2.MultpleUploadFileKeyRequest(keys=keys), async_=async_)
 
     @overload
@@ -2546,7 +3793,7 @@ class CloudDriveUploadTaskList:
         if keys is None:
             return self.client.ResumeAllUploadFiles(async_=async_)
         if isinstance(keys, str):
-            keys = keys,
+            keys = keys, 
         return self.client.ResumeUploadFiles(CloudDrive_pb2.MultpleUploadFileKeyRequest(keys=keys), async_=async_)
 
     @check_response
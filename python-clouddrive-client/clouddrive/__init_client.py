@@ -171,7 +171,7 @@ else:
         elif argspec == "repeated":
             arg_anno = f"list[dict | clouddrive.pb2.{argtype}]"
         elif argspec == "stream":
-            arg_anno = f"Sequence[dict | clouddrive.pb2.{argtype}]"
+            arg_anno = f"Iterable[dict | clouddrive.pb2.{argtype}]"
         else:
             raise NotImplementedError(meta)
         refs.add(argtype)
@@ -210,11 +210,21 @@ else:
     self.stub.{name}(arg, metadata=self.metadata)
     return None"""
         else:
-            if argspec:
-                method_body = f"arg = [to_message(clouddrive.pb2.{argtype}, a) for a in arg]"
+            if argspec == "stream":
+                method_body = f"""\
+if async_:
+    arg = [to_message(clouddrive.pb2.{argtype}, a) for a in arg]
+    return self.async_stub.{name}(arg, metadata=self.metadata)
+else:
+    # NOTE: grpc consumes the iterator lazily, so the messages can be produced while being sent
+    arg = (to_message(clouddrive.pb2.{argtype}, a) for a in arg)
+    return self.stub.{name}(arg, metadata=self.metadata)"""
             else:
-                method_body = f"arg = to_message(clouddrive.pb2.{argtype}, arg)"
-            method_body += f"""
+                if argspec:
+                    method_body = f"arg = [to_message(clouddrive.pb2.{argtype}, a) for a in arg]"
+                else:
+                    method_body = f"arg = to_message(clouddrive.pb2.{argtype}, arg)"
+                method_body += f"""
 if async_:
     return self.async_stub.{name}(arg, metadata=self.metadata)
 else:
@@ -253,7 +263,7 @@ __all__ = ["Client", "CLOUDDRIVE_API_MAP"]
 
 from collections.abc import Coroutine
 from functools import cached_property
-from typing import overload, Any, Iterable, Literal, Never, Sequence
+from typing import overload, Any, Iterable, Literal, Never
 from urllib.parse import urlsplit, urlunsplit
 
 from google.protobuf.empty_pb2 import Empty # type: ignore
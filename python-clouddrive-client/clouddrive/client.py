@@ -6,7 +6,7 @@ __all__ = ["Client", "CLOUDDRIVE_API_MAP"]
 
 from collections.abc import Coroutine
 from functools import cached_property
-from typing import overload, Any, Iterable, Literal, Never, Sequence
+from typing import overload, Any, Iterable, Literal, Never
 from urllib.parse import urlsplit, urlunsplit
 
 from google.protobuf.empty_pb2 import Empty # type: ignore
@@ -125,7 +125,7 @@ CLOUDDRIVE_API_MAP = {
     "ChangePassword": {"argument": dict | clouddrive.pb2.ChangePasswordRequest, "return": clouddrive.pb2.FileOperationResult}, 
     "CreateFile": {"argument": dict | clouddrive.pb2.CreateFileRequest, "return": clouddrive.pb2.CreateFileResult}, 
     "CloseFile": {"argument": dict | clouddrive.pb2.CloseFileRequest, "return": clouddrive.pb2.FileOperationResult}, 
-    "WriteToFileStream": {"argument": Sequence[dict | clouddrive.pb2.WriteFileRequest], "return": clouddrive.pb2.WriteFileResult}, 
+    "WriteToFileStream": {"argument": Iterable[dict | clouddrive.pb2.WriteFileRequest], "return": clouddrive.pb2.WriteFileResult}, 
     "WriteToFile": {"argument": dict | clouddrive.pb2.WriteFileRequest, "return": clouddrive.pb2.WriteFileResult}, 
     "GetPromotions": {"return": clouddrive.pb2.GetPromotionsResult}, 
     "UpdatePromotionResult": {}, 
@@ -5225,7 +5225,7 @@ class Client:
     @overload
     def WriteToFileStream(
         self, 
-        arg: Sequence[dict | clouddrive.pb2.WriteFileRequest], 
+        arg: Iterable[dict | clouddrive.pb2.WriteFileRequest], 
         /, 
         async_: Literal[False] = False, 
     ) -> clouddrive.pb2.WriteFileResult:
@@ -5233,14 +5233,14 @@ class Client:
     @overload
     def WriteToFileStream(
         self, 
-        arg: Sequence[dict | clouddrive.pb2.WriteFileRequest], 
+        arg: Iterable[dict | clouddrive.pb2.WriteFileRequest], 
         /, 
         async_: Literal[True], 
     ) -> Coroutine[Any, Any, clouddrive.pb2.WriteFileResult]:
         ...
     def WriteToFileStream(
         self, 
-        arg: Sequence[dict | clouddrive.pb2.WriteFileRequest], 
+        arg: Iterable[dict | clouddrive.pb2.WriteFileRequest], 
         /, 
         async_: Literal[False, True] = False, 
     ) -> clouddrive.pb2.WriteFileResult | Coroutine[Any, Any, clouddrive.pb2.WriteFileResult]:
@@ -5263,10 +5263,12 @@ class Client:
         }
         message WriteFileResult { uint64 bytesWritten = 1; }
         """
-        arg = [to_message(clouddrive.pb2.WriteFileRequest, a) for a in arg]
         if async_:
+            arg = [to_message(clouddrive.pb2.WriteFileRequest, a) for a in arg]
             return self.async_stub.WriteToFileStream(arg, metadata=self.metadata)
         else:
+            # NOTE: grpc consumes the iterator lazily, so the messages can be produced while being sent
+            arg = (to_message(clouddrive.pb2.WriteFileRequest, a) for a in arg)
             return self.stub.WriteToFileStream(arg, metadata=self.metadata)
 
     @overload
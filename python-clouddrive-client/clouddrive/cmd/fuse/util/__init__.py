@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 # encoding: utf-8
 
-from .fuser import *
 from .log import *
 from .predicate import *
 from .strm import *
-from . import __fuse_monkey_patch
+from .strmtree import *
+
+
+def __getattr__(name: str, /):
+    # NOTE: import the fuser lazily, so that the helpers (e.g. `make_strm_tree`) work without libfuse
+    if name == "CloudDriveFuseOperations":
+        from .fuser import CloudDriveFuseOperations
+        return CloudDriveFuseOperations
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
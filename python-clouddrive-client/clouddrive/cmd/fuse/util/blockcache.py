@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["BlockCache", "BlockFile"]
+
+import logging
+
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from hashlib import sha1
+from os import fstat, makedirs, pread, remove
+from os.path import join as joinpath
+from shutil import rmtree
+from stat import S_ISREG
+from tempfile import mkdtemp
+from threading import Lock, RLock
+from typing import IO
+
+from .log import logger
+
+
+class BlockCache:
+    """挂载范围内共享的块缓存
+
+    - 文件被切分为固定大小的块，以 (文件键, 块序号) 作为键，文件键应该包含路径和版本（例如大小和修改时间），
+      这样文件变化后，旧的块自然不会再被命中，之后会被淘汰
+    - 内存层按字节数做 LRU 淘汰；如果指定了 ``disk_dir``，被淘汰的块会降级到磁盘层（同样按字节数 LRU 淘汰），
+      磁盘层命中时会再提升到内存层
+    - 同一个缺失的块，无论有多少个文件句柄在读，都只会拉取一次，其它读取者等待同一个 ``Future``
+    - 预读在后台线程池中执行，参见 ``BlockFile``
+
+    :param block_size: 块的字节数
+    :param max_bytes: 内存层的最大字节数
+    :param disk_dir: 磁盘层的目录（会在其中创建一个临时目录，关闭时删除），为空则不启用磁盘层
+    :param disk_max_bytes: 磁盘层的最大字节数
+    :param max_workers: 预读的最大并发线程数
+    :param max_readahead: 顺序读取时，最多预读的块数，<= 0 时不预读
+    """
+    def __init__(
+        self, 
+        /, 
+        block_size: int = 1 << 20, 
+        max_bytes: int = 128 << 20, 
+        disk_dir: str = "", 
+        disk_max_bytes: int = 1 << 30, 
+        max_workers: int = 4, 
+        max_readahead: int = 8, 
+    ):
+        self.block_size = max(block_size, 1 << 12)
+        self.max_bytes = max(max_bytes, 0)
+        self.disk_max_bytes = max(disk_max_bytes, 0)
+        self.max_readahead = max(max_readahead, 0)
+        self.stats: dict[str, int] = dict.fromkeys(
+            ("hits_memory", "hits_disk", "hits_inflight", "misses", "fetched_bytes", "readahead"), 0)
+        self._memory: OrderedDict[tuple[str, int], bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[tuple[str, int], int] = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_dir = ""
+        if disk_dir and self.disk_max_bytes:
+            makedirs(disk_dir, exist_ok=True)
+            self._disk_dir = mkdtemp(prefix="blockcache-", dir=disk_dir)
+        self._inflight: dict[tuple[str, int], Future] = {}
+        self._lock = RLock()
+        self._executor = ThreadPoolExecutor(max(max_workers, 1), thread_name_prefix="blockcache")
+
+    def __contains__(self, key: tuple[str, int], /) -> bool:
+        return key in self._memory or key in self._disk
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(block_size={self.block_size}, memory={self._memory_bytes}/{self.max_bytes}, disk={self._disk_bytes}/{self.disk_max_bytes}, stats={self.stats!r})"
+
+    def close(self, /):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._disk.clear()
+            self._disk_bytes = 0
+        if self._disk_dir:
+            rmtree(self._disk_dir, ignore_errors=True)
+
+    def _disk_path(self, key: tuple[str, int], /) -> str:
+        return joinpath(self._disk_dir, "%s-%d" % (sha1(key[0].encode("utf-8")).hexdigest(), key[1]))
+
+    def _lookup(self, key: tuple[str, int], /) -> None | bytes:
+        "在内存层和磁盘层中查找块，找不到时返回 None"
+        with self._lock:
+            memory = self._memory
+            if key in memory:
+                memory.move_to_end(key)
+                self.stats["hits_memory"] += 1
+                return memory[key]
+            if key not in self._disk:
+                return None
+            self._disk.move_to_end(key)
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            # NOTE: 可能刚好被淘汰了
+            return None
+        self.stats["hits_disk"] += 1
+        self._store(key, data)
+        return data
+
+    def _store(self, key: tuple[str, int], data: bytes, /):
+        "把块放入内存层，超出容量时，把最久未用的块降级到磁盘层（或丢弃）"
+        demoted: list[tuple[tuple[str, int], bytes]] = []
+        with self._lock:
+            memory = self._memory
+            if key in memory:
+                memory.move_to_end(key)
+                return
+            memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_bytes and memory:
+                k, v = memory.popitem(last=False)
+                self._memory_bytes -= len(v)
+                if self._disk_dir and k not in self._disk:
+                    demoted.append((k, v))
+        for k, v in demoted:
+            self._demote(k, v)
+
+    def _demote(self, key: tuple[str, int], data: bytes, /):
+        path = self._disk_path(key)
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            logger.log(logging.WARNING, "can't write block to disk: %r\n  |_ %s: %s", path, type(e).__qualname__, e)
+            return
+        evicted: list[tuple[str, int]] = []
+        with self._lock:
+            disk = self._disk
+            disk[key] = len(data)
+            self._disk_bytes += len(data)
+            while self._disk_bytes > self.disk_max_bytes and disk:
+                k, size = disk.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(k)
+        for k in evicted:
+            try:
+                remove(self._disk_path(k))
+            except OSError:
+                pass
+
+    def get(
+        self, 
+        key: str, 
+        index: int, 
+        fetch: Callable[[int], bytes], 
+        /, 
+    ) -> bytes:
+        """获取一个块，缺失时调用 ``fetch(index)`` 拉取（同一个块同时只会拉取一次）
+
+        :param key: 文件键
+        :param index: 块序号
+        :param fetch: 拉取块的函数
+
+        :return: 块的数据
+        """
+        k = (key, index)
+        data = self._lookup(k)
+        if data is not None:
+            return data
+        with self._lock:
+            future = self._inflight.get(k)
+            if future is None:
+                future = self._inflight[k] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            self.stats["hits_inflight"] += 1
+            try:
+                return future.result()
+            except BaseException:
+                # NOTE: 别人（例如预读）拉取失败了，自己再试一次
+                return self.get(key, index, fetch)
+        self.stats["misses"] += 1
+        return self._fill(k, fetch, future)
+
+    def _fill(self, k: tuple[str, int], fetch: Callable[[int], bytes], future: Future, /) -> bytes:
+        try:
+            data = bytes(fetch(k[1]))
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(k, None)
+            future.set_exception(e)
+            raise
+        self.stats["fetched_bytes"] += len(data)
+        self._store(k, data)
+        with self._lock:
+            self._inflight.pop(k, None)
+        future.set_result(data)
+        return data
+
+    def prefetch(
+        self, 
+        key: str, 
+        indexes: range, 
+        fetch: Callable[[int], bytes], 
+        /, 
+    ):
+        """在后台按顺序拉取若干个块（已缓存或正在拉取的会被跳过）
+
+        所有块由同一个任务依次拉取，这样对于同一个流，不会因为乱序而重连
+
+        :param key: 文件键
+        :param indexes: 块序号
+        :param fetch: 拉取块的函数
+        """
+        todo: list[tuple[tuple[str, int], Future]] = []
+        with self._lock:
+            inflight = self._inflight
+            for index in indexes:
+                k = (key, index)
+                if k in inflight or k in self._memory or k in self._disk:
+                    continue
+                future = inflight[k] = Future()
+                todo.append((k, future))
+        if not todo:
+            return
+        self.stats["readahead"] += len(todo)
+        def run():
+            for i, (k, future) in enumerate(todo):
+                try:
+                    self._fill(k, fetch, future)
+                except BaseException:
+                    # NOTE: 预读失败时，放弃剩下的块，让读取者自己去拉取
+                    with self._lock:
+                        for k, future in todo[i+1:]:
+                            self._inflight.pop(k, None)
+                            future.cancel()
+                    return
+        try:
+            self._executor.submit(run)
+        except RuntimeError:
+            with self._lock:
+                for k, future in todo:
+                    self._inflight.pop(k, None)
+                    future.cancel()
+
+
+class BlockFile:
+    """通过 ``BlockCache`` 读取的文件，每个打开的文件句柄一个
+
+    - 底层文件只用来拉取缺失的块，读取时尽量命中共享的块缓存
+    - 如果底层文件支持按位置读取（有 ``pread`` 方法，例如 ``httpfile.HTTPPositionalReader``，或者是本地的普通文件），
+      则并发地拉取，不改变任何文件位置；否则加锁（``seek`` 之后 ``read``）
+    - 检测到顺序读取时，预读的块数从 1 开始倍增，直到 ``cache.max_readahead``；一旦出现跳读，就重置为 0
+
+    :param cache: 块缓存
+    :param key: 文件键，应该包含路径和版本
+    :param size: 文件大小
+    :param file: 底层文件（二进制只读）
+    """
+    def __init__(
+        self, 
+        /, 
+        cache: BlockCache, 
+        key: str, 
+        size: int, 
+        file: IO[bytes], 
+    ):
+        self.cache = cache
+        self.key = key
+        self.size = size
+        self.file = file
+        self._lock = Lock()
+        self._state_lock = Lock()
+        self._next_offset = 0
+        self._window = 0
+        self._pread: None | Callable[[int, int], bytes] = getattr(file, "pread", None)
+        if self._pread is None:
+            try:
+                fd = file.fileno()
+                if S_ISREG(fstat(fd).st_mode):
+                    self._pread = lambda size, offset, /: pread(fd, size, offset)
+            except Exception:
+                pass
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(key={self.key!r}, size={self.size}, file={self.file!r})"
+
+    @property
+    def closed(self, /) -> bool:
+        return self.file.closed
+
+    def close(self, /):
+        self.file.close()
+
+    def fetch(self, index: int, /) -> bytes:
+        "从底层文件中拉取一个块"
+        block_size = self.cache.block_size
+        start = index * block_size
+        size = min(block_size, self.size - start)
+        if size <= 0:
+            return b""
+        if (pread := self._pread) is not None:
+            data = pread(size, start)
+            # NOTE: 可能会少给数据，补足它
+            if 0 < len(data) < size:
+                chunks = [data]
+                remaining = size - len(data)
+                while remaining and (chunk := pread(remaining, start + size - remaining)):
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+                data = b"".join(chunks)
+            return data
+        file = self.file
+        with self._lock:
+            if file.tell() != start:
+                file.seek(start)
+            data = file.read(size)
+            # NOTE: 流可能会少给数据，补足它
+            if 0 < len(data) < size:
+                chunks = [data]
+                remaining = size - len(data)
+                while remaining and (chunk := file.read(remaining)):
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+                data = b"".join(chunks)
+        return data
+
+    def read(self, offset: int, size: int, /) -> bytes:
+        "读取 [offset, offset + size) 的数据"
+        if offset >= self.size or size <= 0:
+            return b""
+        stop = min(offset + size, self.size)
+        cache = self.cache
+        block_size = cache.block_size
+        first, last = offset // block_size, (stop - 1) // block_size
+        # NOTE: 同一个句柄可能被多个线程并发读取，所以更新预读状态时要加锁
+        with self._state_lock:
+            if offset == self._next_offset:
+                window = self._window = min(max(self._window * 2, 1), cache.max_readahead)
+            else:
+                window = self._window = 0
+            self._next_offset = stop
+        if window:
+            last_block = (self.size - 1) // block_size
+            cache.prefetch(self.key, range(last + 1, min(last + window, last_block) + 1), self.fetch)
+        get = cache.get
+        key = self.key
+        fetch = self.fetch
+        if first == last:
+            base = first * block_size
+            return get(key, first, fetch)[offset-base:stop-base]
+        chunks = []
+        for index in range(first, last + 1):
+            block = get(key, index, fetch)
+            base = index * block_size
+            chunks.append(block[max(offset-base, 0):stop-base])
+        return b"".join(chunks)
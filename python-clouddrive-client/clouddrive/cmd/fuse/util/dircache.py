@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["SqliteDirCache"]
+
+import logging
+
+from collections.abc import Callable, Iterator, MutableMapping
+from pickle import dumps as pickle_dumps, loads as pickle_loads, HIGHEST_PROTOCOL
+from sqlite3 import connect
+from threading import Lock
+from time import time
+from typing import Any
+
+from .log import logger
+
+
+class _NormpathMap(dict):
+    "路径规范化映射，写入时同步保存到数据库"
+    def __init__(self, cache: "SqliteDirCache", /):
+        self.cache = cache
+        with cache._lock:
+            super().__init__(cache._con.execute("SELECT path, realpath FROM normpaths"))
+
+    def __setitem__(self, key: str, value: str, /):
+        if self.get(key) == value:
+            return
+        super().__setitem__(key, value)
+        cache = self.cache
+        with cache._lock:
+            cache._con.execute("INSERT OR REPLACE INTO normpaths (path, realpath) VALUES (?, ?)", (key, value))
+
+
+class SqliteDirCache(MutableMapping):
+    """持久化到 SQLite 的目录列表缓存，重新挂载后不必从头罗列
+
+    - 键是目录路径，值是 ``readdir`` 生成的 {名字: 属性}，每个目录记录最后更新的时间，参见 ``age()``
+    - 保存时会去掉属性中的 ``_path``（路径对象引用了文件系统，不能也不必序列化），读取时用 ``as_path(_attr)`` 重建
+    - 尚未上传的项（本地新建或者正在写入的文件、尚未在远程创建的目录）不会被保存
+    - 建议在前面套一层内存的 LRU 缓存，避免反复反序列化
+
+    :param dbfile: 数据库文件
+    :param as_path: 把属性字典转换为路径对象的函数，例如 ``fs.as_path``
+    """
+    def __init__(
+        self, 
+        /, 
+        dbfile: str, 
+        as_path: Callable[[Any], Any], 
+    ):
+        self.dbfile = dbfile
+        self.as_path = as_path
+        con = self._con = connect(dbfile, check_same_thread=False, isolation_level=None)
+        con.execute("PRAGMA journal_mode = WAL")
+        con.execute("PRAGMA synchronous = NORMAL")
+        con.execute("""\
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY, 
+    data BLOB NOT NULL, 
+    updated_at REAL NOT NULL
+)""")
+        con.execute("""\
+CREATE TABLE IF NOT EXISTS normpaths (
+    path TEXT PRIMARY KEY, 
+    realpath TEXT NOT NULL
+)""")
+        self._lock = Lock()
+
+    def __del__(self, /):
+        self.close()
+
+    def __contains__(self, path, /) -> bool:
+        with self._lock:
+            return self._con.execute("SELECT 1 FROM dirs WHERE path = ?", (path,)).fetchone() is not None
+
+    def __getitem__(self, path: str, /) -> dict:
+        with self._lock:
+            row = self._con.execute("SELECT data FROM dirs WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            raise KeyError(path)
+        value = pickle_loads(row[0])
+        as_path = self.as_path
+        for entry in value.values():
+            entry["_path"] = as_path(entry["_attr"])
+        return value
+
+    def __setitem__(self, path: str, value: dict, /):
+        try:
+            data = pickle_dumps(
+                {
+                    name: {k: v for k, v in entry.items() if k != "_path"} 
+                    for name, entry in value.items() if entry.get("_attr") is not None and not entry.get("_spool")
+                }, 
+                protocol=HIGHEST_PROTOCOL, 
+            )
+        except Exception as e:
+            logger.log(logging.WARNING, "can't persist directory: %r\n  |_ %s: %s", path, type(e).__qualname__, e)
+            return
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO dirs (path, data, updated_at) VALUES (?, ?, ?)", 
+                (path, data, time()), 
+            )
+
+    def __delitem__(self, path: str, /):
+        with self._lock:
+            if not self._con.execute("DELETE FROM dirs WHERE path = ?", (path,)).rowcount:
+                raise KeyError(path)
+
+    def __iter__(self, /) -> Iterator[str]:
+        with self._lock:
+            paths = [path for path, in self._con.execute("SELECT path FROM dirs")]
+        return iter(paths)
+
+    def __len__(self, /) -> int:
+        with self._lock:
+            return self._con.execute("SELECT COUNT(1) FROM dirs").fetchone()[0]
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(dbfile={self.dbfile!r})"
+
+    def age(self, path: str, /) -> None | float:
+        "目录距离最后一次更新过去的秒数，没有缓存时返回 None"
+        with self._lock:
+            row = self._con.execute("SELECT updated_at FROM dirs WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return None
+        return time() - row[0]
+
+    def normpath_map(self, /) -> dict[str, str]:
+        "路径规范化映射（NFC 路径 -> 真实路径），修改时同步保存"
+        return _NormpathMap(self)
+
+    def close(self, /):
+        try:
+            self._con.close()
+        except Exception:
+            pass
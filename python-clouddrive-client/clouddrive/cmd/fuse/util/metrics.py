@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["Metrics", "serve_metrics"]
+
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps as json_dumps
+from threading import Lock, Thread
+from time import time
+from typing import Final
+
+
+#: 耗时直方图的桶的上界（秒），从 2**-14（约 61 微秒）到 2**6（64 秒），超过最后一个的计入 +Inf
+BUCKETS: Final[tuple[float, ...]] = tuple(2. ** i for i in range(-14, 7))
+
+
+class _OpStats:
+    __slots__ = ("count", "errors", "total", "max", "buckets")
+
+    def __init__(self, /):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.
+        self.max = 0.
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def quantile(self, q: float, /) -> float:
+        "用直方图估计分位数（在桶内线性插值）"
+        if not self.count:
+            return 0.
+        rank = q * self.count
+        cum = 0
+        for i, n in enumerate(self.buckets):
+            if n and cum + n >= rank:
+                lower = BUCKETS[i-1] if i else 0.
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - cum) / n, self.max)
+            cum += n
+        return self.max
+
+
+class Metrics:
+    """fuse 操作的度量
+
+    - 每种操作的次数、出错次数、总耗时、最大耗时和耗时直方图（可以估计 p50、p90、p99）
+    - 读取的字节数
+    - 按进程（名字）统计的操作次数和读取的字节数，最多保留 ``max_processes`` 个最近活跃的进程
+    - 计数器（``incr``），以及在取快照时才拉取的外部统计（``register``，例如块缓存、链接缓存的命中情况）
+
+    :param max_processes: 最多保留多少个进程的统计
+    """
+    def __init__(self, /, max_processes: int = 256):
+        self.max_processes = max_processes
+        self.started_at = time()
+        self._ops: dict[str, _OpStats] = {}
+        self._processes: OrderedDict[str, list[int]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._sources: dict[str, Callable[[], Mapping[str, int | float]]] = {}
+        self._lock = Lock()
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(ops={list(self._ops)!r})"
+
+    def observe(
+        self, 
+        op: str, 
+        elapsed: float, 
+        /, 
+        nbytes: int = 0, 
+        process: str = "", 
+        error: bool = False, 
+    ):
+        """记录一次操作
+
+        :param op: 操作名
+        :param elapsed: 耗时（秒）
+        :param nbytes: 读取的字节数
+        :param process: 发起操作的进程
+        :param error: 是否出错
+        """
+        index = bisect_left(BUCKETS, elapsed)
+        with self._lock:
+            try:
+                stats = self._ops[op]
+            except KeyError:
+                stats = self._ops[op] = _OpStats()
+            stats.count += 1
+            stats.errors += error
+            stats.total += elapsed
+            if elapsed > stats.max:
+                stats.max = elapsed
+            stats.buckets[index] += 1
+            if nbytes:
+                self._counters["bytes_read"] = self._counters.get("bytes_read", 0) + nbytes
+            if process:
+                processes = self._processes
+                try:
+                    pstats = processes[process]
+                    processes.move_to_end(process)
+                except KeyError:
+                    pstats = processes[process] = [0, 0]
+                    if len(processes) > self.max_processes:
+                        processes.popitem(last=False)
+                pstats[0] += 1
+                pstats[1] += nbytes
+
+    def incr(self, name: str, n: int = 1, /):
+        "计数器加 n"
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def register(self, name: str, source: Callable[[], Mapping[str, int | float]], /):
+        "注册外部统计，取快照时调用 ``source()``，结果的各项以 ``{name}_{key}`` 为名"
+        self._sources[name] = source
+
+    def snapshot(self, /) -> dict:
+        "取得当前的统计（可以序列化为 JSON）"
+        with self._lock:
+            ops = {
+                op: {
+                    "count": s.count, 
+                    "errors": s.errors, 
+                    "total": s.total, 
+                    "max": s.max, 
+                    "p50": s.quantile(.5), 
+                    "p90": s.quantile(.9), 
+                    "p99": s.quantile(.99), 
+                    "buckets": list(s.buckets), 
+                } for op, s in self._ops.items()
+            }
+            counters = dict(self._counters)
+            processes = {p: {"ops": n, "bytes_read": b} for p, (n, b) in self._processes.items()}
+        for name, source in list(self._sources.items()):
+            try:
+                values = source()
+            except Exception:
+                continue
+            for k, v in values.items():
+                counters[f"{name}_{k}"] = v
+        return {
+            "uptime": time() - self.started_at, 
+            "ops": ops, 
+            "counters": counters, 
+            "processes": processes, 
+        }
+
+    def to_prometheus(self, /, prefix: str = "fuse") -> str:
+        "转换为 Prometheus 的文本格式"
+        snapshot = self.snapshot()
+        lines: list[str] = [
+            f"# TYPE {prefix}_op_seconds histogram", 
+        ]
+        for op, s in snapshot["ops"].items():
+            cum = 0
+            for bound, n in zip((*BUCKETS, "+Inf"), s["buckets"]):
+                cum += n
+                lines.append(f'{prefix}_op_seconds_bucket{{op="{op}",le="{bound}"}} {cum}')
+            lines.append(f'{prefix}_op_seconds_sum{{op="{op}"}} {s["total"]}')
+            lines.append(f'{prefix}_op_seconds_count{{op="{op}"}} {s["count"]}')
+        lines.append(f"# TYPE {prefix}_op_errors_total counter")
+        for op, s in snapshot["ops"].items():
+            lines.append(f'{prefix}_op_errors_total{{op="{op}"}} {s["errors"]}')
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{prefix}_{name} {value}")
+        lines.append(f"# TYPE {prefix}_process_ops_total counter")
+        for process, s in snapshot["processes"].items():
+            process = process.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{prefix}_process_ops_total{{process="{process}"}} {s["ops"]}')
+            lines.append(f'{prefix}_process_bytes_read_total{{process="{process}"}} {s["bytes_read"]}')
+        lines.append(f"{prefix}_uptime_seconds {snapshot['uptime']}")
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(
+    metrics: Metrics, 
+    /, 
+    host: str = "127.0.0.1", 
+    port: int = 9105, 
+) -> ThreadingHTTPServer:
+    """在后台线程中启动 HTTP 服务，``/metrics`` 是 Prometheus 的文本格式，其它路径返回 JSON
+
+    :param metrics: 度量
+    :param host: 监听的地址
+    :param port: 监听的端口
+
+    :return: HTTP 服务器，调用它的 ``shutdown()`` 停止服务
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self, /):
+            if self.path.split("?", 1)[0] == "/metrics":
+                body = metrics.to_prometheus().encode("utf-8")
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                body = json_dumps(metrics.snapshot(), ensure_ascii=False).encode("utf-8")
+                content_type = "application/json; charset=utf-8"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, /, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
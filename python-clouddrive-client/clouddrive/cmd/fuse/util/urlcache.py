@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__author__ = "ChenyangGao <https://chenyanggao.github.io>"
+__all__ = ["UrlCache"]
+
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any
+
+from cachetools import TTLCache
+
+
+class UrlCache:
+    """会过期的链接缓存，由 strm 的生成和打开文件共用
+
+    - 键由调用者决定，建议包含用途、路径和签名（例如 ("strm", path, sign)），签名变化后旧的链接自然不会再被命中
+    - 同一个键同时只会生成一次，其它调用者等待同一个 ``Future``
+    - 只缓存字符串（链接），其它结果（例如打开的文件）原样返回，但不缓存，也不共享给等待者（它们会自己再生成一次）
+    - ``stats`` 记录了命中（hits）、等待别人生成（waits）和自己生成（misses）的次数
+
+    :param ttl: 链接的缓存时间（秒），<= 0 时不缓存，但仍然合并并发的生成
+    :param maxsize: 最多缓存的链接数
+    """
+    def __init__(
+        self, 
+        /, 
+        ttl: float = 600, 
+        maxsize: int = 65536, 
+    ):
+        self.ttl = ttl
+        self._cache: None | TTLCache = None
+        if ttl > 0:
+            self._cache = TTLCache(maxsize, ttl=ttl)
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = Lock()
+        self.stats: dict[str, int] = dict.fromkeys(("hits", "waits", "misses"), 0)
+
+    def __contains__(self, key: Hashable, /) -> bool:
+        if (cache := self._cache) is None:
+            return False
+        with self._lock:
+            return key in cache
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(ttl={self.ttl!r}, size={0 if self._cache is None else len(self._cache)})"
+
+    def get(self, key: Hashable, make: Callable[[], Any], /) -> Any:
+        """获取链接，缺失或过期时调用 ``make()`` 生成
+
+        :param key: 键
+        :param make: 生成链接的函数
+
+        :return: 链接（或者 ``make()`` 返回的其它结果）
+        """
+        cache = self._cache
+        with self._lock:
+            if cache is not None:
+                try:
+                    value = cache[key]
+                except KeyError:
+                    pass
+                else:
+                    self.stats["hits"] += 1
+                    return value
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            self.stats["waits"] += 1
+            try:
+                value = future.result()
+            except BaseException:
+                # NOTE: 别人生成失败了，自己再试一次
+                return self.get(key, make)
+            if isinstance(value, str):
+                return value
+            return make()
+        self.stats["misses"] += 1
+        try:
+            value = make()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if cache is not None and isinstance(value, str):
+                cache[key] = value
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def pop(self, key: Hashable, /):
+        "丢弃链接（例如链接已经失效），下次获取时重新生成"
+        if (cache := self._cache) is not None:
+            with self._lock:
+                cache.pop(key, None)
+
+    def clear(self, /):
+        if (cache := self._cache) is not None:
+            with self._lock:
+                cache.clear()
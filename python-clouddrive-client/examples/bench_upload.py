@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__doc__ = """CloudDriveFileSystem 上传的基准测试：在本地启动一个替身 gRPC 服务（只实现了上传相关的接口，可以模拟每次往返的延迟），
+比较逐个 8 KB 的 WriteToFile（旧的做法）、按 MB 分块的 WriteToFile 和客户端流式的 WriteToFileStream"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from os import remove, urandom
+from tempfile import mkstemp
+from time import perf_counter, sleep
+
+import grpc # type: ignore
+
+from clouddrive import CloudDriveFileSystem
+from clouddrive.proto import CloudDrive_pb2_grpc
+import CloudDrive_pb2 # type: ignore
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("-s", "--size", type=int, default=64, help="上传的文件大小（MB），默认值 64")
+    parser.add_argument("-c", "--chunk-size", type=int, default=1 << 20, help="分块的字节数，默认值 1048576 (1 MB)")
+    parser.add_argument("-l", "--latency", type=float, default=1, help="模拟的每次往返的延迟（毫秒），默认值 1")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="重复轮数（取最优），默认值 3")
+    parser.add_argument("-ns", "--no-stream", action="store_true", help="替身服务不实现 WriteToFileStream（测试退回到 WriteToFile）")
+    return parser.parse_args()
+
+
+def make_servicer(latency: float, stream: bool = True):
+    next_fh = count(1).__next__
+    received: dict[int, int] = {}
+
+    class Servicer(CloudDrive_pb2_grpc.CloudDriveFileSrvServicer):
+        def CreateFile(self, request, context):
+            fh = next_fh()
+            received[fh] = 0
+            return CloudDrive_pb2.CreateFileResult(fileHandle=fh)
+
+        def WriteToFile(self, request, context):
+            sleep(latency)
+            received[request.fileHandle] += len(request.buffer)
+            return CloudDrive_pb2.WriteFileResult(bytesWritten=len(request.buffer))
+
+        def CloseFile(self, request, context):
+            return CloudDrive_pb2.FileOperationResult(success=True)
+
+    if stream:
+        def WriteToFileStream(self, request_iterator, context):
+            sleep(latency)
+            total = 0
+            for request in request_iterator:
+                received[request.fileHandle] += len(request.buffer)
+                total += len(request.buffer)
+            return CloudDrive_pb2.WriteFileResult(bytesWritten=total)
+        setattr(Servicer, "WriteToFileStream", WriteToFileStream)
+
+    return Servicer(), received
+
+
+def best(func, repeat: int) -> float:
+    cost = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        cost = min(cost, perf_counter() - start)
+    return cost
+
+
+def report(name: str, size: int, cost: float):
+    print(f"{name:<36} {cost:8.4f}s  {size / cost / (1 << 20):10.1f} MB/s")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    size = args.size << 20
+    servicer, received = make_servicer(args.latency / 1000, stream=not args.no_stream)
+    server = grpc.server(
+        ThreadPoolExecutor(8), 
+        options=[("grpc.max_receive_message_length", args.chunk_size + (1 << 16))], 
+    )
+    CloudDrive_pb2_grpc.add_CloudDriveFileSrvServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    fd, local = mkstemp()
+    try:
+        with open(fd, "wb") as f:
+            for _ in range(args.size):
+                f.write(urandom(1 << 20))
+        fs = CloudDriveFileSystem.login(f"http://127.0.0.1:{port}")
+        def upload(chunk_size: int, stream: bool):
+            fs.__dict__.update(upload_chunk_size=chunk_size, upload_stream=stream)
+            with open(local, "rb") as f:
+                fs._upload("/bench", f)
+            assert received[max(received)] == size
+        report("WriteToFile (8 KB)", size, best(lambda: upload(8192, False), args.repeat))
+        report(f"WriteToFile ({args.chunk_size >> 10} KB)", size, best(lambda: upload(args.chunk_size, False), args.repeat))
+        report(f"WriteToFileStream ({args.chunk_size >> 10} KB)", size, best(lambda: upload(args.chunk_size, True), args.repeat))
+    finally:
+        remove(local)
+        server.stop(None)
@@ -4,8 +4,8 @@
 from __future__ import annotations
 
 __author__ = "ChenyangGao <https://chenyanggao.github.io>"
-__version__ = (0, 0, 5)
-__all__ = ["HTTPFileReader", "AsyncHTTPFileReader"]
+__version__ = (0, 0, 6)
+__all__ = ["HTTPFileReader", "HTTPPositionalReader", "AsyncHTTPFileReader"]
 
 import errno
 
@@ -19,6 +19,7 @@ from io import (
 from os import fstat, stat, PathLike
 from shutil import COPY_BUFSIZE # type: ignore
 from sys import exc_info
+from threading import Condition
 from typing import cast, overload, Any, BinaryIO, Literal, Self
 from types import MappingProxyType
 from warnings import warn
@@ -523,6 +524,218 @@ class HTTPFileReader(RawIOBase, BinaryIO):
             return buffer
 
 
+class HTTPPositionalReader:
+    """Positional reads (like `os.pread`) on a http file, safe to be called from multiple threads.
+
+    It keeps a small pool of range connections (`HTTPFileReader`), each request is mapped to 
+    the idle connection whose position is nearest before the offset (within `seek_threshold`, 
+    so a forward seek just reads and discards, instead of reconnecting). If such a connection 
+    is busy but will end up right there, wait for it; otherwise open a new connection, until 
+    `max_connections` is reached, and then reuse (reconnect) the nearest idle one.
+
+    `stats` counts the connections opened (`connects`) and the seeks which had to reconnect 
+    (`reconnects`).
+    """
+    url: str | Callable[[], str]
+    headers: Mapping
+    length: int
+    max_connections: int
+    seek_threshold: int
+    urlopen: Callable
+
+    def __init__(
+        self, 
+        /, 
+        url: str | Callable[[], str], 
+        headers: None | Mapping = None, 
+        max_connections: int = 4, 
+        seek_threshold: int = 1 << 20, 
+        urlopen = urlopen, 
+        reader: None | HTTPFileReader = None, 
+    ):
+        if headers:
+            headers = {k: v for k, v in headers.items() if k.lower() != "range"}
+        else:
+            headers = {}
+        if urlopen is None:
+            urlopen = globals()["urlopen"]
+        self.url = url
+        self.headers = MappingProxyType(headers)
+        self.max_connections = max(max_connections, 1)
+        self.seek_threshold = max(seek_threshold, 0)
+        self.urlopen = urlopen
+        self._cond = Condition()
+        self._idle: list[HTTPFileReader] = []
+        # NOTE: busy connection -> the position it will be at after the current read
+        self._busy: dict[HTTPFileReader, int] = {}
+        self._count = 0
+        self._closed = False
+        # NOTE: offsets of the reads which are waiting for a connection
+        self._waiting: list[int] = []
+        self.stats: dict[str, int] = {"connects": 1, "reconnects": 0}
+        if reader is None:
+            reader = self._connect(0)
+        self.length = reader.length
+        self._idle.append(reader)
+        self._count = 1
+
+    @classmethod
+    def from_reader(
+        cls, 
+        /, 
+        reader: HTTPFileReader, 
+        max_connections: int = 4, 
+    ) -> Self:
+        "Adopt an opened `HTTPFileReader` as the first connection of the pool."
+        return cls(
+            reader.url, 
+            headers=reader.headers, 
+            max_connections=max_connections, 
+            seek_threshold=reader.seek_threshold, 
+            urlopen=reader.urlopen, 
+            reader=reader, 
+        )
+
+    def __del__(self, /):
+        try:
+            self.close()
+        except:
+            pass
+
+    def __enter__(self, /):
+        return self
+
+    def __exit__(self, /, *exc_info):
+        self.close()
+
+    def __len__(self, /) -> int:
+        return self.length
+
+    def __repr__(self, /) -> str:
+        return f"{type(self).__qualname__}(url={self.url!r}, length={self.length}, connections={self._count}/{self.max_connections})"
+
+    @property
+    def closed(self, /) -> bool:
+        return self._closed
+
+    def close(self, /):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            readers = [*self._idle, *self._busy]
+            self._idle.clear()
+            self._cond.notify_all()
+        for reader in readers:
+            try:
+                reader.close()
+            except Exception:
+                pass
+
+    def _connect(self, start: int, /) -> HTTPFileReader:
+        return HTTPFileReader(
+            self.url, 
+            headers=self.headers, 
+            start=start, 
+            seek_threshold=self.seek_threshold, 
+            urlopen=self.urlopen, 
+        )
+
+    def _acquire(self, offset: int, stop: int, /) -> None | HTTPFileReader:
+        "Take a connection for reading [offset, stop), None means that a new connection should be opened."
+        threshold = self.seek_threshold
+        cond = self._cond
+        waiting = self._waiting
+        with cond:
+            waiting.append(offset)
+            try:
+                while True:
+                    if self._closed:
+                        raise ValueError("I/O operation on closed file.")
+                    best: None | HTTPFileReader = None
+                    best_gap = threshold + 1
+                    best_busy = False
+                    for reader in self._idle:
+                        pos = reader.tell()
+                        gap = offset - pos
+                        if 0 <= gap < best_gap:
+                            # NOTE: leave it to another waiter, which is nearer to this position
+                            best_busy = any(pos <= o < offset for o in waiting)
+                            best, best_gap = reader, gap
+                    for reader, pos in self._busy.items():
+                        gap = offset - pos
+                        if 0 <= gap < best_gap:
+                            best, best_gap, best_busy = reader, gap, True
+                    if best is None:
+                        if self._count < self.max_connections:
+                            self._count += 1
+                            return None
+                        if self._idle:
+                            # NOTE: no connection is near enough, reconnect the nearest idle one
+                            best = min(self._idle, key=lambda r: abs(offset - r.tell()))
+                        else:
+                            cond.wait()
+                            continue
+                    elif best_busy:
+                        cond.wait()
+                        continue
+                    self._idle.remove(best)
+                    self._busy[best] = stop
+                    return best
+            finally:
+                waiting.remove(offset)
+
+    def _release(self, reader: None | HTTPFileReader, ok: bool, /):
+        with self._cond:
+            if reader is None:
+                self._count -= 1
+            else:
+                self._busy.pop(reader, None)
+                if ok and not self._closed:
+                    self._idle.append(reader)
+                else:
+                    self._count -= 1
+                    try:
+                        reader.close()
+                    except Exception:
+                        pass
+            self._cond.notify_all()
+
+    def pread(self, size: int, offset: int, /) -> bytes:
+        "Read at most `size` bytes from `offset`, it doesn't change any file position."
+        if offset < 0:
+            raise OSError(errno.EINVAL, f"negative offset: {offset!r}")
+        length = self.length
+        if size < 0 or offset + size > length:
+            size = length - offset
+        if size <= 0:
+            return b""
+        reader = self._acquire(offset, offset + size)
+        ok = False
+        try:
+            if reader is None:
+                reader = self._connect(offset)
+                self.stats["connects"] += 1
+                with self._cond:
+                    self._busy[reader] = offset + size
+            elif (pos := reader.tell()) != offset:
+                if not 0 < offset - pos <= self.seek_threshold:
+                    self.stats["reconnects"] += 1
+                reader.seek(offset)
+            data = reader.read(size)
+            if 0 < len(data) < size:
+                chunks = [data]
+                remaining = size - len(data)
+                while remaining and (chunk := reader.read(remaining)):
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+                data = b"".join(chunks)
+            ok = True
+            return data
+        finally:
+            self._release(reader, ok)
+
+
 class AsyncHTTPFileReader(HTTPFileReader):
     url: str | Callable[[], Awaitable[str]] # type: ignore
 
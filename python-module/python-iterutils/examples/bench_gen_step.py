@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# encoding: utf-8
+
+__doc__ = "run_gen_step / run_gen_step_iter 的微基准测试：测量每一步（yield）的调度开销"
+
+from argparse import ArgumentParser
+from asyncio import run
+from time import perf_counter
+
+from iterutils import run_gen_step, run_gen_step_iter, Yield, YieldFrom
+
+
+def parse_args():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--steps", type=int, default=100_000, help="每轮的步数，默认值 100000")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="重复轮数（取最优），默认值 5")
+    return parser.parse_args()
+
+
+def make_gen_step(n: int):
+    def gen_step():
+        total = 0
+        for i in range(n):
+            total += yield i
+        return total
+    return gen_step
+
+
+def make_gen_step_async(n: int):
+    async def one(i):
+        return i
+    def gen_step():
+        total = 0
+        for i in range(n):
+            total += yield one(i)
+        return total
+    return gen_step
+
+
+def make_gen_step_iter(n: int):
+    def gen_step():
+        for i in range(n):
+            yield Yield(i, may_call=False)
+        yield YieldFrom(range(n), may_call=False)
+    return gen_step
+
+
+async def consume(it):
+    async for _ in it:
+        pass
+
+
+def best(func, repeat: int) -> float:
+    cost = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        cost = min(cost, perf_counter() - start)
+    return cost
+
+
+def report(name: str, n: int, cost: float):
+    print(f"{name:<36} {cost:8.4f}s  {cost / n * 1e9:8.1f} ns/step")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    n, repeat = args.steps, args.repeat
+    report("run_gen_step(async_=False)", n, best(
+        lambda: run_gen_step(make_gen_step(n), async_=False), repeat))
+    report("run_gen_step(async_=True)", n, best(
+        lambda: run(run_gen_step(make_gen_step(n), async_=True)), repeat))
+    report("run_gen_step(async_=True) + await", n, best(
+        lambda: run(run_gen_step(make_gen_step_async(n), async_=True)), repeat))
+    report("run_gen_step_iter(async_=False)", 2 * n, best(
+        lambda: sum(1 for _ in run_gen_step_iter(make_gen_step_iter(n), async_=False)), repeat))
+    report("run_gen_step_iter(async_=True)", 2 * n, best(
+        lambda: run(consume(run_gen_step_iter(make_gen_step_iter(n), async_=True))), repeat))
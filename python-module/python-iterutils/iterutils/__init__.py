@@ -2,7 +2,7 @@
 # encoding: utf-8
 
 __author__ = "ChenyangGao <https://chenyanggao.github.io>"
-__version__ = (0, 2, 2)
+__version__ = (0, 2, 3)
 __all__ = [
     "Return", "Yield", "YieldFrom", "iterable", "async_iterable", 
     "foreach", "async_foreach", "through", "async_through", "flatten", 
@@ -26,7 +26,7 @@ from collections.abc import (
     ValuesView, 
 )
 from contextlib import (
-    asynccontextmanager, contextmanager, ExitStack, AsyncExitStack, 
+    aclosing, asynccontextmanager, contextmanager, ExitStack, AsyncExitStack, 
 )
 from copy import copy
 from dataclasses import dataclass
@@ -813,6 +813,112 @@ async def iter_gen_step_async(
         await close()
 
 
+def _run_gen_step_sync(
+    gen_step: Generator | Callable[[], Generator], 
+    may_call: bool | Literal[1] = True, 
+):
+    """快速路径：直接驱动生成器，省去 iter_gen_step 这一层中间生成器
+
+    .. note::
+        YieldBase 是抽象基类，对它做 isinstance 判断代价较高（要经过 ABCMeta.__instancecheck__），
+        所以热路径中改为检查 ``type(value).__mro__``（不支持通过 YieldBase.register 注册的虚拟子类）
+    """
+    if callable(gen_step):
+        gen_step = gen_step()
+    send  = gen_step.send
+    throw = gen_step.throw
+    value: Any = None
+    try:
+        try:
+            while YieldBase not in type(value).__mro__:
+                try:
+                    if may_call is 1 or may_call and callable(value):
+                        value = value()
+                except BaseException as e:
+                    value = throw(e)
+                else:
+                    value = send(value)
+        except StopIteration as e:
+            value = e.value
+        if YieldBase in type(value).__mro__:
+            maybe_callable = value.may_call
+            if maybe_callable is not None:
+                may_call = maybe_callable
+            value = value.value
+        if may_call is 1 or may_call and callable(value):
+            try:
+                value = value()
+            except BaseException as e:
+                value = throw(e)
+        return value
+    except KeyboardInterrupt as e:
+        e.args = gen_step,
+        e.add_note(f"stop iterating gen_step: {gen_step!r}")
+        raise
+    finally:
+        gen_step.close()
+
+
+async def _run_gen_step_async(
+    gen_step: Generator | Callable[[], Generator], 
+    may_await: bool | Literal[1] = True, 
+    may_call: bool | Literal[1] = True, 
+):
+    """快速路径（threaded=False）：直接调用 send/throw，不再为每一步包装协程
+    """
+    if callable(gen_step):
+        gen_step = gen_step()
+    send  = gen_step.send
+    throw = gen_step.throw
+    value: Any = None
+    try:
+        try:
+            while YieldBase not in type(value).__mro__:
+                try:
+                    if may_call is 1 or may_call and callable(value):
+                        if iscoroutinefunction(value):
+                            value = await value()
+                        else:
+                            value = value()
+                            if may_await is 1 or may_await and isawaitable(value):
+                                value = await value
+                    elif may_await is 1 or may_await and isawaitable(value):
+                        value = await value
+                except BaseException as e:
+                    value = throw(e)
+                else:
+                    value = send(value)
+        except StopIteration as e:
+            value = e.value
+        if YieldBase in type(value).__mro__:
+            maybe_awaitable = value.may_await
+            if maybe_awaitable is not None:
+                may_await = maybe_awaitable
+            maybe_callable  = value.may_call
+            if maybe_callable is not None:
+                may_call = maybe_callable
+            value = value.value
+        try:
+            if may_call is 1 or may_call and callable(value):
+                if iscoroutinefunction(value):
+                    value = await value()
+                else:
+                    value = value()
+                    if may_await is 1 or may_await and isawaitable(value):
+                        value = await value
+            elif may_await is 1 or may_await and isawaitable(value):
+                value = await value
+        except BaseException as e:
+            value = throw(e)
+        return value
+    except KeyboardInterrupt as e:
+        e.args = gen_step,
+        e.add_note(f"stop iterating gen_step: {gen_step!r}")
+        raise
+    finally:
+        gen_step.close()
+
+
 def run_gen_step(
     gen_step: Generator | Callable[[], Generator], 
     may_await: bool | Literal[1] = True, 
@@ -827,6 +933,12 @@ def run_gen_step(
     if async_ is None:
         async_ = _get_async()
     if async_:
+        if running_flag is None and not threaded:
+            return _run_gen_step_async(
+                gen_step, 
+                may_await=may_await, 
+                may_call=may_call, 
+            )
         async def process():
             gen = iter_gen_step_async(
                 gen_step, 
@@ -859,20 +971,18 @@ def run_gen_step(
                 e.add_note(f"stop iterating gen_step: {gen!r}")
                 raise
         return process()
+    elif running_flag is None:
+        return _run_gen_step_sync(gen_step, may_call=may_call)
     else:
         gen = iter_gen_step(gen_step, may_call=may_call)
         try:
-            if running_flag is None:
-                for value in gen:
-                    pass
-            else:
-                if not callable(running_flag):
-                    running_flag = running_flag.__bool__
+            if not callable(running_flag):
+                running_flag = running_flag.__bool__
+            if not running_flag():
+                raise RuntimeError("stop before starting", gen) from StopIteration()
+            for value in gen:
                 if not running_flag():
-                    raise RuntimeError("stop before starting", gen) from StopIteration()
-                for value in gen:
-                    if not running_flag():
-                        raise RuntimeError("stop midway", gen) from StopIteration(value)
+                    raise RuntimeError("stop midway", gen) from StopIteration(value)
             return value
         except Reraised as e:
             raise e.exception
@@ -893,22 +1003,22 @@ def run_gen_step_sync_iter(
     send:  Callable = gen_step.send
     throw: Callable = gen_step.throw
     close: Callable = gen_step.close
-    def extract(value, may_call=may_call, /):
-        yield_type = -1
-        if isinstance(value, YieldBase):
-            yield_type = value.yield_type
-            maybe_callable = value.may_call
-            if maybe_callable is not None:
-                may_call = maybe_callable
-            value      = value.value
-        if may_call is 1 or may_call and callable(value):
-            value = value()
-        return yield_type, value
+    call: bool | Literal[1]
     try:
         value = send(None)
         while True:
             try:
-                yield_type, value = extract(value)
+                # NOTE: 内联展开，避免每一步都多一次函数调用
+                yield_type = -1
+                call = may_call
+                if YieldBase in type(value).__mro__:
+                    yield_type = value.yield_type
+                    maybe_callable = value.may_call
+                    if maybe_callable is not None:
+                        call = maybe_callable
+                    value = value.value
+                if call is 1 or call and callable(value):
+                    value = value()
                 match yield_type:
                     case 0:
                         return value
@@ -922,7 +1032,17 @@ def run_gen_step_sync_iter(
                 value = send(value)
     except StopIteration as e:
         try:
-            yield_type, value = extract(e.value)
+            value = e.value
+            yield_type = -1
+            call = may_call
+            if YieldBase in type(value).__mro__:
+                yield_type = value.yield_type
+                maybe_callable = value.may_call
+                if maybe_callable is not None:
+                    call = maybe_callable
+                value = value.value
+            if call is 1 or call and callable(value):
+                value = value()
             match yield_type:
                 case 1:
                     yield value
@@ -936,19 +1056,18 @@ def run_gen_step_sync_iter(
         close()
 
 
-async def run_gen_step_async_iter(
+async def _run_gen_step_async_iter_threaded(
     gen_step: Generator | Callable[[], Generator], 
     may_await: bool | Literal[1] = True, 
     may_call: bool | Literal[1] = True, 
-    threaded: bool = False, 
 ) -> AsyncIterator:
-    """
+    """线程模式：生成器的每一步都在线程中执行
     """
     if callable(gen_step):
         gen_step = gen_step()
-    send:  Callable = call_as_async(gen_step.send, threaded=threaded)
-    throw: Callable = call_as_async(gen_step.throw, threaded=threaded)
-    close: Callable = call_as_async(gen_step.close, threaded=threaded)
+    send:  Callable = call_as_async(gen_step.send, threaded=True)
+    throw: Callable = call_as_async(gen_step.throw, threaded=True)
+    close: Callable = call_as_async(gen_step.close, threaded=True)
     async def extract(value, may_await=may_await, may_call=may_call, /):
         yield_type = -1
         if isinstance(value, YieldBase):
@@ -962,7 +1081,7 @@ async def run_gen_step_async_iter(
             value = value.value
         if may_call is 1 or may_call and callable(value):
             value = await call_as_async(
-                value, may_await=may_await, threaded=threaded)()
+                value, may_await=may_await, threaded=True)()
         elif may_await is 1 or may_await and isawaitable(value):
             value = await value
         return yield_type, value
@@ -977,7 +1096,7 @@ async def run_gen_step_async_iter(
                     case 1:
                         yield value
                     case 2:
-                        async for val in ensure_aiter(value, threaded=threaded):
+                        async for val in ensure_aiter(value, threaded=True):
                             yield val
             except BaseException as e:
                 if isinstance(e, Reraised):
@@ -995,7 +1114,7 @@ async def run_gen_step_async_iter(
                     case 1:
                         yield value
                     case 2:
-                        async for val in ensure_aiter(value, threaded=threaded):
+                        async for val in ensure_aiter(value, threaded=True):
                             yield val
             except BaseException as e:
                 if isinstance(e, Reraised):
@@ -1007,6 +1126,110 @@ async def run_gen_step_async_iter(
         await close()
 
 
+async def run_gen_step_async_iter(
+    gen_step: Generator | Callable[[], Generator], 
+    may_await: bool | Literal[1] = True, 
+    may_call: bool | Literal[1] = True, 
+    threaded: bool = False, 
+) -> AsyncIterator:
+    """
+    """
+    if threaded:
+        async with aclosing(_run_gen_step_async_iter_threaded(
+            gen_step, 
+            may_await=may_await, 
+            may_call=may_call, 
+        )) as agen:
+            async for value in agen:
+                yield value
+        return
+    if callable(gen_step):
+        gen_step = gen_step()
+    # NOTE: 非线程模式下，直接调用生成器的方法，无需为每一步都包装一个协程
+    send  = gen_step.send
+    throw = gen_step.throw
+    await_: bool | Literal[1]
+    call: bool | Literal[1]
+    try:
+        value = send(None)
+        while True:
+            try:
+                yield_type = -1
+                await_, call = may_await, may_call
+                if YieldBase in type(value).__mro__:
+                    yield_type = value.yield_type
+                    maybe_awaitable = value.may_await
+                    if maybe_awaitable is not None:
+                        await_ = maybe_awaitable
+                    maybe_callable = value.may_call
+                    if maybe_callable is not None:
+                        call = maybe_callable
+                    value = value.value
+                if call is 1 or call and callable(value):
+                    if iscoroutinefunction(value):
+                        value = await value()
+                    else:
+                        value = value()
+                        if await_ is 1 or await_ and isawaitable(value):
+                            value = await value
+                elif await_ is 1 or await_ and isawaitable(value):
+                    value = await value
+                match yield_type:
+                    case 0:
+                        return
+                    case 1:
+                        yield value
+                    case 2:
+                        # NOTE: 同步的可迭代对象直接批量转发，不必再包装成异步迭代器
+                        if isinstance(value, AsyncIterable):
+                            async for val in value:
+                                yield val
+                        else:
+                            for val in value:
+                                yield val
+            except BaseException as e:
+                value = throw(e)
+            else:
+                value = send(value)
+    except StopIteration as e:
+        try:
+            value = e.value
+            yield_type = -1
+            await_, call = may_await, may_call
+            if YieldBase in type(value).__mro__:
+                yield_type = value.yield_type
+                maybe_awaitable = value.may_await
+                if maybe_awaitable is not None:
+                    await_ = maybe_awaitable
+                maybe_callable = value.may_call
+                if maybe_callable is not None:
+                    call = maybe_callable
+                value = value.value
+            if call is 1 or call and callable(value):
+                if iscoroutinefunction(value):
+                    value = await value()
+                else:
+                    value = value()
+                    if await_ is 1 or await_ and isawaitable(value):
+                        value = await value
+            elif await_ is 1 or await_ and isawaitable(value):
+                value = await value
+            match yield_type:
+                case 1:
+                    yield value
+                case 2:
+                    if isinstance(value, AsyncIterable):
+                        async for val in value:
+                            yield val
+                    else:
+                        for val in value:
+                            yield val
+        except BaseException as e:
+            throw(e)
+    finally:
+        gen_step.close()
+
+
 @overload
 def run_gen_step_iter(
     gen_step: Generator | Callable[[], Generator], 